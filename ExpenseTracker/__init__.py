@@ -9,15 +9,13 @@ This package provides:
 - :mod:`ExpenseTracker.settings` – Settings management, including schema validation, editors, and presets.
 - :mod:`ExpenseTracker.log` – In-app logging with real-time log viewer.
 
-Use :func:`ExpenseTracker.exec_` to launch the application.
+Use :func:`ExpenseTracker.exec_` to launch the application, or ``python -m ExpenseTracker.cli``
+to print summaries and trends without a GUI.
 """
 
-import logging
 import os
 import pathlib
 
-from PySide6 import QtCore
-
 __version__ = '0.0.0'
 __author__ = 'Gergely Wootsch'
 __license__ = 'GPL-3.0'
@@ -31,18 +29,20 @@ __email__ = 'hello+ExpenseTracker@gergely-wootsch.com'
 font_dir = pathlib.Path(__file__).parent / 'config' / 'font'
 os.environ.setdefault('QT_QPA_FONTDIR', str(font_dir))
 
-from .log import log
-
-log.setup_logging()
-
-    
 
 def exec_() -> None:
     """Launch the ExpenseTracker GUI application and enter its event loop.
 
-    Initializes the QApplication, shows the main window, and starts the Qt event loop.
+    Sets up logging, initializes the QApplication, shows the main window, and starts the Qt
+    event loop. Importing the package itself stays free of Qt and logging side effects so
+    :mod:`ExpenseTracker.cli` can run headless.
     """
     import sys
+    from PySide6 import QtCore
+    from .log import log
+
+    log.setup_logging()
+
     from .ui import app
     from .ui import main
     from .ui.actions import signals
@@ -0,0 +1,191 @@
+"""Headless command-line entry point for ledger summaries and trends.
+
+Reads the cached ledger, optionally refreshing it from the spreadsheet first, and prints or
+exports the results of :func:`ExpenseTracker.data.data.get_data` and
+:func:`ExpenseTracker.data.data.get_trends` as CSV or JSON. No application object is created
+and the analytics modules are only imported once the arguments are parsed, so the command is
+suitable for cron jobs and servers.
+
+Examples::
+
+    python -m ExpenseTracker.cli summary
+    python -m ExpenseTracker.cli summary --yearmonth 2025-01 --span 3 --format json
+    python -m ExpenseTracker.cli --refresh trends --category Groceries --output trends.csv
+    python -m ExpenseTracker.cli --refresh --incremental summary
+    python -m ExpenseTracker.cli --refresh requests --format json
+
+Options not given on the command line default to the values stored in the ``metadata``
+config section. Exits with status 1 if the cache is unusable or the refresh fails.
+"""
+import argparse
+import json
+import logging
+import pathlib
+import sys
+from typing import Any, Dict, Optional
+
+FORMATS = ('csv', 'json')
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m ExpenseTracker.cli', description=__doc__.splitlines()[0])
+    parser.add_argument('--refresh', action='store_true',
+                        help='Fetch the ledger from the spreadsheet and update the cache first.')
+    parser.add_argument('--incremental', action='store_true',
+                        help='With --refresh, only fetch the rows added to the bottom of the spreadsheet.')
+    parser.add_argument('--verbose', '-v', action='count', default=0,
+                        help='Log progress to stderr; repeat for debug output.')
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--format', choices=FORMATS, default=None,
+                        help='Output format (default: inferred from --output, otherwise csv).')
+    output.add_argument('--output', '-o', type=pathlib.Path, default=None,
+                        help='Write to this file instead of stdout.')
+
+    common = argparse.ArgumentParser(add_help=False, parents=[output])
+    common.add_argument('--yearmonth', default=None, help='First month of the period as YYYY-MM.')
+    common.add_argument('--span', type=int, default=None, help='Number of months in the period.')
+    common.add_argument('--filter', dest='filter_expression', default='',
+                        help='Filter expression, e.g. \'amount < -50 and account in ("Visa")\'.')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    summary = commands.add_parser('summary', parents=[common], help='Per-category totals for the period.')
+    summary.add_argument('--transactions', action='store_true',
+                         help='Include the transactions of each category (JSON only).')
+
+    trends = commands.add_parser('trends', parents=[common], help='Monthly totals and LOESS trend per category.')
+    trends.add_argument('--category', default=None, help='Only compute the trend of this category.')
+    trends.add_argument('--negative-span', type=int, default=None,
+                        help='Number of months before --yearmonth to include.')
+
+    requests = commands.add_parser('requests', parents=[output],
+                                   help='Sheets API latency, retries and bytes per request method.')
+    requests.add_argument('--refreshes', action='store_true',
+                          help='List the requests and bytes of each refresh instead.')
+
+    args = parser.parse_args(argv)
+    if args.format is None:
+        suffix = args.output.suffix.lower().lstrip('.') if args.output else ''
+        args.format = suffix if suffix in FORMATS else 'csv'
+    return args
+
+
+def _overrides(args: argparse.Namespace) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {'filter_expression': args.filter_expression}
+    if args.yearmonth is not None:
+        kwargs['yearmonth'] = args.yearmonth
+    if args.span is not None:
+        kwargs['span'] = args.span
+    return kwargs
+
+
+def refresh(incremental: bool = False) -> None:
+    """Fetch the ledger from the spreadsheet and replace the cached data.
+
+    Uses the stored credentials only; authenticate from the application first if they have expired.
+
+    Args:
+        incremental: Append the rows added to the bottom of the spreadsheet to the cache instead,
+            falling back to a full fetch if the spreadsheet changed otherwise.
+    """
+    from .core import service
+    from .core.database import database
+
+    if incremental:
+        new_rows = service._fetch_new_rows()
+        if new_rows is not None:
+            database.append_data(new_rows.df)
+            database.set_fetch_state(new_rows.row_count, new_rows.fingerprint)
+            return
+
+    df = service._fetch_data()
+    database.cache_data(df)
+
+
+def summary(args: argparse.Namespace):
+    from .data import data
+
+    df = data.get_data(add_total_row=True, **_overrides(args))
+    if args.format != 'json' or not args.transactions:
+        df = df.drop(columns=['transactions'], errors='ignore')
+    return df
+
+
+def trends(args: argparse.Namespace):
+    from .data import data
+    from .settings import lib
+
+    kwargs = _overrides(args)
+    kwargs['negative_span'] = args.negative_span if args.negative_span is not None else lib.settings['negative_span']
+    kwargs['loess_fraction'] = lib.settings['loess_fraction']
+    return data.get_trends(category=args.category, **kwargs)
+
+
+def requests(args: argparse.Namespace):
+    """Return the telemetry of the requests sent by this process, e.g. by ``--refresh``."""
+    from .core import telemetry
+
+    return telemetry.refresh_frame() if args.refreshes else telemetry.summary_frame()
+
+
+def export(df, fmt: str, path: Optional[pathlib.Path] = None) -> None:
+    """Write a DataFrame as CSV or JSON records to a file, or to stdout if no path is given."""
+    if fmt == 'json':
+        text = json.dumps(json.loads(df.to_json(orient='records', date_format='iso')), indent=2) + '\n'
+    else:
+        text = df.to_csv(index=False)
+
+    if path is None:
+        sys.stdout.write(text)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    logging.info(f'Wrote {len(df)} rows to {path}')
+
+
+def _shutdown() -> None:
+    """Disconnect the Qt singletons from the application signals.
+
+    Without an application object owning them, connected QObjects can crash the interpreter
+    during finalization.
+    """
+    modules = sys.modules
+    if 'ExpenseTracker.ui.actions' not in modules:
+        return
+    signals = modules['ExpenseTracker.ui.actions'].signals
+    for name, attr in (('ExpenseTracker.core.database', 'database'), ('ExpenseTracker.core.sync', 'sync')):
+        if name in modules:
+            signals.disconnect(getattr(modules[name], attr))
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    level = logging.WARNING - 10 * min(args.verbose, 2)
+    logging.basicConfig(level=level, format='%(levelname)s: %(message)s', stream=sys.stderr)
+
+    from .core.database import database
+    from .status import status
+
+    try:
+        if args.refresh:
+            refresh(incremental=args.incremental)
+        if args.command == 'requests':
+            df = requests(args)
+        else:
+            database.verify()
+            df = summary(args) if args.command == 'summary' else trends(args)
+        export(df, args.format, args.output)
+    except status.BaseStatusException:
+        # Already logged when raised
+        return 1
+    except Exception as ex:
+        logging.error(f'{type(ex).__name__}: {ex}')
+        return 1
+    finally:
+        _shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,8 +3,22 @@ Core package for ExpenseTracker providing essential functionality.
 
 This package includes:
 
+- :mod:`ExpenseTracker.core.asyncsheets` – Asyncio Sheets API client on a keep-alive connection pool.
 - :mod:`ExpenseTracker.core.auth` – Google OAuth2 authentication and credential management.
+- :mod:`ExpenseTracker.core.autorefresh` – Periodic background refresh of the cache with change detection.
 - :mod:`ExpenseTracker.core.database` – Local SQLite cache and data access for ledger data.
+- :mod:`ExpenseTracker.core.discovery` – Cached Sheets discovery document and timed service construction.
+- :mod:`ExpenseTracker.core.fetcher` – Concurrent, per-range retried downloads of large worksheets.
+- :mod:`ExpenseTracker.core.filters` – Filter expression language compiled to SQL WHERE clauses and pandas masks.
+- :mod:`ExpenseTracker.core.localsheets` – File-backed stand-in for the Sheets API, selected with a ``local:`` spreadsheet id.
+- :mod:`ExpenseTracker.core.profiler` – Per-stage timing instrumentation of the data pipeline kept in a ring buffer.
+- :mod:`ExpenseTracker.core.quality` – Data-quality scan of the cached ledger, computed once per cache generation.
+- :mod:`ExpenseTracker.core.rowindex` – Persistent index of the remote rows' stable keys for targeted commit verification.
+- :mod:`ExpenseTracker.core.scheduler` – Quota-aware rate limiting and retrying of Sheets API requests.
 - :mod:`ExpenseTracker.core.service` – Google Sheets API integration with asynchronous fetch, verify, and utility operations.
+- :mod:`ExpenseTracker.core.sheetmeta` – Short-lived cache of worksheet sizes and header rows shared across requests.
+- :mod:`ExpenseTracker.core.tasks` – Thread-pool task executor with futures, Qt signal handles and cooperative cancellation.
+- :mod:`ExpenseTracker.core.telemetry` – Per-request latency, retry and payload statistics of Sheets API calls.
+- :mod:`ExpenseTracker.core.typeinfer` – Column type inference from a sample of rows spread across the sheet.
 - :mod:`ExpenseTracker.core.sync` – Queued local edit management and optimistic synchronization with the remote sheet.
 """
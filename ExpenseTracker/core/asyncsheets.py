@@ -0,0 +1,407 @@
+"""Asyncio client for the Sheets API.
+
+:class:`AsyncSheetsClient` sends the requests used by the app (spreadsheet metadata,
+``values:batchGet`` and ``values:batchUpdate``) as coroutines. Many requests can be in flight
+from a single thread. Connections come from a :class:`ConnectionPool` and stay open between
+requests (HTTP/1.1 keep-alive), so concurrent range downloads share a few TLS connections.
+
+Requests use the quotas and retry rules of :mod:`ExpenseTracker.core.scheduler` and are
+recorded in its request records.
+
+:func:`ExpenseTracker.core.fetcher.fetch_value_ranges` downloads the ranges of the Sheets API
+with this client, see :func:`ExpenseTracker.core.fetcher.async_client`.
+
+Coroutines run on the event loop of the :mod:`~ExpenseTracker.core.tasks` executor, which
+reports the result through the Qt signals of a :class:`~ExpenseTracker.core.tasks.TaskHandle`::
+
+    client = AsyncSheetsClient()
+    handle = executor.submit_async(client.fetch_ranges, spreadsheet_id, ranges)
+    handle.finished.connect(on_rows)
+
+Point ``base_url`` at a :class:`~ExpenseTracker.core.localsheets.LocalSheetsServer` to run
+against a local spreadsheet without credentials.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import ssl
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from . import scheduler as _scheduler
+
+#: Base URL of the Sheets API spreadsheets collection
+SHEETS_URL: str = 'https://sheets.googleapis.com/v4/spreadsheets'
+#: Maximum number of open connections per pool
+DEFAULT_CONNECTIONS: int = 8
+#: Seconds an idle connection is kept open
+KEEPALIVE: float = 60.0
+#: Seconds to wait for a response
+DEFAULT_TIMEOUT: float = 60.0
+#: Maximum number of ranges downloaded at the same time by :meth:`AsyncSheetsClient.fetch_ranges`
+DEFAULT_CONCURRENCY: int = 6
+
+_Key = Tuple[str, str, int]
+
+
+@dataclass
+class Response:
+    """An HTTP response.
+
+    Attributes:
+        status: HTTP status code.
+        headers: Response headers with lower-case names.
+        body: The decoded response body.
+    """
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b''
+
+    def json(self) -> Dict[str, Any]:
+        return json.loads(self.body) if self.body else {}
+
+
+class _Connection:
+    """A keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = time.monotonic()
+
+    def close(self) -> None:
+        self.writer.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    async def request(self, method: str, target: str, headers: Dict[str, str],
+                      body: Optional[bytes]) -> Tuple[Response, bool]:
+        """Send a request and read the response. Returns the response and whether the connection can be reused."""
+        lines = [f'{method} {target} HTTP/1.1']
+        lines += [f'{k}: {v}' for k, v in headers.items()]
+        lines.append(f'Content-Length: {len(body or b"")}')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by the server.')
+        version, status_code = status_line.decode('latin-1').split(' ', 2)[:2]
+
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name, value = name.strip().lower(), value.strip()
+            response_headers[name] = f'{response_headers[name]}, {value}' if name in response_headers else value
+
+        keep_alive = version == 'HTTP/1.1' and response_headers.get('connection', '').lower() != 'close'
+        if 'chunked' in response_headers.get('transfer-encoding', '').lower():
+            content = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            content = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            content, keep_alive = await self.reader.read(), False
+
+        if response_headers.get('content-encoding', '').lower() == 'gzip':
+            content = gzip.decompress(content)
+        self.idle_since = time.monotonic()
+        return Response(int(status_code), response_headers, content), keep_alive
+
+    async def _read_chunked(self) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            size = int((await self.reader.readline()).split(b';', 1)[0].strip() or b'0', 16)
+            if not size:
+                # Skip the trailer
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+class ConnectionPool:
+    """Pool of keep-alive connections, shared by the requests of one event loop.
+
+    Args:
+        max_connections: Maximum number of open connections; further requests wait.
+        keepalive: Seconds an idle connection is kept open.
+        timeout: Seconds to wait for a connection and its response.
+
+    Attributes:
+        opened: Number of connections opened so far.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_CONNECTIONS, keepalive: float = KEEPALIVE,
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.max_connections = max_connections
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: Dict[_Key, List[_Connection]] = {}
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._ssl: Optional[ssl.SSLContext] = None
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body: Optional[bytes] = None) -> Response:
+        """Send a request on an idle connection to the host, or on a new one.
+
+        A reused connection the server has closed in the meantime is replaced once.
+
+        Raises:
+            ConnectionError: If the connection fails.
+            TimeoutError: If there is no response within :attr:`timeout`.
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname or '', parts.port or (443 if parts.scheme == 'https' else 80))
+        target = parts.path + (f'?{parts.query}' if parts.query else '')
+        headers = {
+            'Host': parts.netloc,
+            'Accept-Encoding': 'gzip',
+            'User-Agent': 'ExpenseTracker (gzip)',
+            **(headers or {}),
+        }
+
+        async with self._semaphore:
+            conn = self._acquire(key)
+            if conn is not None:
+                try:
+                    return await self._send(key, conn, method, target, headers, body)
+                except ConnectionError:
+                    logging.debug(f'Keep-alive connection to {key[1]} was closed, reconnecting.')
+            conn = await asyncio.wait_for(self._open(key), self.timeout)
+            return await self._send(key, conn, method, target, headers, body)
+
+    async def close(self) -> None:
+        """Close the idle connections."""
+        for connections in self._idle.values():
+            for conn in connections:
+                conn.close()
+        self._idle.clear()
+
+    def idle_count(self) -> int:
+        """Return the number of open idle connections."""
+        return sum(len(c) for c in self._idle.values())
+
+    def _acquire(self, key: _Key) -> Optional[_Connection]:
+        connections = self._idle.get(key, [])
+        now = time.monotonic()
+        while connections:
+            conn = connections.pop()
+            if not conn.closed and now - conn.idle_since < self.keepalive:
+                return conn
+            conn.close()
+        return None
+
+    async def _open(self, key: _Key) -> _Connection:
+        scheme, host, port = key
+        context = None
+        if scheme == 'https':
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        self.opened += 1
+        logging.debug(f'Opened connection to {host}:{port} ({self.opened} so far).')
+        return _Connection(reader, writer)
+
+    async def _send(self, key: _Key, conn: _Connection, method: str, target: str, headers: Dict[str, str],
+                    body: Optional[bytes]) -> Response:
+        try:
+            response, keep_alive = await asyncio.wait_for(conn.request(method, target, headers, body), self.timeout)
+        except asyncio.IncompleteReadError as ex:
+            conn.close()
+            raise ConnectionResetError('Connection closed while reading the response.') from ex
+        except BaseException:
+            # Includes cancellation: the response may be half read
+            conn.close()
+            raise
+        if keep_alive:
+            self._idle.setdefault(key, []).append(conn)
+        else:
+            conn.close()
+        return response
+
+
+class AsyncSheetsClient:
+    """Sends Sheets API requests as coroutines.
+
+    Use one client per event loop.
+
+    Args:
+        credentials: OAuth2 credentials. If None, the app's saved credentials are used for the
+            Sheets API and no credentials for other base URLs.
+        base_url: URL of the spreadsheets collection.
+        pool: Connection pool, defaults to a new pool.
+        rate_limited: Count requests towards the Sheets quota, defaults to True for the Sheets API.
+        attempts: Maximum number of attempts per request.
+        backoff: Upper bound of the delay before the first retry in seconds.
+    """
+
+    def __init__(self, credentials: Any = None, base_url: str = SHEETS_URL, pool: Optional[ConnectionPool] = None,
+                 rate_limited: Optional[bool] = None, attempts: int = _scheduler.DEFAULT_ATTEMPTS,
+                 backoff: float = _scheduler.DEFAULT_BACKOFF) -> None:
+        self.credentials = credentials
+        self.base_url = base_url.rstrip('/')
+        self.pool = pool or ConnectionPool()
+        self.rate_limited = base_url == SHEETS_URL if rate_limited is None else rate_limited
+        self.attempts = attempts
+        self.backoff = backoff
+
+    async def close(self) -> None:
+        """Close the idle connections of the pool."""
+        await self.pool.close()
+
+    async def get_metadata(self, spreadsheet_id: str, fields: Optional[str] = None,
+                           ranges: Optional[List[str]] = None, include_grid_data: bool = False) -> Dict[str, Any]:
+        """Return the spreadsheet resource, like ``spreadsheets().get()``."""
+        params: List[Tuple[str, str]] = [('ranges', r) for r in ranges or []]
+        if include_grid_data:
+            params.append(('includeGridData', 'true'))
+        if fields:
+            params.append(('fields', fields))
+        return await self._call('GET', 'spreadsheets.get', spreadsheet_id, '', params)
+
+    async def batch_get(self, spreadsheet_id: str, ranges: List[str], value_render_option: str = 'UNFORMATTED_VALUE',
+                        date_time_render_option: str = 'SERIAL_NUMBER', major_dimension: str = 'ROWS',
+                        fields: Optional[str] = None) -> Dict[str, Any]:
+        """Return the values of ``ranges``, like ``values().batchGet()``."""
+        params = [('ranges', r) for r in ranges] + [
+            ('valueRenderOption', value_render_option),
+            ('dateTimeRenderOption', date_time_render_option),
+            ('majorDimension', major_dimension),
+        ]
+        if fields:
+            params.append(('fields', fields))
+        return await self._call('GET', 'spreadsheets.values.batchGet', spreadsheet_id, '/values:batchGet', params)
+
+    async def batch_update(self, spreadsheet_id: str, data: List[Dict[str, Any]],
+                           value_input_option: str = 'USER_ENTERED') -> Dict[str, Any]:
+        """Write values to ranges, like ``values().batchUpdate()``.
+
+        Args:
+            spreadsheet_id: Spreadsheet ID.
+            data: Value ranges, e.g. ``[{'range': 'Sheet1!B2', 'values': [['x']]}]``.
+            value_input_option: How the values are interpreted.
+        """
+        body = {'valueInputOption': value_input_option, 'data': data}
+        return await self._call(
+            'POST', 'spreadsheets.values.batchUpdate', spreadsheet_id, '/values:batchUpdate', [], body
+        )
+
+    async def fetch_ranges(self, spreadsheet_id: str, ranges: List[str], value_render_option: str = 'UNFORMATTED_VALUE',
+                           concurrency: int = DEFAULT_CONCURRENCY) -> List[List[Any]]:
+        """Download ranges concurrently and return their rows in the order of ``ranges``.
+
+        The asyncio counterpart of :func:`ExpenseTracker.core.fetcher.fetch_ranges`.
+        """
+        values = await self.fetch_value_ranges(
+            spreadsheet_id, ranges, value_render_option=value_render_option, concurrency=concurrency
+        )
+        return [row for rows in values for row in rows]
+
+    async def fetch_value_ranges(self, spreadsheet_id: str, ranges: List[str],
+                                 value_render_option: str = 'UNFORMATTED_VALUE',
+                                 date_time_render_option: str = 'SERIAL_NUMBER', major_dimension: str = 'ROWS',
+                                 concurrency: int = DEFAULT_CONCURRENCY,
+                                 progress: Optional[Callable[[int, int, int], None]] = None,
+                                 group: int = 1) -> List[List[List[Any]]]:
+        """Download ranges concurrently and return the values of each range, in the order of ``ranges``.
+
+        The asyncio counterpart of :func:`ExpenseTracker.core.fetcher.fetch_value_ranges`, which
+        uses it for the Sheets API. If a request fails all its attempts, the requests still in
+        flight are cancelled and the error is raised.
+
+        Args:
+            progress: Called with the number of completed ranges, the number of ranges and the
+                number of rows or columns fetched so far, on the event loop's thread.
+            group: Number of consecutive ranges requested with one ``batchGet``.
+        """
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        step = max(int(group), 1)
+        counts = {'ranges': 0, 'rows': 0}
+
+        async def fetch(_ranges: List[str]) -> List[List[List[Any]]]:
+            async with semaphore:
+                result = await self.batch_get(
+                    spreadsheet_id, _ranges, value_render_option, date_time_render_option, major_dimension,
+                    fields='valueRanges(values)'
+                )
+            value_ranges = result.get('valueRanges', [])
+            values = [value_ranges[i].get('values', []) if i < len(value_ranges) else [] for i in range(len(_ranges))]
+            counts['ranges'] += len(values)
+            counts['rows'] += sum(len(v) for v in values)
+            logging.debug(
+                f'Fetched {", ".join(_ranges)} ({sum(len(v) for v in values)} {major_dimension.lower()}, '
+                f'{counts["ranges"]}/{len(ranges)}).'
+            )
+            if progress:
+                progress(counts['ranges'], len(ranges), counts['rows'])
+            return values
+
+        tasks = [asyncio.ensure_future(fetch(ranges[i:i + step])) for i in range(0, len(ranges), step)]
+        try:
+            chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return [values for chunk in chunks for values in chunk]
+
+    async def _headers(self) -> Dict[str, str]:
+        headers = {'Accept': 'application/json'}
+        if self.credentials is None and self.base_url == SHEETS_URL:
+            from .auth import auth_manager
+            self.credentials = await asyncio.to_thread(auth_manager.get_valid_credentials)
+        if self.credentials is not None:
+            if not self.credentials.valid:
+                import google.auth.transport.requests
+                await asyncio.to_thread(self.credentials.refresh, google.auth.transport.requests.Request())
+            headers['Authorization'] = f'Bearer {self.credentials.token}'
+        return headers
+
+    async def _call(self, method: str, name: str, spreadsheet_id: str, path: str, params: List[Tuple[str, str]],
+                    body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        url = f'{self.base_url}/{urllib.parse.quote(spreadsheet_id, safe="")}{path}'
+        if params:
+            url = f'{url}?{urllib.parse.urlencode(params)}'
+        content = json.dumps(body).encode('utf-8') if body is not None else None
+        ranges = tuple(v for k, v in params if k == 'ranges') + tuple(d['range'] for d in (body or {}).get('data', []))
+
+        with _scheduler.scheduler.retrying(
+                name.split('.', 1)[-1], ranges, write=method != 'GET', limited=self.rate_limited,
+                attempts=self.attempts, backoff=self.backoff
+        ) as retry:
+            while True:
+                if retry.bucket is not None:
+                    retry.record.waited += await retry.bucket.acquire_async()
+                retry.start()
+                try:
+                    headers = await self._headers()
+                    if content is not None:
+                        headers['Content-Type'] = 'application/json; charset=UTF-8'
+                    response = await self.pool.request(method, url, headers, content)
+                    retry.record.bytes += len(response.body)
+                    if response.status >= 400:
+                        raise HttpError(httplib2.Response({'status': response.status, **response.headers}),
+                                        response.body, uri=url)
+                    result = response.json()
+                except Exception as ex:
+                    delay = retry.failed(ex)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                else:
+                    retry.succeeded()
+                    return result
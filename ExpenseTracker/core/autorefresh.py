@@ -0,0 +1,224 @@
+"""Periodic background refresh of the cached ledger.
+
+The module-level :data:`refresher` checks the spreadsheet for changes on a timer. The check
+and any download run on the :mod:`~ExpenseTracker.core.tasks` executor, without the modal
+progress dialog of :func:`ExpenseTracker.core.service.fetch_data`. Changes are applied on
+the main thread through the cache layer:
+
+- If the sheet is unchanged, nothing is emitted.
+- If rows were only appended, they are added to the cache and ``dataAppended`` is emitted.
+  Views update in place.
+- Otherwise the whole sheet is downloaded. If it differs from the cache, ``dataFetched``
+  is emitted, like a manual refresh; if it equals the cache, nothing is emitted.
+
+Fetching resets the views and discards queued edits, so no refresh starts while edits are
+queued or a commit is running, and a download is dropped if edits were queued meanwhile.
+
+The change check is :func:`ExpenseTracker.core.service._fetch_new_rows`. It compares the
+fingerprint of the header and the last cached rows with the remote sheet, then reads the rows
+below them. Edits above the fingerprinted rows don't change the fingerprint, so the whole sheet
+is also downloaded if no full fetch happened for :data:`FULL_REFRESH_MINUTES`. Edits committed
+by the app store a new fingerprint, see :func:`ExpenseTracker.core.service._refresh_fingerprint`.
+
+The interval is stored in the application settings, in minutes. An interval of 0 turns the
+background refresh off.
+"""
+import enum
+import logging
+import time
+from typing import Any, Optional, Tuple
+
+from PySide6 import QtCore
+
+from .tasks import TaskHandle, executor
+from ..settings.lib import app_name
+from ..ui.actions import signals
+
+#: Settings key of the refresh interval in minutes
+INTERVAL_KEY = 'BackgroundRefresh/interval'
+#: Intervals offered in the UI, in minutes
+INTERVALS = (0, 1, 5, 15, 30, 60)
+#: Minutes after the last full fetch before a refresh downloads the whole sheet
+FULL_REFRESH_MINUTES = 60
+
+
+class RefreshOutcome(enum.StrEnum):
+    """Result of a background refresh."""
+    Unchanged = 'unchanged'
+    Appended = 'appended'
+    Changed = 'changed'
+    Skipped = 'skipped'
+    Failed = 'failed'
+
+
+def check_for_changes(full: bool = False) -> Tuple[RefreshOutcome, Any]:
+    """Compare the cache with the remote sheet and download what changed.
+
+    Blocks; run it off the main thread. The cache is not modified.
+
+    Args:
+        full: Download the whole sheet, catching edits the fingerprint check misses.
+
+    Returns:
+        Tuple[RefreshOutcome, Any]: The outcome and its data:
+
+        - :class:`~ExpenseTracker.core.service.NewRows` for ``Appended`` and ``Unchanged``
+        - the whole sheet as a DataFrame for ``Changed``, None for ``Unchanged`` if the whole
+          sheet was downloaded and equals the cache
+        - None if the cache is not valid yet (``Skipped``), as the first fetch is left to the user
+    """
+    from . import service
+    from .database import CacheState, database
+    from .sheetmeta import metadata_cache
+
+    if database.get_state() != CacheState.Valid:
+        return RefreshOutcome.Skipped, None
+
+    def fetch_all() -> Tuple[RefreshOutcome, Any]:
+        df = service._fetch_data()
+        if database.matches_cache(df):
+            logging.debug('The whole sheet equals the cache.')
+            return RefreshOutcome.Unchanged, None
+        return RefreshOutcome.Changed, df
+
+    if full:
+        logging.debug('Downloading the whole sheet.')
+        return fetch_all()
+
+    # The row count must be current, a size cached by another operation would hide new rows
+    metadata_cache.invalidate()
+    new_rows = service._fetch_new_rows()
+    if new_rows is None:
+        return fetch_all()
+    if new_rows.df.empty:
+        return RefreshOutcome.Unchanged, new_rows
+    return RefreshOutcome.Appended, new_rows
+
+
+class BackgroundRefresher(QtCore.QObject):
+    """Refreshes the cache from the spreadsheet on an interval.
+
+    A refresh is skipped while the previous one is still running, while edits are queued and
+    while a commit is running. The result of a refresh is discarded if a manual fetch started in
+    the meantime, and a changed sheet is discarded if edits were queued in the meantime. A
+    refresh downloads the whole sheet if no full fetch happened for :data:`FULL_REFRESH_MINUTES`.
+    """
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent=parent)
+        self._interval = 0
+        self._generation = 0
+        self._handle: Optional[TaskHandle] = None
+        self._last_full_fetch = time.monotonic()
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(False)
+        self._timer.timeout.connect(self.refresh)
+
+        signals.dataAboutToBeFetched.connect(self._invalidate_pending)
+        signals.dataFetched.connect(self._on_data_fetched)
+
+    def interval(self) -> int:
+        """Return the refresh interval in minutes, 0 if the background refresh is off."""
+        return self._interval
+
+    def set_interval(self, minutes: int, save: bool = True) -> None:
+        """Set the refresh interval and restart the timer.
+
+        Args:
+            minutes: Minutes between refreshes, 0 to turn the background refresh off.
+            save: Store the interval in the application settings.
+        """
+        self._interval = max(int(minutes), 0)
+        if save:
+            QtCore.QSettings(app_name, app_name).setValue(INTERVAL_KEY, self._interval)
+
+        self._timer.stop()
+        if self._interval:
+            self._timer.start(self._interval * 60 * 1000)
+            logging.debug(f'Background refresh every {self._interval} minute(s).')
+        else:
+            logging.debug('Background refresh is off.')
+
+    def start(self) -> None:
+        """Start refreshing at the interval stored in the application settings."""
+        value = QtCore.QSettings(app_name, app_name).value(INTERVAL_KEY, 0)
+        try:
+            minutes = int(value)
+        except (TypeError, ValueError):
+            minutes = 0
+
+        app = QtCore.QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop, QtCore.Qt.UniqueConnection)
+        self.set_interval(minutes, save=False)
+
+    @QtCore.Slot()
+    def stop(self) -> None:
+        """Stop the timer and cancel a running refresh."""
+        self._timer.stop()
+        if self.is_running():
+            self._handle.cancel('Background refresh stopped.')
+
+    def is_running(self) -> bool:
+        """Return True if a refresh is in progress."""
+        return self._handle is not None and not self._handle.settled
+
+    @QtCore.Slot()
+    def refresh(self) -> None:
+        """Start a refresh on the task executor, unless one is already running."""
+        if self.is_running():
+            logging.debug('Background refresh still running, skipping.')
+            return
+        if self._has_pending_edits():
+            logging.debug('Edits are queued or being committed, skipping the background refresh.')
+            return
+
+        generation = self._generation
+        full = time.monotonic() - self._last_full_fetch >= FULL_REFRESH_MINUTES * 60
+        self._handle = executor.submit(check_for_changes, full=full, name='background refresh')
+        self._handle.finished.connect(lambda result: self._apply(generation, full, *result))
+        self._handle.failed.connect(self._on_error)
+
+    @QtCore.Slot()
+    def _invalidate_pending(self) -> None:
+        self._generation += 1
+
+    @QtCore.Slot(object)
+    def _on_data_fetched(self, _: Any) -> None:
+        self._last_full_fetch = time.monotonic()
+
+    @QtCore.Slot(object)
+    def _on_error(self, ex: Exception) -> None:
+        logging.warning(f'Background refresh failed: {ex}')
+        signals.backgroundRefreshFinished.emit(RefreshOutcome.Failed.value)
+
+    @staticmethod
+    def _has_pending_edits() -> bool:
+        from .sync import sync
+        return bool(sync.get_queued_ops()) or sync.is_committing()
+
+    def _apply(self, generation: int, full: bool, outcome: RefreshOutcome, result: Any) -> None:
+        if generation != self._generation:
+            logging.debug('Discarding background refresh, the data was fetched in the meantime.')
+            return
+
+        if outcome == RefreshOutcome.Changed and self._has_pending_edits():
+            # Fetching would discard the queued edits, the next refresh downloads the sheet again
+            logging.debug('Discarding background refresh, edits were queued in the meantime.')
+            outcome = RefreshOutcome.Skipped
+        elif full and outcome == RefreshOutcome.Unchanged:
+            self._last_full_fetch = time.monotonic()
+
+        if outcome == RefreshOutcome.Appended:
+            from . import service
+            service.apply_new_rows(result)
+        elif outcome == RefreshOutcome.Changed:
+            signals.dataAboutToBeFetched.emit()
+            signals.dataFetched.emit(result)
+
+        logging.info(f'Background refresh: {outcome.value}.')
+        signals.backgroundRefreshFinished.emit(outcome.value)
+
+
+refresher = BackgroundRefresher()
@@ -9,14 +9,18 @@ recreates it if necessary.
 
 import datetime
 import enum
+import hashlib
+import json
 import logging
 import sqlite3
 import time
-from typing import Any, Optional, Dict
+from typing import Any, Iterable, List, Optional, Dict, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from PySide6 import QtCore
 
+from . import profiler
 from ..settings import lib
 from ..settings import locale
 from ..status import status
@@ -25,6 +29,11 @@ from ..ui.actions import signals
 CACHE_MAX_AGE_DAYS = 7
 DATE_COLUMN_FORMAT = '%Y-%m-%d'
 
+# Plausible Google Sheets date serials, days since 1899-12-30
+SERIAL_EPOCH = np.datetime64('1899-12-30', 'D')
+SERIAL_MIN = -20000
+SERIAL_MAX = 2958465  # 9999-12-31
+
 TYPE_MAPPING = {
     'date': 'TEXT',
     'int': 'INTEGER',
@@ -41,11 +50,22 @@ META_SCHEMA: Dict[str, str] = {
     'worksheet': 'TEXT',
 }
 
+# Columns added to existing metadata tables on demand instead of forcing a schema reset
+META_OPTIONAL_SCHEMA: Dict[str, str] = {
+    'row_count': 'INTEGER DEFAULT 0',  # Number of data rows of the last fetch
+    'fingerprint': "TEXT DEFAULT ''",  # See ledger_fingerprint()
+}
+
+# Number of trailing rows hashed by ledger_fingerprint()
+FINGERPRINT_ROWS = 20
+
 
 class Table(enum.StrEnum):
     """Enum for database tables."""
     Meta = 'metatable'
     Transactions = 'transactions'
+    Quality = 'quality'
+    RowIndex = 'row_index'
 
 
 class CacheState(enum.StrEnum):
@@ -66,6 +86,39 @@ def now_str() -> str:
     return datetime.datetime.now(datetime.timezone.utc).isoformat()
 
 
+def _fingerprint_cell(value: Any) -> str:
+    if hasattr(value, 'item'):
+        value = value.item()  # numpy scalars
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def ledger_fingerprint(header: Sequence[Any], rows: Iterable[Sequence[Any]]) -> str:
+    """Hash a header row and data rows of the remote sheet.
+
+    Cells are normalized first, so rows hash the same whether they come straight from the
+    Sheets API or from a DataFrame built from it: missing cells, None and NaN are equal, and
+    integral floats equal their integers. Rows are padded to the width of the header.
+
+    Args:
+        header: The header row.
+        rows: Data rows, usually the last :data:`FINGERPRINT_ROWS` rows of the sheet.
+
+    Returns:
+        str: Hex digest of the rows.
+    """
+    width = len(header)
+    digest = hashlib.sha1()
+    for row in [header, *rows]:
+        cells = [_fingerprint_cell(v) for v in list(row)[:width]]
+        cells += [''] * (width - len(cells))
+        digest.update(json.dumps(cells).encode('utf-8'))
+    return digest.hexdigest()
+
+
 def get_sql_type(column: str) -> str:
     """Get the SQLite column type for a given header column.
 
@@ -91,7 +144,7 @@ def get_config_type(column: str) -> str:
     Raises:
         status.HeadersInvalidException: If the column is not found in the header configuration.
     """
-    config = lib.settings.get_section('header')
+    config = lib.settings.snapshot.header
 
     if column not in config:
         raise status.HeadersInvalidException(
@@ -164,7 +217,7 @@ def cast_type(column: str, value: Any) -> Any:
             except ValueError:
                 pass
 
-            current_loc_setting = lib.settings['locale']
+            current_loc_setting = lib.settings.snapshot.locale
             try:
                 dt_obj = locale.parse_date(text_val, locale=current_loc_setting)
                 return dt_obj.strftime(DATE_COLUMN_FORMAT)
@@ -205,7 +258,7 @@ def google_serial_date_to_iso(serial: float) -> str:
     Raises:
         ValueError: If the serial number is out of a plausible range or conversion fails.
     """
-    if serial < -20000 or serial > 2958465:
+    if serial < SERIAL_MIN or serial > SERIAL_MAX:
         logging.warning(f'Google date serial "{serial}" is out of plausible range.')
         raise ValueError(f'Serial date "{serial}" is out of supported range.')
 
@@ -219,6 +272,38 @@ def google_serial_date_to_iso(serial: float) -> str:
         raise ValueError(f'Invalid serial date value {serial}') from e
 
 
+def serial_dates_to_iso(values: Any) -> np.ndarray:
+    """Converts a column of Google Sheets date serials to ISO 'YYYY-MM-DD' strings at once.
+
+    Like :func:`google_serial_date_to_iso` applied to every number of the column. Cells that are
+    not numbers or out of range, e.g. dates the sheet stores as text, are left to
+    :func:`cast_type`.
+
+    Args:
+        values: The cells of a column, a sequence or an array.
+
+    Returns:
+        np.ndarray: An object array of ISO date strings, with None for the cells not converted.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iuf':
+        serials = values.astype(np.float64)
+    else:
+        values = values.astype(object)
+        serials = np.full(len(values), np.nan)
+        numeric = np.fromiter(
+            (isinstance(v, (int, float)) and not isinstance(v, bool) for v in values), dtype=bool, count=len(values)
+        )
+        serials[numeric] = values[numeric].astype(np.float64)
+
+    # NaN compares False
+    valid = (serials >= SERIAL_MIN) & (serials <= SERIAL_MAX)
+    dates = SERIAL_EPOCH + np.trunc(serials[valid]).astype(np.int64).astype('timedelta64[D]')
+    result = np.full(len(serials), None, dtype=object)
+    result[valid] = np.datetime_as_string(dates, unit='D')
+    return result
+
+
 class DatabaseAPI(QtCore.QObject):
     """Database API for the ledger data. Handles schema creation, validation, and data access."""
 
@@ -231,6 +316,17 @@ class DatabaseAPI(QtCore.QObject):
         """Connect signals for cache management."""
         signals.presetAboutToBeActivated.connect(self.reset_cache)
         signals.dataFetched.connect(self.cache_data)
+        signals.configSectionChanged.connect(self.on_config_section_changed)
+
+    @QtCore.Slot(str)
+    def on_config_section_changed(self, section: str) -> None:
+        """Re-run the data-quality scan when the categories or the mapping change."""
+        if section not in ('categories', 'mapping'):
+            return
+        try:
+            self.scan_quality()
+        except (sqlite3.Error, status.BaseStatusException) as e:
+            logging.debug(f'Skipping data-quality scan: {e}')
 
     def _initialize_schema_if_needed(self) -> None:
         """
@@ -267,9 +363,10 @@ class DatabaseAPI(QtCore.QObject):
                 )
                 conn.execute(f"DROP TABLE IF EXISTS {Table.Meta.value}")
                 conn.execute(f"DROP TABLE IF EXISTS {Table.Transactions.value}")
+                conn.execute(f"DROP TABLE IF EXISTS {Table.Quality.value}")
 
                 meta_cols_sql = ", ".join(
-                    f'"{name}" {typedef}' for name, typedef in META_SCHEMA.items()
+                    f'"{name}" {typedef}' for name, typedef in {**META_SCHEMA, **META_OPTIONAL_SCHEMA}.items()
                 )
                 conn.execute(f"CREATE TABLE {Table.Meta.value} ({meta_cols_sql})")
 
@@ -612,6 +709,65 @@ class DatabaseAPI(QtCore.QObject):
             if conn:
                 conn.close()
 
+    @classmethod
+    def _ensure_optional_meta_columns_in_conn(cls, conn: sqlite3.Connection) -> None:
+        """Add the columns of :data:`META_OPTIONAL_SCHEMA` missing from an older metadata table."""
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({Table.Meta.value})").fetchall()}
+        for name, typedef in META_OPTIONAL_SCHEMA.items():
+            if name not in existing:
+                conn.execute(f'ALTER TABLE {Table.Meta.value} ADD COLUMN "{name}" {typedef}')
+                logging.info(f'Added missing metadata column: {name}')
+
+    @classmethod
+    def set_fetch_state(cls, row_count: int, fingerprint: str) -> None:
+        """Store the number of fetched data rows and the fingerprint of the sheet's tail.
+
+        Args:
+            row_count: Number of data rows in the remote sheet, excluding the header.
+            fingerprint: :func:`ledger_fingerprint` of the header and the last rows.
+        """
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            if not cls._table_exists_in_conn(conn, Table.Meta.value):
+                logging.error(f"Metatable '{Table.Meta.value}' not found when setting fetch state.")
+                return
+            cls._ensure_optional_meta_columns_in_conn(conn)
+            conn.execute(
+                f"UPDATE {Table.Meta.value} SET row_count=?, fingerprint=? WHERE meta_id=1",
+                (int(row_count), fingerprint)
+            )
+            conn.commit()
+        finally:
+            if conn:
+                conn.close()
+
+    @classmethod
+    def get_fetch_state(cls) -> Tuple[int, str]:
+        """Return the row count and fingerprint stored by :meth:`set_fetch_state`.
+
+        Returns:
+            Tuple[int, str]: ``(0, '')`` if nothing has been stored.
+        """
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            if not cls._table_exists_in_conn(conn, Table.Meta.value):
+                return 0, ''
+            try:
+                row = conn.execute(
+                    f"SELECT row_count, fingerprint FROM {Table.Meta.value} WHERE meta_id=1"
+                ).fetchone()
+            except sqlite3.OperationalError:
+                # Older metadata table without the fetch state columns
+                return 0, ''
+            if not row:
+                return 0, ''
+            return int(row[0] or 0), row[1] or ''
+        finally:
+            if conn:
+                conn.close()
+
     @classmethod
     def get_state(cls) -> CacheState:
         """Retrieve the current cache state from the metadata table.
@@ -641,9 +797,13 @@ class DatabaseAPI(QtCore.QObject):
                 conn.close()
 
     @classmethod
-    def data(cls) -> pd.DataFrame:
+    def data(cls, filter_expression: str = '') -> pd.DataFrame:
         """Load cached transactions into a pandas DataFrame after verification.
 
+        Args:
+            filter_expression: Optional filter expression compiled to the query's WHERE clause,
+                see :mod:`ExpenseTracker.core.filters`.
+
         Returns:
             pandas.DataFrame: Transactions DataFrame. Empty if cache is invalid,
                               stale, empty, uninitialized, or in error state.
@@ -664,7 +824,16 @@ class DatabaseAPI(QtCore.QObject):
                     cls.set_state(CacheState.Error)
                     return pd.DataFrame()
 
-                df = pd.read_sql_query(f"SELECT * FROM {Table.Transactions.value}", conn)
+                sql, params = f"SELECT * FROM {Table.Transactions.value}", []
+                if filter_expression and filter_expression.strip():
+                    from . import filters
+                    where, params = filters.compile_filter(filter_expression.strip()).to_sql()
+                    filters.register_sql_functions(conn)
+                    sql = f'{sql} WHERE {where}'
+
+                with profiler.stage('database.read_sql') as s:
+                    df = pd.read_sql_query(sql, conn, params=params)
+                    s.rows = len(df)
                 logging.debug(f'Loaded {len(df)} rows from "{Table.Transactions.value}".')
                 return df
             except sqlite3.Error as e:
@@ -739,8 +908,12 @@ class DatabaseAPI(QtCore.QObject):
                 f'UPDATE "{Table.Transactions.value}" SET "{column}" = ? WHERE local_id = ?',
                 (new_value, local_id)
             )
+            quality_changed = cls._update_category_flag_in_conn(conn, local_id, column, new_value)
             conn.commit()
             logging.info(f'Cell updated for local_id={local_id}, column="{column}".')
+            if quality_changed:
+                # Emitted once committed, so receivers read the updated flags
+                signals.dataQualityChanged.emit()
         except sqlite3.Error as e:
             logging.error(f'Failed to update cell for local_id={local_id}, column="{column}": {e}', exc_info=True)
             if conn: conn.rollback()
@@ -785,9 +958,14 @@ class DatabaseAPI(QtCore.QObject):
                 empty_cols_sql = ['"local_id" INTEGER PRIMARY KEY AUTOINCREMENT'] + \
                                  [f'"{col_name}" {get_sql_type(col_name)}' for col_name in config_column_names]
                 conn.execute(f"CREATE TABLE {Table.Transactions.value} ({','.join(empty_cols_sql)})")
+
+                from . import quality
+                cls._write_quality_in_conn(conn, quality.QualityReport())
+                cls._write_row_index_in_conn(conn, [])
                 conn.commit()
                 cls.set_state(CacheState.Empty)
                 cls.stamp()
+                cls.set_fetch_state(0, '')
                 logging.info('DataFrame is empty. Cached an empty transactions table.')
                 return
 
@@ -809,26 +987,7 @@ class DatabaseAPI(QtCore.QObject):
 
             df_reordered = df[config_column_names]
 
-            rows_to_insert = []
-            for i, row_tuple in enumerate(df_reordered.itertuples(index=False, name=None)):
-                current_col_name_for_error = ""  # For more specific error logging
-                try:
-                    casted_row_values = []
-                    for col_idx, col_name in enumerate(config_column_names):
-                        current_col_name_for_error = col_name
-                        casted_row_values.append(cast_type(col_name, row_tuple[col_idx]))
-                    rows_to_insert.append(casted_row_values)
-                except status.HeadersInvalidException as hie:
-                    logging.error(f"Error casting data for row {i} due to header config: {hie}")
-                    cls.set_state(CacheState.Error)
-                    cls.stamp()
-                    raise
-                except Exception as e_cast:
-                    logging.error(
-                        f"Unexpected error casting data for row {i}, col '{current_col_name_for_error}': {e_cast}",
-                        exc_info=True)
-                    raise sqlite3.DataError(
-                        f"Data casting failed for row {i}, column '{current_col_name_for_error}'") from e_cast
+            rows_to_insert = cls._cast_rows(df_reordered, config_column_names)
 
             sql_placeholders = ','.join(['?'] * len(config_column_names))
             sql_column_names_part = ','.join([f'"{col}"' for col in config_column_names])
@@ -837,12 +996,31 @@ class DatabaseAPI(QtCore.QObject):
                 f'VALUES ({sql_placeholders})'
             )
 
-            conn.executemany(insert_sql, rows_to_insert)
+            with profiler.stage('database.insert', rows=len(rows_to_insert)):
+                conn.executemany(insert_sql, rows_to_insert)
+
+            # Rows inserted in a single transaction receive consecutive local_ids
+            first_id = conn.execute(f"SELECT MIN(local_id) FROM {Table.Transactions.value}").fetchone()[0] or 1
+            df_cached = pd.DataFrame(rows_to_insert, columns=config_column_names)
+            df_cached['local_id'] = range(first_id, first_id + len(df_cached))
+
+            from . import quality
+            with profiler.stage('quality.scan', rows=len(df_cached)):
+                report = quality.scan(df_cached)
+            cls._write_quality_in_conn(conn, report)
+
+            from . import rowindex
+            with profiler.stage('database.row_index', rows=len(df_reordered)):
+                cls._write_row_index_in_conn(conn, rowindex.frame_entries(df_reordered))
             conn.commit()
 
             logging.info(f'Successfully cached {len(rows_to_insert)} rows into "{Table.Transactions.value}".')
             cls.set_state(CacheState.Valid)
             cls.stamp()
+            cls.set_fetch_state(
+                len(df), ledger_fingerprint(df_columns, df.tail(FINGERPRINT_ROWS).itertuples(index=False, name=None))
+            )
+            signals.dataQualityChanged.emit()
 
         except sqlite3.Error as e:
             logging.error(f'SQLite error during data caching: {e}', exc_info=True)
@@ -868,5 +1046,364 @@ class DatabaseAPI(QtCore.QObject):
             if conn:
                 conn.close()
 
+    @classmethod
+    def matches_cache(cls, df: pd.DataFrame) -> bool:
+        """Return True if the cached transactions hold exactly the rows of ``df``, in order.
+
+        ``df`` is cast like :meth:`cache_data` casts it, so a downloaded sheet can be compared
+        with the cache without replacing it.
+
+        Args:
+            df: DataFrame with the configured header columns, e.g. from
+                :func:`ExpenseTracker.core.service._fetch_data`.
+        """
+        columns = list(lib.settings.get_section('header') or {})
+        if not columns or set(df.columns.tolist()) != set(columns):
+            return False
+
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            if not cls._table_exists_in_conn(conn, Table.Transactions.value):
+                return False
+            count = conn.execute(f"SELECT COUNT(*) FROM {Table.Transactions.value}").fetchone()[0]
+            if count != len(df):
+                return False
+            names = ','.join(f'"{c}"' for c in columns)
+            cached = conn.execute(
+                f"SELECT {names} FROM {Table.Transactions.value} ORDER BY local_id"
+            ).fetchall()
+        finally:
+            if conn:
+                conn.close()
+
+        def comparable(value: Any) -> Any:
+            return None if isinstance(value, float) and np.isnan(value) else value
+
+        try:
+            remote = cls._cast_rows(df[columns], columns)
+        except sqlite3.DataError:
+            return False
+        return all(
+            [comparable(v) for v in row] == [comparable(v) for v in cached_row]
+            for row, cached_row in zip(remote, cached)
+        )
+
+    @classmethod
+    def append_data(cls, df: pd.DataFrame) -> None:
+        """Append rows to the cached transactions, e.g. the rows added to the bottom of the sheet.
+
+        New rows receive the next local_ids. The data-quality scan is re-run over the whole
+        table, as new rows may duplicate cached ones.
+
+        Args:
+            df: DataFrame with the configured header columns.
+
+        Raises:
+            status.CacheInvalidException: If there is no valid cache to append to.
+            status.HeadersInvalidException: If DataFrame columns mismatch configuration.
+            sqlite3.Error: For database-related issues during caching.
+        """
+        if df.empty:
+            logging.debug('No rows to append to the cache.')
+            cls.stamp()
+            return
+
+        state = cls.get_state()
+        if state not in (CacheState.Valid, CacheState.Empty):
+            raise status.CacheInvalidException(f'Cannot append rows, {state.value}.')
+
+        config_column_names = list(lib.settings.get_section('header').keys())
+        if set(df.columns) != set(config_column_names):
+            diff = set(df.columns).symmetric_difference(set(config_column_names))
+            raise status.HeadersInvalidException(
+                f'DataFrame columns differ from configured headers. Difference: {diff}.'
+            )
+
+        # The rows follow the rows of the last fetch
+        first_row = cls.get_fetch_state()[0] + 2
+
+        conn: Optional[sqlite3.Connection] = None
+        logging.debug(f'Appending {len(df)} rows to the cache.')
+        try:
+            rows_to_insert = cls._cast_rows(df[config_column_names], config_column_names)
+
+            conn = cls.connection()
+            sql_column_names_part = ','.join([f'"{col}"' for col in config_column_names])
+            with profiler.stage('database.insert', rows=len(rows_to_insert)):
+                conn.executemany(
+                    f'INSERT INTO "{Table.Transactions.value}" ({sql_column_names_part}) '
+                    f'VALUES ({",".join(["?"] * len(config_column_names))})',
+                    rows_to_insert
+                )
+
+            from . import rowindex
+            cls._write_row_index_in_conn(
+                conn, rowindex.frame_entries(df[config_column_names], first_row), replace=False
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logging.error(f'SQLite error while appending rows: {e}', exc_info=True)
+            if conn: conn.rollback()
+            cls.set_state(CacheState.Error)
+            raise
+        finally:
+            if conn:
+                conn.close()
+
+        logging.info(f'Appended {len(rows_to_insert)} rows to "{Table.Transactions.value}".')
+        cls.set_state(CacheState.Valid)
+        cls.stamp()
+        with profiler.stage('quality.scan', rows=len(rows_to_insert)):
+            cls.scan_quality()
+
+    @classmethod
+    def _cast_rows(cls, df: pd.DataFrame, columns: list[str]) -> list[list[Any]]:
+        """Cast the values of a DataFrame to their configured types, row by row.
+
+        Args:
+            df: DataFrame with the given columns, in order.
+            columns: The configured header columns.
+
+        Raises:
+            status.HeadersInvalidException: If a column's configured type is invalid.
+            sqlite3.DataError: If a value can't be cast.
+        """
+        rows_to_insert = []
+        with profiler.stage('database.cast', rows=len(df)):
+            try:
+                # Date serials are converted per column, text dates are parsed per cell
+                dates: Dict[int, np.ndarray] = {
+                    col_idx: serial_dates_to_iso(df.iloc[:, col_idx].to_numpy())
+                    for col_idx, col_name in enumerate(columns) if get_config_type(col_name) == 'date'
+                }
+            except status.HeadersInvalidException as hie:
+                logging.error(f"Error casting data due to header config: {hie}")
+                cls.set_state(CacheState.Error)
+                cls.stamp()
+                raise
+
+            for i, row_tuple in enumerate(df.itertuples(index=False, name=None)):
+                current_col_name_for_error = ""  # For more specific error logging
+                try:
+                    casted_row_values = []
+                    for col_idx, col_name in enumerate(columns):
+                        current_col_name_for_error = col_name
+                        if col_idx in dates and dates[col_idx][i] is not None:
+                            casted_row_values.append(dates[col_idx][i])
+                        else:
+                            casted_row_values.append(cast_type(col_name, row_tuple[col_idx]))
+                    rows_to_insert.append(casted_row_values)
+                except status.HeadersInvalidException as hie:
+                    logging.error(f"Error casting data for row {i} due to header config: {hie}")
+                    cls.set_state(CacheState.Error)
+                    cls.stamp()
+                    raise
+                except Exception as e_cast:
+                    logging.error(
+                        f"Unexpected error casting data for row {i}, col '{current_col_name_for_error}': {e_cast}",
+                        exc_info=True)
+                    raise sqlite3.DataError(
+                        f"Data casting failed for row {i}, column '{current_col_name_for_error}'") from e_cast
+        return rows_to_insert
+
+    @staticmethod
+    def _write_quality_in_conn(conn: sqlite3.Connection, report: Any) -> None:
+        """Replace the data-quality side table with the given report using an existing connection.
+
+        Args:
+            conn: Open database connection. The caller is responsible for committing.
+            report: The :class:`ExpenseTracker.core.quality.QualityReport` to store.
+        """
+        conn.execute(f"DROP TABLE IF EXISTS {Table.Quality.value}")
+        conn.execute(
+            f'CREATE TABLE {Table.Quality.value} ("local_id" INTEGER NOT NULL, "issue" TEXT NOT NULL)'
+        )
+        conn.execute(
+            f'CREATE INDEX "{Table.Quality.value}_issue_idx" ON {Table.Quality.value} ("issue")'
+        )
+        conn.executemany(
+            f'INSERT INTO {Table.Quality.value} ("local_id", "issue") VALUES (?, ?)',
+            report.records()
+        )
+
+    @staticmethod
+    def _write_row_index_in_conn(conn: sqlite3.Connection, entries: Iterable[Tuple[int, int]],
+                                 replace: bool = True) -> None:
+        """Write entries of the remote row index using an existing connection.
+
+        Args:
+            conn: Open database connection. The caller is responsible for committing.
+            entries: ``(sheet_row, fingerprint)`` pairs, see :mod:`ExpenseTracker.core.rowindex`.
+            replace: Discard the existing entries first. Otherwise, entries of the same rows are
+                overwritten.
+        """
+        if replace:
+            conn.execute(f"DROP TABLE IF EXISTS {Table.RowIndex.value}")
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {Table.RowIndex.value} '
+            f'("sheet_row" INTEGER PRIMARY KEY, "fingerprint" INTEGER NOT NULL)'
+        )
+        conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "{Table.RowIndex.value}_fingerprint_idx" '
+            f'ON {Table.RowIndex.value} ("fingerprint")'
+        )
+        conn.executemany(
+            f'INSERT OR REPLACE INTO {Table.RowIndex.value} ("sheet_row", "fingerprint") VALUES (?, ?)',
+            entries
+        )
+
+    @classmethod
+    def set_row_index(cls, entries: Iterable[Tuple[int, int]], replace: bool = True) -> None:
+        """Store entries of the remote row index.
+
+        Args:
+            entries: ``(sheet_row, fingerprint)`` pairs.
+            replace: Discard the existing entries first.
+        """
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            cls._write_row_index_in_conn(conn, entries, replace=replace)
+            conn.commit()
+        finally:
+            if conn:
+                conn.close()
+
+    @classmethod
+    def remove_row_index(cls, sheet_rows: Iterable[int]) -> None:
+        """Remove the entries of the given sheet rows from the remote row index, e.g. after
+        their stable key was edited.
+        """
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            if not cls._table_exists_in_conn(conn, Table.RowIndex.value):
+                return
+            conn.executemany(
+                f'DELETE FROM {Table.RowIndex.value} WHERE "sheet_row" = ?',
+                [(r,) for r in sheet_rows]
+            )
+            conn.commit()
+        finally:
+            if conn:
+                conn.close()
+
+    @classmethod
+    def lookup_row_index(cls, fingerprints: Iterable[int]) -> Dict[int, List[int]]:
+        """Look up the sheet rows of stable key fingerprints in the remote row index.
+
+        Args:
+            fingerprints: The fingerprints, see :func:`ExpenseTracker.core.rowindex.fingerprint`.
+
+        Returns:
+            The sheet rows of each found fingerprint, in ascending order. Empty if there's no index.
+        """
+        fingerprints = list(dict.fromkeys(fingerprints))
+        result: Dict[int, List[int]] = {}
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            if not cls._table_exists_in_conn(conn, Table.RowIndex.value):
+                return result
+            # Stay well below SQLite's limit of bound parameters
+            for i in range(0, len(fingerprints), 500):
+                chunk = fingerprints[i:i + 500]
+                records = conn.execute(
+                    f'SELECT "fingerprint", "sheet_row" FROM {Table.RowIndex.value} '
+                    f'WHERE "fingerprint" IN ({",".join(["?"] * len(chunk))}) ORDER BY "sheet_row"',
+                    chunk
+                ).fetchall()
+                for fingerprint, sheet_row in records:
+                    result.setdefault(fingerprint, []).append(sheet_row)
+        finally:
+            if conn:
+                conn.close()
+        return result
+
+    @classmethod
+    def _update_category_flag_in_conn(cls, conn: sqlite3.Connection, local_id: int, column: str,
+                                      new_value: Any) -> bool:
+        """Refresh the unmapped-category flag of a single row after a category edit.
+
+        Does nothing if the edited column isn't the mapped category column or the
+        data-quality table doesn't exist yet.
+
+        Returns:
+            bool: True if the flag was refreshed. The caller emits ``dataQualityChanged`` after
+            committing.
+        """
+        from . import quality
+
+        category_columns = lib.parse_merge_mapping(lib.settings.get_section('mapping').get('category', ''))
+        if column not in category_columns or not cls._table_exists_in_conn(conn, Table.Quality.value):
+            return False
+
+        issue = quality.Issue.UnmappedCategory.value
+        conn.execute(
+            f'DELETE FROM {Table.Quality.value} WHERE "local_id" = ? AND "issue" = ?',
+            (local_id, issue)
+        )
+        value = '' if new_value is None else str(new_value)
+        if value and value not in lib.settings.get_section('categories'):
+            conn.execute(
+                f'INSERT INTO {Table.Quality.value} ("local_id", "issue") VALUES (?, ?)',
+                (local_id, issue)
+            )
+        return True
+
+    @classmethod
+    def scan_quality(cls) -> Any:
+        """Re-run the data-quality scan over the cached transactions and store the results.
+
+        Returns:
+            QualityReport: The new report. Empty if the transactions table doesn't exist.
+        """
+        from . import quality
+
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            if not cls._table_exists_in_conn(conn, Table.Transactions.value):
+                return quality.QualityReport()
+
+            df = pd.read_sql_query(f"SELECT * FROM {Table.Transactions.value}", conn)
+            report = quality.scan(df)
+            cls._write_quality_in_conn(conn, report)
+            conn.commit()
+        finally:
+            if conn:
+                conn.close()
+
+        signals.dataQualityChanged.emit()
+        return report
+
+    @classmethod
+    def quality_report(cls) -> Any:
+        """Read the stored results of the last data-quality scan.
+
+        Returns:
+            QualityReport: Flagged local_ids per issue type. Empty if no scan has been stored.
+        """
+        from . import quality
+
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = cls.connection()
+            if not cls._table_exists_in_conn(conn, Table.Quality.value):
+                return quality.QualityReport()
+
+            records = conn.execute(f'SELECT "local_id", "issue" FROM {Table.Quality.value}').fetchall()
+            total_rows = 0
+            if cls._table_exists_in_conn(conn, Table.Transactions.value):
+                total_rows = conn.execute(f"SELECT COUNT(*) FROM {Table.Transactions.value}").fetchone()[0]
+            return quality.QualityReport.from_records(records, total_rows=total_rows)
+        except sqlite3.Error as e:
+            logging.error(f'Failed to read data-quality report: {e}')
+            return quality.QualityReport()
+        finally:
+            if conn:
+                conn.close()
+
 
 database = DatabaseAPI()
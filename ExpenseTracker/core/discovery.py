@@ -0,0 +1,149 @@
+"""Cached Sheets API discovery document and service construction.
+
+:func:`googleapiclient.discovery.build` reads and parses the discovery document on every
+call. This module parses it once per process and builds services from the parsed copy with
+:func:`~googleapiclient.discovery.build_from_document`, so rebuilding the client after
+:func:`ExpenseTracker.core.service.clear_service` or a credentials change is cheap.
+
+The document is looked up in this order:
+
+1. in memory
+2. the copy bundled with google-api-python-client
+3. the disk cache in the config directory, versioned by API and client library version
+4. the discovery service, writing the result to the disk cache
+
+:func:`prewarm` loads the document off the main thread at startup.
+
+Profiler stages:
+
+- ``service.discovery``: loading and parsing the document
+- ``service.build``: building the resource
+- ``service.first_request``: the first request of a built service, including connecting and
+  authorizing
+"""
+import json
+import logging
+import pathlib
+import threading
+from typing import Any, Dict, Optional
+
+from . import profiler
+from .telemetry import InstrumentedHttp
+from ..status import status
+
+API_NAME: str = 'sheets'
+API_VERSION: str = 'v4'
+DISCOVERY_URL: str = f'https://{API_NAME}.googleapis.com/$discovery/rest?version={API_VERSION}'
+
+_lock = threading.Lock()
+_document: Optional[Dict[str, Any]] = None
+
+
+def library_version() -> str:
+    """Return the version of google-api-python-client."""
+    from googleapiclient import version
+    return version.__version__
+
+
+def cache_path() -> pathlib.Path:
+    """Return the path of the disk cache of the discovery document."""
+    from ..settings import lib
+    return lib.settings.config_dir / 'discovery' / f'{API_NAME}.{API_VERSION}.{library_version()}.json'
+
+
+def _download() -> str:
+    from googleapiclient.http import build_http
+
+    resp, content = build_http().request(DISCOVERY_URL)
+    if resp.status >= 400:
+        raise status.ServiceUnavailableException(
+            f'Failed to download the Sheets discovery document (HTTP {resp.status}).'
+        )
+    return content.decode('utf-8')
+
+
+def _load() -> str:
+    from googleapiclient import discovery_cache
+
+    content = discovery_cache.get_static_doc(API_NAME, API_VERSION)
+    if content:
+        return content
+
+    path = cache_path()
+    if path.exists():
+        logging.debug(f'Using cached discovery document "{path}".')
+        return path.read_text(encoding='utf-8')
+
+    logging.debug(f'Downloading discovery document from {DISCOVERY_URL}')
+    content = _download()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(content, encoding='utf-8')
+        tmp.replace(path)
+    except OSError as ex:
+        logging.warning(f'Failed to cache the discovery document: {ex}')
+    return content
+
+
+def get_document() -> Dict[str, Any]:
+    """Return the parsed Sheets discovery document, loading it on first use.
+
+    Raises:
+        ServiceUnavailableException: If the document is not bundled, not cached and can't be
+            downloaded.
+    """
+    global _document
+    with _lock:
+        if _document is None:
+            with profiler.stage('service.discovery'):
+                _document = json.loads(_load())
+            logging.debug(f'Loaded Sheets discovery document, revision {_document.get("revision")}.')
+        return _document
+
+
+def clear() -> None:
+    """Discard the parsed document. The disk cache is kept."""
+    global _document
+    with _lock:
+        _document = None
+
+
+def prewarm() -> None:
+    """Load the document and the client library ahead of the first request. Errors are logged."""
+    try:
+        get_document()
+        import googleapiclient.discovery  # noqa: F401
+    except Exception as ex:
+        logging.debug(f'Failed to prewarm the Sheets discovery document: {ex}')
+
+
+class _FirstRequestHttp(InstrumentedHttp):
+    """Authorized HTTP object timing its first request as ``service.first_request``."""
+
+    def __init__(self, credentials: Any, http: Any = None) -> None:
+        super().__init__(credentials, http=http)
+        self._first = True
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        if not self._first:
+            return super().request(*args, **kwargs)
+        self._first = False
+        with profiler.stage('service.first_request'):
+            return super().request(*args, **kwargs)
+
+
+def build_service(credentials: Any) -> Any:
+    """Build a Sheets API resource from the cached discovery document.
+
+    Args:
+        credentials: OAuth2 credentials used to authorize requests.
+
+    Returns:
+        The Sheets API resource, like ``build('sheets', 'v4', credentials=credentials)``.
+    """
+    from googleapiclient.discovery import build_from_document
+
+    document = get_document()
+    with profiler.stage('service.build'):
+        return build_from_document(document, http=_FirstRequestHttp(credentials))
@@ -0,0 +1,342 @@
+"""Concurrent range fetching from the Sheets API.
+
+Large worksheets are split into row ranges of ``chunk_size`` rows which are downloaded
+concurrently and reassembled in sheet order. Each range is retried on its own, so a
+transient failure only re-downloads that range, and progress is reported as ranges complete.
+Requests are rate limited and retried by :mod:`ExpenseTracker.core.scheduler`.
+
+The Sheets API service downloads its ranges with an
+:class:`~ExpenseTracker.core.asyncsheets.AsyncSheetsClient` on the executor's event loop, so the
+ranges share a few keep-alive connections instead of a thread and a connection each, see
+:func:`async_client`. Services without credentials, like
+:class:`ExpenseTracker.core.localsheets.LocalSheetsService`, are requested on a thread pool.
+
+:func:`fetch_columns` downloads only some columns, column-major, for building a DataFrame one
+column at a time.
+
+Example::
+
+    ranges = split_ranges('Sheet1', row_count, 'F', chunk_size=2000)
+    rows = fetch_ranges(service, spreadsheet_id, ranges, concurrency=4)
+"""
+import concurrent.futures
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .scheduler import scheduler
+from .tasks import current_token, executor
+
+if TYPE_CHECKING:
+    from .asyncsheets import AsyncSheetsClient
+
+#: Default number of ranges downloaded at the same time
+DEFAULT_CONCURRENCY: int = 4
+#: Default number of attempts per range
+DEFAULT_ATTEMPTS: int = 4
+#: Upper bound of the delay before the first retry of a range, doubled on every further retry
+DEFAULT_BACKOFF: float = 0.5
+
+ProgressCallback = Callable[[int, int, int], None]
+
+
+def split_ranges(worksheet: str, row_count: int, last_col: str, chunk_size: int, first_row: int = 1) -> List[str]:
+    """Split the rows of a worksheet into A1 ranges.
+
+    Args:
+        worksheet: Worksheet title.
+        row_count: Last row to include.
+        last_col: Letter of the last column to include.
+        chunk_size: Number of rows per range.
+        first_row: First row to include.
+
+    Returns:
+        List[str]: Ranges such as ``Sheet1!A1:F3000``, in sheet order.
+    """
+    chunk_size = max(int(chunk_size), 1)
+    ranges: List[str] = []
+    start = first_row
+    while start <= row_count:
+        end = min(start + chunk_size - 1, row_count)
+        ranges.append(f'{worksheet}!A{start}:{last_col}{end}')
+        start = end + 1
+    return ranges
+
+
+def execute_with_retry(request: Any, http: Any = None, attempts: int = DEFAULT_ATTEMPTS,
+                       backoff: float = DEFAULT_BACKOFF) -> Dict[str, Any]:
+    """Execute an API request with the rate-limited, retrying :data:`~.scheduler.scheduler`.
+
+    Args:
+        request: The request, e.g. the result of ``values().batchGet(...)``.
+        http: HTTP object to execute the request with, or None for the service's own.
+        attempts: Maximum number of attempts.
+        backoff: Upper bound of the delay before the first retry in seconds.
+
+    Raises:
+        Exception: The last error if all attempts fail, or the first non-retryable error.
+    """
+    return scheduler.execute(request, http=http, attempts=attempts, backoff=backoff)
+
+
+def async_client(service: Any, concurrency: int = DEFAULT_CONCURRENCY, attempts: int = DEFAULT_ATTEMPTS,
+                 backoff: float = DEFAULT_BACKOFF) -> Optional['AsyncSheetsClient']:
+    """Return an asyncio client sending the requests of ``service``.
+
+    Args:
+        service: The Sheets API resource.
+        concurrency: Maximum number of connections.
+        attempts: Maximum number of attempts per request.
+        backoff: Upper bound of the delay before the first retry of a request in seconds.
+
+    Returns:
+        The client, authorized with the service's credentials, or None if the service has no
+        credentials, e.g. the local stand-in.
+    """
+    credentials = getattr(getattr(service, '_http', None), 'credentials', None)
+    if credentials is None:
+        return None
+
+    from .asyncsheets import AsyncSheetsClient, ConnectionPool
+
+    return AsyncSheetsClient(
+        credentials, pool=ConnectionPool(max_connections=concurrency), attempts=attempts, backoff=backoff
+    )
+
+
+def fetch_ranges(
+        service: Any,
+        spreadsheet_id: str,
+        ranges: List[str],
+        value_render_option: str = 'UNFORMATTED_VALUE',
+        date_time_render_option: str = 'SERIAL_NUMBER',
+        concurrency: int = DEFAULT_CONCURRENCY,
+        attempts: int = DEFAULT_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+        progress: Optional[ProgressCallback] = None,
+) -> List[List[Any]]:
+    """Download ranges and return their rows concatenated in the order of ``ranges``.
+
+    With a concurrency of 1, or a single range, all ranges are requested with one ``batchGet``.
+
+    Args:
+        service: The Sheets API resource.
+        spreadsheet_id: Spreadsheet ID.
+        ranges: A1 ranges, see :func:`split_ranges`.
+        value_render_option: Sheets API value render option.
+        date_time_render_option: Sheets API date-time render option. Serial numbers, the
+            default, are converted without parsing, see
+            :func:`ExpenseTracker.core.database.serial_dates_to_iso`.
+        concurrency: Maximum number of ranges downloaded at the same time.
+        attempts: Maximum number of attempts per request.
+        backoff: Upper bound of the delay before the first retry of a request in seconds.
+        progress: Called with the number of completed ranges, the number of ranges and the
+            number of rows fetched so far, from the thread or event loop that completed the range.
+
+    Returns:
+        List[List[Any]]: The rows of all ranges.
+
+    Raises:
+        OperationCancelledException: If the task running the fetch is cancelled, see
+            :mod:`ExpenseTracker.core.tasks`. Checked before each range.
+        Exception: The error of the first range that failed all its attempts. Ranges not yet
+            started are cancelled.
+    """
+    rows: List[List[Any]] = []
+    for values in fetch_value_ranges(
+            service, spreadsheet_id, ranges, value_render_option=value_render_option,
+            date_time_render_option=date_time_render_option, concurrency=concurrency, attempts=attempts,
+            backoff=backoff, progress=progress
+    ):
+        rows.extend(values)
+    return rows
+
+
+def fetch_value_ranges(
+        service: Any,
+        spreadsheet_id: str,
+        ranges: List[str],
+        value_render_option: str = 'UNFORMATTED_VALUE',
+        date_time_render_option: str = 'SERIAL_NUMBER',
+        major_dimension: str = 'ROWS',
+        concurrency: int = DEFAULT_CONCURRENCY,
+        attempts: int = DEFAULT_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+        progress: Optional[ProgressCallback] = None,
+        group: int = 1,
+) -> List[List[List[Any]]]:
+    """Download ranges and return the values of each range, in the order of ``ranges``.
+
+    Like :func:`fetch_ranges`, but keeps the ranges apart. With a ``major_dimension`` of
+    ``COLUMNS``, the values of a range are its columns. Progress counts the ranges completed
+    and the rows or columns received.
+
+    Args:
+        group: Number of consecutive ranges requested with one ``batchGet``.
+    """
+    if not ranges:
+        return []
+
+    # Worker threads check the token of the task that started the fetch
+    token = current_token()
+
+    def batch_get(_ranges: List[str]) -> List[List[List[Any]]]:
+        if token is not None:
+            token.raise_if_cancelled()
+        request = service.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=_ranges,
+            valueRenderOption=value_render_option,
+            dateTimeRenderOption=date_time_render_option,
+            majorDimension=major_dimension,
+            fields='valueRanges(values)'
+        )
+        result = execute_with_retry(request, attempts=attempts, backoff=backoff)
+        value_ranges = result.get('valueRanges', [])
+        return [
+            value_ranges[i].get('values', []) if i < len(value_ranges) else [] for i in range(len(_ranges))
+        ]
+
+    step = max(int(group), 1)
+    groups = [ranges[i:i + step] for i in range(0, len(ranges), step)]
+    if concurrency <= 1 or len(groups) == 1:
+        results = batch_get(ranges)
+        if progress:
+            progress(len(ranges), len(ranges), sum(len(v) for v in results))
+        return results
+
+    client = async_client(service, concurrency=concurrency, attempts=attempts, backoff=backoff)
+    if client is not None:
+        async def fetch() -> List[List[List[Any]]]:
+            try:
+                return await client.fetch_value_ranges(
+                    spreadsheet_id, ranges, value_render_option=value_render_option,
+                    date_time_render_option=date_time_render_option, major_dimension=major_dimension,
+                    concurrency=concurrency, progress=progress, group=step
+                )
+            finally:
+                await client.close()
+
+        # Cancelling the task cancels the requests in flight
+        return executor.run_async(fetch)
+
+    results: List[List[List[List[Any]]]] = [[] for _ in groups]
+    lock = threading.Lock()
+    counts = {'ranges': 0, 'rows': 0}
+
+    def task(idx: int) -> None:
+        values = batch_get(groups[idx])
+        results[idx] = values
+        with lock:
+            counts['ranges'] += len(values)
+            counts['rows'] += sum(len(v) for v in values)
+            done, fetched = counts['ranges'], counts['rows']
+        logging.debug(
+            f'Fetched {", ".join(groups[idx])} ({sum(len(v) for v in values)} {major_dimension.lower()}, '
+            f'{done}/{len(ranges)}).'
+        )
+        if progress:
+            progress(done, len(ranges), fetched)
+
+    workers = min(concurrency, len(groups))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch') as pool:
+        futures = [pool.submit(task, idx) for idx in range(len(groups))]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return [values for chunk in results for values in chunk]
+
+
+def column_spans(columns: Sequence[int]) -> List[Tuple[int, int]]:
+    """Group column indexes into runs of adjacent columns.
+
+    Example::
+
+        >>> column_spans([0, 1, 2, 5, 7, 8])
+        [(0, 2), (5, 5), (7, 8)]
+    """
+    spans: List[Tuple[int, int]] = []
+    for idx in sorted(set(columns)):
+        if spans and idx == spans[-1][1] + 1:
+            spans[-1] = (spans[-1][0], idx)
+        else:
+            spans.append((idx, idx))
+    return spans
+
+
+def fetch_columns(
+        service: Any,
+        spreadsheet_id: str,
+        worksheet: str,
+        columns: Sequence[int],
+        first_row: int,
+        last_row: int,
+        chunk_size: int,
+        value_render_option: str = 'UNFORMATTED_VALUE',
+        date_time_render_option: str = 'SERIAL_NUMBER',
+        concurrency: int = DEFAULT_CONCURRENCY,
+        attempts: int = DEFAULT_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+        progress: Optional[ProgressCallback] = None,
+) -> List[List[Any]]:
+    """Download the cells of some columns, column-major.
+
+    Adjacent columns are requested as one range with ``majorDimension=COLUMNS`` and the rows are
+    split into blocks of ``chunk_size`` rows, one ``batchGet`` per block holding the ranges of
+    all its columns. Only the requested columns are downloaded, and each comes back as one
+    list instead of being cut out of rows.
+
+    Args:
+        service: The Sheets API resource.
+        spreadsheet_id: Spreadsheet ID.
+        worksheet: Worksheet title.
+        columns: 0-based column indexes.
+        first_row: First row to include, 1-based.
+        last_row: Last row to include.
+        chunk_size: Number of rows per range.
+        progress: Called with the number of completed ranges, the number of ranges and an
+            estimate of the rows fetched so far.
+
+    Returns:
+        List[List[Any]]: One list per column, in the order of ``columns``, each padded with
+        None to ``last_row - first_row + 1`` cells.
+    """
+    from .sync import idx_to_col
+
+    height = max(last_row - first_row + 1, 0)
+    if not columns or not height:
+        return [[None] * height for _ in columns]
+
+    spans = column_spans(columns)
+    blocks = [(start, min(start + max(int(chunk_size), 1) - 1, last_row))
+              for start in range(first_row, last_row + 1, max(int(chunk_size), 1))]
+    ranges = [
+        f'{worksheet}!{idx_to_col(c0)}{r0}:{idx_to_col(c1)}{r1}'
+        for r0, r1 in blocks for c0, c1 in spans
+    ]
+
+    def on_progress(done: int, total: int, _fetched: int) -> None:
+        progress(done, total, height * done // total)
+
+    values = fetch_value_ranges(
+        service, spreadsheet_id, ranges, value_render_option=value_render_option,
+        date_time_render_option=date_time_render_option, major_dimension='COLUMNS', concurrency=concurrency,
+        attempts=attempts, backoff=backoff, progress=on_progress if progress else None, group=len(spans),
+    )
+
+    # Trailing empty cells and columns are omitted from responses
+    cells: Dict[int, List[Any]] = {idx: [] for c0, c1 in spans for idx in range(c0, c1 + 1)}
+    it = iter(values)
+    for r0, r1 in blocks:
+        for c0, c1 in spans:
+            block = next(it)
+            for offset, idx in enumerate(range(c0, c1 + 1)):
+                column = block[offset] if offset < len(block) else []
+                cells[idx].extend(column)
+                cells[idx].extend([None] * (r1 - r0 + 1 - len(column)))
+    return [list(cells[idx]) for idx in columns]
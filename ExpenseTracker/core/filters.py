@@ -0,0 +1,430 @@
+"""Filter expressions for transaction data.
+
+A small expression language for selecting transactions by their logical fields (see
+:data:`ExpenseTracker.settings.lib.DATA_MAPPING_KEYS`), for example::
+
+    amount < -50 and account in ("Visa", "Amex") and description ~ "uber"
+
+Supported syntax:
+
+- comparisons: ``=``, ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``
+- membership: ``field in (value, ...)`` and ``field not in (value, ...)``
+- case-insensitive substring match: ``field ~ "text"`` and ``field !~ "text"``
+- boolean logic: ``and``, ``or``, ``not`` and parentheses
+
+Values are numbers or single/double quoted strings. Amounts take numbers, dates take
+``YYYY-MM-DD`` strings and text fields take either; a literal of the wrong type raises
+:class:`FilterSyntaxError`. Empty cells compare like the prepared data: an empty amount is
+``0`` and empty text is ``""``. Substring matches fold case the same way for any alphabet.
+
+Expressions are parsed once and cached by their text (see :func:`compile_filter`). A compiled
+:class:`Filter` can produce an SQL WHERE clause against the cached transactions table
+(:meth:`Filter.to_sql`) and a vectorized boolean mask for a DataFrame with logical columns
+(:meth:`Filter.mask`).
+"""
+import functools
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Union
+
+import pandas as pd
+
+from ..settings import lib
+
+
+class FilterSyntaxError(ValueError):
+    """Raised when a filter expression can't be parsed."""
+
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+        |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<op>==|!=|<=|>=|!~|[<>=~(),])
+        |(?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""",
+    re.VERBOSE
+)
+
+COMPARISON_OPERATORS: Dict[str, str] = {
+    '=': '=',
+    '==': '=',
+    '!=': '!=',
+    '<': '<',
+    '<=': '<=',
+    '>': '>',
+    '>=': '>=',
+}
+
+KEYWORDS = ('and', 'or', 'not', 'in')
+
+#: Kind of each logical field, deciding the type of its literals and of its empty cells
+FIELD_KINDS: Dict[str, str] = {
+    'date': 'date',
+    'amount': 'number',
+    'description': 'text',
+    'category': 'text',
+    'account': 'text',
+}
+
+#: Name of the SQL function registered by :func:`register_sql_functions`
+SQL_CONTAINS = 'filter_contains'
+
+Value = Union[str, float]
+ColumnMap = Dict[str, List[str]]
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        m = _TOKEN_RE.match(expression, pos)
+        if not m or m.end() == pos:
+            raise FilterSyntaxError(f'Unexpected character at position {pos}: "{expression[pos:pos + 10]}"')
+        pos = m.end()
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == 'name' and text.lower() in KEYWORDS:
+            kind, text = 'keyword', text.lower()
+        tokens.append((kind, text))
+    return tokens
+
+
+def contains(text: Any, pattern: str) -> bool:
+    """Return whether ``pattern`` occurs in ``text``, ignoring case like ``str.contains(case=False)``."""
+    return pattern.upper() in ('' if text is None else str(text)).upper()
+
+
+def register_sql_functions(conn: sqlite3.Connection) -> None:
+    """Register the functions used by :meth:`Filter.to_sql` on a connection.
+
+    SQLite's ``LIKE`` only folds the case of ASCII letters, so substring matches call
+    :func:`contains` instead.
+    """
+    conn.create_function(SQL_CONTAINS, 2, contains, deterministic=True)
+
+
+def _sql_field(field: str, columns: ColumnMap) -> str:
+    """Return the SQL expression of a field, with empty cells as in the prepared data."""
+    cols = columns.get(field, [])
+    kind = FIELD_KINDS.get(field, 'text')
+    if kind == 'date':
+        # Rows without a valid date are dropped when the data is prepared
+        return f'"{cols[0]}"' if len(cols) == 1 else 'NULL'
+    if kind == 'number':
+        return f'COALESCE("{cols[0]}", 0)' if cols else '0'
+    if not cols:
+        return "''"
+    return '(' + " || char(10) || ".join(f'COALESCE("{c}", \'\')' for c in cols) + ')'
+
+
+def _series(df: pd.DataFrame, field: str) -> pd.Series:
+    """Return the column of a field, with empty cells as in the prepared data."""
+    kind = FIELD_KINDS.get(field, 'text')
+    if kind == 'number':
+        return df[field].fillna(0)
+    if kind == 'text':
+        return df[field].fillna('')
+    return df[field]
+
+
+def _series_value(series: pd.Series, value: Value) -> Any:
+    """Coerce a literal to the type of the column it's compared against."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.Timestamp(str(value))
+    if pd.api.types.is_numeric_dtype(series) and isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+@dataclass(frozen=True)
+class Comparison:
+    field: str
+    op: str
+    value: Value
+
+    def to_sql(self, columns: ColumnMap) -> Tuple[str, List[Any]]:
+        return f'COALESCE({_sql_field(self.field, columns)} {COMPARISON_OPERATORS[self.op]} ?, 0)', [self.value]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        series = _series(df, self.field)
+        value = _series_value(series, self.value)
+        op = COMPARISON_OPERATORS[self.op]
+        if op == '=':
+            result = series == value
+        elif op == '!=':
+            result = (series != value) & series.notna()
+        elif op == '<':
+            result = series < value
+        elif op == '<=':
+            result = series <= value
+        elif op == '>':
+            result = series > value
+        else:
+            result = series >= value
+        return result.fillna(False).astype(bool)
+
+
+@dataclass(frozen=True)
+class Membership:
+    field: str
+    values: Tuple[Value, ...]
+    negate: bool = False
+
+    def to_sql(self, columns: ColumnMap) -> Tuple[str, List[Any]]:
+        placeholders = ', '.join('?' * len(self.values))
+        op = 'NOT IN' if self.negate else 'IN'
+        return f'COALESCE({_sql_field(self.field, columns)} {op} ({placeholders}), 0)', list(self.values)
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        series = _series(df, self.field)
+        values = [_series_value(series, v) for v in self.values]
+        result = series.isin(values)
+        if self.negate:
+            result = ~result & series.notna()
+        return result.astype(bool)
+
+
+@dataclass(frozen=True)
+class Match:
+    field: str
+    pattern: str
+    negate: bool = False
+
+    def to_sql(self, columns: ColumnMap) -> Tuple[str, List[Any]]:
+        op = 'NOT ' if self.negate else ''
+        return f'COALESCE({op}{SQL_CONTAINS}({_sql_field(self.field, columns)}, ?), 0)', [self.pattern]
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        series = _series(df, self.field)
+        result = series.astype(str).str.contains(self.pattern, case=False, regex=False)
+        if self.negate:
+            result = ~result & series.notna()
+        return result.astype(bool)
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: Any
+
+    def to_sql(self, columns: ColumnMap) -> Tuple[str, List[Any]]:
+        sql, params = self.operand.to_sql(columns)
+        return f'NOT ({sql})', params
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        return ~self.operand.mask(df)
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    op: str
+    operands: Tuple[Any, ...]
+
+    def to_sql(self, columns: ColumnMap) -> Tuple[str, List[Any]]:
+        parts, params = [], []
+        for operand in self.operands:
+            sql, p = operand.to_sql(columns)
+            parts.append(f'({sql})')
+            params.extend(p)
+        return f' {self.op.upper()} '.join(parts), params
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        result = self.operands[0].mask(df)
+        for operand in self.operands[1:]:
+            if self.op == 'and':
+                result = result & operand.mask(df)
+            else:
+                result = result | operand.mask(df)
+        return result
+
+
+class _Parser:
+    """Recursive-descent parser producing the expression tree."""
+
+    def __init__(self, expression: str) -> None:
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def peek(self) -> Tuple[str, str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ('end', '')
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, kind: str, text: str = '') -> str:
+        k, t = self.next()
+        if k != kind or (text and t != text):
+            raise FilterSyntaxError(f'Expected {text or kind}, got "{t or "end of expression"}".')
+        return t
+
+    def parse(self) -> Any:
+        if not self.tokens:
+            raise FilterSyntaxError('Filter expression is empty.')
+        node = self.parse_or()
+        if self.peek()[0] != 'end':
+            raise FilterSyntaxError(f'Unexpected "{self.peek()[1]}".')
+        return node
+
+    def parse_or(self) -> Any:
+        operands = [self.parse_and()]
+        while self.peek() == ('keyword', 'or'):
+            self.next()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else BoolOp('or', tuple(operands))
+
+    def parse_and(self) -> Any:
+        operands = [self.parse_not()]
+        while self.peek() == ('keyword', 'and'):
+            self.next()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else BoolOp('and', tuple(operands))
+
+    def parse_not(self) -> Any:
+        if self.peek() == ('keyword', 'not'):
+            self.next()
+            return Not(self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self) -> Any:
+        if self.peek() == ('op', '('):
+            self.next()
+            node = self.parse_or()
+            self.expect('op', ')')
+            return node
+        return self.parse_predicate()
+
+    def parse_literal(self) -> Tuple[str, str]:
+        kind, text = self.next()
+        if kind == 'number':
+            return kind, text
+        if kind == 'string':
+            return kind, re.sub(r'\\(.)', r'\1', text[1:-1])
+        raise FilterSyntaxError(f'Expected a value, got "{text or "end of expression"}".')
+
+    def parse_value(self, field: str) -> Value:
+        """Parse a literal compared against ``field``, typed after the field's kind."""
+        kind, text = self.parse_literal()
+        field_kind = FIELD_KINDS.get(field, 'text')
+        if field_kind == 'number':
+            try:
+                return float(text)
+            except ValueError:
+                raise FilterSyntaxError(f'Expected a number for "{field}", got "{text}".') from None
+        if field_kind == 'date':
+            try:
+                if kind != 'string':
+                    raise ValueError(text)
+                return pd.Timestamp(text).strftime('%Y-%m-%d')
+            except ValueError:
+                raise FilterSyntaxError(f'Expected a "YYYY-MM-DD" date for "{field}", got {text}.') from None
+        return text
+
+    def parse_predicate(self) -> Any:
+        kind, field = self.next()
+        if kind != 'name':
+            raise FilterSyntaxError(f'Expected a field name, got "{field or "end of expression"}".')
+        field = field.lower()
+        if field not in lib.DATA_MAPPING_KEYS:
+            raise FilterSyntaxError(
+                f'Unknown field "{field}". Expected one of: {", ".join(lib.DATA_MAPPING_KEYS)}.')
+
+        kind, op = self.next()
+        if (kind, op) == ('keyword', 'not'):
+            self.expect('keyword', 'in')
+            return Membership(field, self.parse_list(field), negate=True)
+        if (kind, op) == ('keyword', 'in'):
+            return Membership(field, self.parse_list(field))
+        if kind == 'op' and op in ('~', '!~'):
+            return Match(field, self.parse_literal()[1], negate=op == '!~')
+        if kind == 'op' and op in COMPARISON_OPERATORS:
+            return Comparison(field, op, self.parse_value(field))
+        raise FilterSyntaxError(f'Expected an operator after "{field}", got "{op or "end of expression"}".')
+
+    def parse_list(self, field: str) -> Tuple[Value, ...]:
+        self.expect('op', '(')
+        values = [self.parse_value(field)]
+        while self.peek() == ('op', ','):
+            self.next()
+            values.append(self.parse_value(field))
+        self.expect('op', ')')
+        return tuple(values)
+
+
+@dataclass(frozen=True)
+class Filter:
+    """A parsed filter expression.
+
+    Attributes:
+        expression: The source text of the expression.
+        root: Root node of the parsed expression tree.
+    """
+    expression: str
+    root: Any
+
+    def to_sql(self, columns: ColumnMap | None = None) -> Tuple[str, List[Any]]:
+        """Compile the filter to an SQL WHERE clause over the cached transactions table.
+
+        Args:
+            columns: Mapping of logical fields to source columns. Defaults to the current
+                ``mapping`` config section.
+
+        Returns:
+            Tuple[str, List[Any]]: The WHERE clause with ``?`` placeholders and its parameters.
+        """
+        if columns is None:
+            columns = mapped_columns()
+        return self.root.to_sql(columns)
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """Evaluate the filter over a DataFrame with logical columns.
+
+        Args:
+            df: DataFrame with the columns of :data:`ExpenseTracker.settings.lib.TRANSACTION_DATA_COLUMNS`.
+
+        Returns:
+            pd.Series: Boolean mask aligned with ``df``.
+        """
+        if df.empty:
+            return pd.Series(False, index=df.index, dtype=bool)
+        return self.root.mask(df).reindex(df.index, fill_value=False)
+
+
+def mapped_columns() -> ColumnMap:
+    """Return the source columns of each logical field from the ``mapping`` config section."""
+    cfg = lib.settings.get_section('mapping')
+    return {k: lib.parse_merge_mapping(cfg.get(k, '')) for k in lib.DATA_MAPPING_KEYS}
+
+
+@functools.lru_cache(maxsize=128)
+def compile_filter(expression: str) -> Filter:
+    """Parse a filter expression.
+
+    Results are cached by the expression text.
+
+    Args:
+        expression: The filter expression.
+
+    Returns:
+        Filter: The compiled filter.
+
+    Raises:
+        FilterSyntaxError: If the expression is invalid or a literal doesn't fit its field.
+    """
+    return Filter(expression, _Parser(expression).parse())
+
+
+def apply_filter(df: pd.DataFrame, expression: str) -> pd.DataFrame:
+    """Return the rows of a DataFrame with logical columns matching a filter expression.
+
+    An empty expression returns ``df`` unchanged.
+    """
+    if not expression or not expression.strip():
+        return df
+    return df[compile_filter(expression.strip()).mask(df)]
@@ -0,0 +1,543 @@
+"""File-backed stand-in for the Google Sheets service.
+
+Implements the subset of the Sheets API v4 resource used by :mod:`ExpenseTracker.core.service`
+and :mod:`ExpenseTracker.core.sync`:
+
+- ``spreadsheets().get()`` including grid data for header type detection
+- ``spreadsheets().values().batchGet()``
+- ``spreadsheets().values().batchUpdate()``
+
+The spreadsheet is backed by a local CSV or SQLite file and selected by setting the
+spreadsheet id in the ``spreadsheet`` config section to a ``local:`` URI::
+
+    local:/path/to/ledger.csv
+    local:/path/to/ledger.db?latency=0.05&error_rate=0.01
+
+A CSV file holds a single worksheet titled after the ``worksheet`` query parameter
+(``Sheet1`` by default) with the header in its first row. An SQLite file holds one worksheet per
+table, with the column names as the header row.
+
+Query parameters:
+
+- ``latency``: Seconds to sleep before executing each request.
+- ``error_rate``: Probability of a request failing with an :class:`HttpError`.
+- ``error_status``: HTTP status of injected errors (``429`` by default, a quota error).
+- ``seed``: Seed of the error injection.
+- ``worksheet``: Title of the worksheet of a CSV file.
+
+Values are typed like the Sheets API: numeric cells are numbers, ``YYYY-MM-DD`` cells are
+dates rendered as serial numbers or date strings depending on the render options, and
+everything else is text.
+
+:class:`LocalSheetsServer` serves the same resource over HTTP/1.1 with keep-alive, at the
+REST paths of the Sheets API, for clients that talk HTTP directly such as
+:mod:`ExpenseTracker.core.asyncsheets`.
+"""
+import csv
+import datetime
+import http.server
+import json
+import logging
+import pathlib
+import random
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from . import scheduler
+
+LOCAL_SCHEME = 'local:'
+DEFAULT_WORKSHEET = 'Sheet1'
+SERIAL_EPOCH = datetime.date(1899, 12, 30)
+
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_CELL_RE = re.compile(r'^([A-Za-z]*)(\d*)$')
+
+
+def is_local(spreadsheet_id: str) -> bool:
+    """Return True if the spreadsheet id selects the local stand-in service."""
+    return bool(spreadsheet_id) and spreadsheet_id.startswith(LOCAL_SCHEME)
+
+
+def parse_local_id(spreadsheet_id: str) -> Tuple[pathlib.Path, Dict[str, str]]:
+    """Split a ``local:`` spreadsheet id into the backing file path and its options."""
+    parsed = urllib.parse.urlsplit(spreadsheet_id[len(LOCAL_SCHEME):])
+    path = pathlib.Path(urllib.parse.unquote(parsed.path)).expanduser()
+    return path, dict(urllib.parse.parse_qsl(parsed.query))
+
+
+def col_to_idx(letters: str) -> int:
+    """Convert spreadsheet column letter(s) to a zero-based column index."""
+    idx = 0
+    for c in letters.upper():
+        idx = idx * 26 + (ord(c) - ord('A') + 1)
+    return idx - 1
+
+
+def parse_range(range_: str) -> Tuple[str, int, Optional[int], int, Optional[int]]:
+    """Parse an A1 range.
+
+    Args:
+        range_: Range like ``Sheet1!A1:H100``, ``Sheet1!C2:C`` or ``'My Sheet'!B5``.
+
+    Returns:
+        Tuple of the worksheet title, first row, last row, first column and last column. Rows and
+        columns are zero-based and the ends inclusive. An open end is None.
+    """
+    title, _, cells = range_.rpartition('!')
+    if not title:
+        title, cells = cells, ''
+    title = title.strip("'").replace("''", "'")
+
+    if not cells:
+        return title, 0, None, 0, None
+
+    start, _, end = cells.partition(':')
+    start_m, end_m = _CELL_RE.match(start), _CELL_RE.match(end or start)
+    if not start_m or not end_m:
+        raise ValueError(f'Invalid range "{range_}".')
+
+    start_col = col_to_idx(start_m.group(1)) if start_m.group(1) else 0
+    start_row = int(start_m.group(2)) - 1 if start_m.group(2) else 0
+    end_col = col_to_idx(end_m.group(1)) if end_m.group(1) else None
+    end_row = int(end_m.group(2)) - 1 if end_m.group(2) else None
+    return title, start_row, end_row, start_col, end_col
+
+
+def parse_cell(value: Any) -> Any:
+    """Type a raw cell value the way Sheets interprets user-entered values."""
+    if value is None or isinstance(value, (int, float, datetime.date)):
+        return value
+    text = str(value).strip()
+    if text == '':
+        return None
+    if _DATE_RE.match(text):
+        try:
+            return datetime.date.fromisoformat(text)
+        except ValueError:
+            return text
+    try:
+        number = float(text)
+    except ValueError:
+        return str(value)
+    return int(number) if number.is_integer() and '.' not in text else number
+
+
+def _serial(value: datetime.date) -> int:
+    return (value - SERIAL_EPOCH).days
+
+
+def _render(value: Any, value_render_option: str, date_time_render_option: str) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, datetime.date):
+        if value_render_option != 'FORMATTED_VALUE' and date_time_render_option == 'SERIAL_NUMBER':
+            return _serial(value)
+        return value.isoformat()
+    if value_render_option == 'FORMATTED_VALUE':
+        return str(value)
+    return value
+
+
+def _grid_cell(value: Any) -> Dict[str, Any]:
+    if value is None:
+        return {}
+    if isinstance(value, datetime.date):
+        return {
+            'userEnteredFormat': {'numberFormat': {'type': 'DATE', 'pattern': 'yyyy-mm-dd'}},
+            'effectiveValue': {'numberValue': _serial(value)},
+            'formattedValue': value.isoformat(),
+        }
+    if isinstance(value, (int, float)):
+        return {
+            'userEnteredFormat': {'numberFormat': {'type': 'NUMBER'}},
+            'effectiveValue': {'numberValue': value},
+            'formattedValue': str(value),
+        }
+    return {'effectiveValue': {'stringValue': str(value)}, 'formattedValue': str(value)}
+
+
+def _trim(rows: List[List[Any]]) -> List[List[Any]]:
+    """Drop trailing empty cells and rows, as the Sheets API does."""
+    out = []
+    for row in rows:
+        end = len(row)
+        while end and row[end - 1] in ('', None):
+            end -= 1
+        out.append(row[:end])
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+class _Request:
+    """Deferred request mirroring ``googleapiclient.http.HttpRequest.execute``."""
+
+    #: Local requests do not count towards the Sheets quota
+    rate_limited = False
+
+    def __init__(self, service: 'LocalSheetsService', func: Callable[[], Dict[str, Any]], uri: str,
+                 ranges: Sequence[str] = ()) -> None:
+        self._service = service
+        self._func = func
+        self.uri = uri
+        self.ranges = tuple(ranges)
+
+    def execute(self, http: Any = None, num_retries: int = 0) -> Dict[str, Any]:
+        result = self._service._execute(self._func, self.uri)
+        # Counted as the size of the JSON the API would send
+        scheduler.count_bytes(len(json.dumps(result)))
+        return result
+
+
+class _Values:
+    def __init__(self, service: 'LocalSheetsService') -> None:
+        self._service = service
+
+    def batchGet(
+            self,
+            spreadsheetId: str,
+            ranges: List[str],
+            valueRenderOption: str = 'FORMATTED_VALUE',
+            dateTimeRenderOption: str = 'SERIAL_NUMBER',
+            majorDimension: str = 'ROWS',
+            fields: Optional[str] = None,
+    ) -> _Request:
+        s = self._service
+
+        def func() -> Dict[str, Any]:
+            s._check_id(spreadsheetId)
+            _ranges = [ranges] if isinstance(ranges, str) else ranges
+            return {
+                'spreadsheetId': spreadsheetId,
+                'valueRanges': [
+                    s._read_range(r, valueRenderOption, dateTimeRenderOption, majorDimension) for r in _ranges
+                ],
+            }
+
+        return _Request(
+            s, func, f'values:batchGet ({len(ranges)} ranges)', [ranges] if isinstance(ranges, str) else ranges
+        )
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict[str, Any]) -> _Request:
+        s = self._service
+
+        def func() -> Dict[str, Any]:
+            s._check_id(spreadsheetId)
+            return s._write_ranges(body.get('data', []), body.get('valueInputOption', 'USER_ENTERED'))
+
+        return _Request(s, func, 'values:batchUpdate', [d['range'] for d in body.get('data', []) if 'range' in d])
+
+
+class _Spreadsheets:
+    def __init__(self, service: 'LocalSheetsService') -> None:
+        self._service = service
+
+    def get(
+            self,
+            spreadsheetId: str,
+            ranges: Optional[List[str]] = None,
+            includeGridData: bool = False,
+            fields: Optional[str] = None,
+    ) -> _Request:
+        s = self._service
+
+        def func() -> Dict[str, Any]:
+            s._check_id(spreadsheetId)
+            return s._spreadsheet(ranges, includeGridData)
+
+        return _Request(s, func, 'spreadsheets.get')
+
+    def values(self) -> _Values:
+        return _Values(self._service)
+
+
+class LocalSheetsService:
+    """Local stand-in for the Sheets API v4 resource.
+
+    Args:
+        spreadsheet_id: A ``local:`` URI naming the backing file and options.
+    """
+
+    def __init__(self, spreadsheet_id: str) -> None:
+        if not is_local(spreadsheet_id):
+            raise ValueError(f'"{spreadsheet_id}" is not a local spreadsheet id.')
+
+        self.spreadsheet_id = spreadsheet_id
+        self.path, options = parse_local_id(spreadsheet_id)
+        self.latency = float(options.get('latency', 0.0))
+        self.error_rate = float(options.get('error_rate', 0.0))
+        self.error_status = int(options.get('error_status', 429))
+        self.csv_worksheet = options.get('worksheet', DEFAULT_WORKSHEET)
+        self._random = random.Random(options.get('seed'))
+
+        self._lock = threading.RLock()
+        self._sheets: Dict[str, List[List[Any]]] = {}
+        self.request_count = 0
+
+        self._load()
+
+    def spreadsheets(self) -> _Spreadsheets:
+        return _Spreadsheets(self)
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def is_csv(self) -> bool:
+        return self.path.suffix.lower() == '.csv'
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f'Local spreadsheet "{self.path}" does not exist.')
+
+        if self.is_csv:
+            with self.path.open(newline='', encoding='utf-8') as f:
+                rows = [[parse_cell(v) for v in row] for row in csv.reader(f)]
+            self._sheets = {self.csv_worksheet: rows}
+        else:
+            conn = sqlite3.connect(self.path)
+            try:
+                tables = [r[0] for r in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+                )]
+                for table in tables:
+                    cursor = conn.execute(f'SELECT * FROM "{table}" ORDER BY rowid')
+                    header = [d[0] for d in cursor.description]
+                    self._sheets[table] = [header] + [[parse_cell(v) for v in row] for row in cursor]
+            finally:
+                conn.close()
+        logging.debug(f'Loaded local spreadsheet "{self.path}" with worksheets {list(self._sheets)}.')
+
+    def _save(self, title: str) -> None:
+        rows = self._sheets[title]
+        if self.is_csv:
+            with self.path.open('w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                for row in rows:
+                    writer.writerow(['' if v is None else (v.isoformat() if isinstance(v, datetime.date) else v)
+                                     for v in row])
+            return
+
+        header, data = rows[0], rows[1:]
+        width = len(header)
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute(f'DROP TABLE IF EXISTS "{title}"')
+            conn.execute(f'CREATE TABLE "{title}" ({", ".join(f"{json.dumps(str(h))}" for h in header)})')
+            conn.executemany(
+                f'INSERT INTO "{title}" VALUES ({", ".join("?" * width)})',
+                [[v.isoformat() if isinstance(v, datetime.date) else v for v in (row + [None] * width)[:width]]
+                 for row in data]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _execute(self, func: Callable[[], Dict[str, Any]], uri: str) -> Dict[str, Any]:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        with self._lock:
+            self.request_count += 1
+            if self.error_rate > 0 and self._random.random() < self.error_rate:
+                self._raise(self.error_status, 'Injected error: quota exceeded.', uri)
+            return func()
+
+    def _raise(self, status_code: int, message: str, uri: str = '') -> None:
+        resp = httplib2.Response({'status': status_code})
+        resp.reason = message
+        content = json.dumps({'error': {'code': status_code, 'message': message}}).encode('utf-8')
+        raise HttpError(resp, content, uri=uri)
+
+    def _check_id(self, spreadsheet_id: str) -> None:
+        if spreadsheet_id != self.spreadsheet_id:
+            self._raise(404, f'Requested entity was not found: "{spreadsheet_id}".')
+
+    def _sheet(self, title: str) -> List[List[Any]]:
+        if title not in self._sheets:
+            self._raise(400, f'Unable to parse range: {title}')
+        return self._sheets[title]
+
+    def _spreadsheet(self, ranges: Optional[List[str]], include_grid_data: bool) -> Dict[str, Any]:
+        sheets = []
+        for i, (title, rows) in enumerate(self._sheets.items()):
+            sheets.append({
+                'properties': {
+                    'sheetId': i,
+                    'title': title,
+                    'index': i,
+                    'gridProperties': {
+                        'rowCount': len(rows),
+                        'columnCount': max((len(r) for r in rows), default=0),
+                    },
+                }
+            })
+
+        if include_grid_data:
+            for r in ranges or [title for title in self._sheets]:
+                title, r0, r1, c0, c1 = parse_range(r)
+                rows = self._slice(self._sheet(title), r0, r1, c0, c1)
+                sheet = next(s for s in sheets if s['properties']['title'] == title)
+                sheet.setdefault('data', []).append({
+                    'startRow': r0,
+                    'startColumn': c0,
+                    'rowData': [{'values': [_grid_cell(v) for v in row]} for row in rows],
+                })
+
+        return {'spreadsheetId': self.spreadsheet_id, 'sheets': sheets}
+
+    @staticmethod
+    def _slice(rows: List[List[Any]], r0: int, r1: Optional[int], c0: int,
+               c1: Optional[int]) -> List[List[Any]]:
+        width = max((len(r) for r in rows), default=0)
+        r1 = len(rows) - 1 if r1 is None else min(r1, len(rows) - 1)
+        c1 = width - 1 if c1 is None else c1
+        return [(row + [None] * (c1 + 1 - len(row)))[c0:c1 + 1] for row in rows[r0:r1 + 1]]
+
+    def _read_range(self, range_: str, value_render_option: str, date_time_render_option: str,
+                    major_dimension: str) -> Dict[str, Any]:
+        title, r0, r1, c0, c1 = parse_range(range_)
+        rows = self._slice(self._sheet(title), r0, r1, c0, c1)
+        values = [[_render(v, value_render_option, date_time_render_option) for v in row] for row in rows]
+        if major_dimension == 'COLUMNS':
+            values = [list(col) for col in zip(*values)] if values else []
+        result = {'range': range_, 'majorDimension': major_dimension}
+        values = _trim(values)
+        if values:
+            result['values'] = values
+        return result
+
+    def _write_ranges(self, data: List[Dict[str, Any]], value_input_option: str) -> Dict[str, Any]:
+        updated_cells = 0
+        touched = set()
+        for item in data:
+            title, r0, _, c0, _ = parse_range(item['range'])
+            sheet = self._sheet(title)
+            for i, row_values in enumerate(item.get('values', [])):
+                row_idx = r0 + i
+                while len(sheet) <= row_idx:
+                    sheet.append([])
+                row = sheet[row_idx]
+                for j, value in enumerate(row_values):
+                    col_idx = c0 + j
+                    if len(row) <= col_idx:
+                        row.extend([None] * (col_idx + 1 - len(row)))
+                    row[col_idx] = parse_cell(value) if value_input_option == 'USER_ENTERED' else value
+                    updated_cells += 1
+            touched.add(title)
+
+        for title in touched:
+            self._save(title)
+        return {
+            'spreadsheetId': self.spreadsheet_id,
+            'totalUpdatedCells': updated_cells,
+            'responses': [{'updatedRange': item['range']} for item in data],
+        }
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Maps Sheets API v4 REST paths onto a :class:`LocalSheetsService`."""
+    protocol_version = 'HTTP/1.1'
+    server: 'LocalSheetsServer'
+
+    def do_GET(self) -> None:
+        self._dispatch()
+
+    def do_POST(self) -> None:
+        self._dispatch()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug(f'Local Sheets server: {format % args}')
+
+    def _dispatch(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        body: Dict[str, Any] = {}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            body = json.loads(self.rfile.read(length))
+
+        prefix = '/v4/spreadsheets/'
+        if not url.path.startswith(prefix):
+            return self._reply(404, {'error': {'code': 404, 'message': f'Unknown path: {url.path}'}})
+        spreadsheet_id, _, method = url.path[len(prefix):].partition('/')
+        spreadsheet_id = urllib.parse.unquote(spreadsheet_id)
+
+        values = self.server.service.spreadsheets().values()
+        if self.command == 'GET' and not method:
+            request = self.server.service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                ranges=query.get('ranges'),
+                includeGridData=query.get('includeGridData', ['false'])[0] == 'true',
+            )
+        elif self.command == 'GET' and method == 'values:batchGet':
+            request = values.batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=query.get('ranges', []),
+                valueRenderOption=query.get('valueRenderOption', ['FORMATTED_VALUE'])[0],
+                dateTimeRenderOption=query.get('dateTimeRenderOption', ['SERIAL_NUMBER'])[0],
+                majorDimension=query.get('majorDimension', ['ROWS'])[0],
+            )
+        elif self.command == 'POST' and method == 'values:batchUpdate':
+            request = values.batchUpdate(spreadsheetId=spreadsheet_id, body=body)
+        else:
+            return self._reply(404, {'error': {'code': 404, 'message': f'Unknown method: {method}'}})
+
+        try:
+            result = request.execute()
+        except HttpError as ex:
+            return self._reply(ex.resp.status, json.loads(ex.content))
+        self._reply(200, result)
+
+    def _reply(self, status_code: int, payload: Dict[str, Any]) -> None:
+        content = json.dumps(payload).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(content)))
+        if status_code == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class LocalSheetsServer(http.server.ThreadingHTTPServer):
+    """HTTP server exposing a :class:`LocalSheetsService` at the Sheets API REST paths.
+
+    The server listens on localhost and runs on a daemon thread until :meth:`close` is called.
+
+    Args:
+        spreadsheet_id: A ``local:`` URI naming the backing file and options.
+        port: Port to listen on, 0 for a free port.
+
+    Attributes:
+        url: Base URL to use in place of ``https://sheets.googleapis.com/v4/spreadsheets``.
+        connection_count: Number of TCP connections accepted so far.
+    """
+    daemon_threads = True
+
+    def __init__(self, spreadsheet_id: str, port: int = 0) -> None:
+        self.service = LocalSheetsService(spreadsheet_id)
+        self.connection_count = 0
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.url = f'http://127.0.0.1:{self.server_address[1]}/v4/spreadsheets'
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={'poll_interval': 0.05}, name='local-sheets-server', daemon=True
+        )
+        self._thread.start()
+
+    def get_request(self) -> Tuple[Any, Any]:
+        request = super().get_request()
+        self.connection_count += 1
+        return request
+
+    def close(self) -> None:
+        """Stop serving and release the port."""
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
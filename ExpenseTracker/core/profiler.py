@@ -0,0 +1,255 @@
+"""Lightweight timing instrumentation for the data pipeline stages.
+
+Stages are wrapped with the :func:`stage` context manager or the :func:`profiled` decorator.
+Each completed stage appends a :class:`StageRecord` to a fixed-size ring buffer held by the
+module-level :data:`profiler`, recording:
+
+- wall time
+- number of rows processed, when known
+- peak traced allocations, when :mod:`tracemalloc` is tracing
+
+Allocation tracking is off by default as tracing slows every allocation down; toggle it with
+:meth:`Profiler.set_track_allocations`. The Performance dock polls the buffer to show per-stage
+histograms of recent refreshes.
+
+Example::
+
+    with stage('database.cast') as s:
+        rows = [...]
+        s.rows = len(rows)
+
+    @profiled('data.get_data')
+    def get_data(...):
+        ...
+"""
+import collections
+import functools
+import logging
+import statistics
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+DEFAULT_CAPACITY = 2000
+
+
+@dataclass
+class StageRecord:
+    """Timing of one completed stage.
+
+    Attributes:
+        stage: Name of the stage, e.g. ``database.cast``.
+        seconds: Wall time in seconds.
+        rows: Number of rows processed, or None if unknown.
+        peak_bytes: Peak traced allocations during the stage, or None if not tracing.
+        finished: Time the stage finished, as returned by :func:`time.time`.
+    """
+    stage: str
+    seconds: float
+    rows: Optional[int] = None
+    peak_bytes: Optional[int] = None
+    finished: float = 0.0
+
+
+@dataclass
+class StageSummary:
+    """Aggregated timings of a stage across the records in the buffer."""
+    stage: str
+    durations: List[float] = field(default_factory=list)
+    last_rows: Optional[int] = None
+    peak_bytes: Optional[int] = None
+
+    @property
+    def calls(self) -> int:
+        return len(self.durations)
+
+    @property
+    def last(self) -> float:
+        return self.durations[-1] if self.durations else 0.0
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.durations) if self.durations else 0.0
+
+    @property
+    def p90(self) -> float:
+        if not self.durations:
+            return 0.0
+        values = sorted(self.durations)
+        return values[min(len(values) - 1, int(round(0.9 * (len(values) - 1))))]
+
+    @property
+    def max(self) -> float:
+        return max(self.durations) if self.durations else 0.0
+
+    def histogram(self, bins: int = 10) -> List[int]:
+        """Return the number of durations falling into each of ``bins`` equal-width bins."""
+        counts = [0] * bins
+        if not self.durations:
+            return counts
+        lo, hi = min(self.durations), max(self.durations)
+        width = (hi - lo) / bins
+        for value in self.durations:
+            idx = int((value - lo) / width) if width else 0
+            counts[min(idx, bins - 1)] += 1
+        return counts
+
+
+class _ActiveStage:
+    """Handle yielded by :func:`stage`; set ``rows`` to record the number of rows processed."""
+
+    __slots__ = ('name', 'rows', 'start_bytes', 'peak_bytes')
+
+    def __init__(self, name: str, rows: Optional[int]) -> None:
+        self.name = name
+        self.rows = rows
+        self.start_bytes = 0
+        self.peak_bytes = 0
+
+
+class Profiler:
+    """Collects stage records into a ring buffer.
+
+    Args:
+        capacity: Maximum number of records kept; older records are discarded first.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self._records: Deque[StageRecord] = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self.enabled = True
+
+    @property
+    def generation(self) -> int:
+        """Counter incremented whenever a record is added or the buffer is cleared."""
+        return self._generation
+
+    def records(self) -> List[StageRecord]:
+        """Return a snapshot of the buffered records, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        """Discard all buffered records."""
+        with self._lock:
+            self._records.clear()
+            self._generation += 1
+
+    def add(self, record: StageRecord) -> None:
+        """Append a record to the buffer."""
+        with self._lock:
+            self._records.append(record)
+            self._generation += 1
+
+    def summary(self) -> Dict[str, StageSummary]:
+        """Return the buffered records aggregated per stage, in order of first appearance."""
+        result: Dict[str, StageSummary] = {}
+        for record in self.records():
+            item = result.setdefault(record.stage, StageSummary(record.stage))
+            item.durations.append(record.seconds)
+            if record.rows is not None:
+                item.last_rows = record.rows
+            if record.peak_bytes is not None:
+                item.peak_bytes = max(item.peak_bytes or 0, record.peak_bytes)
+        return result
+
+    @staticmethod
+    def track_allocations() -> bool:
+        """Return True if peak allocations are being recorded."""
+        return tracemalloc.is_tracing()
+
+    @staticmethod
+    def set_track_allocations(enabled: bool) -> None:
+        """Start or stop tracing allocations with :mod:`tracemalloc`."""
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            logging.debug('Started tracing allocations for the stage profiler.')
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logging.debug('Stopped tracing allocations for the stage profiler.')
+
+    def _stack(self) -> List[_ActiveStage]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[_ActiveStage]:
+        """Time the enclosed block as a stage.
+
+        Stages may nest. Peak allocations of a nested stage count towards its enclosing stages.
+
+        Args:
+            name: Name of the stage.
+            rows: Number of rows processed, if known upfront. Can also be set on the yielded handle.
+        """
+        active = _ActiveStage(name, rows)
+        if not self.enabled:
+            yield active
+            return
+
+        stack = self._stack()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            for outer in stack:
+                outer.peak_bytes = max(outer.peak_bytes, peak)
+            tracemalloc.reset_peak()
+            active.start_bytes = active.peak_bytes = current
+
+        stack.append(active)
+        start = time.perf_counter()
+        try:
+            yield active
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+
+            peak_bytes = None
+            if tracing and tracemalloc.is_tracing():
+                active.peak_bytes = max(active.peak_bytes, tracemalloc.get_traced_memory()[1])
+                peak_bytes = active.peak_bytes - active.start_bytes
+                if stack:
+                    stack[-1].peak_bytes = max(stack[-1].peak_bytes, active.peak_bytes)
+
+            self.add(StageRecord(name, seconds, active.rows, peak_bytes, time.time()))
+
+
+def _count_rows(value: Any) -> Optional[int]:
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+profiler = Profiler()
+
+
+def stage(name: str, rows: Optional[int] = None):
+    """Time the enclosed block as a stage of the module-level :data:`profiler`."""
+    return profiler.stage(name, rows=rows)
+
+
+def profiled(name: str) -> Callable:
+    """Decorator timing each call of the function as a stage.
+
+    The number of rows is taken from the length of the return value, if it has one.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.stage(name) as s:
+                result = func(*args, **kwargs)
+                s.rows = _count_rows(result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,135 @@
+"""Data-quality scan of the cached ledger data.
+
+The scan runs once per cache generation, right after :meth:`DatabaseAPI.cache_data` writes
+the transactions table, and flags rows the analytics layer can't use as-is:
+
+- invalid dates: the mapped date column can't be parsed as ``YYYY-MM-DD``
+- invalid amounts: the mapped amount column isn't numeric
+- unmapped categories: the category isn't defined in the ``categories`` config section
+- duplicate rows: every configured column matches an earlier row
+
+The results are stored in a side table as ``(local_id, issue)`` pairs so the analytics
+functions and the UI can read them instead of recomputing the checks.
+"""
+import enum
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import pandas as pd
+
+from .database import DATE_COLUMN_FORMAT
+from ..settings import lib
+
+
+class Issue(enum.StrEnum):
+    """Data-quality issue types recorded by the scan."""
+    InvalidDate = 'invalid_date'
+    InvalidAmount = 'invalid_amount'
+    UnmappedCategory = 'unmapped_category'
+    Duplicate = 'duplicate'
+
+
+ISSUE_LABELS: Dict[Issue, str] = {
+    Issue.InvalidDate: 'Invalid date',
+    Issue.InvalidAmount: 'Invalid amount',
+    Issue.UnmappedCategory: 'Unmapped category',
+    Issue.Duplicate: 'Duplicate row',
+}
+
+
+@dataclass
+class QualityReport:
+    """Results of a data-quality scan.
+
+    Attributes:
+        issues: Mapping of each issue type to the sorted local_ids flagged with it.
+        total_rows: Number of rows scanned.
+    """
+    issues: Dict[Issue, List[int]] = field(default_factory=lambda: {k: [] for k in Issue})
+    total_rows: int = 0
+
+    def ids(self, issue: Issue) -> List[int]:
+        """Return the local_ids flagged with the given issue."""
+        return self.issues.get(issue, [])
+
+    def counts(self) -> Dict[Issue, int]:
+        """Return the number of flagged rows per issue type."""
+        return {k: len(self.issues.get(k, [])) for k in Issue}
+
+    def is_clean(self) -> bool:
+        """Return True if the scan found no issues."""
+        return not any(self.issues.values())
+
+    def records(self) -> List[tuple[int, str]]:
+        """Return the report as a flat list of ``(local_id, issue)`` pairs."""
+        return [(i, k.value) for k, ids in self.issues.items() for i in ids]
+
+    @classmethod
+    def from_records(cls, records: List[tuple[int, str]], total_rows: int = 0) -> 'QualityReport':
+        """Build a report from ``(local_id, issue)`` pairs read back from the database."""
+        report = cls(total_rows=total_rows)
+        for local_id, issue in records:
+            try:
+                report.issues[Issue(issue)].append(int(local_id))
+            except ValueError:
+                logging.debug(f'Skipping unknown data-quality issue "{issue}".')
+        for ids in report.issues.values():
+            ids.sort()
+        return report
+
+
+def _mapped_column(df: pd.DataFrame, key: str) -> str:
+    """Return the source column mapped to a logical key, or an empty string if absent."""
+    cfg = lib.settings.get_section('mapping')
+    columns = [c for c in lib.parse_merge_mapping(cfg.get(key, '')) if c in df.columns]
+    return columns[0] if columns else ''
+
+
+def scan(df: pd.DataFrame) -> QualityReport:
+    """Scan cached transaction rows for data-quality issues.
+
+    Args:
+        df: Transactions as stored in the cache, including the ``local_id`` column.
+
+    Returns:
+        QualityReport: The flagged local_ids per issue type.
+    """
+    report = QualityReport(total_rows=len(df))
+    if df.empty or 'local_id' not in df.columns:
+        return report
+
+    local_ids = df['local_id']
+
+    date_column = _mapped_column(df, 'date')
+    if date_column:
+        dates = pd.to_datetime(df[date_column], format=DATE_COLUMN_FORMAT, errors='coerce')
+        report.issues[Issue.InvalidDate] = local_ids[dates.isna()].astype(int).tolist()
+
+    amount_column = _mapped_column(df, 'amount')
+    if amount_column:
+        amounts = pd.to_numeric(df[amount_column], errors='coerce')
+        report.issues[Issue.InvalidAmount] = local_ids[amounts.isna()].astype(int).tolist()
+
+    category_column = _mapped_column(df, 'category')
+    if category_column:
+        known = set(lib.settings.get_section('categories').keys())
+        categories = df[category_column].fillna('').astype(str)
+        mask = (categories != '') & ~categories.isin(known)
+        report.issues[Issue.UnmappedCategory] = local_ids[mask].astype(int).tolist()
+
+    value_columns = [c for c in df.columns if c != 'local_id']
+    if value_columns:
+        mask = df.duplicated(subset=value_columns, keep='first')
+        report.issues[Issue.Duplicate] = local_ids[mask].astype(int).tolist()
+
+    counts = report.counts()
+    if not report.is_clean():
+        logging.warning(
+            'Data-quality scan flagged ' +
+            ', '.join(f'{n} {ISSUE_LABELS[k].lower()} row(s)' for k, n in counts.items() if n) +
+            f' out of {report.total_rows}.'
+        )
+    else:
+        logging.debug(f'Data-quality scan found no issues in {report.total_rows} rows.')
+    return report
@@ -0,0 +1,276 @@
+"""Persistent index of the stable keys of the remote rows.
+
+Committing an edit must make sure the target row still holds the transaction that was edited
+locally. Re-reading the stable key columns (date, amount and description, or the id column)
+of the whole worksheet for every commit downloads the entire ledger's keys even if a single
+cell changed. Instead, the cache database keeps a ``row_index`` table mapping a fingerprint of
+each row's normalized stable key to its sheet row:
+
+- :meth:`~ExpenseTracker.core.database.DatabaseAPI.cache_data` records the index of the fetched
+  rows, and :meth:`~ExpenseTracker.core.database.DatabaseAPI.append_data` extends it
+- :meth:`~ExpenseTracker.core.sync.SyncAPI.commit_queue` looks the queued edits up in the
+  index and reads back only their target rows. If every target row still holds the edited key,
+  the edits are sent; otherwise the stable columns are fetched in full, as before, and the
+  index is rebuilt from them
+
+The index is only a hint: a row is never written without its key being read back first.
+
+Example::
+
+    entries = frame_entries(df)  # [(sheet_row, fingerprint), ...]
+    key = (('2025-01-01',), (-10.5,), ('Coffee',))
+    fingerprint(key)
+"""
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+#: Header names recognised as an id column, which then is the only stable field
+ID_ALIASES = frozenset({'id', '#', 'number', 'num'})
+#: Stable fields of the composite key used without an id column
+COMPOSITE_FIELDS: Tuple[str, ...] = ('date', 'amount', 'description')
+#: Most target rows read back by a single commit, larger commits fetch the stable columns in full
+MAX_VERIFY_ROWS: int = 100
+
+
+def normalize_value(field: str, value: Any) -> Any:
+    """Normalize a stable key cell as read with unformatted values and serial number dates.
+
+    Dates are converted to ISO strings, amounts rounded to cents, ids to integers and text
+    is stripped. Empty cells are None, or an empty string for text fields.
+
+    Args:
+        field: The logical stable field, e.g. ``date``.
+        value: The cell value.
+    """
+    from .database import google_serial_date_to_iso
+
+    if value is None:
+        return None if field in ('date', 'amount', 'id') else ''
+    if field == 'date':
+        try:
+            return google_serial_date_to_iso(float(value))
+        except (ValueError, TypeError):
+            return str(value)
+    if field == 'amount':
+        try:
+            return round(float(value), 2)
+        except (ValueError, TypeError):
+            return str(value)
+    if field == 'id':
+        try:
+            return int(float(value))
+        except (ValueError, TypeError):
+            return str(value).strip() if isinstance(value, str) else str(value)
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def normalize_values(field: str, values: Any) -> List[Any]:
+    """Return the normalized values of a stable key column, like :func:`normalize_value` per cell.
+
+    Numbers and strings are normalized column-wise; the remaining cells, and numbers whose
+    vectorized result could differ from :func:`normalize_value`, e.g. amounts halfway between
+    two cents, go through :func:`normalize_value`. NaN in a numeric column counts as empty.
+
+    Args:
+        field: The logical stable field, e.g. ``date``.
+        values: The cells of the column, a sequence or an array.
+    """
+    from .database import serial_dates_to_iso
+
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf':
+        numbers = values.astype(np.float64)
+        missing = np.isnan(numbers)
+        numeric = ~missing
+        values = values.astype(object)
+    else:
+        # Sequences are kept as objects, converting them to an array would turn ints into floats
+        values = np.asarray(values, dtype=object)
+        missing = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+        numeric = np.fromiter((_is_number(v) for v in values), dtype=bool, count=len(values))
+        numbers = np.full(len(values), np.nan)
+        numbers[numeric] = values[numeric].astype(np.float64)
+
+    result = np.full(len(values), None, dtype=object)
+    if field not in ('date', 'amount', 'id'):
+        result[missing] = ''
+    done = missing.copy()
+
+    if field == 'date':
+        dates = serial_dates_to_iso(np.where(numeric, numbers, np.nan))
+        converted = dates != None  # noqa: E711, elementwise
+        result[converted] = dates[converted]
+        done |= converted
+    elif field == 'amount':
+        # Python rounds the exact decimal value, so cents close to a half are left to round()
+        scaled = numbers * 100.0
+        half = np.abs(np.mod(scaled, 1.0) - 0.5) < 1e-6
+        rounded = numeric & np.isfinite(numbers) & (np.abs(numbers) < 1e13) & ~half
+        result[rounded] = np.round(numbers[rounded], 2).tolist()
+        done |= rounded
+    elif field == 'id':
+        truncated = numeric & np.isfinite(numbers) & (np.abs(numbers) < 2.0 ** 63)
+        result[truncated] = np.trunc(numbers[truncated]).astype(np.int64).tolist()
+        done |= truncated
+    else:
+        strings = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        if strings.any():
+            result[strings] = pd.Series(values[strings], dtype=object).str.strip().to_numpy(dtype=object)
+        done |= strings
+
+    for i in np.flatnonzero(~done):
+        result[i] = normalize_value(field, values[i])
+    return result.tolist()
+
+
+def stable_layout(headers: Sequence[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Return the stable fields of a worksheet and the headers each one is read from.
+
+    An id column is used on its own if present, otherwise the composite of
+    :data:`COMPOSITE_FIELDS` via the configured mapping.
+
+    Args:
+        headers: The header row.
+
+    Raises:
+        ValueError: If a composite field is mapped to none of the headers.
+    """
+    id_header = next((h for h in headers if h.strip().lower() in ID_ALIASES), None)
+    if id_header:
+        return ['id'], {'id': [id_header]}
+
+    from ..settings import lib
+
+    plan = lib.settings.snapshot.mapping_plan
+    stable_map: Dict[str, List[str]] = {}
+    for field in COMPOSITE_FIELDS:
+        present = [c for c in plan.sources(field) if c in headers]
+        if not present:
+            raise ValueError(f'Mapping for stable key "{field}" references no valid header.')
+        stable_map[field] = present
+    return list(COMPOSITE_FIELDS), stable_map
+
+
+def key_headers(columns: Dict[Tuple[str, str], Any]) -> Dict[str, List[str]]:
+    """Return the sorted headers of each field of ``(field, header)`` keyed columns, in key order."""
+    headers: Dict[str, List[str]] = {}
+    for field, header in columns:
+        headers.setdefault(field, []).append(header)
+    for names in headers.values():
+        names.sort()
+    return headers
+
+
+def row_keys(columns: Dict[Tuple[str, str], List[Any]], fields: Sequence[str],
+             row_count: int) -> List[Tuple[Any, ...]]:
+    """Return the stable key of each row, like the keys matched by the sync.
+
+    Each key holds a tuple per field, of the field's values in the order of their sorted headers.
+
+    Args:
+        columns: Normalized values per ``(field, header)``, each of ``row_count`` values.
+        fields: The stable fields, in key order.
+        row_count: Number of rows.
+    """
+    headers = key_headers(columns)
+    return [
+        tuple(
+            tuple(columns[(field, h)][i] for h in headers[field]) if field in headers else None
+            for field in fields
+        )
+        for i in range(row_count)
+    ]
+
+
+def key_columns(columns: Dict[Tuple[str, str], List[Any]], fields: Sequence[str]) -> List[List[Any]]:
+    """Return the columns of the stable keys in key order, see :func:`row_keys`."""
+    headers = key_headers(columns)
+    return [columns[(field, h)] for field in fields for h in headers.get(field, [])]
+
+
+def _hash_column(values: Sequence[Any]) -> np.ndarray:
+    """Hash the cells of a column so that equal values hash equally, e.g. ``1`` and ``1.0``."""
+    values = np.asarray(values, dtype=object)
+    numeric = np.fromiter((_is_number(v) or isinstance(v, bool) for v in values), dtype=bool, count=len(values))
+    result = np.empty(len(values), dtype=np.uint64)
+    if numeric.any():
+        # Adding zero turns -0.0 into 0.0
+        result[numeric] = pd.util.hash_array(values[numeric].astype(np.float64) + 0.0)
+    if not numeric.all():
+        result[~numeric] = pd.util.hash_array(values[~numeric].astype(str).astype(object))
+    return result
+
+
+def hash_keys(columns: Sequence[Sequence[Any]], row_count: int) -> np.ndarray:
+    """Hash the stable key of each row into a single int64.
+
+    Equal keys hash equally. Different keys may collide, so matches must be compared.
+
+    Args:
+        columns: The columns of the keys, see :func:`key_columns`.
+        row_count: Number of rows.
+    """
+    result = np.full(row_count, 3430008, dtype=np.uint64)
+    multiplier = np.uint64(1000003)
+    for column in columns:
+        result = (result ^ _hash_column(column)) * multiplier
+    return result.view(np.int64)
+
+
+def empty_keys(columns: Sequence[Sequence[Any]], row_count: int) -> np.ndarray:
+    """Return a mask of the rows whose stable key is empty. Such rows are never matched."""
+    result = np.ones(row_count, dtype=bool)
+    for column in columns:
+        result &= np.fromiter((v is None or v == '' for v in column), dtype=bool, count=row_count)
+    return result
+
+
+def fingerprint(key: Tuple[Any, ...]) -> int:
+    """Return the hash of a stable key, see :func:`hash_keys`."""
+    values = [v for part in key for v in (part if isinstance(part, tuple) else (part,))]
+    return int(hash_keys([[v] for v in values], 1)[0])
+
+
+def entries(hashes: np.ndarray, empty: np.ndarray, first_row: int = 2) -> List[Tuple[int, int]]:
+    """Return ``(sheet_row, fingerprint)`` of the non-empty keys of consecutive rows.
+
+    Args:
+        hashes: The hash of each row's key.
+        empty: Mask of the rows with an empty key.
+        first_row: Sheet row of the first key, 1-based.
+    """
+    rows = np.flatnonzero(~empty)
+    return list(zip((rows + first_row).tolist(), hashes[rows].tolist()))
+
+
+def frame_entries(df: pd.DataFrame, first_row: int = 2) -> List[Tuple[int, int]]:
+    """Return the index entries of fetched rows.
+
+    Args:
+        df: The fetched rows, columns named after the header row, values as fetched.
+        first_row: Sheet row of the first row of ``df``, 1-based.
+
+    Returns:
+        The entries, or an empty list if the stable fields aren't mapped to the columns.
+    """
+    try:
+        fields, stable_map = stable_layout([str(c) for c in df.columns])
+    except ValueError as ex:
+        logging.debug(f'Not indexing the rows: {ex}')
+        return []
+
+    columns: Dict[Tuple[str, str], List[Any]] = {}
+    for field, headers in stable_map.items():
+        for header in headers:
+            column = df[header]
+            if column.dtype.kind not in 'iuf':
+                column = column.astype(object).where(column.notna(), None)
+            columns[(field, header)] = normalize_values(field, column.to_numpy())
+    key_cols = key_columns(columns, fields)
+    return entries(hash_keys(key_cols, len(df)), empty_keys(key_cols, len(df)), first_row)
@@ -0,0 +1,509 @@
+"""Rate limiting and retrying of Sheets API requests.
+
+Every request sent to the Sheets API goes through the module-level :data:`scheduler`, which:
+
+- waits for a token from a per-minute token bucket, one for read and one for write requests,
+  sized after the Sheets per-user quotas
+- retries transient failures (429, 5xx, timeouts) with exponential backoff and full jitter,
+  honouring the ``Retry-After`` header of the response
+- pauses the bucket after a 429, so other requests in flight back off too
+- raises non-transient errors, such as 403 or 404, immediately
+- records the number of attempts, the latency, the ranges and the response size of each
+  request in a ring buffer, aggregated by :mod:`ExpenseTracker.core.telemetry`
+- executes each request on an HTTP object of the calling thread, see :func:`thread_http`, as
+  several tasks may share one service
+
+Requests of the local stand-in service do not count towards a quota and are only retried.
+
+Example::
+
+    result = scheduler.execute(service.spreadsheets().values().batchGet(...))
+"""
+import asyncio
+import collections
+import contextlib
+import datetime
+import email.utils
+import json
+import logging
+import random
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from googleapiclient.errors import HttpError
+
+if TYPE_CHECKING:
+    from .tasks import CancellationToken
+
+#: Read requests per minute, the Sheets per-user quota
+READ_QUOTA: int = 60
+#: Write requests per minute, the Sheets per-user quota
+WRITE_QUOTA: int = 60
+#: Default number of attempts per request
+DEFAULT_ATTEMPTS: int = 4
+#: Upper bound of the delay before the first retry, doubled on every further retry
+DEFAULT_BACKOFF: float = 0.5
+#: Longest delay between two attempts
+MAX_BACKOFF: float = 32.0
+#: HTTP status codes worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+#: Number of request records kept
+DEFAULT_CAPACITY: int = 500
+
+
+def is_retryable(ex: Optional[BaseException]) -> bool:
+    """Return True if a failed request may succeed when repeated."""
+    if isinstance(ex, HttpError):
+        return bool(ex.resp) and ex.resp.status in RETRY_STATUSES
+    return isinstance(ex, (socket.timeout, ssl.SSLError, ConnectionError, TimeoutError))
+
+
+def http_status(ex: BaseException) -> Optional[int]:
+    """Return the HTTP status of a failed request, or None if it did not get a response."""
+    resp = getattr(ex, 'resp', None)
+    return getattr(resp, 'status', None) if isinstance(ex, HttpError) else None
+
+
+def retry_after(ex: BaseException) -> Optional[float]:
+    """Return the delay requested by the ``Retry-After`` header of a failed request, in seconds."""
+    resp = getattr(ex, 'resp', None)
+    if not isinstance(ex, HttpError) or not resp:
+        return None
+    value = resp.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, backoff: float = DEFAULT_BACKOFF, maximum: float = MAX_BACKOFF) -> float:
+    """Return a random delay before retry number ``attempt``, starting at 1 (full jitter)."""
+    return random.uniform(0.0, min(maximum, backoff * (2 ** (attempt - 1))))
+
+
+def is_write(request: Any) -> bool:
+    """Return True if the request modifies the spreadsheet."""
+    method = getattr(request, 'method', None)
+    if method:
+        return method.upper() != 'GET'
+    return 'update' in str(getattr(request, 'uri', '')).lower()
+
+
+def request_name(request: Any) -> str:
+    """Return a short name of the request for logging, e.g. ``spreadsheets.values.batchGet``."""
+    method_id = getattr(request, 'methodId', None)
+    if method_id:
+        return method_id.split('.', 1)[-1] if method_id.startswith('sheets.') else method_id
+    uri = str(getattr(request, 'uri', '') or '')
+    return uri.split(' ', 1)[0] if uri else type(request).__name__
+
+
+def request_ranges(request: Any) -> Tuple[str, ...]:
+    """Return the A1 ranges a request reads or writes, from its query or its body."""
+    ranges = getattr(request, 'ranges', None)
+    if ranges is not None:
+        return tuple(ranges)
+    uri = str(getattr(request, 'uri', '') or '')
+    found = urllib.parse.parse_qs(urllib.parse.urlsplit(uri).query).get('ranges', [])
+    body = getattr(request, 'body', None)
+    if body and 'update' in uri.lower():
+        try:
+            found += [d['range'] for d in json.loads(body).get('data', []) if 'range' in d]
+        except (ValueError, TypeError, AttributeError):
+            pass
+    return tuple(found)
+
+
+_current = threading.local()
+
+
+def count_bytes(size: int) -> None:
+    """Add ``size`` response bytes to the request the calling thread is executing.
+
+    Called by the transport, see :class:`ExpenseTracker.core.telemetry.InstrumentedHttp`.
+    """
+    record = getattr(_current, 'record', None)
+    if record is not None:
+        record.bytes += size
+
+
+_owners: 'weakref.WeakKeyDictionary[Any, int]' = weakref.WeakKeyDictionary()
+_owners_lock = threading.Lock()
+
+
+def thread_http(request: Any) -> Any:
+    """Return the HTTP object the calling thread executes ``request`` with.
+
+    httplib2 is not thread-safe, so the transport of a service is used only by the first thread
+    sending one of its requests. Other threads get an authorized transport of their own, with
+    the same credentials, kept for the thread's later requests.
+
+    Returns:
+        The transport, or None for requests without credentials, e.g. of the local stand-in.
+    """
+    http = getattr(request, 'http', None)
+    credentials = getattr(http, 'credentials', None)
+    if credentials is None:
+        return None
+
+    thread = threading.get_ident()
+    with _owners_lock:
+        owner = _owners.setdefault(http, thread)
+    if owner == thread:
+        return http
+
+    own = getattr(_current, 'http', None)
+    if own is None:
+        own = _current.http = weakref.WeakKeyDictionary()
+    if http not in own:
+        from .telemetry import InstrumentedHttp
+        own[http] = InstrumentedHttp(credentials)
+    return own[http]
+
+
+def _sleep(seconds: float) -> None:
+    """Sleep between attempts, waking early if the running task is cancelled."""
+    from .tasks import current_token
+
+    token = current_token()
+    if token is None:
+        time.sleep(seconds)
+    elif token.wait(seconds):
+        token.raise_if_cancelled()
+
+
+class TokenBucket:
+    """Blocking token bucket.
+
+    Args:
+        rate: Tokens added per minute.
+        capacity: Maximum number of tokens, defaults to ``rate``.
+        clock: Monotonic clock in seconds.
+        sleep: Function sleeping for a number of seconds.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep) -> None:
+        self.rate = rate / 60.0
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        start = max(self._updated, self._paused_until)
+        if now > start:
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated = max(now, self._updated)
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available, without waiting.
+
+        Returns:
+            float: 0.0 if a token was taken, otherwise the seconds until one may be available.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now >= self._paused_until and self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return max(self._paused_until - now, (1.0 - self._tokens) / self.rate if self.rate else 1.0)
+
+    def acquire(self, token: Optional['CancellationToken'] = None) -> float:
+        """Take a token, waiting until one is available.
+
+        The wait ends early if ``token`` is cancelled.
+
+        Args:
+            token: Cancellation token to wait on, defaults to the token of the running task.
+                Without a token, the wait uses the ``sleep`` function.
+
+        Returns:
+            float: Seconds waited.
+
+        Raises:
+            OperationCancelledException: If the token is cancelled while waiting.
+        """
+        from .tasks import current_token
+
+        token = token if token is not None else current_token()
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return waited
+            if token is None:
+                self._sleep(delay)
+            elif token.wait(delay):
+                token.raise_if_cancelled()
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        """Take a token from a coroutine, see :meth:`acquire`.
+
+        Cancelling the coroutine ends the wait.
+
+        Returns:
+            float: Seconds waited.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next ``seconds``, then only one before refilling at the quota rate."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 1.0)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+
+@dataclass
+class RequestRecord:
+    """Outcome of one scheduled request.
+
+    Attributes:
+        name: Short name of the request, see :func:`request_name`.
+        attempts: Number of times the request was sent.
+        seconds: Wall time including retries and waits.
+        waited: Seconds spent waiting for the rate limiter.
+        error: Type name of the last error, or None if the request succeeded.
+        status: HTTP status of the last error, if it had a response.
+        finished: Time the request finished, as returned by :func:`time.time`.
+        ranges: A1 ranges of the request, see :func:`request_ranges`.
+        bytes: Size of the response bodies received, summed over all attempts.
+    """
+    name: str
+    attempts: int
+    seconds: float
+    waited: float = 0.0
+    error: Optional[str] = None
+    status: Optional[int] = None
+    finished: float = 0.0
+    ranges: Tuple[str, ...] = ()
+    bytes: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+
+class Retry:
+    """Attempts of one request, shared by :meth:`RequestScheduler.execute` and the asyncio client.
+
+    The caller takes a token from :attr:`bucket`, calls :meth:`start`, sends the request, and
+    then calls :meth:`succeeded` or :meth:`failed`, see :meth:`RequestScheduler.retrying`.
+
+    Args:
+        record: Record of the request, updated by every attempt.
+        bucket: Token bucket to take a token from before each attempt, or None if the request
+            is not rate limited.
+        attempts: Maximum number of attempts.
+        backoff: Upper bound of the delay before the first retry.
+    """
+
+    def __init__(self, record: RequestRecord, bucket: Optional[TokenBucket], attempts: int, backoff: float) -> None:
+        self.record = record
+        self.bucket = bucket
+        self.attempts = attempts
+        self.backoff = backoff
+
+    def start(self) -> None:
+        """Count an attempt, right before the request is sent."""
+        self.record.attempts += 1
+
+    def succeeded(self) -> None:
+        """Clear the error of the previous attempts."""
+        self.record.error = self.record.status = None
+
+    def failed(self, ex: Exception) -> Optional[float]:
+        """Record a failed attempt and return the delay before the next one.
+
+        A 429 pauses the bucket for the delay, so other requests back off too.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None if the error is final: the last attempt
+            failed or the error is not retryable.
+        """
+        record = self.record
+        record.error, record.status = type(ex).__name__, http_status(ex)
+        if record.attempts >= self.attempts or not is_retryable(ex):
+            return None
+        delay = max(backoff_delay(record.attempts, self.backoff), retry_after(ex) or 0.0)
+        if record.status == 429 and self.bucket is not None:
+            self.bucket.pause(delay)
+        logging.debug(f'{record.name} failed ({ex}), retrying in {delay:.2f}s ({record.attempts}/{self.attempts}).')
+        return delay
+
+
+class RequestScheduler:
+    """Sends requests through the rate limiters, retrying transient failures.
+
+    Args:
+        read_quota: Read requests per minute.
+        write_quota: Write requests per minute.
+        attempts: Default maximum number of attempts per request.
+        backoff: Default upper bound of the delay before the first retry.
+        capacity: Number of request records kept.
+    """
+
+    def __init__(self, read_quota: float = READ_QUOTA, write_quota: float = WRITE_QUOTA,
+                 attempts: int = DEFAULT_ATTEMPTS, backoff: float = DEFAULT_BACKOFF,
+                 capacity: int = DEFAULT_CAPACITY) -> None:
+        self.read_bucket = TokenBucket(read_quota)
+        self.write_bucket = TokenBucket(write_quota)
+        self.attempts = attempts
+        self.backoff = backoff
+        self._records: Deque[RequestRecord] = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter incremented whenever a record is added or the buffer is cleared."""
+        return self._generation
+
+    def records(self) -> List[RequestRecord]:
+        """Return a snapshot of the recorded requests, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def add_record(self, record: RequestRecord) -> None:
+        """Add a request to the records, see :meth:`retrying`."""
+        with self._lock:
+            self._records.append(record)
+            self._generation += 1
+        logging.debug(
+            f'{record.name}: {record.attempts} attempt(s), {record.seconds:.3f}s '
+            f'({record.waited:.3f}s rate limited), {record.bytes:,} bytes.'
+        )
+
+    def clear(self) -> None:
+        """Discard the recorded requests."""
+        with self._lock:
+            self._records.clear()
+            self._generation += 1
+
+    @contextlib.contextmanager
+    def retrying(self, name: str, ranges: Sequence[str] = (), write: bool = False, limited: bool = True,
+                 attempts: Optional[int] = None, backoff: Optional[float] = None) -> Iterator[Retry]:
+        """Track the attempts of a request, and record it once the block exits.
+
+        The block sends the request in a loop, like :meth:`execute`::
+
+            with scheduler.retrying('values.batchGet', ranges) as retry:
+                while True:
+                    retry.record.waited += retry.bucket.acquire()
+                    retry.start()
+                    try:
+                        result = send()
+                    except Exception as ex:
+                        delay = retry.failed(ex)
+                        if delay is None:
+                            raise
+                        time.sleep(delay)
+                    else:
+                        retry.succeeded()
+                        return result
+
+        Args:
+            name: Short name of the request, see :func:`request_name`.
+            ranges: A1 ranges of the request.
+            write: True if the request modifies the spreadsheet, it then uses the write bucket.
+            limited: False if the request does not count towards the quota.
+            attempts: Maximum number of attempts, defaults to :attr:`attempts`.
+            backoff: Upper bound of the delay before the first retry, defaults to :attr:`backoff`.
+        """
+        record = RequestRecord(name, 0, 0.0, ranges=tuple(ranges))
+        bucket = (self.write_bucket if write else self.read_bucket) if limited else None
+        start = time.perf_counter()
+        try:
+            yield Retry(
+                record, bucket, self.attempts if attempts is None else attempts,
+                self.backoff if backoff is None else backoff
+            )
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.finished = time.time()
+            self.add_record(record)
+
+    def execute(self, request: Any, http: Any = None, attempts: Optional[int] = None,
+                backoff: Optional[float] = None) -> Dict[str, Any]:
+        """Execute an API request within the quota, retrying transient failures.
+
+        Args:
+            request: The request, e.g. the result of ``values().batchGet(...)``.
+            http: HTTP object to execute the request with, defaults to :func:`thread_http`.
+            attempts: Maximum number of attempts, defaults to :attr:`attempts`.
+            backoff: Upper bound of the delay before the first retry, defaults to :attr:`backoff`.
+
+        Raises:
+            OperationCancelledException: If the running task is cancelled before the request is
+                sent. Once a write request was sent it may have been applied, so its retries
+                are not cancelled.
+            Exception: The last error if all attempts fail, or the first non-retryable error.
+        """
+        from .tasks import check_cancelled, uncancellable
+
+        write = is_write(request)
+        http = http if http is not None else thread_http(request)
+        with self.retrying(
+                request_name(request), request_ranges(request), write=write,
+                limited=getattr(request, 'rate_limited', True), attempts=attempts, backoff=backoff
+        ) as retry, contextlib.ExitStack() as sent:
+            previous, _current.record = getattr(_current, 'record', None), retry.record
+            try:
+                while True:
+                    if retry.bucket is not None:
+                        retry.record.waited += retry.bucket.acquire()
+                    # The task may have been cancelled while waiting for the rate limiter
+                    check_cancelled()
+                    retry.start()
+                    if write and retry.record.attempts == 1:
+                        sent.enter_context(uncancellable())
+                    try:
+                        result = request.execute(http=http) if http is not None else request.execute()
+                    except Exception as ex:
+                        delay = retry.failed(ex)
+                        if delay is None:
+                            raise
+                        _sleep(delay)
+                    else:
+                        retry.succeeded()
+                        return result
+            finally:
+                _current.record = previous
+
+
+scheduler = RequestScheduler()
+
+
+def execute(request: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Execute a request with the module-level :data:`scheduler`."""
+    return scheduler.execute(request, **kwargs)
@@ -9,14 +9,18 @@ import socket
 import ssl
 import threading
 import time
+from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
 from PySide6 import QtCore, QtWidgets
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from . import discovery, profiler
 from .auth import auth_manager, AuthExpiredError
+from .scheduler import is_retryable, backoff_delay, scheduler
+from .sheetmeta import SheetProperties, metadata_cache
 from ..status import status
 from ..ui.ui import BaseProgressDialog
 
@@ -24,61 +28,57 @@ from ..ui.ui import BaseProgressDialog
 _cached_service: Any = None
 
 TOTAL_TIMEOUT: int = 180
-MAX_RETRIES: int = 6
+MAX_RETRIES: int = 3  # Attempts per operation; each request is also retried by the scheduler
 BATCH_SIZE: int = 3000  # Number of rows per batch for large sheets
+FETCH_CONCURRENCY: int = 4  # Number of batches downloaded at the same time
+COLUMN_MAJOR: bool = True  # Fetch only the configured columns, column by column
+TYPE_SAMPLE_ROWS: int = 200  # Number of rows sampled to infer the header types
 
 
-class AsyncWorker(QtCore.QThread):
+def _call_with_retries(func: Callable[..., Any], *args: Any, max_attempts: int = MAX_RETRIES,
+                       wait_seconds: float = 2.0, **kwargs: Any) -> Any:
     """
-    Generic worker thread with retry logic for blocking functions.
+    Calls a blocking function, retrying transient failures.
 
-    Signals:
-        resultReady (object): Emitted with the function's result on success.
-        errorOccurred (str): Emitted with an error message on failure.
-    """
-    resultReady = QtCore.Signal(object)
-    errorOccurred = QtCore.Signal(object)
-
-    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
-        super().__init__()
-        self.func = func
-        self.args = args
-
-        self.max_attempts = kwargs.pop('max_attempts', MAX_RETRIES)
-        self.wait_seconds = kwargs.pop('wait_seconds', 2.0)
-        self.kwargs = kwargs
-
-    def run(self) -> None:
-        attempts = 0
-        last_exception = None
-        while attempts < self.max_attempts:
-            attempts += 1
-            try:
-                result = self.func(*self.args, **self.kwargs)
-                self.resultReady.emit(result)
-                return
-            except AuthExpiredError as ex:
-                # Notify GUI that interactive authentication is required
-                from ..ui.actions import signals
-                signals.authenticationRequested.emit()
-                self.errorOccurred.emit(ex)
-                return
-            except (
-                    status.AuthenticationExceptionException,
-                    status.CredsNotFoundException,
-                    status.CredsInvalidException,
-                    status.SpreadsheetIdNotConfiguredException,
-                    status.SpreadsheetWorksheetNotConfiguredException,
-                    status.HeadersInvalidException,
-                    status.HeaderMappingInvalidException
-            ) as ex:
-                self.errorOccurred.emit(ex)
-                return
-            except Exception as ex:
-                last_exception = ex
-                time.sleep(self.wait_seconds)
-        # All retries exhausted
-        self.errorOccurred.emit(last_exception)
+    Only transient failures, such as quota errors and timeouts, are retried, with exponential
+    backoff and jitter. Other errors are raised right away. Backoff delays end early if the
+    running task is cancelled.
+
+    Args:
+        func: The blocking function to call.
+        max_attempts (int): Maximum number of attempts.
+        wait_seconds (float): Upper bound of the delay before the first retry.
+    """
+    from .tasks import check_cancelled, current_token
+
+    attempts = 0
+    while True:
+        attempts += 1
+        check_cancelled()
+        try:
+            return func(*args, **kwargs)
+        except (
+                AuthExpiredError,
+                status.OperationCancelledException,
+                status.AuthenticationExceptionException,
+                status.CredsNotFoundException,
+                status.CredsInvalidException,
+                status.SpreadsheetIdNotConfiguredException,
+                status.SpreadsheetWorksheetNotConfiguredException,
+                status.HeadersInvalidException,
+                status.HeaderMappingInvalidException
+        ):
+            raise
+        except Exception as ex:
+            if attempts >= max_attempts or not (is_retryable(ex) or is_retryable(ex.__cause__)):
+                raise
+            delay = backoff_delay(attempts, wait_seconds)
+            logging.debug(f'{func.__name__} failed ({ex}), retrying in {delay:.2f}s.')
+            token = current_token()
+            if token is not None:
+                token.wait(delay)
+            else:
+                time.sleep(delay)
 
 
 class SheetsFetchProgressDialog(BaseProgressDialog):
@@ -122,6 +122,7 @@ class SheetsFetchProgressDialog(BaseProgressDialog):
         self.accepted.connect(self.on_cancel)
         from ..ui.actions import signals
         signals.error.connect(self.on_error)
+        signals.dataFetchProgress.connect(self.on_progress)
 
     @QtCore.Slot(str)
     def on_error(self, msg: str) -> None:
@@ -129,6 +130,11 @@ class SheetsFetchProgressDialog(BaseProgressDialog):
         self.error_label.setText(msg)
         QtWidgets.QApplication.processEvents()
 
+    @QtCore.Slot(int, int, int)
+    def on_progress(self, done: int, total: int, rows: int) -> None:
+        """Show the number of ranges and rows fetched so far."""
+        self.status_label.setText(f'{self.status_text} ({done}/{total} ranges, {rows} rows)')
+
     def _update_countdown_label(self) -> None:
         """Update countdown label each second."""
         self.countdown_label.setText(f'Please wait ({self.remaining}s)...')
@@ -153,16 +159,37 @@ def clear_service() -> None:
         logging.debug(f'Failed closing cached Sheets service client: {ex}')
 
     _cached_service = None
+    metadata_cache.invalidate()
 
 
 def get_service() -> Any:
     """
     Builds (or returns cached) Google Sheets service client.
 
+    If the configured spreadsheet id is a ``local:`` URI, returns the file-backed stand-in
+    from :mod:`ExpenseTracker.core.localsheets` instead, without authenticating.
+
     Returns:
         The Sheets API Resource, reusing a single client per app run.
     """
     global _cached_service
+    from ..settings import lib
+    from . import localsheets
+
+    spreadsheet_id: str = lib.settings.get_section('spreadsheet').get('id', '') or ''
+    if localsheets.is_local(spreadsheet_id):
+        if (isinstance(_cached_service, localsheets.LocalSheetsService) and
+                _cached_service.spreadsheet_id == spreadsheet_id):
+            return _cached_service
+        try:
+            _cached_service = localsheets.LocalSheetsService(spreadsheet_id)
+        except (OSError, ValueError) as ex:
+            raise status.ServiceUnavailableException(f'Local spreadsheet unavailable: {ex}') from ex
+        logging.debug(f'Using local spreadsheet "{_cached_service.path}".')
+        return _cached_service
+    if isinstance(_cached_service, localsheets.LocalSheetsService):
+        _cached_service = None
+
     # Obtain valid credentials (non-interactive, may raise AuthExpiredError)
     logging.debug(
         f"[Thread-{threading.get_ident()}] get_service: invoking auth_manager.get_valid_credentials at {time.time()}")
@@ -173,7 +200,7 @@ def get_service() -> Any:
     if _cached_service is not None:
         return _cached_service
     try:
-        service: Any = build('sheets', 'v4', credentials=creds)
+        service: Any = discovery.build_service(creds)
         logging.debug('Google Sheets service client created successfully.')
         _cached_service = service
         return service
@@ -216,20 +243,10 @@ def _query_sheet_size(service: Any, spreadsheet_id: str, worksheet_name: str) ->
     Raises:
         WorksheetNotFoundException: If the worksheet doesn't exist.
     """
-    result: Dict[str, Any] = service.spreadsheets().get(
-        spreadsheetId=spreadsheet_id,
-        fields='sheets(properties(title,gridProperties(rowCount,columnCount)))'
-    ).execute()
-
-    sheet: Optional[Dict[str, Any]] = next(
-        (s for s in result.get('sheets', [])
-         if s.get('properties', {}).get('title', '') == worksheet_name), None)
+    sheet: Optional[SheetProperties] = metadata_cache.sheets(service, spreadsheet_id).get(worksheet_name)
     if not sheet:
         raise status.WorksheetNotFoundException(f'Worksheet "{worksheet_name}" not found.')
-    grid_props: Dict[str, Any] = sheet.get('properties', {}).get('gridProperties', {})
-    row_count: int = grid_props.get('rowCount', 0)
-    column_count: int = grid_props.get('columnCount', 0)
-    return row_count, column_count
+    return sheet.row_count, sheet.column_count
 
 
 def _verify_sheet_access() -> Any:
@@ -254,10 +271,7 @@ def _verify_sheet_access() -> Any:
 
     logging.debug('Connecting to Google Sheets API...')
     try:
-        result: Dict[str, Any] = service.spreadsheets().get(
-            spreadsheetId=spreadsheet_id,
-            fields='sheets(properties(title,gridProperties(rowCount,columnCount)))'
-        ).execute()
+        sheets: Dict[str, SheetProperties] = metadata_cache.sheets(service, spreadsheet_id)
         logging.debug(f'Access confirmed for spreadsheet "{spreadsheet_id}".')
     except HttpError as ex:
         stat: Optional[int] = ex.resp.status if ex.resp else None
@@ -279,7 +293,7 @@ def _verify_sheet_access() -> Any:
     except ssl.SSLError as ex:
         raise status.ServiceUnavailableException(f'SSL error fetching data: {ex}') from ex
 
-    if not result:
+    if not sheets:
         # No response from Sheets API: service unavailable
         raise status.ServiceUnavailableException('No result returned from the Sheets API.')
 
@@ -287,10 +301,7 @@ def _verify_sheet_access() -> Any:
     if not worksheet_name:
         raise status.SpreadsheetWorksheetNotConfiguredException
 
-    sheet: Optional[Dict[str, Any]] = next(
-        (s for s in result.get('sheets', [])
-         if s.get('properties', {}).get('title', '') == worksheet_name), None)
-    if not sheet:
+    if worksheet_name not in sheets:
         raise status.WorksheetNotFoundException(
             f'Worksheet "{worksheet_name}" not found in spreadsheet "{spreadsheet_id}".')
 
@@ -300,10 +311,13 @@ def _verify_sheet_access() -> Any:
 
 def verify_sheet_access(total_timeout: int = TOTAL_TIMEOUT) -> Any:
     """
-    Asynchronously verifies access to the spreadsheet, returning the Sheets API resource.
+    Asynchronously verifies access to the spreadsheet.
+
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: Finishes with the Sheets API resource.
     """
-    return start_asynchronous(_verify_sheet_access, total_timeout=total_timeout,
-                              status_text='Verifying sheet access.')
+    return _start_operation(_verify_sheet_access, total_timeout=total_timeout,
+                            status_text='Verifying sheet access.')
 
 
 def _verify_headers(remote_headers: List[str] = None) -> Set[str]:
@@ -338,12 +352,15 @@ def _verify_headers(remote_headers: List[str] = None) -> Set[str]:
     return remote_headers_set
 
 
-def verify_headers(total_timeout: int = TOTAL_TIMEOUT) -> Set[str]:
+def verify_headers(total_timeout: int = TOTAL_TIMEOUT) -> Any:
     """
     Asynchronously verifies the headers of the remote spreadsheet.
+
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: Finishes with the set of remote headers.
     """
-    return start_asynchronous(_verify_headers, total_timeout=total_timeout,
-                              status_text='Verifying headers.')
+    return _start_operation(_verify_headers, total_timeout=total_timeout,
+                            status_text='Verifying headers.')
 
 
 def _verify_mapping(remote_headers: List[str] = None) -> None:
@@ -400,20 +417,155 @@ def _verify_mapping(remote_headers: List[str] = None) -> None:
     logging.debug(f'Header mapping verified successfully. Found {len(config_headers_full)} columns.')
 
 
-def verify_mapping(total_timeout: int = TOTAL_TIMEOUT) -> None:
+def verify_mapping(total_timeout: int = TOTAL_TIMEOUT) -> Any:
     """
     Asynchronously verifies the header mapping configuration against the remote spreadsheet's column values.
+
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: Finishes with None if the mapping is valid.
+    """
+    return _start_operation(_verify_mapping, total_timeout=total_timeout,
+                            status_text='Verifying header mapping.')
+
+
+def _ledger_columns(header: List[Any]) -> List[int]:
+    """
+    Returns the indexes of the remote columns named in the ``header`` or ``mapping`` configuration.
+
+    Args:
+        header: The remote header row.
+
+    Returns:
+        Column indexes in sheet order.
+    """
+    from ..settings import lib
+    from ..settings.lib import parse_merge_mapping
+
+    names: Set[str] = set(lib.settings.get_section('header') or {})
+    for spec in (lib.settings.get_section('mapping') or {}).values():
+        names.update(parse_merge_mapping(spec))
+    return [i for i, name in enumerate(header) if name in names]
+
+
+def _probe_columns(header: List[Any]) -> List[int]:
+    """
+    Returns the indexes of the remote columns every ledger row has a value in: the columns mapped
+    to ``date`` and ``amount``, or all ledger columns if those are not in the header.
+    """
+    from ..settings import lib
+    from ..settings.lib import parse_merge_mapping
+
+    mapping: Dict[str, Any] = lib.settings.get_section('mapping') or {}
+    names: Set[str] = set()
+    for key in ('date', 'amount'):
+        names.update(parse_merge_mapping(mapping.get(key, '')))
+    indexes: List[int] = [i for i, name in enumerate(header) if name in names]
+    return indexes or _ledger_columns(header)
+
+
+def _used_rows(service: Any, spreadsheet_id: str, worksheet_name: str, grid_rows: int, header: List[Any],
+               hint: Optional[int] = None, columns: Optional[List[int]] = None) -> int:
+    """
+    Returns the number of sheet rows to read, the grid rows minus the blank rows below the data.
+
+    Sheets often keep thousands of empty rows at the bottom of the grid. Downloading them returns
+    nothing but still costs a request per chunk, so fetches and commits stop at the last row with
+    a value, see :meth:`~ExpenseTracker.core.sheetmeta.SheetMetadataCache.used_range`.
+
+    Args:
+        service: The Sheets API resource.
+        spreadsheet_id: Spreadsheet ID.
+        worksheet_name: Worksheet title.
+        grid_rows: Rows of the grid.
+        header: The remote header row.
+        hint: The likely last row. Defaults to the last row of the cached fetch.
+        columns: Indexes of the columns to probe. Defaults to :func:`_probe_columns`.
+
+    Returns:
+        The last used row, at least 1 for the header.
+    """
+    if hint is None:
+        from .database import CacheState, database
+        if database.get_state() == CacheState.Valid:
+            hint = database.get_fetch_state()[0] + 1
+
+    with profiler.stage('service.used_range') as s:
+        used = metadata_cache.used_range(
+            service, spreadsheet_id, worksheet_name, grid_rows,
+            _probe_columns(header) if columns is None else columns, hint=hint
+        )
+        s.rows = used.skipped
+    if used.skipped:
+        logging.info(f'Skipping {used.skipped} blank rows below row {used.last_row} of "{worksheet_name}".')
+    return max(used.last_row, 1)
+
+
+def _column_array(values: List[Any]) -> np.ndarray:
+    """
+    Converts the cells of a column to an array typed like pandas infers it: int64 if all cells
+    are integers, float64 with NaN for empty cells if all are numbers, object otherwise.
+    """
+    kinds: Set[type] = {type(v) for v in values}
+    if kinds == {int}:
+        return np.array(values, dtype=np.int64)
+    if kinds and kinds <= {int, float, type(None)} and kinds != {type(None)}:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _trim_columns(columns: List[List[Any]]) -> List[List[Any]]:
+    """
+    Drops the rows below the last row with a value, the blank rows of the grid that row-major
+    responses omit.
+    """
+    height = 0
+    for cells in columns:
+        end = len(cells)
+        while end > height and cells[end - 1] in ('', None):
+            end -= 1
+        height = max(height, end)
+    return [cells[:height] for cells in columns]
+
+
+def _build_frame(names: List[Any], columns: List[List[Any]]) -> pd.DataFrame:
+    """
+    Builds a DataFrame from column-major cells, one typed array per column.
+
+    Args:
+        names: Column names.
+        columns: The cells of each column, of equal length.
     """
-    return start_asynchronous(_verify_mapping, total_timeout=total_timeout,
-                              status_text='Verifying header mapping.')
+    with profiler.stage('service.build_frame', rows=len(columns[0]) if columns else 0):
+        return pd.DataFrame({name: _column_array(cells) for name, cells in zip(names, columns)}, copy=False)
 
 
+@profiler.profiled('service.fetch_data')
 def _fetch_data(
-        value_render_option: str = 'UNFORMATTED_VALUE'
+        value_render_option: str = 'UNFORMATTED_VALUE',
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        column_major: Optional[bool] = None,
 ) -> pd.DataFrame:
     """
     Retrieves ledger data as a pandas DataFrame using the spreadsheet configuration.
 
+    The sheet is split into ranges of ``chunk_size`` rows downloaded concurrently, see
+    :func:`ExpenseTracker.core.fetcher.fetch_ranges`.
+
+    Column-major, only the columns named in the ``header`` and ``mapping`` configuration are
+    downloaded, with :func:`ExpenseTracker.core.fetcher.fetch_columns`, and the DataFrame is built
+    from one typed array per column. Row-major, every column is downloaded and the DataFrame is
+    built from the rows.
+
+    Args:
+        value_render_option (str): Sheets API value render option.
+        chunk_size (int, optional): Rows per range. Defaults to :data:`BATCH_SIZE`.
+        concurrency (int, optional): Ranges downloaded at the same time. Defaults to
+            :data:`FETCH_CONCURRENCY`; 1 requests all ranges with a single call.
+        column_major (bool, optional): Fetch column-major. Defaults to :data:`COLUMN_MAJOR`.
+
     Returns:
         A pandas DataFrame containing the ledger data.
     """
@@ -436,50 +588,321 @@ def _fetch_data(
         logging.warning(f'No data rows found in "{worksheet_name}".')
         return pd.DataFrame()
 
+    from . import fetcher
     from .sync import idx_to_col
+    from ..ui.actions import signals
+
+    header: List[Any] = metadata_cache.header(
+        service, spreadsheet_id, worksheet_name, col_count, value_render_option=value_render_option
+    )
+    row_count = _used_rows(service, spreadsheet_id, worksheet_name, row_count, header)
+    if row_count < 2:
+        logging.warning(f'No data rows found in "{worksheet_name}".')
+        return pd.DataFrame()
+
+    if COLUMN_MAJOR if column_major is None else column_major:
+        _verify_mapping(remote_headers=header)
+        _verify_headers(remote_headers=header)
+
+        indexes: List[int] = _ledger_columns(header)
+        logging.debug(f'Fetching {len(indexes)} of {len(header)} columns, rows 2-{row_count}.')
+        columns: List[List[Any]] = fetcher.fetch_columns(
+            service,
+            spreadsheet_id,
+            worksheet_name,
+            indexes,
+            2,
+            row_count,
+            chunk_size or BATCH_SIZE,
+            value_render_option=value_render_option,
+            concurrency=FETCH_CONCURRENCY if concurrency is None else concurrency,
+            progress=signals.dataFetchProgress.emit,
+        )
+        df = _build_frame([header[i] for i in indexes], _trim_columns(columns))
+        logging.debug(f'Constructed DataFrame: {df.shape[0]} rows x {df.shape[1]} columns.')
+        return df
+
     last_col: str = idx_to_col(col_count - 1)
-    data_ranges: List[str] = []
-    data_start: int = 1
-    while data_start <= row_count:
-        data_end: int = min(data_start + BATCH_SIZE - 1, row_count)
-        data_ranges.append(f'{worksheet_name}!A{data_start}:{last_col}{data_end}')
-        data_start = data_end + 1
-
-    logging.debug(f'Fetching data rows 1-{row_count} in batches.')
-    batch_result: Dict[str, Any] = service.spreadsheets().values().batchGet(
-        spreadsheetId=spreadsheet_id,
-        ranges=data_ranges,
-        valueRenderOption=value_render_option,
-        fields='valueRanges(values)'
-    ).execute()
+    data_ranges: List[str] = fetcher.split_ranges(
+        worksheet_name, row_count, last_col, chunk_size or BATCH_SIZE
+    )
 
-    data_rows: List[List[Any]] = []
-    for vr in batch_result.get('valueRanges', []):
-        values: List[List[Any]] = vr.get('values', [])
-        if values:
-            data_rows.extend(values)
+    logging.debug(f'Fetching data rows 1-{row_count} in {len(data_ranges)} batches.')
+    data_rows: List[List[Any]] = fetcher.fetch_ranges(
+        service,
+        spreadsheet_id,
+        data_ranges,
+        value_render_option=value_render_option,
+        concurrency=FETCH_CONCURRENCY if concurrency is None else concurrency,
+        progress=signals.dataFetchProgress.emit,
+    )
     logging.debug(f'Total data rows fetched: {len(data_rows)}.')
 
-    header: List[Any] = data_rows.pop(0) if data_rows else []
+    header = data_rows.pop(0) if data_rows else []
     df: pd.DataFrame = pd.DataFrame(data_rows, columns=header)
 
     logging.debug(f'Constructed DataFrame: {df.shape[0]} rows x {df.shape[1]} columns from sheet "{worksheet_name}".')
 
-    _verify_mapping()
+    _verify_mapping(remote_headers=header)
     _verify_headers(remote_headers=header)
 
     return df
 
 
-def fetch_data(total_timeout: int = TOTAL_TIMEOUT) -> pd.DataFrame:
+@dataclass
+class NewRows:
+    """Rows added to the bottom of the remote sheet since the last fetch.
+
+    Attributes:
+        df: The new rows, with the remote header as columns. May be empty.
+        row_count: Number of data rows in the remote sheet, including the new rows.
+        fingerprint: Fingerprint of the sheet's new tail, see
+            :func:`ExpenseTracker.core.database.ledger_fingerprint`.
+    """
+    df: pd.DataFrame
+    row_count: int
+    fingerprint: str
+
+
+def _fetch_tail(
+        service: Any,
+        spreadsheet_id: str,
+        worksheet_name: str,
+        row_count: int,
+        col_count: int,
+        value_render_option: str = 'UNFORMATTED_VALUE',
+) -> Tuple[List[Any], List[List[Any]]]:
+    """
+    Downloads the header and the last :data:`~ExpenseTracker.core.database.FINGERPRINT_ROWS`
+    of ``row_count`` data rows in a single request.
+
+    Returns:
+        Tuple[List[Any], List[List[Any]]]: The header and the tail rows, padded with empty rows.
+    """
+    from . import fetcher
+    from .database import FINGERPRINT_ROWS
+    from .sync import idx_to_col
+
+    last_col: str = idx_to_col(col_count - 1)
+    tail_start: int = max(2, row_count + 2 - FINGERPRINT_ROWS)
+    request = service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=[f'{worksheet_name}!A1:{last_col}1', f'{worksheet_name}!A{tail_start}:{last_col}{row_count + 1}'],
+        valueRenderOption=value_render_option,
+        dateTimeRenderOption='SERIAL_NUMBER',
+        fields='valueRanges(values)'
+    )
+    value_ranges: List[Dict[str, Any]] = fetcher.execute_with_retry(request).get('valueRanges', [])
+    header_rows: List[List[Any]] = value_ranges[0].get('values', []) if value_ranges else []
+    header: List[Any] = header_rows[0] if header_rows else []
+    tail: List[List[Any]] = value_ranges[1].get('values', []) if len(value_ranges) > 1 else []
+    # Trailing empty rows are omitted from responses
+    tail += [[] for _ in range(row_count + 2 - tail_start - len(tail))]
+    return header, tail
+
+
+def _ledger_tail(header: List[Any], tail: List[List[Any]]) -> Tuple[List[int], List[Any], List[List[Any]]]:
+    """
+    Keeps the columns of the cached DataFrame of a column-major fetch, so the tail is
+    fingerprinted like :meth:`~ExpenseTracker.core.database.DatabaseAPI.cache_data` does.
+
+    Returns:
+        Tuple: The indexes of the kept columns, and the header and tail rows reduced to them.
+    """
+    indexes: List[int] = _ledger_columns(header)
+    header = [header[i] for i in indexes]
+    tail = [[row[i] if i < len(row) else None for i in indexes] for row in tail]
+    return indexes, header, tail
+
+
+def _refresh_fingerprint(service: Any, spreadsheet_id: str, worksheet_name: str, col_count: int) -> None:
+    """
+    Stores the fingerprint of the remote tail after the app itself edited it.
+
+    Committed edits change the rows fingerprinted by :func:`_fetch_new_rows`, which would
+    otherwise take them for a remote change and download the whole sheet.
+    """
+    from .database import database, ledger_fingerprint
+
+    row_count, stored_fingerprint = database.get_fetch_state()
+    if not row_count or not stored_fingerprint:
+        return
+    header, tail = _fetch_tail(service, spreadsheet_id, worksheet_name, row_count, col_count)
+    if COLUMN_MAJOR:
+        _, header, tail = _ledger_tail(header, tail)
+    database.set_fetch_state(row_count, ledger_fingerprint(header, tail))
+
+
+@profiler.profiled('service.fetch_new_rows')
+def _fetch_new_rows(
+        value_render_option: str = 'UNFORMATTED_VALUE',
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        column_major: Optional[bool] = None,
+) -> Optional[NewRows]:
+    """
+    Retrieves only the rows appended to the remote sheet since the cache was last written.
+
+    Re-downloads the header and the last :data:`~ExpenseTracker.core.database.FINGERPRINT_ROWS`
+    cached rows and compares their fingerprint with the one stored with the cache. If they
+    match, the rows below are downloaded like :func:`_fetch_data` does.
+
+    Returns:
+        NewRows: The new rows, or None if the cache can't be extended and a full fetch is needed:
+        the cache is not valid, has no fingerprint, or the header or the tail rows changed.
+    """
+    from ..settings import lib
+    from . import fetcher
+    from .database import CacheState, FINGERPRINT_ROWS, database, ledger_fingerprint
+    from .sync import idx_to_col
+    from ..ui.actions import signals
+
+    if database.get_state() != CacheState.Valid:
+        logging.debug('Cache is not valid, a full fetch is needed.')
+        return None
+    row_count, stored_fingerprint = database.get_fetch_state()
+    if not row_count or not stored_fingerprint:
+        logging.debug('No fetch state stored with the cache, a full fetch is needed.')
+        return None
+
+    config: Dict[str, Any] = lib.settings.get_section('spreadsheet')
+    spreadsheet_id: Optional[str] = config.get('id', None)
+    if not spreadsheet_id:
+        raise status.SpreadsheetIdNotConfiguredException
+    worksheet_name: Optional[str] = config.get('worksheet', None)
+    if not worksheet_name:
+        raise status.SpreadsheetWorksheetNotConfiguredException
+
+    service: Any = _verify_sheet_access()
+    grid_rows, col_count = _query_sheet_size(service, spreadsheet_id, worksheet_name)
+    if grid_rows < row_count + 1:
+        logging.info(f'Remote sheet has fewer than {row_count} data rows, a full fetch is needed.')
+        return None
+
+    # Data rows start on the second sheet row
+    last_col: str = idx_to_col(col_count - 1)
+    header, tail = _fetch_tail(service, spreadsheet_id, worksheet_name, row_count, col_count, value_render_option)
+
+    # Blank rows below the data are not downloaded
+    used_rows: int = _used_rows(service, spreadsheet_id, worksheet_name, grid_rows, header, hint=row_count + 1)
+
+    column_major = COLUMN_MAJOR if column_major is None else column_major
+    if column_major:
+        indexes, header, tail = _ledger_tail(header, tail)
+
+    if not header or ledger_fingerprint(header, tail) != stored_fingerprint:
+        logging.info('The remote sheet changed above its last fetched row, a full fetch is needed.')
+        return None
+
+    if used_rows < row_count + 2:
+        logging.debug('No new rows.')
+        return NewRows(df=pd.DataFrame(columns=header), row_count=row_count, fingerprint=stored_fingerprint)
+
+    if column_major:
+        logging.debug(f'Fetching {len(indexes)} columns, rows {row_count + 2}-{used_rows}.')
+        columns: List[List[Any]] = fetcher.fetch_columns(
+            service,
+            spreadsheet_id,
+            worksheet_name,
+            indexes,
+            row_count + 2,
+            used_rows,
+            chunk_size or BATCH_SIZE,
+            value_render_option=value_render_option,
+            concurrency=FETCH_CONCURRENCY if concurrency is None else concurrency,
+            progress=signals.dataFetchProgress.emit,
+        )
+        columns = _trim_columns(columns)
+        rows: List[Tuple[Any, ...]] = list(zip(*columns))
+        logging.debug(f'Fetched {len(rows)} new rows.')
+        return NewRows(
+            df=_build_frame(header, columns),
+            row_count=row_count + len(rows),
+            fingerprint=ledger_fingerprint(header, (tail + [list(r) for r in rows])[-FINGERPRINT_ROWS:]),
+        )
+
+    data_ranges: List[str] = fetcher.split_ranges(
+        worksheet_name, used_rows, last_col, chunk_size or BATCH_SIZE, first_row=row_count + 2
+    )
+    logging.debug(f'Fetching rows {row_count + 2}-{used_rows} in {len(data_ranges)} batches.')
+    new_rows: List[List[Any]] = fetcher.fetch_ranges(
+        service,
+        spreadsheet_id,
+        data_ranges,
+        value_render_option=value_render_option,
+        concurrency=FETCH_CONCURRENCY if concurrency is None else concurrency,
+        progress=signals.dataFetchProgress.emit,
+    )
+    logging.debug(f'Fetched {len(new_rows)} new rows.')
+
+    return NewRows(
+        df=pd.DataFrame(new_rows, columns=header),
+        row_count=row_count + len(new_rows),
+        fingerprint=ledger_fingerprint(header, (tail + new_rows)[-FINGERPRINT_ROWS:]),
+    )
+
+
+def apply_new_rows(new_rows: NewRows) -> None:
     """
-    Asynchronously fetches ledger data as a pandas DataFrame.
+    Appends the rows returned by :func:`_fetch_new_rows` to the cache and emits ``dataAppended``.
     """
     from ..ui.actions import signals
+    from .database import database
+
+    database.append_data(new_rows.df)
+    database.set_fetch_state(new_rows.row_count, new_rows.fingerprint)
+    signals.dataAppended.emit(new_rows.df.copy())
+
+
+def _fetch_latest(incremental: bool = False) -> Any:
+    """
+    Fetches the new rows if ``incremental`` and the cache can be extended, otherwise the whole sheet.
+
+    Returns:
+        NewRows or pd.DataFrame: The result of :func:`_fetch_new_rows` or :func:`_fetch_data`.
+    """
+    if incremental:
+        new_rows = _fetch_new_rows()
+        if new_rows is not None:
+            return new_rows
+    return _fetch_data()
+
 
+def fetch_data(total_timeout: int = TOTAL_TIMEOUT, incremental: bool = False) -> Any:
+    """
+    Asynchronously fetches ledger data, without blocking the caller.
+
+    Emits ``dataFetched`` with the DataFrame, or ``dataAppended`` after appending new rows to the
+    cache, once the fetch completes.
+
+    Args:
+        total_timeout (int): Total operation timeout.
+        incremental (bool): Only fetch the rows appended to the sheet since the last fetch and
+            append them to the cache, see :func:`_fetch_new_rows`. Falls back to a full fetch if
+            the sheet changed otherwise.
+
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: The handle of the running fetch.
+    """
+    from ..ui.actions import signals
+
+    # A user-requested refresh must see the current sheet, not metadata cached moments ago
+    metadata_cache.invalidate()
     signals.dataAboutToBeFetched.emit()
-    data = start_asynchronous(_fetch_data, total_timeout=total_timeout, status_text='Fetching data.')
-    signals.dataFetched.emit(data.copy())
+
+    handle = run_asynchronous(_fetch_latest, incremental, total_timeout=total_timeout,
+                              status_text='Fetching new rows.' if incremental else 'Fetching data.')
+
+    @QtCore.Slot(object)
+    def on_finished(result: Any) -> None:
+        if isinstance(result, NewRows):
+            apply_new_rows(result)
+        else:
+            signals.dataFetched.emit(result.copy())
+
+    handle.finished.connect(on_finished)
+    handle.failed.connect(_status_exception)
+    return handle
 
 
 def _fetch_headers(
@@ -509,41 +932,85 @@ def _fetch_headers(
     service: Any = _verify_sheet_access()
 
     _, col_count = _query_sheet_size(service, spreadsheet_id, worksheet_name)
-    from .sync import idx_to_col
-    end_col: str = idx_to_col(col_count - 1)
-    range_ = f'{worksheet_name}!A1:{end_col}1'
-
-    logging.debug(f'Fetching headers from range "{range_}".')
-    batch_result: Dict[str, Any] = service.spreadsheets().values().batchGet(
-        spreadsheetId=spreadsheet_id,
-        ranges=[range_],
-        valueRenderOption=value_render_option,
-        fields='valueRanges(values)'
-    ).execute()
-
-    data_rows: List[List[Any]] = []
-    for vr in batch_result.get('valueRanges', []):
-        values: List[List[Any]] = vr.get('values', [])
-        if values:
-            data_rows.extend(values)
-
-    logging.debug(f'Total header rows fetched: {len(data_rows)}.')
+    header_row: List[str] = metadata_cache.header(
+        service, spreadsheet_id, worksheet_name, col_count, value_render_option=value_render_option
+    )
 
-    if not data_rows:
+    if not header_row:
         logging.warning(f'The remote sheet is empty!')
-        return data_rows
+        return header_row
 
-    header_row: List[Any] = data_rows[0] if data_rows[0] else []
-    header_row = [str(cell) for cell in header_row]
     logging.debug(f'Found {len(header_row)} headers in the remote sheet: [{",".join(sorted(header_row))}].')
     return header_row
 
 
-def fetch_headers(total_timeout: int = TOTAL_TIMEOUT) -> List[str]:
+def fetch_headers(total_timeout: int = TOTAL_TIMEOUT) -> Any:
     """
     Asynchronously fetches the header row.
+
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: Finishes with the list of headers.
+    """
+    return _start_operation(_fetch_headers, total_timeout=total_timeout, status_text='Fetching headers.')
+
+
+def _infer_header_types(sample_size: Optional[int] = None, refresh: bool = False) -> Dict[str, Any]:
     """
-    return start_asynchronous(_fetch_headers, total_timeout=total_timeout, status_text='Fetching headers.')
+    Infers the type of each remote column from a sample of the rows, see
+    :func:`ExpenseTracker.core.typeinfer.infer_types`.
+
+    Args:
+        sample_size (int, optional): Rows to sample. Defaults to :data:`TYPE_SAMPLE_ROWS`.
+        refresh (bool): Sample again even if the header row was sampled before.
+
+    Returns:
+        A :class:`~ExpenseTracker.core.typeinfer.TypeGuess` per header name, in sheet order.
+    """
+    from ..settings import lib
+    from . import typeinfer
+
+    config: Dict[str, Any] = lib.settings.get_section('spreadsheet')
+    spreadsheet_id: Optional[str] = config.get('id', None)
+    if not spreadsheet_id:
+        raise status.SpreadsheetIdNotConfiguredException
+    worksheet_name: Optional[str] = config.get('worksheet', None)
+    if not worksheet_name:
+        raise status.SpreadsheetWorksheetNotConfiguredException
+
+    service: Any = _verify_sheet_access()
+    row_count, col_count = _query_sheet_size(service, spreadsheet_id, worksheet_name)
+    header: List[str] = metadata_cache.header(service, spreadsheet_id, worksheet_name, col_count)
+    if not header:
+        logging.warning(f'The remote sheet is empty!')
+        return {}
+
+    # Without a mapping, the first column tells where the data ends
+    last_row: int = _used_rows(
+        service, spreadsheet_id, worksheet_name, row_count, header, columns=_probe_columns(header) or [0]
+    )
+    with profiler.stage('service.infer_types') as s:
+        guesses = typeinfer.infer_types(
+            service, spreadsheet_id, worksheet_name, header, last_row,
+            sample_size=TYPE_SAMPLE_ROWS if sample_size is None else sample_size,
+            locale=lib.settings.snapshot.locale, refresh=refresh,
+        )
+        s.rows = max(last_row - 1, 0)
+    logging.debug(
+        f'Inferred header types: {", ".join(f"{k}={v.type} ({v.confidence:.0%})" for k, v in guesses.items())}.'
+    )
+    return guesses
+
+
+def infer_header_types(total_timeout: int = TOTAL_TIMEOUT, refresh: bool = False) -> Any:
+    """
+    Asynchronously infers the type of each remote column.
+
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: Finishes with a
+        :class:`~ExpenseTracker.core.typeinfer.TypeGuess` per header name.
+    """
+    return _start_operation(_infer_header_types, refresh=refresh, total_timeout=total_timeout,
+                            status_text='Detecting header types.')
 
 
 def _fetch_categories(
@@ -580,12 +1047,12 @@ def _fetch_categories(
     range_: str = f'{worksheet_name}!{column_letter}2:{column_letter}'
 
     logging.debug(f'Fetching categories from range "{range_}".')
-    batch_result: Dict[str, Any] = service.spreadsheets().values().batchGet(
+    batch_result: Dict[str, Any] = scheduler.execute(service.spreadsheets().values().batchGet(
         spreadsheetId=spreadsheet_id,
         ranges=[range_],
         valueRenderOption=value_render_option,
         fields='valueRanges(values)'
-    ).execute()
+    ))
 
     data_rows: List[List[Any]] = []
     for vr in batch_result.get('valueRanges', []):
@@ -603,82 +1070,93 @@ def _fetch_categories(
     return categories
 
 
-def fetch_categories(total_timeout: int = TOTAL_TIMEOUT) -> List[str]:
+def fetch_categories(total_timeout: int = TOTAL_TIMEOUT) -> Any:
     """
     Asynchronously fetches the unique list of categories.
+
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: Finishes with the sorted categories.
     """
-    return start_asynchronous(_fetch_categories, total_timeout=total_timeout, status_text='Fetching categories.')
+    return _start_operation(_fetch_categories, total_timeout=total_timeout, status_text='Fetching categories.')
+
+
+def _status_exception(err: BaseException) -> status.BaseStatusException:
+    """
+    Converts the error of a failed operation to a status exception.
+
+    Expired authentication also requests interactive authentication.
+    """
+    from ..ui.actions import signals
+
+    # Propagate known status exceptions directly
+    if isinstance(err, status.BaseStatusException):
+        return err
+
+    # If authentication expired, notify GUI and raise authentication exception
+    if isinstance(err, AuthExpiredError):
+        if signals:
+            signals.authenticationRequested.emit()
+        return status.AuthenticationExceptionException(str(err))
+
+    # Unknown errors
+    return status.UnknownException(str(err))
 
 
-def start_asynchronous(func: Callable[..., Any], *args: Any, total_timeout: int = TOTAL_TIMEOUT,
-                       status_text: str = 'Fetching data.', **kwargs: Any) -> Any:
+def run_asynchronous(func: Callable[..., Any], *args: Any, total_timeout: int = TOTAL_TIMEOUT,
+                     status_text: str = 'Fetching data.', settle_on_return: bool = False, **kwargs: Any) -> Any:
     """
-    Generic asynchronous operation wrapper.
+    Runs a blocking function on the task executor with a progress dialog, without waiting.
 
-    Creates and runs an AsyncWorker with a progress dialog and event loop.
+    Transient failures are retried, see :func:`_call_with_retries`. Cancelling the dialog or
+    reaching the timeout cancels the task; the thread is never terminated.
 
     Args:
         func: The blocking function to run.
         *args, **kwargs: Arguments passed to func.
         total_timeout (int): Total operation timeout.
         status_text (str): Label displayed in the progress dialog.
+        settle_on_return (bool): Settle the handle once the function returns, reporting its
+            outcome even if it was cancelled, see :class:`~ExpenseTracker.core.tasks.TaskHandle`.
 
     Returns:
-        The result of the function on success.
-
-    Raises:
-        Exception: If the operation is cancelled, times out, or an error occurs.
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: The handle of the running operation.
     """
+    from .tasks import executor
+
     dialog: SheetsFetchProgressDialog = SheetsFetchProgressDialog(
         total_timeout,
         status_text=status_text,
     )
-    worker: AsyncWorker = AsyncWorker(func, *args, **kwargs)
+    handle = executor.submit(_call_with_retries, func, *args, timeout=total_timeout,
+                             name=getattr(func, '__name__', None), settle_on_return=settle_on_return, **kwargs)
 
-    result: Dict[str, Any] = {'data': None, 'error': None}
-    loop: QtCore.QEventLoop = QtCore.QEventLoop()
+    dialog.cancelled.connect(handle.cancel)
+    handle.finished.connect(dialog.close)
+    handle.cancelled.connect(dialog.close)
+    handle.failed.connect(dialog.close)
 
-    worker.errorOccurred.connect(
-        lambda err: dialog.errorOccurred.emit(str(err)),
-        QtCore.Qt.QueuedConnection
-    )
-    worker.resultReady.connect(lambda d: (result.update({'data': d}), loop.quit()))
-    worker.errorOccurred.connect(lambda err: (result.update({'error': err}), loop.quit()))
-    dialog.cancelled.connect(lambda: loop.quit())
-
-    worker.start()
     dialog.open()
+    return handle
 
-    timer: QtCore.QTimer = QtCore.QTimer()
-    timer.setSingleShot(True)
-    timer.setInterval(total_timeout * 1000)
-    timer.timeout.connect(lambda: (dialog.countdown_timer.stop(), loop.quit()))
-    timer.start()
-    loop.exec()
-
-    if worker.isRunning():
-        worker.terminate()
-        worker.wait()
-        raise Exception('Operation cancelled or timed out.')
-    dialog.close()
-    if result['error']:
-        err = result['error']
-        from ..status import status
-        from ..ui.actions import signals
 
-        # Propagate known status exceptions directly
-        if isinstance(err, status.BaseStatusException):
-            raise err
+def _start_operation(func: Callable[..., Any], *args: Any, total_timeout: int = TOTAL_TIMEOUT,
+                     status_text: str = 'Fetching data.', **kwargs: Any) -> Any:
+    """
+    Runs an operation with :func:`run_asynchronous` and reports its failure as a status exception.
 
-        # If authentication expired, notify GUI and raise authentication exception
-        if isinstance(err, AuthExpiredError) or isinstance(err, status.AuthenticationExceptionException):
-            if signals:
-                signals.authenticationRequested.emit()
-            raise status.AuthenticationExceptionException(str(err))
+    Args:
+        func: The blocking function to run.
+        *args, **kwargs: Arguments passed to func.
+        total_timeout (int): Total operation timeout.
+        status_text (str): Label displayed in the progress dialog.
 
-        # Unknown errors
-        raise status.UnknownException(str(err))
-    return result['data']
+    Returns:
+        :class:`~ExpenseTracker.core.tasks.TaskHandle`: The handle of the running operation. Its
+        ``failed`` signal receives the original error.
+    """
+    handle = run_asynchronous(func, *args, total_timeout=total_timeout, status_text=status_text, **kwargs)
+    handle.failed.connect(_status_exception)
+    return handle
 
 
 # Reset cached Sheets API client when credentials/config change
@@ -689,10 +1167,13 @@ try:
     @QtCore.Slot(str)
     def _reset_cached_service(section: str) -> None:
         """Clear the cached Sheets client when client_secret changes."""
+        if section == 'spreadsheet':
+            metadata_cache.invalidate()
         if section == 'client_secret':
             logging.debug('Clearing cached Sheets service client due to client_secret change')
             global _cached_service
             _cached_service = None
+            metadata_cache.invalidate()
 
 
     signals.configSectionChanged.connect(_reset_cached_service)
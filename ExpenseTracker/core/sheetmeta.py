@@ -0,0 +1,200 @@
+"""Short-lived cache of spreadsheet metadata shared by the service and sync operations.
+
+Verifying access, querying the grid size and reading the header row each used to request the
+same metadata again. The module-level :data:`metadata_cache` keeps:
+
+- the worksheets of a spreadsheet with their grid sizes, from one ``spreadsheets().get``
+- the header row of a worksheet, from one ``values().batchGet``
+- the used range of a worksheet, the rows above its trailing blank grid rows, see
+  :meth:`SheetMetadataCache.used_range`
+
+Entries expire after :data:`DEFAULT_TTL` seconds and are tied to the service object that
+fetched them, so a new client (e.g. after re-authenticating) never reads another client's
+entries. User-initiated refreshes and commits call :meth:`SheetMetadataCache.invalidate` first
+and then share the fresh entries across all their steps.
+
+Example::
+
+    sheets = metadata_cache.sheets(service, spreadsheet_id)
+    header = metadata_cache.header(service, spreadsheet_id, 'Sheet1', sheets['Sheet1'].column_count)
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .scheduler import scheduler
+
+#: Seconds an entry stays valid
+DEFAULT_TTL: float = 30.0
+#: Rows of the first window read upwards by :meth:`SheetMetadataCache.used_range`, doubled for every further window
+PROBE_ROWS: int = 1000
+
+SHEETS_FIELDS = 'sheets(properties(title,gridProperties(rowCount,columnCount)))'
+
+
+@dataclass(frozen=True)
+class SheetProperties:
+    """Title and grid size of a worksheet."""
+    title: str
+    row_count: int
+    column_count: int
+
+
+@dataclass(frozen=True)
+class UsedRange:
+    """Extent of the data of a worksheet.
+
+    Attributes:
+        last_row: Last row with a value in the probed columns, 1-based, 0 if they are empty.
+        grid_rows: Rows of the grid, including blank ones.
+    """
+    last_row: int
+    grid_rows: int
+
+    @property
+    def skipped(self) -> int:
+        """Number of blank grid rows below the data."""
+        return max(self.grid_rows - self.last_row, 0)
+
+
+class SheetMetadataCache:
+    """Thread-safe TTL cache of worksheet properties and header rows.
+
+    Args:
+        ttl: Seconds an entry stays valid.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expires, service, value)
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[float, Any, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: Tuple[Hashable, ...], service: Any, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] is service and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        value = load()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, service, value)
+        return value
+
+    def sheets(self, service: Any, spreadsheet_id: str) -> Dict[str, SheetProperties]:
+        """Return the worksheets of a spreadsheet keyed by title.
+
+        Raises:
+            HttpError: If the request fails. Failures are not cached.
+        """
+
+        def load() -> Dict[str, SheetProperties]:
+            logging.debug(f'Requesting worksheet properties of "{spreadsheet_id}".')
+            result = scheduler.execute(service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=SHEETS_FIELDS))
+            sheets: Dict[str, SheetProperties] = {}
+            for sheet in (result or {}).get('sheets', []):
+                props = sheet.get('properties', {})
+                grid = props.get('gridProperties', {})
+                title = props.get('title', '')
+                sheets[title] = SheetProperties(title, grid.get('rowCount', 0), grid.get('columnCount', 0))
+            return sheets
+
+        return self._get(('sheets', spreadsheet_id), service, load)
+
+    def header(self, service: Any, spreadsheet_id: str, worksheet: str, column_count: int,
+               value_render_option: str = 'UNFORMATTED_VALUE') -> List[str]:
+        """Return the first row of a worksheet as strings, or an empty list if it is empty.
+
+        Raises:
+            HttpError: If the request fails. Failures are not cached.
+        """
+        if column_count <= 0:
+            return []
+
+        def load() -> List[str]:
+            from .sync import idx_to_col
+            range_ = f'{worksheet}!A1:{idx_to_col(column_count - 1)}1'
+            logging.debug(f'Requesting header row "{range_}".')
+            result = scheduler.execute(service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=[range_],
+                valueRenderOption=value_render_option,
+                fields='valueRanges(values)',
+            ))
+            value_ranges = result.get('valueRanges', [])
+            rows = value_ranges[0].get('values', []) if value_ranges else []
+            return [str(v) for v in rows[0]] if rows and rows[0] else []
+
+        key = ('header', spreadsheet_id, worksheet, column_count, value_render_option)
+        return list(self._get(key, service, load))
+
+    def used_range(self, service: Any, spreadsheet_id: str, worksheet: str, grid_rows: int,
+                   columns: Sequence[int], hint: Optional[int] = None) -> UsedRange:
+        """Return the last row with a value in any of ``columns``.
+
+        Responses omit trailing empty cells, so reading a column returns only its cells down to
+        the last value. With a ``hint``, usually the last row of the previous fetch, only the
+        cells from that row down are read, which is a few rows at most. Otherwise, or if they are
+        all empty because rows were deleted, windows of :data:`PROBE_ROWS` rows, doubling in
+        size, are read upwards from the bottom until one has a value. Only the cells from the
+        top of that window down to the last value are downloaded, not the columns in full.
+
+        Args:
+            service: The Sheets API resource.
+            spreadsheet_id: Spreadsheet ID.
+            worksheet: Worksheet title.
+            grid_rows: Rows of the grid.
+            columns: 0-based indexes of columns every data row has a value in.
+            hint: A row likely to be the last one with a value, 1-based.
+
+        Raises:
+            HttpError: If the request fails. Failures are not cached.
+        """
+        if not columns or grid_rows <= 0:
+            return UsedRange(grid_rows, grid_rows)
+
+        def read(first_row: int, last_row: int) -> int:
+            from .sync import idx_to_col
+            letters = [idx_to_col(c) for c in columns]
+            logging.debug(f'Probing rows {first_row}-{last_row} of "{worksheet}" for values.')
+            result = scheduler.execute(service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=[f'{worksheet}!{c}{first_row}:{c}{last_row}' for c in letters],
+                valueRenderOption='UNFORMATTED_VALUE',
+                majorDimension='COLUMNS',
+                fields='valueRanges(values)',
+            ))
+            lengths = [len(vr.get('values', [[]])[0]) for vr in result.get('valueRanges', []) if vr.get('values')]
+            return first_row - 1 + max(lengths) if lengths else 0
+
+        def load() -> UsedRange:
+            last_row, bottom = 0, grid_rows
+            if hint and 1 < hint <= grid_rows:
+                last_row, bottom = read(hint, grid_rows), hint - 1
+            size = PROBE_ROWS
+            while not last_row and bottom >= 1:
+                top = max(bottom - size + 1, 1)
+                last_row = read(top, bottom)
+                bottom, size = top - 1, size * 2
+            return UsedRange(last_row, grid_rows)
+
+        key = ('used', spreadsheet_id, worksheet, grid_rows, tuple(columns))
+        return self._get(key, service, load)
+
+    def invalidate(self, spreadsheet_id: Optional[str] = None) -> None:
+        """Discard the entries of a spreadsheet, or all entries if no id is given."""
+        with self._lock:
+            if spreadsheet_id is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[1] == spreadsheet_id]:
+                del self._entries[key]
+
+
+metadata_cache = SheetMetadataCache()
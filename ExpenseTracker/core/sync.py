@@ -5,6 +5,10 @@ re-fetch the sheet data for stable key fields (date, amount, description), match
 rows exactly, and if all still match, send a single batchUpdate. Ambiguities or
 mismatches abort.
 
+The rows of the edits are first looked up in the persistent row index, see
+:mod:`ExpenseTracker.core.rowindex`, and only those rows are re-fetched. The stable
+key columns are fetched in full only if a row no longer holds its key.
+
 Stable key fields:
 - date: mapped to date-like columns (supports Google Sheets serial dates)
 - amount: mapped to numeric columns
@@ -17,17 +21,26 @@ import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple, Optional
 
+import numpy as np
 from PySide6 import QtCore
 from googleapiclient.errors import HttpError
 
-from .database import DatabaseAPI, google_serial_date_to_iso
+from . import profiler
+from . import rowindex
+from .database import DatabaseAPI, FINGERPRINT_ROWS
 from .service import (
     _verify_sheet_access,
     _query_sheet_size,
-    start_asynchronous,
-    TOTAL_TIMEOUT,  # Implicitly used by start_asynchronous
+    _refresh_fingerprint,
+    _used_rows,
+    run_asynchronous,
+    TOTAL_TIMEOUT,
     _verify_mapping,
 )
+from .scheduler import scheduler
+from .sheetmeta import metadata_cache
+from .tasks import TaskHandle, uncancellable
+from ..status.status import OperationCancelledException
 from ..settings import lib
 from ..settings.lib import parse_merge_mapping
 
@@ -65,13 +78,14 @@ class SyncAPI(QtCore.QObject):
     when committing these edits to a Google Sheet. It ensures data integrity by
     re-fetching key data before an update.
     """
-    commitFinished = QtCore.Signal(dict)  # Emits Dict[(local_id, column), (success, message)]
+    commitFinished = QtCore.Signal(object)  # Emits Dict[(local_id, column), (success, message)]
     dataUpdated = QtCore.Signal(list)  # Emits List[EditOperation] of successfully committed ops
     queueChanged = QtCore.Signal(int)  # Emits current queue size
 
     def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(parent)
         self._queue: List[EditOperation] = []
+        self._commit: Optional[TaskHandle] = None
         self._parsed_mapping: Dict[str, List[str]] = {}  # Cache for parsed column mappings
         self._connect_signals()
 
@@ -152,6 +166,10 @@ class SyncAPI(QtCore.QObject):
         """
         return list(self._queue)
 
+    def is_committing(self) -> bool:
+        """Return True if a commit started by :meth:`commit_queue_async` is still running."""
+        return self._commit is not None and not self._commit.settled
+
     def clear_queue(self) -> None:
         """Discard all pending edits from the queue.
 
@@ -185,6 +203,8 @@ class SyncAPI(QtCore.QObject):
             return results
 
         logging.info(f'Starting commit of {len(self._queue)} queued edit(s)')
+        # The optimistic lock relies on the current sheet size and header
+        metadata_cache.invalidate(self.sheet_id)
         try:
             service = _verify_sheet_access()
             row_count, col_count = _query_sheet_size(
@@ -215,22 +235,31 @@ class SyncAPI(QtCore.QObject):
 
             _verify_mapping(remote_headers=headers)  # Verifies current settings mapping against remote
             header_to_idx = {h: i for i, h in enumerate(headers)}
+            # Blank grid rows can't match an edit
+            row_count = _used_rows(service, self.sheet_id, self.worksheet, row_count, headers)
+            data_rows = max(row_count - 1, 0)
 
             stable_fields = self._determine_stable_fields(headers)
             stable_map = self._build_stable_headers_map(headers, stable_fields)
 
-            col_vals_map = self._fetch_stable_data(
-                service, stable_map, header_to_idx, row_count, data_rows
-            )
-            remote_rows = self._assemble_remote_rows(
-                col_vals_map, data_rows  # stable_fields argument removed
-            )
-            remote_index_map = self._build_remote_index_map(
-                remote_rows, stable_fields
-            )
-            to_update = self._match_operations(
-                remote_index_map, stable_fields, results
+            # Read back only the target rows if the row index still locates them
+            to_update = self._match_indexed_rows(
+                service, stable_fields, stable_map, header_to_idx, row_count
             )
+            if to_update is None:
+                col_vals_map = self._fetch_stable_data(
+                    service, stable_map, header_to_idx, row_count, data_rows
+                )
+                key_cols = rowindex.key_columns(col_vals_map, stable_fields)
+                hashes = rowindex.hash_keys(key_cols, data_rows)
+                empty = rowindex.empty_keys(key_cols, data_rows)
+                self._rebuild_row_index(hashes, empty)
+                remote_index_map = self._join_remote_keys(
+                    col_vals_map, stable_fields, hashes, empty
+                )
+                to_update = self._match_operations(
+                    remote_index_map, stable_fields, results
+                )
 
             if not to_update:
                 failed_count = sum(1 for success, _ in results.values() if not success)
@@ -241,9 +270,15 @@ class SyncAPI(QtCore.QObject):
                 return results
 
             payload = self._build_update_payload(to_update, header_to_idx)
-            service.spreadsheets().values().batchUpdate(
+            # The last chance to cancel is right before sending, the edits are then kept queued.
+            # Once sent, the commit runs to the end whether or not it was cancelled meanwhile.
+            scheduler.execute(service.spreadsheets().values().batchUpdate(
                 spreadsheetId=self.sheet_id, body=payload
-            ).execute()
+            ))
+            with uncancellable():
+                metadata_cache.invalidate(self.sheet_id)
+                self._forget_edited_keys(to_update, stable_map)
+                self._refresh_fingerprint(service, to_update, col_count)
             logging.info(
                 f'Successfully pushed {len(to_update)} edit(s) to remote sheet.'
             )
@@ -273,6 +308,8 @@ class SyncAPI(QtCore.QObject):
                 results[(op.local_id, op.column)] = (False, f'Configuration error: {ve}')
             self.clear_queue()
             return results
+        except OperationCancelledException:
+            raise
         except Exception:  # Catch-all for other unexpected errors
             logging.exception('Batch update failed for queued edits due to an unexpected error.')
             for op in self._queue:  # Mark all ops as failed
@@ -289,33 +326,45 @@ class SyncAPI(QtCore.QObject):
         return results
 
     @QtCore.Slot()
-    def commit_queue_async(self) -> None:
-        """Run commit_queue in a QThread and emit commitFinished when done.
+    def commit_queue_async(self) -> Optional[TaskHandle]:
+        """Run commit_queue on the task executor and emit commitFinished when done.
+
+        Cancelling the operation before the edits are sent keeps them queued and reports them
+        as failed. Once sent, the commit runs to the end and reports its results, so the
+        handle only settles when commit_queue returns.
 
         Returns:
-            None
+            Optional[TaskHandle]: The handle of the commit, or None if the queue is empty.
         """
         if not self._queue:
             logging.info('Async commit requested, but queue is empty. Nothing to do.')
             self.commitFinished.emit({})  # Emit empty results
-            return
+            return None
 
         logging.debug('Starting asynchronous commit_queue')
-        # start_asynchronous is expected to handle the actual threading and error reporting
-        result = start_asynchronous(
+        # The worker owns the queue until it returns
+        ops = list(self._queue)
+        handle = run_asynchronous(
             self.commit_queue,
-            total_timeout=TOTAL_TIMEOUT,  # This constant comes from .service
+            total_timeout=TOTAL_TIMEOUT,
             status_text='Syncing edits...',
+            settle_on_return=True,
         )
-        # Note: The result from start_asynchronous might be None if it has its own signalling.
-        # Assuming it returns the direct result for now.
-        # If start_asynchronous emits its own signal, this signal emit might be redundant
-        # or should be connected to start_asynchronous's completion signal.
-        # For this review, assuming current structure is intended.
-        logging.debug(
-            f'Asynchronous commit_queue task created/completed. Emitting commitFinished.'
-        )
-        self.commitFinished.emit(result if result is not None else {})
+
+        @QtCore.Slot(str)
+        def on_cancelled(reason: str) -> None:
+            self.commitFinished.emit({(op.local_id, op.column): (False, reason) for op in ops})
+
+        @QtCore.Slot(object)
+        def on_failed(ex: Exception) -> None:
+            logging.error(f'Commit failed: {ex}')
+            self.commitFinished.emit({(op.local_id, op.column): (False, str(ex)) for op in ops})
+
+        handle.finished.connect(lambda result: self.commitFinished.emit(result if result is not None else {}))
+        handle.cancelled.connect(on_cancelled)
+        handle.failed.connect(on_failed)
+        self._commit = handle
+        return handle
 
     def _get_parsed_mapping(self, key: str) -> List[str]:
         """Get and cache parsed mapping specification for a logical key.
@@ -328,8 +377,7 @@ class SyncAPI(QtCore.QObject):
                        Returns an empty list if the key is not found or mapping is empty.
         """
         if key not in self._parsed_mapping:
-            raw_spec = lib.settings.get_section('mapping').get(key, '')
-            self._parsed_mapping[key] = parse_merge_mapping(raw_spec)
+            self._parsed_mapping[key] = list(lib.settings.snapshot.mapping_plan.sources(key))
         return self._parsed_mapping[key]
 
     def _get_local_stable_keys(self, row: Dict[str, Any]) -> Dict[str, Tuple[Any, ...]]:
@@ -405,30 +453,17 @@ class SyncAPI(QtCore.QObject):
         Returns:
             List[str]: A list of header strings. Returns empty list if headers can't be fetched.
         """
-        if col_count == 0:
-            return []
-        last_col_letter = idx_to_col(col_count - 1)
-        header_range = f'{self.worksheet}!A1:{last_col_letter}1'
-        logging.debug(f'Fetching remote headers from range: {header_range}')
         try:
-            batch_get_result = service.spreadsheets().values().batchGet(
-                spreadsheetId=self.sheet_id,
-                ranges=[header_range],
-                valueRenderOption='UNFORMATTED_VALUE',  # Get raw values
-                fields='valueRanges(values)',
-            ).execute()
+            headers = metadata_cache.header(service, self.sheet_id, self.worksheet, col_count)
         except HttpError as e:
             logging.error(f'HttpError fetching headers: {e}')
             return []
 
-        value_ranges = batch_get_result.get('valueRanges', [])
-        if value_ranges and value_ranges[0].get('values'):
-            # Headers are expected to be in the first (and only) row of the first valueRange
-            headers = [str(cell_value) for cell_value in value_ranges[0]['values'][0]]
+        if not headers and col_count:
+            logging.warning('No header data found in remote sheet response.')
+        else:
             logging.debug(f'Fetched headers: {headers}')
-            return headers
-        logging.warning('No header data found in remote sheet response.')
-        return []
+        return headers
 
     def _determine_stable_fields(self, remote_headers: List[str]) -> List[str]:
         """Determine logical stable fields to use based on remote headers.
@@ -550,13 +585,13 @@ class SyncAPI(QtCore.QObject):
             return {}
 
         logging.debug(f'Fetching stable data from ranges: {ranges_to_fetch}')
-        batch_get_result = service.spreadsheets().values().batchGet(
+        batch_get_result = scheduler.execute(service.spreadsheets().values().batchGet(
             spreadsheetId=self.sheet_id,
             ranges=ranges_to_fetch,
             valueRenderOption='UNFORMATTED_VALUE',  # Get raw, unformatted values
             dateTimeRenderOption='SERIAL_NUMBER',  # Get dates as serial numbers
             fields='valueRanges(values)',
-        ).execute()
+        ))
 
         value_ranges_response = batch_get_result.get('valueRanges', [])
         column_values_map: Dict[Tuple[str, str], List[Any]] = {}
@@ -570,115 +605,10 @@ class SyncAPI(QtCore.QObject):
             # Ensure the list has `data_row_count` elements, padding with None if necessary
             flattened_values.extend([None] * (data_row_count - len(flattened_values)))
 
-            normalized_values: List[Any] = []
-            for v in flattened_values:
-                normalized_v = v  # Default to original value
-                if v is not None:  # Perform normalization only on non-None values
-                    if logical_field == 'date':
-                        try:
-                            normalized_v = google_serial_date_to_iso(float(v))
-                        except (ValueError, TypeError):  # If v is not a floatable string or number
-                            normalized_v = str(v) if v is not None else ''  # Fallback to string or empty
-                    elif logical_field == 'amount':
-                        try:
-                            normalized_v = round(float(v), 2)
-                        except (ValueError, TypeError):
-                            normalized_v = str(v) if v is not None else ''
-                    elif logical_field == 'id':
-                        try:
-                            normalized_v = int(float(v))  # ID often numeric, but allow float parsing
-                        except (ValueError, TypeError):
-                            normalized_v = str(v).strip() if isinstance(v, str) else str(v)
-                    else:  # Typically description or other text fields
-                        if isinstance(v, str):
-                            normalized_v = v.strip()
-                        else:  # Non-string, non-None values converted to string
-                            normalized_v = str(v)
-                else:  # v is None
-                    if logical_field in ('date', 'amount', 'id'):
-                        normalized_v = None  # Keep None for key numeric/date fields
-                    else:  # Description etc.
-                        normalized_v = ''  # Convert None to empty string for text fields for consistency
-                normalized_values.append(normalized_v)
+            normalized_values = rowindex.normalize_values(logical_field, flattened_values)
             column_values_map[(logical_field, actual_header)] = normalized_values
         return column_values_map
 
-    def _assemble_remote_rows(
-            self,
-            column_values_map: Dict[Tuple[str, str], List[Any]],  # (log. field, act. header) -> [values]
-            data_row_count: int,
-    ) -> List[Dict[str, Any]]:  # Returns List[Dict[logical_field_name, Tuple[values...]]]
-        """Build list of remote rows, keyed by logical stable fields.
-
-        Each row dictionary maps a logical stable field name to a tuple of its values
-        (since one logical field can map to multiple actual headers).
-
-        Args:
-            column_values_map: Mapping from (logical_field, actual_header) to its list of values.
-            data_row_count: Number of data rows in the sheet.
-
-        Returns:
-            List[Dict[str, Any]]: A list of dictionaries, where each dictionary represents a remote row.
-                                  Each row maps logical field names to a tuple of their values.
-        """
-        remote_rows_data: List[Dict[str, Any]] = []
-        # Group actual headers by their logical field name
-        headers_grouped_by_logical: Dict[str, List[str]] = {}
-        for logical_field, actual_header in column_values_map.keys():
-            headers_grouped_by_logical.setdefault(logical_field, []).append(actual_header)
-
-        # Sort actual_headers within each logical group to ensure consistent tuple order
-        for logical_field in headers_grouped_by_logical:
-            headers_grouped_by_logical[logical_field].sort()
-
-        for i in range(data_row_count):  # Iterate through each row index
-            row_entry: Dict[str, Any] = {}
-            for logical_field, actual_headers_list in headers_grouped_by_logical.items():
-                # For each logical field, collect values from its mapped actual headers for the current row
-                # Ensure actual_headers_list is sorted for consistent tuple creation if order matters
-                # (already sorted above)
-                value_tuple = tuple(column_values_map[(logical_field, h)][i] for h in actual_headers_list)
-                row_entry[logical_field] = value_tuple
-            remote_rows_data.append(row_entry)
-        return remote_rows_data
-
-    def _build_remote_index_map(
-            self,
-            remote_rows_data: List[Dict[str, Any]],  # List of {log. field: (values...)}
-            logical_stable_fields: List[str],  # e.g. ['id'] or ['date', 'amount', 'description']
-    ) -> Dict[Tuple[Any, ...], List[int]]:
-        """Create an index map from stable-key tuples to remote row indices.
-
-        The key for the map is a tuple of value-tuples, ordered by `logical_stable_fields`.
-        Example key: `( (date_val1, date_val2), (amount_val1,), (desc_val1,) )`
-
-        Args:
-            remote_rows_data: List of remote row dictionaries (from _assemble_remote_rows).
-            logical_stable_fields: Ordered list of logical stable field names to form the key.
-
-        Returns:
-            Dict[Tuple[Any, ...], List[int]]:
-                Mapping from a composite stable key tuple to a list of 0-based data row indices
-                that match this key.
-        """
-        index_map: Dict[Tuple[Any, ...], List[int]] = {}
-        for remote_data_idx, row_dict in enumerate(remote_rows_data):
-            # Construct the key tuple using values for fields specified in logical_stable_fields, in that order.
-            # Each element of this key_tuple is itself a tuple of values (from row_dict[field]).
-            key_tuple = tuple(row_dict.get(field) for field in logical_stable_fields)
-
-            # Heuristic: skip rows where all components of the stable key are None or empty tuples.
-            # This helps avoid matching genuinely empty rows or rows with all key fields blank.
-            if all(
-                    (v_tuple is None) or
-                    (isinstance(v_tuple, tuple) and all(elem is None or elem == '' for elem in v_tuple))
-                    for v_tuple in key_tuple
-            ):
-                continue  # Skip this row as its stable key is considered "empty"
-
-            index_map.setdefault(key_tuple, []).append(remote_data_idx)
-        return index_map
-
     def _match_operations(
             self,
             remote_index_map: Dict[Tuple[Any, ...], List[int]],
@@ -737,6 +667,208 @@ class SyncAPI(QtCore.QObject):
                 logging.warning(f'Op ({op.local_id}, {op.column}) failed: no matching row. Key: {op_key_tuple}')
         return to_update
 
+    def _match_indexed_rows(
+            self,
+            service: Any,
+            logical_stable_fields: List[str],
+            stable_map: Dict[str, List[str]],
+            header_to_idx: Dict[str, int],
+            total_row_count: int,
+    ) -> Optional[List[Tuple[EditOperation, int]]]:
+        """Locate the queued edits with the persistent row index and verify only their rows.
+
+        The sheet rows are looked up by the fingerprint of each edit's stable key, then read
+        back with a single ``batchGet`` and compared to the keys of the edits.
+
+        Args:
+            service: Authorized Google Sheets API service instance.
+            logical_stable_fields: Ordered list of logical fields used for matching.
+            stable_map: Mapping from logical stable field to list of its actual remote header names.
+            header_to_idx: Mapping from actual remote header name to its zero-based column index.
+            total_row_count: Total number of used rows in the sheet, including the header.
+
+        Returns:
+            The edits and their 1-based sheet row numbers, as returned by `_match_operations`,
+            or None if an edit isn't indexed, is ambiguous or its row no longer holds its key.
+            The stable columns must then be fetched in full.
+        """
+        op_keys = [tuple(op.stable_keys.get(field) for field in logical_stable_fields) for op in self._queue]
+        try:
+            rows_by_fingerprint = DatabaseAPI.lookup_row_index(rowindex.fingerprint(k) for k in op_keys)
+        except Exception as ex:
+            logging.debug(f'Row index lookup failed: {ex}')
+            return None
+
+        index_map = {
+            key: [r - 2 for r in rows_by_fingerprint.get(rowindex.fingerprint(key), []) if r <= total_row_count]
+            for key in op_keys
+        }
+        misses: Dict[Tuple[int, str], Tuple[bool, str]] = {}
+        to_update = self._match_operations(index_map, logical_stable_fields, misses)
+        sheet_rows = sorted({row for _, row in to_update})
+        if misses or len(sheet_rows) > rowindex.MAX_VERIFY_ROWS:
+            logging.debug(f'Row index located {len(to_update)} of {len(self._queue)} edit(s), fetching stable columns.')
+            return None
+
+        with profiler.stage('sync.verify_rows', rows=len(sheet_rows)):
+            remote_keys = self._fetch_stable_rows(service, stable_map, header_to_idx, sheet_rows,
+                                                  logical_stable_fields)
+        for (op, row), key in zip(to_update, op_keys):
+            if remote_keys.get(row) != key:
+                logging.debug(f'Sheet row {row} no longer holds the key of op ({op.local_id}, {op.column}).')
+                return None
+
+        logging.debug(f'Verified {len(sheet_rows)} indexed row(s) for {len(to_update)} edit(s).')
+        return to_update
+
+    def _fetch_stable_rows(
+            self,
+            service: Any,
+            stable_map: Dict[str, List[str]],
+            header_to_idx: Dict[str, int],
+            sheet_rows: List[int],
+            logical_stable_fields: List[str],
+    ) -> Dict[int, Tuple[Any, ...]]:
+        """Fetch and normalize the stable keys of the given sheet rows.
+
+        Args:
+            service: Authorized Google Sheets API service instance.
+            stable_map: Mapping from logical stable field to list of its actual remote header names.
+            header_to_idx: Mapping from actual remote header name to its zero-based column index.
+            sheet_rows: 1-based sheet row numbers.
+            logical_stable_fields: Ordered list of logical fields forming the key.
+
+        Returns:
+            Dict[int, Tuple[Any, ...]]: The stable key of each sheet row.
+        """
+        indices = [header_to_idx[h] for headers in stable_map.values() for h in headers]
+        if not sheet_rows or not indices:
+            return {}
+        first_col, last_col = min(indices), max(indices)
+        span = f'{idx_to_col(first_col)}{{row}}:{idx_to_col(last_col)}{{row}}'
+
+        batch_get_result = scheduler.execute(service.spreadsheets().values().batchGet(
+            spreadsheetId=self.sheet_id,
+            ranges=[f'{self.worksheet}!{span.format(row=row)}' for row in sheet_rows],
+            valueRenderOption='UNFORMATTED_VALUE',
+            dateTimeRenderOption='SERIAL_NUMBER',
+            fields='valueRanges(values)',
+        ))
+        value_ranges = batch_get_result.get('valueRanges', [])
+        row_values = [
+            (value_ranges[i].get('values') or [[]])[0] if i < len(value_ranges) else []
+            for i in range(len(sheet_rows))
+        ]
+
+        column_values_map: Dict[Tuple[str, str], List[Any]] = {}
+        for logical_field, actual_headers in stable_map.items():
+            for actual_header in actual_headers:
+                offset = header_to_idx[actual_header] - first_col
+                column_values_map[(logical_field, actual_header)] = rowindex.normalize_values(
+                    logical_field, [values[offset] if offset < len(values) else None for values in row_values]
+                )
+        keys = rowindex.row_keys(column_values_map, logical_stable_fields, len(sheet_rows))
+        return dict(zip(sheet_rows, keys))
+
+    def _rebuild_row_index(self, hashes: Any, empty: Any) -> None:
+        """Replace the persistent row index with the stable keys fetched in full.
+
+        Args:
+            hashes: The hash of each data row's stable key, see `rowindex.hash_keys`.
+            empty: Mask of the data rows with an empty stable key.
+        """
+        try:
+            DatabaseAPI.set_row_index(rowindex.entries(hashes, empty))
+        except Exception as ex:
+            logging.debug(f'Failed to rebuild the row index: {ex}')
+
+    def _join_remote_keys(
+            self,
+            column_values_map: Dict[Tuple[str, str], List[Any]],  # (log. field, act. header) -> [values]
+            logical_stable_fields: List[str],
+            hashes: Any,
+            empty: Any,
+    ) -> Dict[Tuple[Any, ...], List[int]]:
+        """Hash-join the stable keys of the queued edits with the remote rows.
+
+        The remote rows are sorted by the int64 hash of their key and each edit's key is looked
+        up with a binary search. Rows whose hash matches are compared to the key, so the result
+        is the same as a full index of the remote keys restricted to the keys of the queue.
+
+        Args:
+            column_values_map: Mapping from (logical_field, actual_header) to its list of values.
+            logical_stable_fields: Ordered list of logical stable field names forming the key.
+            hashes: The hash of each data row's stable key, see `rowindex.hash_keys`.
+            empty: Mask of the data rows with an empty stable key, which never match.
+
+        Returns:
+            Dict[Tuple[Any, ...], List[int]]:
+                Mapping from the composite stable key of each queued edit to the ascending
+                0-based data row indices holding it. Keys without a match are left out.
+        """
+        op_keys = list(dict.fromkeys(
+            tuple(op.stable_keys.get(field) for field in logical_stable_fields) for op in self._queue
+        ))
+        if not op_keys:
+            return {}
+
+        rows = np.flatnonzero(~empty)
+        rows = rows[np.argsort(hashes[rows], kind='stable')]
+        sorted_hashes = hashes[rows]
+        probes = np.array([rowindex.fingerprint(key) for key in op_keys], dtype=np.int64)
+        starts = np.searchsorted(sorted_hashes, probes, side='left')
+        ends = np.searchsorted(sorted_hashes, probes, side='right')
+
+        headers = rowindex.key_headers(column_values_map)
+
+        def remote_key(idx: int) -> Tuple[Any, ...]:
+            return tuple(
+                tuple(column_values_map[(field, h)][idx] for h in headers[field]) if field in headers else None
+                for field in logical_stable_fields
+            )
+
+        index_map: Dict[Tuple[Any, ...], List[int]] = {}
+        for key, start, end in zip(op_keys, starts.tolist(), ends.tolist()):
+            # The stable sort keeps rows of equal hashes in ascending order
+            matches = [idx for idx in rows[start:end].tolist() if remote_key(idx) == key]
+            if matches:
+                index_map[key] = matches
+        return index_map
+
+    def _forget_edited_keys(
+            self,
+            updated_ops: List[Tuple[EditOperation, int]],
+            stable_map: Dict[str, List[str]],
+    ) -> None:
+        """Drop the row index entries of rows whose stable key was edited."""
+        stable_headers = {h for headers in stable_map.values() for h in headers}
+        rows = {
+            row for op, row in updated_ops
+            if op.column in stable_map or stable_headers.intersection(self._get_parsed_mapping(op.column))
+        }
+        if not rows:
+            return
+        try:
+            DatabaseAPI.remove_row_index(rows)
+        except Exception as ex:
+            logging.debug(f'Failed to update the row index: {ex}')
+
+    def _refresh_fingerprint(
+            self,
+            service: Any,
+            updated_ops: List[Tuple[EditOperation, int]],
+            col_count: int,
+    ) -> None:
+        """Store the fingerprint of the cached tail again if an edit landed in it."""
+        cached_rows, _ = DatabaseAPI.get_fetch_state()
+        tail_start = max(2, cached_rows + 2 - FINGERPRINT_ROWS)
+        if not any(tail_start <= row <= cached_rows + 1 for _, row in updated_ops):
+            return
+        try:
+            _refresh_fingerprint(service, self.sheet_id, self.worksheet, col_count)
+        except Exception as ex:
+            logging.warning(f'Failed to update the fingerprint of the cached rows: {ex}')
+
     def _build_update_payload(
             self,
             to_update: List[Tuple[EditOperation, int]],  # (EditOperation, 1-based_sheet_row_number)
@@ -0,0 +1,358 @@
+"""Thread-pool task executor with cooperative cancellation.
+
+:data:`executor` runs blocking operations, such as fetching the ledger or committing edits,
+on a shared thread pool, so several operations can run at the same time. Each submitted task
+gets:
+
+- a :class:`CancellationToken`, available to the task as :func:`current_token`
+- a :class:`TaskHandle` wrapping its :class:`concurrent.futures.Future`, with Qt signals
+  delivered on the thread that submitted the task
+
+Coroutines run on the executor's event loop, a daemon thread started on first use, with
+:meth:`TaskExecutor.submit_async`. They get the same :class:`TaskHandle`; cancelling it
+cancels the coroutine at its next ``await``. Tasks wait for a coroutine with
+:meth:`TaskExecutor.run_async`, which cancels it along with the task.
+
+Threads are never terminated. Cancelling a task, or reaching its timeout, sets its token and
+settles the handle with ``cancelled`` right away. The task itself stops at the next
+:func:`check_cancelled` in its loops, and its result is discarded. Tasks check the token
+before anything that can't be undone, like writing to the spreadsheet. Writing to the cache
+is left to the receiver of ``finished``.
+
+Tasks that write themselves, like committing edits, are submitted with
+``settle_on_return=True``. Their handle settles once the task returns and reports what it
+did: ``finished`` if it completed despite the cancellation, having passed the point of no
+return, and ``cancelled`` only if it stopped. Code past that point runs in
+:func:`uncancellable`.
+
+Example::
+
+    handle = executor.submit(service._fetch_data, timeout=180)
+    handle.finished.connect(on_data)
+    handle.failed.connect(on_error)
+    cancel_button.clicked.connect(handle.cancel)
+"""
+import asyncio
+import concurrent.futures
+import contextlib
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Iterator, Optional, Set
+
+from PySide6 import QtCore
+
+from ..status import status
+
+#: Default number of tasks running at the same time
+DEFAULT_WORKERS: int = 4
+#: Seconds between checks of the cancellation token while waiting for a coroutine
+POLL_INTERVAL: float = 0.05
+
+_local = threading.local()
+
+
+class TaskCancelled(status.OperationCancelledException):
+    """Raised inside a task when its token is cancelled.
+
+    Cancelling is routine, so unlike other status exceptions this one is only logged at debug
+    level and is not reported through ``signals.error``. :meth:`TaskHandle.result` raises a
+    regular :class:`~ExpenseTracker.status.status.OperationCancelledException` in its place.
+    """
+
+    def __init__(self, message: str = None):
+        self.status_message = status.get_message(self.status)
+        exception_message = f'{self.status_message} {message}' if message else self.status_message
+        Exception.__init__(self, exception_message)
+        logging.debug(exception_message)
+
+
+class CancellationToken:
+    """Thread-safe flag requesting a task to stop."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.reason = ''
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = 'Operation cancelled.') -> None:
+        """Request the task to stop. Only the first reason is kept."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise :class:`TaskCancelled` if cancelled."""
+        if self._event.is_set():
+            raise TaskCancelled(self.reason)
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep for up to ``seconds``, waking early on cancellation. Returns True if cancelled."""
+        return self._event.wait(seconds)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Return the token of the task running on this thread, or None outside of a task."""
+    return getattr(_local, 'token', None)
+
+
+def check_cancelled() -> None:
+    """Raise if the task running on this thread was cancelled. Does nothing outside of a task."""
+    token = current_token()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+@contextlib.contextmanager
+def uncancellable() -> Iterator[None]:
+    """Hide the token of the running task, for work that must complete once started.
+
+    Inside the block :func:`current_token` returns None, so :func:`check_cancelled` and
+    cancellable waits ignore the cancellation. The task's handle should be submitted with
+    ``settle_on_return=True`` to report the outcome.
+    """
+    token = current_token()
+    _local.token = None
+    try:
+        yield
+    finally:
+        _local.token = token
+
+
+class TaskHandle(QtCore.QObject):
+    """Handle of a submitted task.
+
+    Exactly one of the signals is emitted, on the thread the handle was created on. By default
+    cancelling emits ``cancelled`` right away; with ``settle_on_return`` the handle waits for
+    the task to return and emits ``finished`` if it completed anyway.
+
+    Signals:
+        finished (object): The task returned a result.
+        failed (object): The task raised an exception.
+        cancelled (str): The task was cancelled or timed out, with the reason.
+    """
+    finished = QtCore.Signal(object)
+    failed = QtCore.Signal(object)
+    cancelled = QtCore.Signal(str)
+
+    _settle = QtCore.Signal()
+
+    def __init__(self, future: concurrent.futures.Future, token: CancellationToken, name: str,
+                 on_settled: Optional[Callable[['TaskHandle'], None]] = None,
+                 settle_on_return: bool = False) -> None:
+        super().__init__()
+        self.future = future
+        self.token = token
+        self.name = name
+        self.settle_on_return = settle_on_return
+        self._on_settled = on_settled
+        self._lock = threading.Lock()
+        self._settled = False
+        # Queued, so signals connected right after submitting are not missed
+        self._settle.connect(self._emit, QtCore.Qt.QueuedConnection)
+
+    def done(self) -> bool:
+        """Return True once the task completed or was cancelled."""
+        if self.settle_on_return:
+            return self.future.done()
+        return self.future.done() or self.token.cancelled
+
+    @property
+    def settled(self) -> bool:
+        """True once one of the signals was emitted."""
+        return self._settled
+
+    def cancel(self, reason: str = 'Operation cancelled.') -> None:
+        """Cancel the task. A task that has not started yet won't run at all."""
+        with self._lock:
+            if self._settled or self.future.done():
+                return
+        self.token.cancel(reason)
+        self.future.cancel()
+        logging.debug(f'Task "{self.name}" cancelled: {reason}')
+        if not self.settle_on_return:
+            self._settle.emit()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """Block until the task completes and return its result.
+
+        Raises:
+            OperationCancelledException: If the task was cancelled.
+            Exception: The exception raised by the task.
+        """
+        if self.token.cancelled and not self.settle_on_return:
+            raise status.OperationCancelledException(self.token.reason)
+        try:
+            return self.future.result(timeout=timeout)
+        except (concurrent.futures.CancelledError, TaskCancelled):
+            if self.token.cancelled:
+                raise status.OperationCancelledException(self.token.reason) from None
+            raise
+
+    def _on_done(self, _future: concurrent.futures.Future) -> None:
+        self._settle.emit()
+
+    @QtCore.Slot()
+    def _emit(self) -> None:
+        with self._lock:
+            if self._settled:
+                return
+            self._settled = True
+        if self._on_settled:
+            self._on_settled(self)
+
+        if self.token.cancelled and (not self.settle_on_return or self.future.cancelled()):
+            self.cancelled.emit(self.token.reason)
+            return
+        ex = self.future.exception()
+        if isinstance(ex, TaskCancelled) and self.token.cancelled:
+            self.cancelled.emit(self.token.reason)
+        elif ex is not None:
+            self.failed.emit(ex)
+        else:
+            self.finished.emit(self.future.result())
+
+
+class TaskExecutor:
+    """Runs functions on a thread pool and returns :class:`TaskHandle` objects.
+
+    Args:
+        max_workers: Number of tasks running at the same time; further tasks are queued.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS) -> None:
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task')
+        self._handles: Set[TaskHandle] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def active(self) -> int:
+        """Return the number of submitted tasks whose handles are not settled yet."""
+        with self._lock:
+            return len(self._handles)
+
+    def submit(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None,
+               name: Optional[str] = None, settle_on_return: bool = False, **kwargs: Any) -> TaskHandle:
+        """Run ``func(*args, **kwargs)`` on the pool.
+
+        Args:
+            func: The blocking function to run.
+            timeout: Seconds after which the task is cancelled, or None for no limit.
+            name: Name used in log messages, defaults to the function name.
+            settle_on_return: Settle the handle when the task returns rather than when it's
+                cancelled, see :class:`TaskHandle`.
+
+        Returns:
+            TaskHandle: The handle of the task.
+        """
+        token = CancellationToken()
+        name = name or getattr(func, '__name__', repr(func))
+
+        def run() -> Any:
+            token.raise_if_cancelled()
+            _local.token = token
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _local.token = None
+
+        return self._track(self._pool.submit(run), token, name, timeout, settle_on_return)
+
+    def submit_async(self, func: Callable[..., Awaitable[Any]], *args: Any, timeout: Optional[float] = None,
+                     name: Optional[str] = None, **kwargs: Any) -> TaskHandle:
+        """Run the coroutine ``func(*args, **kwargs)`` on the executor's event loop.
+
+        Args:
+            func: The coroutine function to run.
+            timeout: Seconds after which the task is cancelled, or None for no limit.
+            name: Name used in log messages, defaults to the function name.
+
+        Returns:
+            TaskHandle: The handle of the task.
+        """
+        token = CancellationToken()
+        name = name or getattr(func, '__name__', repr(func))
+
+        async def run() -> Any:
+            token.raise_if_cancelled()
+            return await func(*args, **kwargs)
+
+        return self._track(asyncio.run_coroutine_threadsafe(run(), self.event_loop()), token, name, timeout)
+
+    def run_async(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Run the coroutine ``func(*args, **kwargs)`` on the executor's event loop and wait for its result.
+
+        Called from a task, the coroutine is cancelled as soon as the task is. Must not be
+        called from the event loop itself.
+
+        Raises:
+            OperationCancelledException: If the running task is cancelled.
+        """
+        token = current_token()
+        future = asyncio.run_coroutine_threadsafe(func(*args, **kwargs), self.event_loop())
+        try:
+            while token is not None and not future.done():
+                concurrent.futures.wait([future], timeout=POLL_INTERVAL)
+                token.raise_if_cancelled()
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the executor's event loop, starting its thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+
+                def run() -> None:
+                    try:
+                        loop.run_forever()
+                    finally:
+                        loop.close()
+
+                threading.Thread(target=run, name='task-loop', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _track(self, future: concurrent.futures.Future, token: CancellationToken, name: str,
+               timeout: Optional[float], settle_on_return: bool = False) -> TaskHandle:
+        # Referenced until settled, callers don't have to keep the handle
+        handle = TaskHandle(future, token, name, on_settled=self._release, settle_on_return=settle_on_return)
+        with self._lock:
+            self._handles.add(handle)
+
+        timer: Optional[threading.Timer] = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, handle.cancel, args=(f'Operation timed out after {timeout:g}s.',))
+            timer.daemon = True
+            timer.start()
+
+        def on_done(f: concurrent.futures.Future) -> None:
+            if timer is not None:
+                timer.cancel()
+            handle._on_done(f)
+
+        future.add_done_callback(on_done)
+        return handle
+
+    def _release(self, handle: TaskHandle) -> None:
+        with self._lock:
+            self._handles.discard(handle)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel all tasks and stop accepting new ones."""
+        with self._lock:
+            handles = list(self._handles)
+        for handle in handles:
+            handle.cancel('Application is shutting down.')
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+
+executor = TaskExecutor()
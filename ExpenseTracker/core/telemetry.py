@@ -0,0 +1,211 @@
+"""Per-request telemetry of the Sheets API calls.
+
+Every request sent through the :data:`~ExpenseTracker.core.scheduler.scheduler`, and every call
+of the asyncio client, leaves a :class:`~ExpenseTracker.core.scheduler.RequestRecord` in the
+scheduler's ring buffer with its method, ranges, latency, number of attempts, HTTP status and
+response size. Response bytes are counted by the transport: services are built with
+:class:`InstrumentedHttp`, and the local stand-in counts the JSON it returns.
+
+This module aggregates the buffer:
+
+- :func:`summary`: calls, retries, errors, p50/p95 latency and bytes per method
+- :func:`refreshes`: requests and bytes of each recent refresh, matched to the
+  ``service.fetch_data`` and ``service.fetch_new_rows`` profiler stages
+- :func:`summary_frame` and :func:`refresh_frame`: the same as DataFrames, for the CLI
+
+The Performance dock shows :func:`summary` below the stage timings, and
+``python -m ExpenseTracker.cli --refresh requests`` prints it after a refresh.
+
+Example::
+
+    for name, stats in telemetry.summary().items():
+        print(name, stats.calls, stats.p95, stats.bytes)
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import google_auth_httplib2
+
+from . import profiler
+from . import scheduler
+
+#: Profiler stages timing a refresh of the ledger
+REFRESH_STAGES = ('service.fetch_data', 'service.fetch_new_rows')
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the ``q`` quantile of ``values`` by the nearest rank, or 0.0 if there are none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+@dataclass
+class RequestStats:
+    """Aggregated records of one request method.
+
+    Attributes:
+        name: Name of the method, e.g. ``values.batchGet``.
+        latencies: Wall time of each call including retries, oldest first.
+        retries: Attempts beyond the first, summed over all calls.
+        errors: Calls that failed all their attempts.
+        bytes: Response bytes received.
+        ranges: Ranges requested.
+    """
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    retries: int = 0
+    errors: int = 0
+    bytes: int = 0
+    ranges: int = 0
+
+    @property
+    def calls(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.latencies, 0.5)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.latencies, 0.95)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.latencies)
+
+
+@dataclass
+class RefreshStats:
+    """The requests sent during one refresh.
+
+    Attributes:
+        stage: The profiler stage of the refresh.
+        seconds: Wall time of the refresh.
+        finished: Time the refresh finished, as returned by :func:`time.time`.
+        requests: Number of requests.
+        retries: Attempts beyond the first, summed over the requests.
+        bytes: Response bytes received.
+    """
+    stage: str
+    seconds: float
+    finished: float
+    requests: int = 0
+    retries: int = 0
+    bytes: int = 0
+
+
+def summary(records: Optional[List[scheduler.RequestRecord]] = None) -> Dict[str, RequestStats]:
+    """Aggregate request records per method, in order of first appearance.
+
+    Args:
+        records: The records to aggregate. Defaults to the scheduler's buffer.
+    """
+    records = scheduler.scheduler.records() if records is None else records
+    result: Dict[str, RequestStats] = {}
+    for record in records:
+        item = result.setdefault(record.name, RequestStats(record.name))
+        item.latencies.append(record.seconds)
+        item.retries += record.retries
+        item.errors += 0 if record.ok else 1
+        item.bytes += record.bytes
+        item.ranges += len(record.ranges)
+    return result
+
+
+def refreshes(records: Optional[List[scheduler.RequestRecord]] = None,
+              stages: Optional[List[profiler.StageRecord]] = None) -> List[RefreshStats]:
+    """Return the requests and bytes of each refresh, oldest first.
+
+    A request belongs to a refresh if it finished while the refresh's profiler stage ran.
+
+    Args:
+        records: Request records. Defaults to the scheduler's buffer.
+        stages: Stage records. Defaults to the profiler's buffer.
+    """
+    records = scheduler.scheduler.records() if records is None else records
+    stages = profiler.profiler.records() if stages is None else stages
+
+    result: List[RefreshStats] = []
+    for stage in stages:
+        if stage.stage not in REFRESH_STAGES:
+            continue
+        item = RefreshStats(stage.stage, stage.seconds, stage.finished)
+        start = stage.finished - stage.seconds
+        for record in records:
+            if start <= record.finished <= stage.finished:
+                item.requests += 1
+                item.retries += record.retries
+                item.bytes += record.bytes
+        result.append(item)
+    return result
+
+
+def bytes_per_refresh(items: Optional[List[RefreshStats]] = None) -> float:
+    """Return the mean response bytes of the refreshes, or 0.0 if there were none."""
+    items = refreshes() if items is None else items
+    return sum(r.bytes for r in items) / len(items) if items else 0.0
+
+
+def summary_frame(records: Optional[List[scheduler.RequestRecord]] = None) -> Any:
+    """Return :func:`summary` as a DataFrame, one row per method, latencies in milliseconds."""
+    import pandas as pd
+
+    return pd.DataFrame(
+        [
+            {
+                'request': s.name,
+                'calls': s.calls,
+                'ranges': s.ranges,
+                'retries': s.retries,
+                'errors': s.errors,
+                'p50_ms': round(s.p50 * 1000.0, 1),
+                'p95_ms': round(s.p95 * 1000.0, 1),
+                'total_ms': round(s.total_seconds * 1000.0, 1),
+                'bytes': s.bytes,
+            }
+            for s in summary(records).values()
+        ],
+        columns=['request', 'calls', 'ranges', 'retries', 'errors', 'p50_ms', 'p95_ms', 'total_ms', 'bytes'],
+    )
+
+
+def refresh_frame(records: Optional[List[scheduler.RequestRecord]] = None,
+                  stages: Optional[List[profiler.StageRecord]] = None) -> Any:
+    """Return :func:`refreshes` as a DataFrame, one row per refresh."""
+    import pandas as pd
+
+    return pd.DataFrame(
+        [
+            {
+                'stage': r.stage,
+                'seconds': round(r.seconds, 3),
+                'requests': r.requests,
+                'retries': r.retries,
+                'bytes': r.bytes,
+            }
+            for r in refreshes(records, stages)
+        ],
+        columns=['stage', 'seconds', 'requests', 'retries', 'bytes'],
+    )
+
+
+class InstrumentedHttp(google_auth_httplib2.AuthorizedHttp):
+    """Authorized HTTP transport counting the response bytes of each request.
+
+    The bytes are added to the record of the request the scheduler is executing on the
+    calling thread, see :func:`ExpenseTracker.core.scheduler.count_bytes`.
+    """
+
+    def __init__(self, credentials: Any, http: Any = None) -> None:
+        if http is None:
+            from googleapiclient.http import build_http
+            http = build_http()
+        super().__init__(credentials, http=http)
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        response, content = super().request(*args, **kwargs)
+        scheduler.count_bytes(len(content or b''))
+        return response, content
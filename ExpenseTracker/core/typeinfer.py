@@ -0,0 +1,204 @@
+"""Column type inference from a sample of the ledger rows.
+
+Reading the cell formats of a worksheet needs ``spreadsheets().get`` with grid data, which
+returns several objects per cell and is very slow on large ledgers. Instead, this module
+downloads a few blocks of rows spread evenly across the sheet with a single ``batchGet`` and
+infers the type of each column from the sampled values:
+
+- numbers are ``int`` if all are whole, ``float`` otherwise
+- dates are requested as formatted strings, so they are told apart from numbers
+- everything else is ``string``
+
+Each :class:`TypeGuess` carries the share of the sampled cells agreeing with the type as its
+confidence. Results are cached per spreadsheet, worksheet and hash of the header row, so
+repeated detections are instant until the header changes or :func:`clear` is called.
+
+Example::
+
+    guesses = infer_types(service, spreadsheet_id, 'Sheet1', header, last_row)
+    types = {name: guess.type for name, guess in guesses.items()}
+"""
+import datetime
+import hashlib
+import json
+import logging
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .scheduler import scheduler
+
+#: Rows sampled per worksheet
+DEFAULT_SAMPLE_SIZE: int = 200
+#: Number of evenly spaced blocks the sample is split into
+SAMPLE_BLOCKS: int = 8
+
+_DATE_RE = re.compile(r'^\d{4}-\d{1,2}-\d{1,2}')
+
+_lock = threading.Lock()
+_cache: Dict[Tuple[str, str, str, int], Dict[str, 'TypeGuess']] = {}
+
+
+@dataclass(frozen=True)
+class TypeGuess:
+    """Inferred type of a column.
+
+    Attributes:
+        type: One of the configurable header types: ``date``, ``int``, ``float`` or ``string``.
+        confidence: Share of the sampled non-empty cells agreeing with the type, from 0 to 1.
+        samples: Number of sampled non-empty cells.
+    """
+    type: str
+    confidence: float
+    samples: int
+
+
+def header_hash(header: Sequence[Any]) -> str:
+    """Return a hash of the header row."""
+    return hashlib.sha1(json.dumps([str(h) for h in header]).encode('utf-8')).hexdigest()
+
+
+def sample_blocks(first_row: int, last_row: int, sample_size: int,
+                  blocks: int = SAMPLE_BLOCKS) -> List[Tuple[int, int]]:
+    """Return row spans of about ``sample_size`` rows spread evenly from ``first_row`` to ``last_row``.
+
+    Example::
+
+        >>> sample_blocks(2, 1001, 40, blocks=4)
+        [(2, 11), (332, 341), (662, 671), (992, 1001)]
+    """
+    rows = last_row - first_row + 1
+    if rows <= 0 or sample_size <= 0:
+        return []
+    if rows <= sample_size:
+        return [(first_row, last_row)]
+
+    blocks = max(min(blocks, sample_size), 1)
+    length = math.ceil(sample_size / blocks)
+    if blocks == 1:
+        return [(first_row, first_row + length - 1)]
+    step = (rows - length) / (blocks - 1)
+    return [(first_row + round(i * step), first_row + round(i * step) + length - 1) for i in range(blocks)]
+
+
+def _is_date(text: str, locale: Optional[str]) -> bool:
+    if _DATE_RE.match(text):
+        return True
+    if not locale or not any(c.isdigit() for c in text):
+        return False
+    from ..settings import locale as _locale
+    try:
+        _locale.parse_date(text, locale=locale)
+    except Exception:
+        return False
+    return True
+
+
+def _kind(value: Any, locale: Optional[str]) -> Optional[str]:
+    """Return the type of a cell, or None if it is empty."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return 'string'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'int' if value.is_integer() else 'float'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return 'date'
+    text = str(value).strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return 'date' if _is_date(text, locale) else 'string'
+    return 'int' if number.is_integer() and '.' not in text else 'float'
+
+
+def infer_column(values: Sequence[Any], locale: Optional[str] = None) -> TypeGuess:
+    """Infer the type of a column from its sampled cells.
+
+    Args:
+        values: The sampled cells, dates as formatted strings.
+        locale: Locale to parse non-ISO date strings with, e.g. ``en_US``.
+    """
+    counts = {'date': 0, 'int': 0, 'float': 0, 'string': 0}
+    for value in values:
+        kind = _kind(value, locale)
+        if kind is not None:
+            counts[kind] += 1
+
+    samples = sum(counts.values())
+    if not samples:
+        return TypeGuess('string', 0.0, 0)
+
+    numbers = counts['int'] + counts['float']
+    candidates = [
+        ('string', counts['string']),
+        ('date', counts['date']),
+        ('float' if counts['float'] else 'int', numbers),
+    ]
+    # Ties go to the first candidate, string
+    kind, votes = max(candidates, key=lambda c: c[1])
+    return TypeGuess(kind, votes / samples, samples)
+
+
+def infer_types(service: Any, spreadsheet_id: str, worksheet: str, header: Sequence[Any], last_row: int,
+                sample_size: int = DEFAULT_SAMPLE_SIZE, locale: Optional[str] = None,
+                refresh: bool = False) -> Dict[str, TypeGuess]:
+    """Infer the types of the columns of a worksheet from a sample of its rows.
+
+    Args:
+        service: The Sheets API resource.
+        spreadsheet_id: Spreadsheet ID.
+        worksheet: Worksheet title.
+        header: The header row.
+        last_row: The last row with data, 1-based.
+        sample_size: Number of rows to sample.
+        locale: Locale to parse non-ISO date strings with.
+        refresh: Ignore the cached result.
+
+    Returns:
+        The guess of each named column, in header order.
+
+    Raises:
+        HttpError: If the request fails.
+    """
+    from .sync import idx_to_col
+
+    key = (spreadsheet_id, worksheet, header_hash(header), sample_size)
+    if not refresh:
+        with _lock:
+            if key in _cache:
+                return dict(_cache[key])
+
+    spans = sample_blocks(2, last_row, sample_size)
+    columns: List[List[Any]] = [[] for _ in header]
+    if spans and header:
+        last_col = idx_to_col(len(header) - 1)
+        logging.debug(f'Sampling {sum(r1 - r0 + 1 for r0, r1 in spans)} rows of "{worksheet}" in {len(spans)} blocks.')
+        result = scheduler.execute(service.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=[f'{worksheet}!A{r0}:{last_col}{r1}' for r0, r1 in spans],
+            valueRenderOption='UNFORMATTED_VALUE',
+            dateTimeRenderOption='FORMATTED_STRING',
+            fields='valueRanges(values)',
+        ))
+        for value_range in result.get('valueRanges', []):
+            for row in value_range.get('values', []):
+                for idx, value in enumerate(row[:len(header)]):
+                    columns[idx].append(value)
+
+    guesses = {
+        str(name): infer_column(cells, locale=locale) for name, cells in zip(header, columns) if str(name).strip()
+    }
+    with _lock:
+        _cache[key] = dict(guesses)
+    return guesses
+
+
+def clear() -> None:
+    """Discard the cached guesses."""
+    with _lock:
+        _cache.clear()
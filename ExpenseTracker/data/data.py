@@ -6,13 +6,14 @@ database, filtering and preparing it for analysis, and retrieving expenditure su
 import enum
 import functools
 import logging
-import re
 from typing import Optional
 
+import numpy as np
 import pandas as pd
-from statsmodels.nonparametric.smoothers_lowess import lowess
 
 from ..core import database
+from ..core import filters
+from ..core import profiler
 from ..settings import lib
 from ..settings import locale
 from ..status.status import BaseStatusException
@@ -28,6 +29,11 @@ METADATA_KEYS = [
 ]
 
 
+DEFAULT_ROLLING_WINDOW = 3
+#: Columns :func:`get_data` adds for ``rolling_window``
+ROLLING_COLUMNS = ('rolling_mean', 'rolling_median', 'rolling_std', 'rolling_p90')
+
+
 class SummaryMode(enum.StrEnum):
     Total = 'total'
     Monthly = 'monthly'
@@ -37,7 +43,9 @@ def metadata():
     """Decorator to inject metadata settings and verify database connectivity.
 
     Retrieves metadata settings from configuration and verifies the database before calling
-    the wrapped function.
+    the wrapped function. Metadata keys passed explicitly as keyword arguments take precedence
+    over the stored settings. A ``filter_expression`` keyword argument is also applied to the
+    database query.
     """
 
     def decorator(func):
@@ -45,22 +53,29 @@ def metadata():
         def wrapper(*args, **kwargs):
             from ..settings import lib
             from ..core.database import database as db
-            data = lib.settings.get_section('metadata')
+            data = lib.settings.snapshot.metadata
             for key in METADATA_KEYS:
                 if key in data:
-                    kwargs[key] = data[key]
+                    kwargs.setdefault(key, data[key])
 
             try:
                 db.verify()
             except BaseStatusException:
                 return pd.DataFrame()
-            return func(db.data(), **kwargs)
+            # Push the filter down into the SQL query to avoid loading rows that are dropped anyway
+            return func(db.data(filter_expression=kwargs.get('filter_expression', '')), **kwargs)
 
         return wrapper
 
     return decorator
 
 
+def _merge_columns(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """Join the values of several columns row-wise with newlines; missing values join as ''."""
+    parts = [df[c].fillna('').astype(str) for c in columns]
+    return parts[0].str.cat(parts[1:], sep='\n')
+
+
 def _strict_header_mapping(df: pd.DataFrame) -> pd.DataFrame:
     """Map and reorder DataFrame columns based on configuration.
 
@@ -75,22 +90,15 @@ def _strict_header_mapping(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame with strict header mapping.
     """
-    cfg = lib.settings.get_section('mapping')
-    if not cfg:
+    snapshot = lib.settings.snapshot
+    if not snapshot.mapping:
         logging.error('Header mapping missing in config')
         return pd.DataFrame(columns=lib.TRANSACTION_DATA_COLUMNS)
 
-    # build a merge-map → {internal_key: [raw_col1, raw_col2, etc.]}
-    merge_map: dict[str, list[str]] = {key: [] for key in lib.DATA_MAPPING_KEYS}
-    j = r"|".join(map(re.escape, lib.DATA_MAPPING_SEPARATOR_CHARS))
-    for internal_key, raw_spec in cfg.items():
-        for raw in re.split(j, raw_spec):
-            merge_map.setdefault(internal_key, []).append(raw)
-
     # Build a DataFrame with exactly the configured mapping keys,
     # preserving index for any additional columns like local_id
     out = pd.DataFrame(columns=lib.TRANSACTION_DATA_COLUMNS)
-    for internal_key, raw_cols in merge_map.items():
+    for internal_key, raw_cols in snapshot.mapping_plan.columns.items():
         present = [c for c in raw_cols if c in df.columns]
         if not present:
             # missing column → create empty
@@ -99,7 +107,7 @@ def _strict_header_mapping(df: pd.DataFrame) -> pd.DataFrame:
         if len(present) == 1:
             out[internal_key] = df[present[0]].copy()
         else:
-            out[internal_key] = df[present].fillna("").astype(str).agg("\n".join, axis=1)
+            out[internal_key] = _merge_columns(df, present)
 
     # Preserve local_id if present in the source df
     if 'local_id' in df.columns:
@@ -112,7 +120,7 @@ def _conform_date_column(df: pd.DataFrame) -> pd.DataFrame:
     """Convert 'date' column to datetime, drop invalid entries, and sort.
 
     Parses the 'date' column using the database.DATE_COLUMN_FORMAT, drops rows with invalid
-    dates, logs warnings for parsing failures, and returns a sorted DataFrame.
+    dates, and returns a sorted DataFrame.
 
     Args:
         df (pd.DataFrame): DataFrame with a 'date' column.
@@ -121,13 +129,9 @@ def _conform_date_column(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame sorted by 'date' with valid datetime entries.
     """
     df['date'] = pd.to_datetime(df['date'], format=database.DATE_COLUMN_FORMAT, errors='coerce')
+    # Invalid dates are reported once per cache generation by the data-quality scan
     clean_df = df.dropna(subset=['date'])
 
-    # Compare size before and after dropping Na values
-    if len(df) != len(clean_df):
-        logging.warning(
-            f'Unparsable date formats encountered: Dropped {len(df) - len(clean_df)} rows with invalid date format.')
-
     # Check if the date column is empty after conversion
     if clean_df['date'].empty:
         logging.error('Date column is empty after conversion. No valid dates found.')
@@ -141,8 +145,8 @@ def _conform_date_column(df: pd.DataFrame) -> pd.DataFrame:
 def _conform_amount_column(df: pd.DataFrame) -> pd.DataFrame:
     """Convert 'amount' column to numeric, handle invalid values, and fill NaNs.
 
-    Converts the 'amount' column to numeric floats, logs warnings for invalid values, replaces
-    NaNs with zero, and returns the DataFrame.
+    Converts the 'amount' column to numeric floats, replaces invalid values with zero, and
+    returns the DataFrame.
 
     Args:
         df (pd.DataFrame): DataFrame with an 'amount' column.
@@ -152,11 +156,7 @@ def _conform_amount_column(df: pd.DataFrame) -> pd.DataFrame:
     """
     df['amount'] = pd.to_numeric(df['amount'], downcast='float', errors='coerce')
 
-    l = len(df) - len(df.dropna(subset=['amount']))
-    if l > 0:
-        logging.warning(f'{l} rows have invalid amount amount values.')
-
-    # Replace NaN values with 0
+    # Replace NaN values with 0. Invalid amounts are reported by the data-quality scan
     df['amount'] = df['amount'].fillna(0)
 
     return df
@@ -179,6 +179,26 @@ def _conform_string_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _normalize(df: pd.DataFrame, filter_expression: str) -> pd.DataFrame:
+    """Map, conform and filter raw cache rows, see :func:`_strict_header_mapping`.
+
+    Args:
+        df (pd.DataFrame): Raw transaction data.
+        filter_expression (str): Filter expression, see :mod:`ExpenseTracker.core.filters`.
+
+    Returns:
+        pd.DataFrame: Transactions with typed 'date', 'amount' and string columns.
+    """
+    with profiler.stage('data.normalize', rows=len(df)):
+        return (
+            _strict_header_mapping(df)
+            .pipe(_conform_date_column)
+            .pipe(_conform_amount_column)
+            .pipe(_conform_string_columns)
+            .pipe(filters.apply_filter, filter_expression)
+        )
+
+
 def _conform_period(df: pd.DataFrame, yearmonth: str, span: int) -> pd.DataFrame:
     """Filter DataFrame to a specified period range.
 
@@ -315,6 +335,8 @@ def get_data(
         span: int = 1,
         summary_mode: str = SummaryMode.Total.value,
         add_total_row: bool = True,
+        filter_expression: str = '',
+        rolling_window: int = 0,
 ) -> pd.DataFrame:
     """Load and prepare transaction data for analysis.
 
@@ -331,6 +353,10 @@ def get_data(
         span (int): Number of months to include in the analysis.
         summary_mode (str): Summary mode, either 'total' or 'monthly'.
         add_total_row (bool): Append a total summary row to the result.
+        filter_expression (str): Optional filter expression, see :mod:`ExpenseTracker.core.filters`.
+        rolling_window (int): If set, add the rolling statistics of each category at the end of
+            the period, computed from the same rows as :func:`get_rolling_stats`, as
+            :data:`ROLLING_COLUMNS`. Categories without statistics, like the total row, get NaN.
 
     Returns:
         pd.DataFrame: Prepared DataFrame with columns ['category', 'total', 'transactions',
@@ -343,13 +369,11 @@ def get_data(
     # Ensure span is at least 1
     span = max(int(span) if span else 1, 1)
 
-    df = (
-        _strict_header_mapping(df)
-        .pipe(_conform_date_column)
-        .pipe(_conform_amount_column)
-        .pipe(_conform_string_columns)
-        .pipe(_conform_period, yearmonth, span)
-    )
+    df = _normalize(df, filter_expression)
+    stats = None
+    if rolling_window:
+        stats = _rolling_stats(df, rolling_window, exclude_negative, exclude_zero, exclude_positive, yearmonth, span)
+    df = _conform_period(df, yearmonth, span)
 
     if exclude_zero:
         logging.debug('Excluding zero amounts')
@@ -364,32 +388,34 @@ def get_data(
     # Use fixed transaction columns (including local_id) for record payloads
     transaction_columns = lib.TRANSACTION_DATA_COLUMNS.copy()
 
+    snapshot = lib.settings.snapshot
+
     # Fallback locale
-    _locale = lib.settings['locale']
+    _locale = snapshot.locale
     if _locale not in locale.LOCALE_MAP:
         _locale = 'en_GB'
 
     # Group by category; aggregate totals & build transaction list
     if not df.empty:
-        df = (
-            df.groupby('category')
-            .apply(
-                lambda _df: pd.Series({
-                    'total': _df['amount'].sum(),
-                    'transactions': _df[transaction_columns].to_dict(orient='records'),
-                    'description': _build_description(_df, _locale),
-                    'weight': 0.0,  # Will be filled by _calculate_weights
-                })
+        with profiler.stage('data.aggregate', rows=len(df)):
+            df = (
+                df.groupby('category')
+                .apply(
+                    lambda _df: pd.Series({
+                        'total': _df['amount'].sum(),
+                        'transactions': _df[transaction_columns].to_dict(orient='records'),
+                        'description': _build_description(_df, _locale),
+                        'weight': 0.0,  # Will be filled by _calculate_weights
+                    })
+                )
+                .reset_index()
             )
-            .reset_index()
-        )
     else:
         df = pd.DataFrame(columns=['category', 'total', 'transactions', 'description', 'weight'])
 
     # add missing categories
     if not hide_empty_categories:
-        categories = lib.settings.get_section('categories')
-        for category in categories:
+        for category in snapshot.categories:
             if category not in df['category'].values:
                 df = pd.concat([df, pd.DataFrame({'category': [category], 'total': [0.0]})], ignore_index=True)
 
@@ -402,15 +428,13 @@ def get_data(
         df = df[df['category'].notna() & (df['category'] != '')]
 
     # Preserve custom category order defined in configuration
-    config = lib.settings.get_section('categories')
-    order = list(config.keys())
+    order = snapshot.category_order
     # Assign ordering index, unknown categories go to end
-    df['__order'] = df['category'].apply(lambda x: order.index(x) if x in order else len(order))
-    df = df.sort_values('__order').drop(columns='__order').reset_index(drop=True)
+    df['__order'] = df['category'].map(lambda x: order.get(x, len(order)))
+    df = df.sort_values('__order', kind='stable').drop(columns='__order').reset_index(drop=True)
 
     # Remove excluded categories
-    config = lib.settings.get_section('categories')
-    excluded = [k for k, v in config.items() if v['excluded']]
+    excluded = snapshot.excluded_categories
     if excluded:
         df = df[~df['category'].isin(excluded)]
 
@@ -425,6 +449,12 @@ def get_data(
             ignore_index=True
         )
 
+    if stats is not None:
+        end = pd.Period(yearmonth) + (span - 1)
+        stats = stats[stats['month'].dt.to_period('M') == end].set_index('category')
+        for column, name in zip(ROLLING_COLUMNS, ('mean', 'median', 'std', 'p90')):
+            df[column] = df['category'].map(stats[name])
+
     return df
 
 
@@ -441,6 +471,7 @@ def get_trends(
         negative_span: int = 3,
         summary_mode: str = SummaryMode.Total.value,
         loess_fraction: float = 0.15,
+        filter_expression: str = '',
 ) -> pd.DataFrame:
     """Compute monthly spending trends with smoothing.
 
@@ -459,17 +490,13 @@ def get_trends(
         negative_span (int): Backward span in months for trend computation.
         summary_mode (str): Summary mode; maintained for compatibility.
         loess_fraction (float): Fraction of data for LOESS smoothing (0 < loess_fraction <= 1).
+        filter_expression (str): Optional filter expression, see :mod:`ExpenseTracker.core.filters`.
 
     Returns:
         pd.DataFrame: Trend data with columns ['category', 'month', 'loess', 'monthly_total'].
     """
     # conform input
-    df2 = (
-        _strict_header_mapping(df)
-        .pipe(_conform_date_column)
-        .pipe(_conform_amount_column)
-        .pipe(_conform_string_columns)
-    )
+    df2 = _normalize(df, filter_expression)
     if df2.empty:
         return pd.DataFrame(columns=lib.TREND_DATA_COLUMNS)
     # apply amount filters
@@ -509,7 +536,8 @@ def get_trends(
         idx = pd.MultiIndex.from_product([cats, periods], names=['category', 'period'])
         grp = df2.groupby(['category', 'period'])['amount'].sum()
         df_monthly = grp.reindex(idx, fill_value=0).rename('monthly_total').reset_index()
-    # smoothing and build output
+    # smoothing and build output; statsmodels is slow to import, so only load it when needed
+    from statsmodels.nonparametric.smoothers_lowess import lowess
     rows = []
     for cat, sub in df_monthly.groupby('category'):
         vals = sub['monthly_total'].values
@@ -534,3 +562,96 @@ def get_trends(
     # timestamp for plotting
     df_trends['month'] = df_trends['period'].dt.to_timestamp('M')
     return df_trends[lib.TREND_DATA_COLUMNS]
+
+
+@metadata()
+def get_rolling_stats(
+        df: pd.DataFrame,
+        window: int = DEFAULT_ROLLING_WINDOW,
+        hide_empty_categories: bool = True,  # unused
+        exclude_negative: bool = False,
+        exclude_zero: bool = False,
+        exclude_positive: bool = True,
+        yearmonth: str = "",
+        span: int = 1,
+        summary_mode: str = SummaryMode.Total.value,  # unused
+        filter_expression: str = '',
+) -> pd.DataFrame:
+    """Compute rolling per-category statistics over monthly totals.
+
+    Builds a month x category matrix of monthly totals and a single N-month window view of it,
+    reduced to the rolling mean, median, population standard deviation and 90th percentile of
+    each category for every month up to the end of the selected period. Windows at the start
+    are partial, like ``rolling(window, min_periods=1)``.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame with 'amount', 'category', and 'date' columns.
+        window (int): Size of the rolling window in months.
+        hide_empty_categories (bool): Currently unused flag to hide categories with no data.
+        exclude_negative (bool): Exclude negative amount transactions.
+        exclude_zero (bool): Exclude zero amount transactions.
+        exclude_positive (bool): Exclude positive amount transactions.
+        yearmonth (str): Starting year-month 'YYYY-MM' of the selected period; uses latest period if empty.
+        span (int): Number of months in the selected period.
+        summary_mode (str): Summary mode; maintained for compatibility.
+        filter_expression (str): Optional filter expression, see :mod:`ExpenseTracker.core.filters`.
+
+    Returns:
+        pd.DataFrame: Rolling statistics with columns ['category', 'month', 'mean', 'median',
+            'std', 'p90'], one row per category and month.
+    """
+    return _rolling_stats(
+        _normalize(df, filter_expression), window, exclude_negative, exclude_zero, exclude_positive, yearmonth, span
+    )
+
+
+def _rolling_stats(df: pd.DataFrame, window: int, exclude_negative: bool, exclude_zero: bool,
+                   exclude_positive: bool, yearmonth: str, span: int) -> pd.DataFrame:
+    """Compute the statistics of :func:`get_rolling_stats` from normalized transactions.
+
+    The input frame is not modified.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=lib.ROLLING_STATS_COLUMNS)
+    if exclude_zero:
+        df = df[df['amount'] != 0]
+    if exclude_negative:
+        df = df[df['amount'] >= 0]
+    if exclude_positive:
+        df = df[df['amount'] <= 0]
+    if df.empty:
+        return pd.DataFrame(columns=lib.ROLLING_STATS_COLUMNS)
+
+    period = df['date'].dt.to_period('M').rename('period')
+    start = period.min()
+    end = (pd.Period(yearmonth) if yearmonth else period.max()) + (max(int(span), 1) - 1)
+    if end < start:
+        return pd.DataFrame(columns=lib.ROLLING_STATS_COLUMNS)
+    periods = pd.period_range(start, end, freq='M')
+
+    # Month x category matrix, months without transactions count as zero
+    matrix = (
+        df.groupby([period, 'category'])['amount'].sum()
+        .unstack('category', fill_value=0.0)
+        .reindex(periods, fill_value=0.0)
+    )
+
+    # One month x category x window view; the leading padding makes the first windows partial,
+    # like min_periods=1, and the NaN-aware reductions skip it
+    window = max(int(window), 1)
+    values = matrix.to_numpy(dtype=float)
+    padded = np.vstack([np.full((window - 1, values.shape[1]), np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+    stats = pd.concat({
+        name: pd.DataFrame(reduce(windows, axis=-1), index=matrix.index, columns=matrix.columns).stack()
+        for name, reduce in (
+            ('mean', np.nanmean),
+            ('median', np.nanmedian),
+            ('std', np.nanstd),
+            ('p90', functools.partial(np.nanquantile, q=0.9)),
+        )
+    }, axis=1)
+    stats.index.names = ['period', 'category']
+    stats = stats.reset_index()
+    stats['month'] = stats['period'].dt.to_timestamp('M')
+    return stats[lib.ROLLING_STATS_COLUMNS]
@@ -1,6 +1,7 @@
 """Qt table models for the ExpenseTracker application.
 
 This subpackage provides table models and proxy models for displaying and
-managing expense summaries (ExpenseModel and ExpenseSortFilterProxyModel) and
-transactions (TransactionsModel and TransactionsSortFilterProxyModel) within Qt views.
+managing expense summaries (ExpenseModel and ExpenseSortFilterProxyModel), transactions
+(TransactionsModel and TransactionsSortFilterProxyModel) and data-quality issues
+(QualityModel) within Qt views.
 """
@@ -5,7 +5,8 @@ from typing import Any, Optional
 import pandas as pd
 from PySide6 import QtCore, QtGui
 
-from ..data import get_data, SummaryMode
+from ..data import DEFAULT_ROLLING_WINDOW, get_data, SummaryMode
+from ...core import profiler
 from ...core.sync import sync
 from ...settings import lib
 from ...settings import locale
@@ -19,6 +20,17 @@ AverageRole = QtCore.Qt.UserRole + 4
 TotalRole = QtCore.Qt.UserRole + 5
 WeightRole = QtCore.Qt.UserRole + 6
 CategoryRole = QtCore.Qt.UserRole + 7
+RollingMeanRole = QtCore.Qt.UserRole + 8
+RollingMedianRole = QtCore.Qt.UserRole + 9
+RollingStdRole = QtCore.Qt.UserRole + 10
+RollingP90Role = QtCore.Qt.UserRole + 11
+
+ROLLING_ROLES = {
+    RollingMeanRole: 'rolling_mean',
+    RollingMedianRole: 'rolling_median',
+    RollingStdRole: 'rolling_std',
+    RollingP90Role: 'rolling_p90',
+}
 
 
 class Columns(enum.IntEnum):
@@ -52,9 +64,14 @@ class ExpenseModel(QtCore.QAbstractTableModel):
             'transactions': [],
             'weight': [],
             'description': [],
+            'amount_text': [],
             'mean': 0,
             'max': 0,
             'min': 0,
+            'rolling_mean': [],
+            'rolling_median': [],
+            'rolling_std': [],
+            'rolling_p90': [],
         }
 
         self._connect_signals()
@@ -63,6 +80,7 @@ class ExpenseModel(QtCore.QAbstractTableModel):
         signals.presetAboutToBeActivated.connect(self.clear_data)
         signals.dataAboutToBeFetched.connect(self.clear_data)
         signals.dataFetched.connect(self.init_data)
+        signals.dataAppended.connect(self.init_data)
         signals.categoryExcluded.connect(self.init_data)
 
         @QtCore.Slot(str, object)
@@ -74,7 +92,8 @@ class ExpenseModel(QtCore.QAbstractTableModel):
                     'exclude_positive',
                     'summary_mode',
                     'span',
-                    'yearmonth'
+                    'yearmonth',
+                    'locale',
             ):
                 self.init_data()
 
@@ -138,6 +157,9 @@ class ExpenseModel(QtCore.QAbstractTableModel):
             return self._cache['max'][row]
         if role == MinimumRole:
             return self._cache['min'][row]
+        if role in ROLLING_ROLES:
+            values = self._cache[ROLLING_ROLES[role]]
+            return values[row] if row < len(values) else None
         if role == TotalRole:
             return total_value
         if role == WeightRole:
@@ -164,7 +186,7 @@ class ExpenseModel(QtCore.QAbstractTableModel):
                 if category == '':
                     return ui.get_icon('cat_unknown', color=ui.Color.Yellow(), engine=ui.CategoryIconEngine)
 
-                config = lib.settings.get_section('categories')
+                config = lib.settings.snapshot.categories
                 if not config:
                     return None
 
@@ -183,16 +205,17 @@ class ExpenseModel(QtCore.QAbstractTableModel):
         if col == Columns.Category:
             if role == QtCore.Qt.DisplayRole:
                 if is_total_row:
-                    if lib.settings['summary_mode'] == SummaryMode.Total.value:
+                    summary_mode = lib.settings.snapshot.summary_mode
+                    if summary_mode == SummaryMode.Total.value:
                         return 'Total'
-                    elif lib.settings['summary_mode'] == SummaryMode.Monthly.value:
+                    elif summary_mode == SummaryMode.Monthly.value:
                         return 'Monthly Average'
                     return 'Total*'
 
                 if category == '':
                     return '(Uncategorized)'
 
-                categories_cfg = lib.settings.get_section('categories')
+                categories_cfg = lib.settings.snapshot.categories
                 if not categories_cfg:
                     return category
 
@@ -212,7 +235,7 @@ class ExpenseModel(QtCore.QAbstractTableModel):
                     return ui.Color.Yellow()
 
             if role == QtCore.Qt.DecorationRole:
-                config = lib.settings.get_section('categories')
+                config = lib.settings.snapshot.categories
                 if is_total_row:
                     return None
                 if category and category not in config:
@@ -225,7 +248,7 @@ class ExpenseModel(QtCore.QAbstractTableModel):
         elif col == Columns.Amount:
             # Amount column
             if role == QtCore.Qt.DisplayRole:
-                return locale.format_currency_value(int(total_value), lib.settings['locale'])
+                return self._cache['amount_text'][row]
             if role == QtCore.Qt.FontRole:
                 if total_value == 0:
                     font, _ = ui.Font.ThinFont(ui.Size.MediumText(1.0))
@@ -257,7 +280,7 @@ class ExpenseModel(QtCore.QAbstractTableModel):
 
     @QtCore.Slot()
     def _init_data(self):
-        df = get_data()
+        df = get_data(rolling_window=DEFAULT_ROLLING_WINDOW)
 
         if df is None or df.empty:
             logging.debug('No data available')
@@ -268,6 +291,9 @@ class ExpenseModel(QtCore.QAbstractTableModel):
 
         for k in lib.EXPENSE_DATA_COLUMNS:
             self._cache[k] = self._df[k].tolist()
+        self._cache['amount_text'] = locale.format_currency_many(
+            self._df['total'].astype(int), lib.settings.snapshot.locale
+        )
 
         # if last row is a "Total" row, exclude it from stats
         if len(self._df) > 1 and self._df.iloc[-1]['category'] == 'Total':
@@ -283,18 +309,32 @@ class ExpenseModel(QtCore.QAbstractTableModel):
         self._cache['max'] = [self._cache['max']] * len(self._df)
         self._cache['min'] = [self._cache['min']] * len(self._df)
 
+        self._init_rolling_stats()
+
+    def _init_rolling_stats(self) -> None:
+        """Cache the rolling statistics of each category at the end of the selected period."""
+        for key in ROLLING_ROLES.values():
+            if key not in self._df:
+                self._cache[key] = [None] * len(self._df)
+                continue
+            # Categories without statistics, e.g. the total row, have none
+            values = self._df[key]
+            self._cache[key] = values.astype(object).where(values.notna(), None).tolist()
+
     @QtCore.Slot()
     def init_data(self) -> None:
         logging.debug('Initializing model data')
-        self.beginResetModel()
+        with profiler.stage('model.expense_reset') as s:
+            self.beginResetModel()
 
-        try:
-            self._init_data()
-        except Exception as ex:
-            logging.error(f'Failed to load transactions data: {ex}')
-            self._df = pd.DataFrame(columns=lib.EXPENSE_DATA_COLUMNS)
-        finally:
-            self.endResetModel()
+            try:
+                self._init_data()
+            except Exception as ex:
+                logging.error(f'Failed to load transactions data: {ex}')
+                self._df = pd.DataFrame(columns=lib.EXPENSE_DATA_COLUMNS)
+            finally:
+                self.endResetModel()
+            s.rows = self.rowCount()
 
     @QtCore.Slot()
     def clear_data(self) -> None:
@@ -308,9 +348,14 @@ class ExpenseModel(QtCore.QAbstractTableModel):
             'transactions': [],
             'weight': [],
             'description': [],
+            'amount_text': [],
             'mean': 0,
             'max': 0,
             'min': 0,
+            'rolling_mean': [],
+            'rolling_median': [],
+            'rolling_std': [],
+            'rolling_p90': [],
         }
         self._df = pd.DataFrame(columns=lib.EXPENSE_DATA_COLUMNS)
 
@@ -351,11 +396,10 @@ class ExpenseSortFilterProxyModel(QtCore.QSortFilterProxyModel):
             return True
 
         if self._sort_mode == 'config':
-            config = lib.settings.get_section('categories')
-            categories = list(config.keys())
+            order = lib.settings.snapshot.category_order
 
-            left_idx = categories.index(left_cat) if left_cat in categories else len(categories)
-            right_idx = categories.index(right_cat) if right_cat in categories else len(categories)
+            left_idx = order.get(left_cat, len(order))
+            right_idx = order.get(right_cat, len(order))
 
             return left_idx < right_idx
 
@@ -0,0 +1,142 @@
+"""Table model listing the rows flagged by the data-quality scan.
+
+The model reads the stored scan results via :meth:`DatabaseAPI.quality_report` and resolves
+the flagged rows against the cached transactions once per reset.
+"""
+import logging
+from typing import Optional, Any, List, Dict
+
+import pandas as pd
+from PySide6 import QtWidgets, QtCore
+
+from ...core import database
+from ...core import quality
+from ...settings import lib
+from ...ui import ui
+from ...ui.actions import signals
+
+LocalIdRole = QtCore.Qt.UserRole + 0
+IssueRole = QtCore.Qt.UserRole + 1
+
+COLUMNS = ('Issue', 'Row', 'Date', 'Amount', 'Category')
+
+
+class QualityModel(QtCore.QAbstractTableModel):
+    """Lists one row per flagged ``(issue, local_id)`` pair."""
+    summaryChanged = QtCore.Signal(str)
+
+    def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(parent=parent)
+        self._data: List[Dict[str, Any]] = []
+        self._connect_signals()
+
+    def _connect_signals(self) -> None:
+        # Caching, appending and category edits all emit dataQualityChanged once
+        signals.dataQualityChanged.connect(self.init_data)
+        signals.presetActivated.connect(self.init_data)
+        signals.dataAboutToBeFetched.connect(self.clear_data)
+        signals.presetAboutToBeActivated.connect(self.clear_data)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return len(COLUMNS)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return len(self._data)
+
+    @QtCore.Slot()
+    def init_data(self, *args) -> None:
+        self.beginResetModel()
+        self._data.clear()
+        try:
+            self._populate_model_data()
+        except Exception as e:
+            logging.error(f'Failed to load data-quality report: {e}')
+            self._data.clear()
+            self.summaryChanged.emit('')
+        finally:
+            self.endResetModel()
+
+    @QtCore.Slot()
+    def clear_data(self) -> None:
+        self.beginResetModel()
+        self._data.clear()
+        self.endResetModel()
+        self.summaryChanged.emit('')
+
+    def _populate_model_data(self) -> None:
+        report = database.database.quality_report()
+        if report.is_clean():
+            self.summaryChanged.emit(f'No issues in {report.total_rows} rows' if report.total_rows else '')
+            return
+
+        df = database.database.data()
+        if not df.empty and 'local_id' in df.columns:
+            df = df.set_index('local_id', drop=False)
+
+        config = lib.settings.get_section('mapping')
+
+        def _value(local_id: int, key: str) -> str:
+            columns = [c for c in lib.parse_merge_mapping(config.get(key, '')) if c in df.columns]
+            if not columns or local_id not in df.index:
+                return ''
+            v = df.at[local_id, columns[0]]
+            return '' if pd.isna(v) else str(v)
+
+        for issue in quality.Issue:
+            for local_id in report.ids(issue):
+                self._data.append({
+                    'issue': issue,
+                    'local_id': local_id,
+                    'date': _value(local_id, 'date'),
+                    'amount': _value(local_id, 'amount'),
+                    'category': _value(local_id, 'category'),
+                })
+
+        self.summaryChanged.emit(', '.join(
+            f'{n} {quality.ISSUE_LABELS[k].lower()}' for k, n in report.counts().items() if n
+        ))
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid() or not (0 <= index.row() < len(self._data)):
+            return None
+
+        row_item = self._data[index.row()]
+        column = index.column()
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return quality.ISSUE_LABELS[row_item['issue']]
+            if column == 1:
+                return str(row_item['local_id'])
+            if column == 2:
+                return row_item['date']
+            if column == 3:
+                return row_item['amount']
+            if column == 4:
+                return row_item['category']
+        elif role == QtCore.Qt.FontRole:
+            if column == 0:
+                font, _ = ui.Font.BoldFont(ui.Size.SmallText(1.0))
+                return font
+            font, _ = ui.Font.ThinFont(ui.Size.SmallText(1.0))
+            return font
+        elif role == QtCore.Qt.ForegroundRole:
+            if column == 0:
+                return ui.Color.Yellow()
+            return ui.Color.SecondaryText()
+        elif role == QtCore.Qt.TextAlignmentRole:
+            if column == 3:
+                return QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+            return QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter
+        elif role == LocalIdRole:
+            return row_item['local_id']
+        elif role == IssueRole:
+            return row_item['issue']
+
+        return None
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            if 0 <= section < len(COLUMNS):
+                return COLUMNS[section]
+        return None
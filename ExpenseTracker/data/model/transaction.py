@@ -9,6 +9,8 @@ from typing import Any, Optional, Dict, Tuple
 import pandas as pd
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from ...core import filters
+from ...core import profiler
 from ...settings import lib
 from ...settings import locale
 from ...ui import ui
@@ -64,18 +66,19 @@ class TransactionsModel(QtCore.QAbstractTableModel):
 
     @QtCore.Slot(list)
     def init_data(self, data: list) -> None:
-        self.beginResetModel()
-        self._data = []
-        self._pending_data = []
-        try:
-            if not data:
-                return
-            self._data = data
-        except Exception as ex:
-            logging.error(f'Failed to load transactions data: {ex}')
+        with profiler.stage('model.transactions_reset', rows=len(data or [])):
+            self.beginResetModel()
             self._data = []
-        finally:
-            self.endResetModel()
+            self._pending_data = []
+            try:
+                if not data:
+                    return
+                self._data = data
+            except Exception as ex:
+                logging.error(f'Failed to load transactions data: {ex}')
+                self._data = []
+            finally:
+                self.endResetModel()
 
     @QtCore.Slot()
     def clear_data(self) -> None:
@@ -86,6 +89,10 @@ class TransactionsModel(QtCore.QAbstractTableModel):
         self._failed_cells.clear()
         self.endResetModel()
 
+    def records(self) -> list:
+        """Return the transaction records backing the model."""
+        return self._data
+
     def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
         return len(self._data)
 
@@ -141,7 +148,7 @@ class TransactionsModel(QtCore.QAbstractTableModel):
         elif col_idx == Columns.Amount.value:
             if role == QtCore.Qt.DisplayRole:
                 if isinstance(value, (int, float)):
-                    return locale.format_currency_value(value, lib.settings['locale'])
+                    return locale.format_currency_value(value, lib.settings.snapshot.locale)
                 return f'{value}'
             elif role == QtCore.Qt.FontRole:
                 font, _ = ui.Font.BlackFont(ui.Size.MediumText(1.0))
@@ -158,7 +165,7 @@ class TransactionsModel(QtCore.QAbstractTableModel):
                     return ui.Color.Green()
             elif role in (QtCore.Qt.StatusTipRole, QtCore.Qt.ToolTipRole):
                 if isinstance(value, (int, float)):
-                    return locale.format_currency_value(value, lib.settings['locale'])
+                    return locale.format_currency_value(value, lib.settings.snapshot.locale)
                 return f'{value}'
 
         elif col_idx == Columns.Description.value:
@@ -178,7 +185,7 @@ class TransactionsModel(QtCore.QAbstractTableModel):
                     return value
 
         elif col_idx == Columns.Category.value:
-            config = lib.settings.get_section('categories') or {}
+            config = lib.settings.snapshot.categories
             if role == QtCore.Qt.DisplayRole:
                 if value in config:
                     display_name = config[value].get('display_name', value)
@@ -196,9 +203,8 @@ class TransactionsModel(QtCore.QAbstractTableModel):
                 icon = ui.get_icon(icon_name, color=color, engine=ui.CategoryIconEngine)
                 return icon
             elif role in (QtCore.Qt.StatusTipRole, QtCore.Qt.ToolTipRole):
-                categories = lib.settings.get_section('categories') or {}
-                if value in categories:
-                    display_name = categories[value]['display_name']
+                if value in config:
+                    display_name = config[value]['display_name']
                 else:
                     display_name = f'{value}'
                 return f'{display_name} ({value})'
@@ -316,7 +322,9 @@ class TransactionsModel(QtCore.QAbstractTableModel):
 class TransactionsSortFilterProxyModel(QtCore.QSortFilterProxyModel):
     """Sort and filter proxy model for transaction data.
 
-    Sorts by absolute amount in the Amount column and filters by Description wildcard.
+    Sorts by absolute amount in the Amount column. The filter string is either a filter
+    expression (see :mod:`ExpenseTracker.core.filters`) evaluated once over all rows, or a
+    wildcard matched against the Description column.
     """
 
     def __init__(self, parent=None):
@@ -328,6 +336,8 @@ class TransactionsSortFilterProxyModel(QtCore.QSortFilterProxyModel):
         self.setSortRole(QtCore.Qt.EditRole)
 
         self._filter_string = ''
+        self._filter: Optional[filters.Filter] = None
+        self._accepted_rows: set[int] = set()
 
         self._connect_signals()
 
@@ -346,5 +356,51 @@ class TransactionsSortFilterProxyModel(QtCore.QSortFilterProxyModel):
     def set_filter_string(self, filter_string: str) -> None:
         """Set the filter string for filtering the model data."""
         self._filter_string = filter_string
-        self.setFilterWildcard(filter_string)
+        self._filter = None
+
+        text = filter_string.strip()
+        if text:
+            try:
+                self._filter = filters.compile_filter(text)
+            except filters.FilterSyntaxError as ex:
+                logging.debug(f'Not a filter expression, using wildcard: {ex}')
+
+        if self._filter is not None:
+            self.setFilterWildcard('')
+            self._update_accepted_rows()
+        else:
+            self.setFilterWildcard(filter_string)
         self.invalidateFilter()
+
+    def setSourceModel(self, model: QtCore.QAbstractItemModel) -> None:
+        super().setSourceModel(model)
+        model.modelReset.connect(self._on_source_changed)
+        model.dataChanged.connect(self._on_source_changed)
+
+    @QtCore.Slot()
+    def _on_source_changed(self, *args) -> None:
+        if self._filter is None:
+            return
+        self._update_accepted_rows()
+        self.invalidateFilter()
+
+    def _update_accepted_rows(self) -> None:
+        """Evaluate the filter expression over all source rows in a single vectorized pass."""
+        model = self.sourceModel()
+        if model is None or not hasattr(model, 'records') or not model.records():
+            self._accepted_rows = set()
+            return
+
+        df = pd.DataFrame(model.records()).reindex(columns=lib.TRANSACTION_DATA_COLUMNS)
+        try:
+            mask = self._filter.mask(df)
+        except (TypeError, ValueError) as ex:
+            logging.error(f'Failed to evaluate filter "{self._filter.expression}": {ex}')
+            self._accepted_rows = set()
+            return
+        self._accepted_rows = set(mask.to_numpy().nonzero()[0].tolist())
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
+        if self._filter is not None:
+            return source_row in self._accepted_rows
+        return super().filterAcceptsRow(source_row, source_parent)
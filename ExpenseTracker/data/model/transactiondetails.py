@@ -61,22 +61,18 @@ class TransactionDetailsModel(QtCore.QAbstractTableModel):
 
         df_raw = pd.DataFrame([row_data])
 
-        config = lib.settings.get_section('mapping')
-        header_config = lib.settings.get_section('header')
+        snapshot = lib.settings.snapshot
+        plan = snapshot.mapping_plan
+        header_config = snapshot.header
 
         current_data_list: List[Dict[str, Any]] = []
         primary_amount_value: Optional[float] = None
 
         for raw_column in df_raw.columns:
-            is_merge_mapped = any(
-                raw_column in lib.parse_merge_mapping(str(v)) for k, v in config.items() if lib.is_merge_mapped(str(v))
-            )
-            is_extra = not bool(next(iter(
-                k for k, v in config.items() if raw_column in lib.parse_merge_mapping(str(v))
-            ), None))
-            mapped_to = next(iter(
-                k for k, v in config.items() if raw_column in lib.parse_merge_mapping(str(v))
-            ), None)
+            mapped_keys = plan.keys_of(raw_column)
+            is_merge_mapped = plan.is_merged_column(raw_column)
+            is_extra = not mapped_keys
+            mapped_to = mapped_keys[0] if mapped_keys else None
 
             value = df_raw.iloc[0][raw_column]
             processed_value = value if not pd.isna(value) else None
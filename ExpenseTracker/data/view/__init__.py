@@ -7,4 +7,5 @@ interacting with expense data, including:
 - TransactionsView and TransactionsDockWidget: detailed transaction tables with edit and sync controls
 - PieChartView and PieChartDockWidget: interactive pie chart visualization
 - TrendGraph and TrendDockWidget: bar-and-trend chart visualization
+- QualityDockWidget: rows flagged by the data-quality scan
 """
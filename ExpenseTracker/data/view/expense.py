@@ -326,6 +326,38 @@ class ExpenseView(QtWidgets.QTableView):
         action.triggered.connect(signals.dataFetchRequested)
         self.addAction(action)
 
+        action = QtGui.QAction('Fetch New Rows', self)
+        action.setShortcut('Ctrl+Alt+R')
+        action.setShortcutContext(QtCore.Qt.WidgetWithChildrenShortcut)
+        action.setStatusTip('Only fetch the rows added to the bottom of the spreadsheet')
+        action.triggered.connect(signals.newRowsFetchRequested)
+        self.addAction(action)
+
+        from ...core.autorefresh import INTERVALS, refresher
+
+        @QtCore.Slot(QtGui.QAction)
+        def set_refresh_interval(a: QtGui.QAction) -> None:
+            refresher.set_interval(a.data())
+
+        refresh_menu = QtWidgets.QMenu('Background Refresh', self)
+        refresh_menu.setStatusTip('Check the spreadsheet for changes in the background')
+        refresh_group = QtGui.QActionGroup(self)
+        refresh_group.setExclusive(True)
+        for minutes in INTERVALS:
+            act = QtGui.QAction(f'Every {minutes} min' if minutes else 'Off', self, checkable=True)
+            act.setData(minutes)
+            refresh_group.addAction(act)
+            refresh_menu.addAction(act)
+        refresh_group.triggered.connect(set_refresh_interval)
+
+        @QtCore.Slot()
+        def update_refresh_menu() -> None:
+            for act in refresh_group.actions():
+                act.setChecked(act.data() == refresher.interval())
+
+        refresh_menu.aboutToShow.connect(update_refresh_menu)
+        self.addAction(refresh_menu.menuAction())
+
         action = QtGui.QAction('Reload', self)
         action.setShortcut('Ctrl+Shift+R')
         action.setShortcutContext(QtCore.Qt.WidgetWithChildrenShortcut)
@@ -0,0 +1,117 @@
+"""
+Data-quality view listing the rows flagged by the last data-quality scan.
+"""
+import logging
+from typing import Optional
+
+from PySide6 import QtWidgets, QtCore
+
+from ..model.quality import QualityModel, LocalIdRole
+from ...ui import ui
+from ...ui.actions import signals
+from ...ui.dockable_widget import DockableWidget
+
+
+class QualityDockWidget(DockableWidget):
+    """Dock widget for displaying data-quality issues."""
+
+    def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(
+            'Data Quality',
+            parent=parent,
+            min_height=ui.Size.DefaultHeight(0.5),
+            min_width=ui.Size.DefaultWidth(0.5)
+        )
+        self.setObjectName('ExpenseTrackerQualityDockWidget')
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.setSizePolicy(QtWidgets.QSizePolicy.MinimumExpanding, QtWidgets.QSizePolicy.Preferred)
+        self.setProperty('rounded', True)
+
+        self.view: Optional[QtWidgets.QTableView] = None
+        self.summary_label: Optional[QtWidgets.QLabel] = None
+
+        self._create_ui()
+        self._init_model()
+        self._connect_signals()
+
+    def _create_ui(self) -> None:
+        self.layout().setContentsMargins(0, 0, 0, 0)
+        self.layout().setSpacing(0)
+
+        widget = QtWidgets.QWidget(parent=self)
+        QtWidgets.QVBoxLayout(widget)
+
+        o = ui.Size.Margin(1.0)
+        widget.layout().setContentsMargins(o, o, o, o)
+        widget.layout().setSpacing(ui.Size.Margin(0.5))
+
+        widget.setProperty('transparent', True)
+
+        self.summary_label = QtWidgets.QLabel(parent=widget)
+        self.summary_label.setProperty('rounded', True)
+        self.summary_label.setProperty('button', True)
+        self.summary_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.summary_label.setSizePolicy(QtWidgets.QSizePolicy.Maximum, QtWidgets.QSizePolicy.Fixed)
+        widget.layout().addWidget(self.summary_label, 0, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+
+        self.view = QtWidgets.QTableView(parent=widget)
+        self.view.setProperty('rounded', True)
+        self.view.setProperty('transparent', True)
+
+        self.view.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.view.setAlternatingRowColors(False)
+        self.view.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+
+        widget.layout().addWidget(self.view, 1)
+
+        self.setWidget(widget)
+
+    def _init_model(self) -> None:
+        model = QualityModel(parent=self)
+        self.view.setModel(model)
+
+        self.update_summary_label('')
+        self._init_headers()
+
+    def _init_headers(self) -> None:
+        if self.view is None:
+            logging.error('View not initialized before _init_headers call.')
+            return
+
+        v_header = self.view.verticalHeader()
+        h_header = self.view.horizontalHeader()
+
+        v_header.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        v_header.setDefaultSectionSize(ui.Size.RowHeight(0.8))
+        v_header.setVisible(False)
+
+        h_header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        h_header.setStretchLastSection(True)
+
+    def _connect_signals(self) -> None:
+        self.view.model().summaryChanged.connect(self.update_summary_label)
+        self.view.clicked.connect(self.on_item_clicked)
+
+    @QtCore.Slot(QtCore.QModelIndex)
+    def on_item_clicked(self, index: QtCore.QModelIndex) -> None:
+        if not index.isValid():
+            return
+        local_id = index.data(LocalIdRole)
+        if local_id is None:
+            return
+        signals.transactionItemSelected.emit(int(local_id))
+
+    @QtCore.Slot(str)
+    def update_summary_label(self, summary: str) -> None:
+        self.summary_label.setText(summary)
+        self.summary_label.setHidden(not summary)
+
+    def sizeHint(self) -> QtCore.QSize:
+        return QtCore.QSize(
+            ui.Size.DefaultWidth(0.8),
+            ui.Size.DefaultHeight(0.5)
+        )
@@ -116,6 +116,7 @@ class TrendGraph(QtWidgets.QWidget):
         signals.presetAboutToBeActivated.connect(self.clear_data)
         signals.dataAboutToBeFetched.connect(self.clear_data)
         signals.dataFetched.connect(self.init_data)
+        signals.dataAppended.connect(self.init_data)
 
         self._init_data_timer.timeout.connect(self.init_data)
 
@@ -4,6 +4,6 @@ Logging subsystem: handlers, models, and views for application logging.
 Modules:
 
 - :mod:`ExpenseTracker.log.log` – Log handler integrating with Python logging.
-- :mod:`ExpenseTracker.log.model` – Table model and proxy for displaying and filtering in-memory logs.
-- :mod:`ExpenseTracker.log.view` – Qt views and dock widgets for rendering and interacting with log messages.
+- :mod:`ExpenseTracker.log.model` – Table models and proxy for displaying and filtering in-memory logs and stage timings.
+- :mod:`ExpenseTracker.log.view` – Qt views and dock widgets for rendering log messages and per-stage performance timings.
 """
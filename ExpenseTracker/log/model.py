@@ -4,6 +4,8 @@ Provides:
 - Columns, Level, Roles: enums for table structure and roles
 - LogTableModel: polls TankHandler for log entries
 - LogFilterProxyModel: filters and sorts log entries
+- PerformanceModel: polls the stage profiler for per-stage timings
+- RequestModel: polls the request scheduler for per-method Sheets API telemetry
 - get_handler: utility to access the TankHandler
 """
 import enum
@@ -15,6 +17,9 @@ from typing import Any
 from PySide6 import QtCore
 
 from .log import TankHandler
+from ..core import profiler
+from ..core import scheduler
+from ..core import telemetry
 from ..ui import ui
 
 
@@ -36,9 +41,76 @@ class Level(enum.IntEnum):
     CRITICAL = logging.CRITICAL  # 50
 
 
+class PerformanceColumns(enum.IntEnum):
+    """Defines the column indexes for the stage timings table."""
+    Stage = 0
+    Calls = 1
+    Last = 2
+    Median = 3
+    P90 = 4
+    Max = 5
+    Rows = 6
+    PeakMemory = 7
+    Histogram = 8
+
+
+PERFORMANCE_HEADERS = {
+    PerformanceColumns.Stage: 'Stage',
+    PerformanceColumns.Calls: 'Calls',
+    PerformanceColumns.Last: 'Last',
+    PerformanceColumns.Median: 'Median',
+    PerformanceColumns.P90: 'P90',
+    PerformanceColumns.Max: 'Max',
+    PerformanceColumns.Rows: 'Rows',
+    PerformanceColumns.PeakMemory: 'Peak Memory',
+    PerformanceColumns.Histogram: 'Histogram',
+}
+
+
+class RequestColumns(enum.IntEnum):
+    """Defines the column indexes for the Sheets API request table."""
+    Request = 0
+    Calls = 1
+    Retries = 2
+    Errors = 3
+    P50 = 4
+    P95 = 5
+    Bytes = 6
+
+
+REQUEST_HEADERS = {
+    RequestColumns.Request: 'Request',
+    RequestColumns.Calls: 'Calls',
+    RequestColumns.Retries: 'Retries',
+    RequestColumns.Errors: 'Errors',
+    RequestColumns.P50: 'P50',
+    RequestColumns.P95: 'P95',
+    RequestColumns.Bytes: 'Bytes',
+}
+
+
 class Roles:
     """Custom model roles for specialized data."""
     LOG_LEVEL = QtCore.Qt.UserRole + 1
+    HISTOGRAM = QtCore.Qt.UserRole + 2
+    SORT_VALUE = QtCore.Qt.UserRole + 3
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration as milliseconds, or seconds above one second."""
+    if seconds >= 1.0:
+        return f'{seconds:.2f} s'
+    return f'{seconds * 1000.0:.1f} ms'
+
+
+def format_bytes(value: int) -> str:
+    """Format a byte count using binary units."""
+    size = float(value)
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024.0:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024.0
+    return f'{size:.1f} GiB'
 
 
 def get_handler():
@@ -327,6 +399,257 @@ class LogFilterProxyModel(QtCore.QSortFilterProxyModel):
         return left_str < right_str
 
 
+class PerformanceModel(QtCore.QAbstractTableModel):
+    """A model of per-stage timings aggregated from the stage profiler's ring buffer.
+
+    Each row summarizes one stage over the buffered records. The model polls the profiler
+    and only resets when new records have arrived.
+    """
+
+    def __init__(self, parent: Any = None, fetch_interval_ms: int = 1000, bins: int = 12):
+        """
+        Initializes the PerformanceModel.
+
+        Args:
+            parent (Any, optional): Parent QObject. Defaults to None.
+            fetch_interval_ms (int, optional): Interval in ms to poll the profiler. Defaults to 1000.
+            bins (int, optional): Number of histogram bins per stage. Defaults to 12.
+        """
+        super().__init__(parent=parent)
+        self._stages: list[profiler.StageSummary] = []
+        self._generation = -1
+        self._bins = bins
+        self._is_paused = False
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(fetch_interval_ms)
+
+    @QtCore.Slot()
+    def pause(self) -> None:
+        """Pauses polling the profiler."""
+        self._is_paused = True
+
+    @QtCore.Slot()
+    def resume(self) -> None:
+        """Resumes polling the profiler."""
+        self._is_paused = False
+        self.refresh()
+
+    @QtCore.Slot()
+    def refresh(self) -> None:
+        """Reloads the stage summaries if the profiler recorded anything new."""
+        if self._is_paused or profiler.profiler.generation == self._generation:
+            return
+        self._generation = profiler.profiler.generation
+
+        self.beginResetModel()
+        self._stages = list(profiler.profiler.summary().values())
+        self.endResetModel()
+
+    @QtCore.Slot()
+    def clear(self) -> None:
+        """Clears the profiler's records and the model."""
+        profiler.profiler.clear()
+        self._generation = -1
+        self.refresh()
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._stages)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(PerformanceColumns)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self._stages):
+            return None
+
+        item = self._stages[index.row()]
+        column = index.column()
+
+        if role == QtCore.Qt.TextAlignmentRole:
+            if column == PerformanceColumns.Stage:
+                return QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter
+            return QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+
+        if role == QtCore.Qt.FontRole:
+            font, _ = ui.Font.LightFont(ui.Size.SmallText(1.0))
+            return font
+
+        if role == Roles.HISTOGRAM:
+            return item.histogram(self._bins)
+
+        if role == Roles.SORT_VALUE:
+            return {
+                PerformanceColumns.Stage: item.stage,
+                PerformanceColumns.Calls: item.calls,
+                PerformanceColumns.Last: item.last,
+                PerformanceColumns.Median: item.median,
+                PerformanceColumns.P90: item.p90,
+                PerformanceColumns.Max: item.max,
+                PerformanceColumns.Rows: item.last_rows if item.last_rows is not None else -1,
+                PerformanceColumns.PeakMemory: item.peak_bytes if item.peak_bytes is not None else -1,
+                PerformanceColumns.Histogram: item.max,
+            }[PerformanceColumns(column)]
+
+        if role == QtCore.Qt.ToolTipRole and column == PerformanceColumns.Histogram:
+            return f'Distribution of the last {item.calls} timings, {format_seconds(min(item.durations))} ' \
+                   f'to {format_seconds(item.max)}'
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == PerformanceColumns.Stage:
+                return item.stage
+            if column == PerformanceColumns.Calls:
+                return str(item.calls)
+            if column == PerformanceColumns.Last:
+                return format_seconds(item.last)
+            if column == PerformanceColumns.Median:
+                return format_seconds(item.median)
+            if column == PerformanceColumns.P90:
+                return format_seconds(item.p90)
+            if column == PerformanceColumns.Max:
+                return format_seconds(item.max)
+            if column == PerformanceColumns.Rows:
+                return f'{item.last_rows:,}' if item.last_rows is not None else ''
+            if column == PerformanceColumns.PeakMemory:
+                return format_bytes(item.peak_bytes) if item.peak_bytes is not None else ''
+        return None
+
+    def headerData(self, section: int, orientation, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            try:
+                return PERFORMANCE_HEADERS[PerformanceColumns(section)]
+            except ValueError:
+                return None
+        return super().headerData(section, orientation, role)
+
+
+class RequestModel(QtCore.QAbstractTableModel):
+    """A model of Sheets API request telemetry aggregated per method.
+
+    Polls the request scheduler's ring buffer and only resets when new requests were recorded.
+    :attr:`refreshes` holds the requests and bytes of each recent refresh.
+    """
+
+    def __init__(self, parent: Any = None, fetch_interval_ms: int = 1000):
+        """
+        Initializes the RequestModel.
+
+        Args:
+            parent (Any, optional): Parent QObject. Defaults to None.
+            fetch_interval_ms (int, optional): Interval in ms to poll the scheduler. Defaults to 1000.
+        """
+        super().__init__(parent=parent)
+        self._requests: list[telemetry.RequestStats] = []
+        self.refreshes: list[telemetry.RefreshStats] = []
+        self._generation = -1
+        self._is_paused = False
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(fetch_interval_ms)
+
+    @QtCore.Slot()
+    def pause(self) -> None:
+        """Pauses polling the scheduler."""
+        self._is_paused = True
+
+    @QtCore.Slot()
+    def resume(self) -> None:
+        """Resumes polling the scheduler."""
+        self._is_paused = False
+        self.refresh()
+
+    @QtCore.Slot()
+    def refresh(self) -> None:
+        """Reloads the request summaries if the scheduler recorded anything new."""
+        if self._is_paused or scheduler.scheduler.generation == self._generation:
+            return
+        self._generation = scheduler.scheduler.generation
+
+        self.beginResetModel()
+        records = scheduler.scheduler.records()
+        self._requests = list(telemetry.summary(records).values())
+        self.refreshes = telemetry.refreshes(records)
+        self.endResetModel()
+
+    @QtCore.Slot()
+    def clear(self) -> None:
+        """Clears the scheduler's records and the model."""
+        scheduler.scheduler.clear()
+        self._generation = -1
+        self.refresh()
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._requests)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(RequestColumns)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self._requests):
+            return None
+
+        item = self._requests[index.row()]
+        column = index.column()
+
+        if role == QtCore.Qt.TextAlignmentRole:
+            if column == RequestColumns.Request:
+                return QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter
+            return QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+
+        if role == QtCore.Qt.FontRole:
+            font, _ = ui.Font.LightFont(ui.Size.SmallText(1.0))
+            return font
+
+        if role == Roles.SORT_VALUE:
+            return {
+                RequestColumns.Request: item.name,
+                RequestColumns.Calls: item.calls,
+                RequestColumns.Retries: item.retries,
+                RequestColumns.Errors: item.errors,
+                RequestColumns.P50: item.p50,
+                RequestColumns.P95: item.p95,
+                RequestColumns.Bytes: item.bytes,
+            }[RequestColumns(column)]
+
+        if role == QtCore.Qt.ToolTipRole and column == RequestColumns.Request:
+            return f'{item.ranges} range(s) in {item.calls} call(s), {format_seconds(item.total_seconds)} in total'
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == RequestColumns.Request:
+                return item.name
+            if column == RequestColumns.Calls:
+                return str(item.calls)
+            if column == RequestColumns.Retries:
+                return str(item.retries)
+            if column == RequestColumns.Errors:
+                return str(item.errors)
+            if column == RequestColumns.P50:
+                return format_seconds(item.p50)
+            if column == RequestColumns.P95:
+                return format_seconds(item.p95)
+            if column == RequestColumns.Bytes:
+                return format_bytes(item.bytes)
+        return None
+
+    def headerData(self, section: int, orientation, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            try:
+                return REQUEST_HEADERS[RequestColumns(section)]
+            except ValueError:
+                return None
+        return super().headerData(section, orientation, role)
+
+
 class LogEntryModel(QtCore.QAbstractTableModel):
     """Model for displaying a single log entry."""
 
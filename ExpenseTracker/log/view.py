@@ -3,6 +3,8 @@
 This module provides:
     - LogTableView: table view for formatted log entries
     - LogDockWidget: dockable container with filtering and clear actions
+    - PerformanceDockWidget: per-stage timings and histograms from the stage profiler, and
+      per-method Sheets API request telemetry
 """
 import logging
 
@@ -11,6 +13,10 @@ from PySide6 import QtCore, QtWidgets, QtGui
 from . import log
 from .model import LogFilterProxyModel, Columns
 from .model import LogTableModel, get_handler, LogEntryModel
+from .model import PerformanceModel, PerformanceColumns, Roles
+from .model import RequestModel, RequestColumns, format_bytes, format_seconds
+from ..core import profiler
+from ..core import telemetry
 from ..ui import ui
 from ..ui.dockable_widget import DockableWidget
 
@@ -287,6 +293,214 @@ class LogDockWidget(DockableWidget):
             model.pause()
 
 
+class HistogramDelegate(ui.RoundedRowDelegate):
+    """Paints the histogram column of the performance table as a bar chart."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(
+            first_column=0,
+            last_column=-1,
+            parent=parent
+        )
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> None:
+        if index.column() != PerformanceColumns.Histogram.value:
+            super().paint(painter, option, index)
+            return
+
+        counts = index.data(Roles.HISTOGRAM) or []
+        peak = max(counts) if counts else 0
+        if not peak:
+            return
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(ui.Color.Blue())
+
+        o = ui.Size.Indicator(1.0)
+        rect = option.rect.adjusted(o, o, -o, -o)
+        width = rect.width() / len(counts)
+        for i, count in enumerate(counts):
+            if not count:
+                continue
+            height = max(rect.height() * count / peak, o)
+            bar = QtCore.QRectF(
+                rect.left() + i * width + o * 0.5,
+                rect.bottom() - height,
+                max(width - o, 1.0),
+                height
+            )
+            painter.drawRoundedRect(bar, o * 0.5, o * 0.5)
+        painter.restore()
+
+
+class PerformanceTableView(QtWidgets.QTableView):
+    """A QTableView displaying per-stage timings from PerformanceModel."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+
+        self.setItemDelegate(HistogramDelegate(parent=self))
+        self.setProperty('noitembackground', True)
+        self.setProperty('rounded', True)
+
+        proxy = QtCore.QSortFilterProxyModel(self)
+        proxy.setSourceModel(PerformanceModel(parent=self))
+        proxy.setSortRole(Roles.SORT_VALUE)
+        self.setModel(proxy)
+
+        self._init_headers()
+
+    def _init_headers(self):
+        header = self.horizontalHeader()
+        header.setDefaultAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+        header.setDefaultSectionSize(ui.Size.DefaultWidth(0.12))
+        header.setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        header.setSectionResizeMode(PerformanceColumns.Stage.value, QtWidgets.QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(PerformanceColumns.Histogram.value, QtWidgets.QHeaderView.Stretch)
+
+        self.setSortingEnabled(True)
+        self.sortByColumn(PerformanceColumns.Median, QtCore.Qt.DescendingOrder)
+
+        header = self.verticalHeader()
+        header.setDefaultSectionSize(ui.Size.RowHeight(1.0))
+        header.setHidden(True)
+
+    def sizeHint(self):
+        return QtCore.QSize(
+            ui.Size.DefaultWidth(1.0),
+            ui.Size.DefaultHeight(0.5)
+        )
+
+
+class RequestTableView(QtWidgets.QTableView):
+    """A QTableView displaying per-method Sheets API telemetry from RequestModel."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+
+        self.setItemDelegate(ui.RoundedRowDelegate(first_column=0, last_column=-1, parent=self))
+        self.setProperty('noitembackground', True)
+        self.setProperty('rounded', True)
+
+        proxy = QtCore.QSortFilterProxyModel(self)
+        proxy.setSourceModel(RequestModel(parent=self))
+        proxy.setSortRole(Roles.SORT_VALUE)
+        self.setModel(proxy)
+
+        self._init_headers()
+
+    def _init_headers(self):
+        header = self.horizontalHeader()
+        header.setDefaultAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+        header.setDefaultSectionSize(ui.Size.DefaultWidth(0.12))
+        header.setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        header.setSectionResizeMode(RequestColumns.Request.value, QtWidgets.QHeaderView.ResizeToContents)
+        header.setStretchLastSection(True)
+
+        self.setSortingEnabled(True)
+        self.sortByColumn(RequestColumns.P95, QtCore.Qt.DescendingOrder)
+
+        header = self.verticalHeader()
+        header.setDefaultSectionSize(ui.Size.RowHeight(1.0))
+        header.setHidden(True)
+
+    def sizeHint(self):
+        return QtCore.QSize(
+            ui.Size.DefaultWidth(1.0),
+            ui.Size.DefaultHeight(0.25)
+        )
+
+
+class PerformanceDockWidget(DockableWidget):
+    """Dockable widget showing per-stage timings of recent refreshes."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__('Performance', parent)
+        self.setObjectName('ExpenseTrackerPerformanceDockWidget')
+
+        widget = QtWidgets.QWidget(self)
+        widget.setProperty('rounded', True)
+
+        QtWidgets.QVBoxLayout(widget)
+        widget.layout().setContentsMargins(0, 0, 0, 0)
+        widget.layout().setSpacing(0)
+
+        self.view = PerformanceTableView(widget)
+        self.view.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+        widget.layout().addWidget(self.view, 2)
+
+        self.request_view = RequestTableView(widget)
+        self.request_view.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+        widget.layout().addWidget(self.request_view, 1)
+
+        o = ui.Size.Indicator(1.0)
+        self.refresh_label = QtWidgets.QLabel(widget)
+        self.refresh_label.setContentsMargins(o, o, o, o)
+        widget.layout().addWidget(self.refresh_label, 0)
+
+        self.setWidget(widget)
+
+        self._init_actions()
+        self._connect_signals()
+
+    def _connect_signals(self) -> None:
+        self.visibilityChanged.connect(self.on_visibility_changed)
+        self.request_view.model().sourceModel().modelReset.connect(self.update_refresh_label)
+
+    def _init_actions(self) -> None:
+        model = self.view.model().sourceModel()
+
+        action = QtGui.QAction('Track Allocations', self)
+        action.setCheckable(True)
+        action.setChecked(profiler.Profiler.track_allocations())
+        action.setToolTip('Record peak allocations per stage (slows down processing while enabled)')
+        action.toggled.connect(profiler.Profiler.set_track_allocations)
+        self.view.addAction(action)
+
+        action = QtGui.QAction('Clear Timings', self)
+        action.setIcon(ui.get_icon('btn_delete'))
+        action.setToolTip('Clear all recorded stage timings')
+        action.triggered.connect(model.clear)
+        self.view.addAction(action)
+
+        action = QtGui.QAction('Clear Requests', self)
+        action.setIcon(ui.get_icon('btn_delete'))
+        action.setToolTip('Clear all recorded Sheets API requests')
+        action.triggered.connect(self.request_view.model().sourceModel().clear)
+        self.request_view.addAction(action)
+
+    @QtCore.Slot()
+    def update_refresh_label(self) -> None:
+        """Shows the requests and bytes of the last refresh and the mean bytes per refresh."""
+        refreshes = self.request_view.model().sourceModel().refreshes
+        if not refreshes:
+            self.refresh_label.setText('No refreshes recorded')
+            return
+        last = refreshes[-1]
+        self.refresh_label.setText(
+            f'Last refresh: {last.requests} request(s), {format_bytes(last.bytes)} in '
+            f'{format_seconds(last.seconds)}  |  Mean: {format_bytes(telemetry.bytes_per_refresh(refreshes))} '
+            f'per refresh over {len(refreshes)}'
+        )
+
+    @QtCore.Slot(bool)
+    def on_visibility_changed(self, visible: bool) -> None:
+        for view in (self.view, self.request_view):
+            model = view.model().sourceModel()
+            if visible:
+                model.resume()
+            else:
+                model.pause()
+
+
 class LogEntryViewDelegate(ui.RoundedRowDelegate):
 
     def createEditor(self, parent, option, index):
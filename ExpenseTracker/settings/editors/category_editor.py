@@ -541,9 +541,7 @@ class CategoryEditor(QtWidgets.QWidget):
         self.view.verticalHeader().setVisible(False)
 
     def _init_actions(self):
-        def sync_action():
-            from ...core import service
-            categories = service.fetch_categories()
+        def on_categories(categories: list) -> None:
             if categories:
                 msg = (f'Found {len(categories)} categories in the remote spreadsheet.\n\n'
                        'Do you want to replace and override the current definition? '
@@ -572,6 +570,13 @@ class CategoryEditor(QtWidgets.QWidget):
                     return
                 lib.settings.set_section('categories', data)
 
+        def sync_action():
+            from ...core import service
+
+            # Failures are reported by the service
+            handle = service.fetch_categories()
+            handle.finished.connect(on_categories)
+
         action = QtGui.QAction('Sync', self)
         action.setShortcut('Ctrl+S')
         action.setStatusTip('Sync categories from the remote spreadsheet')
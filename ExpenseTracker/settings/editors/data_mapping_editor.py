@@ -341,20 +341,26 @@ class DataMappingEditor(QtWidgets.QWidget):
         action.setEnabled(False)
         self.addAction(action)
 
+        @QtCore.Slot(object)
+        def on_verified(_: object) -> None:
+            QtWidgets.QMessageBox.information(
+                self.parent() or None,
+                'Mapping OK',
+                'Header mapping is valid.')
+
+        @QtCore.Slot(object)
+        def on_failed(ex: Exception) -> None:
+            QtWidgets.QMessageBox.critical(
+                self.parent() or None,
+                'Mapping Error',
+                f'Mapping verification failed: {ex}')
+
         @QtCore.Slot()
         def verify() -> None:
             from ...core import service
-            try:
-                service.verify_mapping()
-                QtWidgets.QMessageBox.information(
-                    self.parent() or None,
-                    'Mapping OK',
-                    'Header mapping is valid.')
-            except Exception as ex:
-                QtWidgets.QMessageBox.critical(
-                    self.parent() or None,
-                    'Mapping Error',
-                    f'Mapping verification failed: {ex}')
+            handle = service.verify_mapping()
+            handle.finished.connect(on_verified)
+            handle.failed.connect(on_failed)
 
         action = QtGui.QAction('Verify Mapping...', self)
         action.setShortcut('Ctrl+M')
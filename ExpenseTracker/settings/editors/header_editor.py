@@ -6,6 +6,7 @@ Provides:
 """
 import ast
 import logging
+from typing import Any
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -459,19 +460,24 @@ class HeaderEditor(QtWidgets.QWidget):
         self.toolbar.addAction(action)
         self.addAction(action)
 
-        @QtCore.Slot()
-        def sync_action():
-            try:
-                headers = service.fetch_headers()
-            except Exception as e:
-                logging.error(f'Failed to load header definitions: {e}')
-                QtWidgets.QMessageBox.critical(
-                    self,
-                    'Error',
-                    f'Failed to load header definitions: {e}'
-                )
-                raise RuntimeError(f'Failed to load header definitions: {e}') from e
+        def apply_headers(headers: list, guesses: dict) -> None:
+            data = {k: guesses[k].type if k in guesses else 'string' for k in headers}
 
+            lib.settings.set_section('header', data)
+
+            uncertain = [k for k in headers if k not in guesses or guesses[k].confidence < 0.9]
+            msg = f'Found {len(headers)} header columns.'
+            if uncertain:
+                msg += f' Verify the detected data types of: {", ".join(uncertain)}.'
+            QtWidgets.QMessageBox.information(
+                self,
+                'Sync Headers Complete',
+                msg,
+                QtWidgets.QMessageBox.Ok
+            )
+
+        @QtCore.Slot(object)
+        def on_headers(headers: list) -> None:
             if not headers:
                 logging.warning('No header definitions found.')
                 QtWidgets.QMessageBox.warning(
@@ -481,19 +487,31 @@ class HeaderEditor(QtWidgets.QWidget):
                 )
                 return
 
-            # Convert List to header -> type mapping Dict with a default string type
-            data = {k: 'string' for k in headers}
+            @QtCore.Slot(object)
+            def on_types_failed(e: Exception) -> None:
+                logging.warning(f'Failed to detect the header types: {e}')
+                apply_headers(headers, {})
 
-            lib.settings.set_section('header', data)
+            # Types are inferred from a sample of the rows, unknown columns default to string
+            handle = service.infer_header_types()
+            handle.finished.connect(lambda guesses: apply_headers(headers, guesses))
+            handle.failed.connect(on_types_failed)
 
-            msg = f'Found {len(headers)} header columns. Dont\' forget to verify and set the column data types.'
-            QtWidgets.QMessageBox.information(
+        @QtCore.Slot(object)
+        def on_headers_failed(e: Exception) -> None:
+            logging.error(f'Failed to load header definitions: {e}')
+            QtWidgets.QMessageBox.critical(
                 self,
-                'Sync Headers Complete',
-                msg,
-                QtWidgets.QMessageBox.Ok
+                'Error',
+                f'Failed to load header definitions: {e}'
             )
 
+        @QtCore.Slot()
+        def sync_action():
+            handle = service.fetch_headers()
+            handle.finished.connect(on_headers)
+            handle.failed.connect(on_headers_failed)
+
         action = QtGui.QAction('Sync', self)
         action.setShortcut('Ctrl+L')
         action.setShortcutContext(QtCore.Qt.WidgetWithChildrenShortcut)
@@ -503,24 +521,30 @@ class HeaderEditor(QtWidgets.QWidget):
         self.toolbar.addAction(action)
         self.addAction(action)
 
+        @QtCore.Slot(object)
+        def on_headers_verified(_: Any) -> None:
+            msg = 'Header definitions are valid.'
+            logging.debug(msg)
+            QtWidgets.QMessageBox.information(
+                self,
+                'Verify Headers',
+                msg,
+                QtWidgets.QMessageBox.Ok
+            )
+
+        @QtCore.Slot(object)
+        def on_verify_failed(e: Exception) -> None:
+            QtWidgets.QMessageBox.critical(
+                self,
+                'Error',
+                f'Failed to verify header definitions: {e}'
+            )
+
         @QtCore.Slot()
         def verify_headers_action():
-            try:
-                service.verify_headers()
-                msg = 'Header definitions are valid.'
-                logging.debug(msg)
-                QtWidgets.QMessageBox.information(
-                    self,
-                    'Verify Headers',
-                    msg,
-                    QtWidgets.QMessageBox.Ok
-                )
-            except Exception as e:
-                QtWidgets.QMessageBox.critical(
-                    self,
-                    'Error',
-                    f'Failed to verify header definitions: {e}'
-                )
+            handle = service.verify_headers()
+            handle.finished.connect(on_headers_verified)
+            handle.failed.connect(on_verify_failed)
 
         action = QtGui.QAction('Verify', self)
         action.setShortcut('Ctrl+I')
@@ -145,6 +145,10 @@ class SpreadsheetEditor(QtWidgets.QWidget):
         if not id_text:
             return
 
+        from ...core import localsheets
+        if localsheets.is_local(id_text):
+            return
+
         id_re = r'(?:(?:https?://)?docs\.google\.com/spreadsheets/d/|/d/)([a-zA-Z0-9\-_]+)'
         match = re.search(id_re, id_text)
         result = match.group(1) if match else None
@@ -4,6 +4,7 @@ Provides:
     - Schema validation and enforcement for ledger.json structure.
     - Loading, saving, reverting, and managing application settings.
     - Preset handling for bundling and loading client_secret.json and ledger.json.
+    - Read-only, versioned settings snapshots for hot paths.
     - Constants for column names and data schemas.
 """
 import copy
@@ -13,7 +14,8 @@ import pathlib
 import re
 import shutil
 import tempfile
-from typing import Dict, Any, Optional, List
+import types
+from typing import Dict, Any, Optional, List, Tuple
 
 from PySide6 import QtCore, QtWidgets
 
@@ -38,8 +40,10 @@ EXPENSE_DATA_COLUMNS: List[str] = ['category', 'total', 'transactions', 'descrip
 DATA_MAPPING_KEYS: List[str] = ['date', 'amount', 'description', 'category', 'account']
 TRANSACTION_DATA_COLUMNS: List[str] = DATA_MAPPING_KEYS + ['local_id', ]
 TREND_DATA_COLUMNS: List[str] = ['category', 'month', 'monthly_total', 'loess']
+ROLLING_STATS_COLUMNS: List[str] = ['category', 'month', 'mean', 'median', 'std', 'p90']
 
 DATA_MAPPING_SEPARATOR_CHARS: List[str] = ['|', '+']
+_MERGE_MAPPING_SPLIT = re.compile('|'.join(map(re.escape, DATA_MAPPING_SEPARATOR_CHARS)))
 
 HEADER_TYPES: List[str] = ['string', 'int', 'float', 'date']
 
@@ -126,9 +130,7 @@ def parse_merge_mapping(key: str) -> list[str]:
     Returns:
         list[str]: List of header names extracted from key.
     """
-    import re
-    pattern = '|'.join(map(re.escape, DATA_MAPPING_SEPARATOR_CHARS))
-    parts = re.split(pattern, key or '')
+    parts = _MERGE_MAPPING_SPLIT.split(key or '')
     return [f.strip() for f in parts if f and f.strip()]
 
 
@@ -137,6 +139,45 @@ def is_merge_mapped(key: str) -> bool:
     return (len(parse_merge_mapping(key)) > 1)
 
 
+class MappingPlan:
+    """The 'mapping' section compiled into source columns per logical key.
+
+    Every key of :data:`DATA_MAPPING_KEYS` is present, followed by any other configured keys.
+    Built once per settings change, see :attr:`SettingsSnapshot.mapping_plan`.
+
+    Attributes:
+        columns: Source columns of each logical key, in merge order.
+        merged_keys: Logical keys mapped to more than one source column.
+    """
+    __slots__ = ('columns', 'merged_keys', '_keys_by_column')
+
+    def __init__(self, mapping: Dict[str, str]) -> None:
+        columns: Dict[str, Tuple[str, ...]] = {k: () for k in DATA_MAPPING_KEYS}
+        for key, spec in mapping.items():
+            columns[key] = tuple(parse_merge_mapping(str(spec)))
+
+        keys_by_column: Dict[str, List[str]] = {}
+        for key, sources in columns.items():
+            for column in sources:
+                keys_by_column.setdefault(column, []).append(key)
+
+        self.columns = types.MappingProxyType(columns)
+        self.merged_keys = frozenset(k for k, v in columns.items() if len(v) > 1)
+        self._keys_by_column = types.MappingProxyType({k: tuple(v) for k, v in keys_by_column.items()})
+
+    def sources(self, key: str) -> Tuple[str, ...]:
+        """Return the source columns of a logical key, or an empty tuple if it is not mapped."""
+        return self.columns.get(key, ())
+
+    def keys_of(self, column: str) -> Tuple[str, ...]:
+        """Return the logical keys a source column is mapped to."""
+        return self._keys_by_column.get(column, ())
+
+    def is_merged_column(self, column: str) -> bool:
+        """Return True if the source column is part of a merged mapping."""
+        return any(k in self.merged_keys for k in self.keys_of(column))
+
+
 
 def _validate_header(header_dict: Dict[str, Any], allowed_values: List[str]) -> None:
     """Validate the 'header' section of the ledger configuration.
@@ -260,6 +301,78 @@ def _validate_categories(categories_dict: Dict[str, Any], item_schema: Dict[str,
                     raise ValueError(msg)
 
 
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy of nested dicts and lists."""
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class SettingsSnapshot:
+    """Immutable view of the ledger settings at one point in time.
+
+    Built once per settings change by :attr:`SettingsAPI.snapshot`, so hot paths can read
+    settings without copying sections or re-validating metadata types. Metadata values are
+    exposed as attributes, e.g. ``snapshot.locale``; values of the wrong type read as None,
+    like :meth:`SettingsAPI.__getitem__`.
+
+    Attributes:
+        version: Incremented every time the settings change.
+        header: Read-only header section.
+        mapping: Read-only mapping section.
+        categories: Read-only categories section.
+        metadata: Read-only metadata section.
+        spreadsheet: Read-only spreadsheet section.
+        mapping_plan: The compiled mapping section.
+        mapped_columns: Source columns of each mapping key, see :func:`parse_merge_mapping`.
+        category_order: Position of each configured category.
+        excluded_categories: Names of the categories marked as excluded.
+    """
+    __slots__ = (
+        'version', 'header', 'mapping', 'categories', 'metadata', 'spreadsheet',
+        'mapping_plan', 'mapped_columns', 'category_order', 'excluded_categories', *METADATA_KEYS
+    )
+
+    def __init__(self, version: int, ledger_data: Dict[str, Any]) -> None:
+        values: Dict[str, Any] = {'version': version}
+        for section in ('header', 'mapping', 'categories', 'metadata', 'spreadsheet'):
+            values[section] = _freeze(ledger_data.get(section) or {})
+
+        metadata = values['metadata']
+        for key in METADATA_KEYS:
+            _type = LEDGER_SCHEMA['metadata']['item_schema'][key]['type']
+            v = metadata.get(key)
+            if not isinstance(v, _type):
+                logging.error(f'Metadata key "{key}" is not of type {_type}, got {type(v)}.')
+                v = None
+            values[key] = v
+
+        values['mapping_plan'] = MappingPlan(values['mapping'])
+        values['mapped_columns'] = values['mapping_plan'].columns
+        values['category_order'] = types.MappingProxyType(
+            {k: i for i, k in enumerate(values['categories'])}
+        )
+        values['excluded_categories'] = frozenset(
+            k for k, v in values['categories'].items() if v.get('excluded')
+        )
+
+        for k, v in values.items():
+            object.__setattr__(self, k, v)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError('SettingsSnapshot is read-only.')
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError('SettingsSnapshot is read-only.')
+
+    def mapped_column(self, key: str) -> str:
+        """Return the first source column mapped to a logical key, or an empty string."""
+        columns = self.mapped_columns.get(key, ())
+        return columns[0] if columns else ''
+
+
 class ConfigPaths:
     """Manage app file paths and ensure default templates and directories exist.
 
@@ -421,6 +534,9 @@ class SettingsAPI(ConfigPaths):
 
         self._signals_blocked: bool = False
 
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._version: int = 0
+
         self.ledger_data: Dict[str, Any] = {}
         for k in LEDGER_SCHEMA.keys():
             self.ledger_data[k] = {}
@@ -450,19 +566,8 @@ class SettingsAPI(ConfigPaths):
         if 'metadata' not in self.ledger_data:
             raise RuntimeError('Malformed ledger data, missing "metadata" section.')
 
-        # Verify type
-        _type = LEDGER_SCHEMA['metadata']['item_schema'].get(key, {}).get('type', None)
-        if _type is None:
-            logging.error(f'Metadata key "{key}" is not defined in schema.')
-            return None
-
-        v = self.ledger_data['metadata'].get(key)
-
-        if _type and not isinstance(v, _type):
-            logging.error(f'Metadata key "{key}" is not of type {_type}, got {type(v)}.')
-            return None
-
-        return v
+        # Types are verified once when the snapshot is built
+        return getattr(self.snapshot, key)
 
     def __setitem__(self, key: str, value: Any) -> None:
         """Assign a metadata value using dictionary-style access and persist it.
@@ -509,6 +614,7 @@ class SettingsAPI(ConfigPaths):
                 value = bool(value)
 
         self.ledger_data['metadata'][key] = value
+        self.invalidate_snapshot()
         self.save_section('metadata')
 
         if self._signals_blocked:
@@ -523,6 +629,26 @@ class SettingsAPI(ConfigPaths):
 
         signals.presetsChanged.connect(self.init_data)
         signals.presetActivated.connect(self.init_data)
+        signals.configSectionChanged.connect(self.invalidate_snapshot)
+        signals.metadataChanged.connect(self.invalidate_snapshot)
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        """Read-only snapshot of the current ledger settings.
+
+        The snapshot is rebuilt lazily after the settings change, so repeated reads are O(1)
+        and never copy or re-validate the sections. Use it on hot paths instead of
+        :meth:`get_section` and item access.
+        """
+        if self._snapshot is None:
+            self._snapshot = SettingsSnapshot(self._version, self.ledger_data)
+        return self._snapshot
+
+    @QtCore.Slot()
+    def invalidate_snapshot(self, *args: Any) -> None:
+        """Discard the current snapshot; the next access builds a new version."""
+        self._version += 1
+        self._snapshot = None
 
     def block_signals(self, v: bool) -> None:
         """Enable or disable emission of configuration change signals.
@@ -566,6 +692,7 @@ class SettingsAPI(ConfigPaths):
             with self.ledger_path.open('r', encoding='utf-8') as f:
                 data: Dict[str, Any] = json.load(f)
             self.ledger_data = data
+            self.invalidate_snapshot()
             self.validate_ledger_data()
             return self.ledger_data
 
@@ -724,6 +851,7 @@ class SettingsAPI(ConfigPaths):
 
             # All required keys present; update and save
             self.ledger_data[section_name] = new_data
+            self.invalidate_snapshot()
             self.save_section(section_name)
             signals.configSectionChanged.emit(section_name)
 
@@ -737,6 +865,7 @@ class SettingsAPI(ConfigPaths):
         current_section_data: Dict[str, Any] = self.ledger_data.get(section_name).copy()
 
         self.ledger_data[section_name] = new_data
+        self.invalidate_snapshot()
         try:
             self.validate_ledger_data()
             self.save_section(section_name)
@@ -745,6 +874,7 @@ class SettingsAPI(ConfigPaths):
         except (ValueError, TypeError) as e:
             logging.error(f'Validation error on set_section("{section_name}"): {e}')
             self.ledger_data[section_name] = current_section_data
+            self.invalidate_snapshot()
             raise
 
     def reload_section(self, section_name: str) -> None:
@@ -776,6 +906,7 @@ class SettingsAPI(ConfigPaths):
                 data: Dict[str, Any] = json.load(f)
             self.validate_ledger_data(data=data)
             self.ledger_data[section_name] = data[section_name]
+            self.invalidate_snapshot()
 
             signals.configSectionChanged.emit(section_name)
 
@@ -816,6 +947,7 @@ class SettingsAPI(ConfigPaths):
 
         # Revert to template data
         self.ledger_data[section_name] = template_data[section_name]
+        self.invalidate_snapshot()
         self.save_section(section_name)
 
         signals.configSectionChanged.emit(section_name)
@@ -861,6 +993,8 @@ class SettingsAPI(ConfigPaths):
 
         with self.ledger_path.open('w', encoding='utf-8') as f:
             json.dump(new_data, f, indent=4, ensure_ascii=False)
+        # The section may have been edited in place
+        self.invalidate_snapshot()
 
     def save_all(self) -> None:
         """Save both ledger.json and client_secret.json atomically, with rollback on failure.
@@ -880,6 +1014,7 @@ class SettingsAPI(ConfigPaths):
         except (ValueError, TypeError) as e:
             logging.error(f'Failed to save ledger: {e}. Rolling back.')
             self.ledger_data = original_ledger_data
+            self.invalidate_snapshot()
             raise
 
         self.validate_client_secret(self.client_secret_data)
@@ -4,14 +4,19 @@ Provides:
     - get_currency_from_locale: map locale to default currency code.
     - format_float: format decimal numbers per locale conventions.
     - format_currency_value: format currency values based on locale.
+    - format_currency_many: format a sequence of currency values in one call.
+    - get_locale / get_currency_formatter: memoized babel locales and currency patterns.
     - parse_date: parse date strings into datetime objects.
     - CURRENCY_MAP and LOCALE_MAP for default mappings.
 """
 import datetime
+import functools
 import logging
+from dataclasses import dataclass
 from datetime import date
-from typing import List
+from typing import Any, Hashable, Iterable, List
 
+import pandas as pd
 from babel import Locale, numbers, dates
 
 CURRENCY_MAP: dict[str, str] = {
@@ -72,6 +77,9 @@ LOCALE_MAP: List[str] = [
     "zh_CN",
 ]
 
+#: Number of formatted currency strings kept by :func:`format_currency_value`
+CURRENCY_CACHE_SIZE = 8192
+
 
 def get_currency_from_locale(locale: str) -> str:
     """
@@ -102,7 +110,7 @@ def format_float(value: float, locale: str) -> str:
         str: The formatted decimal string.
     """
     try:
-        locale_obj = Locale.parse(locale)
+        locale_obj = get_locale(locale)
         formatted_value = numbers.format_decimal(value, locale=locale_obj)
         return formatted_value
     except Exception as e:
@@ -110,11 +118,68 @@ def format_float(value: float, locale: str) -> str:
         return str(value)
 
 
+@functools.lru_cache(maxsize=None)
+def get_locale(locale: str) -> Locale:
+    """
+    Return the parsed babel Locale of a locale string, parsing each locale only once.
+
+    Args:
+        locale (str): Locale string, e.g. 'en_US'.
+
+    Returns:
+        Locale: The parsed locale.
+    """
+    return Locale.parse(locale)
+
+
+@dataclass(frozen=True)
+class CurrencyFormatter:
+    """
+    Pre-parsed locale, default currency and standard currency pattern of a locale.
+
+    Attributes:
+        locale (Locale): The parsed locale.
+        currency (str): Currency code, see :func:`get_currency_from_locale`.
+        pattern (numbers.NumberPattern): The locale's standard currency pattern.
+    """
+    locale: Locale
+    currency: str
+    pattern: numbers.NumberPattern
+
+    def format(self, value: Any) -> str:
+        """Format a value, equivalent to :func:`babel.numbers.format_currency` with the defaults."""
+        return self.pattern.apply(value, self.locale, currency=self.currency)
+
+
+@functools.lru_cache(maxsize=None)
+def get_currency_formatter(locale: str) -> CurrencyFormatter:
+    """
+    Return the memoized currency formatter of a locale.
+
+    Args:
+        locale (str): Locale string, e.g. 'fr_FR'.
+
+    Returns:
+        CurrencyFormatter: The formatter.
+
+    Raises:
+        Exception: If the locale cannot be parsed or has no standard currency format.
+    """
+    locale_obj = get_locale(locale)
+    return CurrencyFormatter(locale_obj, get_currency_from_locale(locale), locale_obj.currency_formats['standard'])
+
+
+@functools.lru_cache(maxsize=CURRENCY_CACHE_SIZE, typed=True)
+def _format_currency_cached(value: Any, locale: str) -> str:
+    return get_currency_formatter(locale).format(value)
+
+
 def format_currency_value(value: float, locale: str) -> str:
     """
     Format a float as a currency string based on the locale's default currency.
 
-    The default currency is determined by the territory extracted from the locale.
+    The default currency is determined by the territory extracted from the locale. Results
+    are kept in an LRU cache, as the same amounts are formatted repeatedly by the views.
 
     Args:
         value (float): The numeric value to be formatted.
@@ -124,15 +189,39 @@ def format_currency_value(value: float, locale: str) -> str:
         str: The formatted currency string.
     """
     try:
-        currency_code = get_currency_from_locale(locale)
-        locale_obj = Locale.parse(locale)
-        formatted_currency = numbers.format_currency(value, currency=currency_code, locale=locale_obj)
-        return formatted_currency
+        # 0.0 and -0.0 share a cache key but format differently
+        if isinstance(value, Hashable) and value != 0:
+            return _format_currency_cached(value, locale)
+        return get_currency_formatter(locale).format(value)
     except Exception as e:
         logging.debug(f'Error formatting currency: {value} for locale: {locale}, error: {e}')
         return str(value)
 
 
+def format_currency_many(values: Iterable[Any], locale: str) -> List[str]:
+    """
+    Format a sequence of values as currency strings.
+
+    Each distinct value is formatted once, so columns with repeated amounts are cheap.
+
+    Args:
+        values (Iterable): Numeric values, e.g. a list, numpy array or pandas Series.
+        locale (str): Locale string, e.g. 'fr_FR'.
+
+    Returns:
+        List[str]: The formatted strings, in the order of ``values``.
+    """
+    values = values if isinstance(values, (pd.Series, pd.Index)) else pd.Series(list(values), dtype=object)
+    if values.empty:
+        return []
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    # 0.0 and -0.0 share a code, adding 0.0 formats both like format_currency_value(0.0)
+    formatted = pd.Series(
+        [format_currency_value(v + 0.0 if pd.api.types.is_float(v) else v, locale) for v in uniques], dtype=object
+    )
+    return formatted.take(codes).tolist()
+
+
 def parse_date(date_str: str, locale: str = None, format: str = 'short') -> date:
     """
     Parse a date string into a datetime object based on the locale.
@@ -39,6 +39,7 @@ class Status(enum.StrEnum):
 
     # Service status
     ServiceUnavailable = enum.auto()
+    OperationCancelled = enum.auto()
 
     # Configuration status
     HeadersInvalid = enum.auto()
@@ -73,6 +74,7 @@ STATUS_MESSAGE: Dict[Status, str] = {
     Status.CategoriesInvalid: 'The categories seem to be incomplete, or contain invalid values.',
 
     Status.ServiceUnavailable: 'Google Sheets service is unavailable. Please check your connection.',
+    Status.OperationCancelled: 'The operation was cancelled.',
     Status.CacheInvalid: 'The cache is invalid. Try fetching the data from the source again.',
 
 }
@@ -186,6 +188,11 @@ class ServiceUnavailableException(BaseStatusException):
     status = Status.ServiceUnavailable
 
 
+class OperationCancelledException(BaseStatusException):
+    """Exception raised when an operation is cancelled by the user or times out."""
+    status = Status.OperationCancelled
+
+
 class HeadersInvalidException(BaseStatusException):
     """Exception raised when spreadsheet headers are invalid or misconfigured."""
     status = Status.HeadersInvalid
@@ -28,6 +28,13 @@ def open_spreadsheet() -> None:
         QtWidgets.QMessageBox.critical(None, 'Error', 'Invalid spreadsheet configuration.')
         raise
 
+    from ..core import localsheets
+    if localsheets.is_local(spreadsheet_id):
+        path, _ = localsheets.parse_local_id(spreadsheet_id)
+        logging.debug(f'Opening local spreadsheet: {path}')
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(path)))
+        return
+
     url: str = f'https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit#gid=0'
     if sheet_name:
         url += f'&sheet={sheet_name}'
@@ -45,8 +52,13 @@ class Signals(QtCore.QObject):
     metadataChanged = QtCore.Signal(str, object)
 
     dataFetchRequested = QtCore.Signal()
+    newRowsFetchRequested = QtCore.Signal()
     dataAboutToBeFetched = QtCore.Signal()
     dataFetched = QtCore.Signal(pandas.DataFrame)
+    dataAppended = QtCore.Signal(pandas.DataFrame)  # Rows appended to the cache by an incremental fetch
+    dataFetchProgress = QtCore.Signal(int, int, int)  # Ranges done, ranges total, rows fetched
+    backgroundRefreshFinished = QtCore.Signal(str)  # RefreshOutcome of a background refresh
+    dataQualityChanged = QtCore.Signal()
 
     transactionsChanged = QtCore.Signal(list)
     transactionItemSelected = QtCore.Signal(int)
@@ -80,8 +92,20 @@ class Signals(QtCore.QObject):
     def _connect_signals(self):
         self.openSpreadsheet.connect(open_spreadsheet)
 
-        from ..core import service
-        self.dataFetchRequested.connect(service.fetch_data)
+        # The service module pulls in the Google API client, import it on first use
+        @QtCore.Slot()
+        def _on_data_fetch_requested() -> None:
+            from ..core import service
+            service.fetch_data()
+
+        self.dataFetchRequested.connect(_on_data_fetch_requested)
+
+        @QtCore.Slot()
+        def _on_new_rows_fetch_requested() -> None:
+            from ..core import service
+            service.fetch_data(incremental=True)
+
+        self.newRowsFetchRequested.connect(_on_new_rows_fetch_requested)
 
         # Handle authentication requests emitted by background workers
         @QtCore.Slot()
@@ -186,6 +186,7 @@ class BaseChartView(QtWidgets.QWidget):
         signals.dataAboutToBeFetched.connect(self.clear_data)
 
         signals.dataFetched.connect(self.start_init_data_timer)
+        signals.dataAppended.connect(self.start_init_data_timer)
 
         @QtCore.Slot(str, object)
         def _meta(key: str, _: object) -> None:
@@ -9,20 +9,23 @@ This module defines:
 """
 import functools
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 from PySide6 import QtWidgets, QtCore, QtGui
 
 from . import ui
 from .yearmonth import RangeSelectorBar
-from ..core import database
+from ..core import database, discovery
+from ..core.autorefresh import refresher
+from ..core.tasks import executor
 from ..data.view.doughnut import DoughnutDockWidget
 from ..data.view.expense import ExpenseView
 from ..data.view.piechart import PieChartDockWidget
 from ..data.view.transaction import TransactionsDockWidget
 from ..data.view.transactiondetails import TransactionDetailsDockWidget
+from ..data.view.quality import QualityDockWidget
 from ..data.view.trends import TrendDockWidget
-from ..log.view import LogDockWidget
+from ..log.view import LogDockWidget, PerformanceDockWidget
 from ..settings.lib import app_name
 from ..settings.presets.view import PresetsDockWidget
 from ..settings.settings import SettingsDockWidget
@@ -203,6 +206,8 @@ class StatusIndicator(QtWidgets.QWidget):
         signals.configSectionChanged.connect(self.update_status)
         signals.dataAboutToBeFetched.connect(self.update_status)
         signals.dataFetched.connect(self.update_status)
+        signals.dataAppended.connect(self.update_status)
+        signals.backgroundRefreshFinished.connect(self.update_status)
         signals.presetActivated.connect(self.update_status)
 
     def mouseReleaseEvent(self, event):
@@ -284,15 +289,18 @@ class StatusIndicator(QtWidgets.QWidget):
         self.update_status()
 
         from ..core import service
-        try:
-            service.verify_sheet_access()
+
+        @QtCore.Slot(object)
+        def on_finished(_: Any) -> None:
             QtWidgets.QMessageBox.information(
                 self,
                 'Status',
                 f'Spreadsheet access verified. \nStatus: {self._status.value.capitalize()}',
                 QtWidgets.QMessageBox.Ok
             )
-        except Exception as ex:
+
+        @QtCore.Slot(object)
+        def on_failed(ex: Exception) -> None:
             QtWidgets.QMessageBox.warning(
                 self,
                 'Status',
@@ -300,6 +308,10 @@ class StatusIndicator(QtWidgets.QWidget):
                 QtWidgets.QMessageBox.Ok
             )
 
+        handle = service.verify_sheet_access()
+        handle.finished.connect(on_finished)
+        handle.failed.connect(on_failed)
+
 
 class ResizableMainWidget(QtWidgets.QMainWindow):
     """QMainWindow subclass handling geometry state and maximize/restore behavior."""
@@ -373,15 +385,22 @@ class MainWindow(ResizableMainWidget):
         self.presets_view: PresetsDockWidget
         self.settings_view: SettingsDockWidget
         self.log_view: LogDockWidget
+        self.performance_view: PerformanceDockWidget
         self.trends_view: TrendDockWidget
         self.piechart_view: PieChartDockWidget
         self.doughnut_view: DoughnutDockWidget
+        self.quality_view: QualityDockWidget
 
         self._create_ui()
         self._init_actions()
         self._connect_signals()
         self.load_window_settings()
 
+        refresher.start()
+        QtWidgets.QApplication.instance().aboutToQuit.connect(executor.shutdown)
+        # Parse the discovery document before the first request needs it
+        executor.submit(discovery.prewarm, name='discovery prewarm')
+
     def _configure_dock_behavior(self) -> None:
         """
         Enable nested and animated docking, and set default tab positions for all dock areas.
@@ -459,6 +478,11 @@ class MainWindow(ResizableMainWidget):
                 'class': LogDockWidget,
                 'name': 'ExpenseTrackerLogDockWidget',
                 'area': QtCore.Qt.BottomDockWidgetArea},
+            {
+                'attr': 'performance_view',
+                'class': PerformanceDockWidget,
+                'name': 'ExpenseTrackerPerformanceDockWidget',
+                'area': QtCore.Qt.BottomDockWidgetArea},
             {
                 'attr': 'trends_view',
                 'class': TrendDockWidget,
@@ -474,16 +498,27 @@ class MainWindow(ResizableMainWidget):
                 'class': DoughnutDockWidget,
                 'name': 'ExpenseTrackerDoughnutDockWidget',
                 'area': QtCore.Qt.RightDockWidgetArea},
+            {
+                'attr': 'quality_view',
+                'class': QualityDockWidget,
+                'name': 'ExpenseTrackerQualityDockWidget',
+                'area': QtCore.Qt.BottomDockWidgetArea},
         ]
         for cfg in dock_configs:
             widget = cfg['class'](parent=self)
             setattr(self, cfg['attr'], widget)
             widget.setObjectName(cfg['name'])
             self.addDockWidget(cfg['area'], widget)
-            widget.hide()
 
             logging.debug(f'Added dock {cfg["name"]} in area {cfg["area"]}')
 
+        # Show the stage timings as a tab next to the logs. Docks must be tabified before
+        # they are hidden for the arrangement to stick
+        self.tabifyDockWidget(self.log_view, self.performance_view)
+
+        for cfg in dock_configs:
+            getattr(self, cfg['attr']).hide()
+
     def _init_actions(self) -> None:
         """
         Create and register toolbar/menu actions defined by configuration.
@@ -604,6 +639,18 @@ class MainWindow(ResizableMainWidget):
                 'icon': 'btn_log',
                 'shortcut': 'Ctrl+6'
             },
+            {
+                'label': 'Performance',
+                'widget_attr': 'performance_view',
+                'icon': 'btn_range',
+                'shortcut': 'Ctrl+8'
+            },
+            {
+                'label': 'Data Quality',
+                'widget_attr': 'quality_view',
+                'icon': 'btn_alert',
+                'shortcut': 'Ctrl+7'
+            },
             {
                 'label': 'Settings',
                 'widget_attr': 'settings_view',
@@ -746,6 +793,8 @@ class MainWindow(ResizableMainWidget):
                 self.piechart_view,
                 self.doughnut_view,
                 self.log_view,
+                self.performance_view,
+                self.quality_view,
                 self.settings_view,
         ):
             view.toggled.emit(view.isVisible())
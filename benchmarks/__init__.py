@@ -0,0 +1,10 @@
+"""Benchmark suite for the ExpenseTracker analytics and cache pipeline.
+
+The suite generates synthetic ledgers and times the hot paths of the application without
+network access or a GUI:
+
+- :mod:`benchmarks.ledger` – Synthetic ledger generator with configurable size and cardinality.
+- :mod:`benchmarks.suite` – Benchmark cases, result files and baseline comparison.
+
+Run it with ``python -m benchmarks``. See ``python -m benchmarks --help`` for options.
+"""
@@ -0,0 +1,82 @@
+"""Command-line entry point of the benchmark suite.
+
+Examples::
+
+    python -m benchmarks
+    python -m benchmarks --rows 10000 100000 --repeat 5 --output build/benchmarks.json
+    python -m benchmarks --rows 10000 --update-baseline
+    python -m benchmarks --rows 100000 --cases fetch_data fetch_data_single --latency 0.2
+
+Exits with status 1 if any case regresses against the baseline.
+"""
+import argparse
+import logging
+import pathlib
+import sys
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    from .suite import BASELINE_PATH, CASES, DEFAULT_THRESHOLD
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000],
+                        help='Ledger sizes to benchmark (default: 10000).')
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=None,
+                        help='Cases to run (default: all).')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (default: 3).')
+    parser.add_argument('--categories', type=int, default=12, help='Distinct categories (default: 12).')
+    parser.add_argument('--accounts', type=int, default=4, help='Distinct accounts (default: 4).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0).')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Simulated latency of each spreadsheet request in seconds (default: 0).')
+    parser.add_argument('--output', type=pathlib.Path, default=None, help='Write results to this JSON file.')
+    parser.add_argument('--baseline', type=pathlib.Path, default=BASELINE_PATH,
+                        help='Baseline results to compare against.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed slowdown as a fraction of the baseline (default: {DEFAULT_THRESHOLD}).')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Overwrite the baseline with the results instead of comparing.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    args = parse_args(argv)
+
+    from . import suite
+
+    # Keep the pipeline's own logging out of the timings
+    suite.prepare_environment()
+    logging.getLogger().setLevel(logging.WARNING)
+    results = suite.run_suite(
+        args.rows,
+        cases=args.cases,
+        repeat=args.repeat,
+        categories=args.categories,
+        accounts=args.accounts,
+        seed=args.seed,
+        latency=args.latency,
+    )
+
+    width = max(len(r.key) for r in results)
+    for r in results:
+        print(f'{r.key:<{width}}  best {r.best:9.4f}s  median {r.median:9.4f}s')
+
+    if args.output:
+        suite.write_results(results, args.output)
+        print(f'Results written to {args.output}')
+
+    if args.update_baseline:
+        suite.write_results(results, args.baseline)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    regressions = suite.compare(results, suite.load_results(args.baseline), args.threshold)
+    for r in regressions:
+        print(f'REGRESSION {r.key}: {r.current:.4f}s vs baseline {r.baseline:.4f}s ({r.ratio:.2f}x)')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Synthetic ledger generator.
+
+Generates ledgers shaped like the default ledger template: a date column with mixed formats
+(Google Sheets serial numbers, ISO strings and locale formatted strings), an amount column,
+a description merged from three source columns, and category and account columns with
+configurable cardinality.
+"""
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+HEADER: Dict[str, str] = {
+    'Date': 'date',
+    'Amount': 'float',
+    'Description': 'string',
+    'Notes': 'string',
+    'Reference': 'string',
+    'Category': 'string',
+    'Account': 'string',
+}
+
+MAPPING: Dict[str, str] = {
+    'date': 'Date',
+    'amount': 'Amount',
+    'description': 'Description|Notes|Reference',
+    'category': 'Category',
+    'account': 'Account',
+}
+
+SERIAL_EPOCH = datetime.date(1899, 12, 30)
+
+MERCHANTS = (
+    'Tesco', 'Uber', 'Amazon', 'Shell', 'Netflix', 'Spotify', 'Costa', 'Boots', 'Ikea', 'Lidl',
+    'Aldi', 'Deliveroo', 'Trainline', 'Octopus Energy', 'Thames Water', 'Vodafone',
+)
+
+
+@dataclass
+class Ledger:
+    """A generated ledger and the config sections describing it.
+
+    Attributes:
+        df: The ledger rows as they would be fetched from the remote sheet.
+        header: The ``header`` config section.
+        mapping: The ``mapping`` config section.
+        categories: The ``categories`` config section.
+        start: First month covered by the ledger.
+        months: Number of months covered by the ledger.
+    """
+    df: pd.DataFrame
+    header: Dict[str, str] = field(default_factory=lambda: dict(HEADER))
+    mapping: Dict[str, str] = field(default_factory=lambda: dict(MAPPING))
+    categories: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    start: str = ''
+    months: int = 0
+
+    def sheet_values(self) -> List[List[Any]]:
+        """Return the rows as unformatted values, with dates as serial numbers."""
+        df = self.df.copy()
+        dates = pd.to_datetime(df['Date'].map(_to_iso))
+        df['Date'] = (dates - pd.Timestamp(SERIAL_EPOCH)).dt.days.astype(float)
+        return df.astype(object).where(df.notna(), None).values.tolist()
+
+
+def _to_iso(value: Any) -> str:
+    if isinstance(value, (int, float)):
+        return (SERIAL_EPOCH + datetime.timedelta(days=int(value))).isoformat()
+    if '/' in value:
+        day, month, year = value.split('/')
+        return f'{year}-{month}-{day}'
+    return value
+
+
+def generate_ledger(
+        rows: int,
+        categories: int = 12,
+        accounts: int = 4,
+        months: int = 24,
+        seed: int = 0,
+) -> Ledger:
+    """Generate a synthetic ledger.
+
+    Args:
+        rows: Number of transactions.
+        categories: Number of distinct categories.
+        accounts: Number of distinct accounts.
+        months: Number of months the transactions are spread over.
+        seed: Random seed.
+
+    Returns:
+        Ledger: The generated ledger.
+    """
+    rng = np.random.default_rng(seed)
+
+    start = pd.Timestamp('2023-01-01')
+    end = start + pd.DateOffset(months=months)
+    offsets = rng.integers(0, (end - start).days, size=rows)
+    dates = (start + pd.to_timedelta(np.sort(offsets), unit='D'))
+
+    serials = (dates - pd.Timestamp(SERIAL_EPOCH)).days.astype(float)
+    iso = dates.strftime('%Y-%m-%d')
+    localized = dates.strftime('%d/%m/%Y')
+
+    # 60% serial numbers, 30% ISO strings, 10% locale formatted strings
+    kind = rng.random(rows)
+    date_values = np.where(kind < 0.6, serials.astype(object), np.where(kind < 0.9, iso, localized))
+
+    category_names = [f'Category {i:02d}' for i in range(categories)]
+    account_names = [f'Account {i:02d}' for i in range(accounts)]
+
+    # Skewed category distribution, like real ledgers
+    weights = 1.0 / np.arange(1, categories + 1)
+    weights /= weights.sum()
+
+    amounts = -np.round(rng.lognormal(mean=3.0, sigma=1.0, size=rows), 2)
+    income = rng.random(rows) < 0.05
+    amounts[income] = np.round(rng.uniform(500, 3000, size=income.sum()), 2)
+
+    merchants = np.asarray(MERCHANTS, dtype=object)[rng.integers(0, len(MERCHANTS), size=rows)]
+    notes = np.where(rng.random(rows) < 0.3, 'Card payment', '')
+    references = np.char.add('REF', rng.integers(0, 10 ** 6, size=rows).astype(str))
+
+    df = pd.DataFrame({
+        'Date': date_values,
+        'Amount': amounts,
+        'Description': merchants,
+        'Notes': notes,
+        'Reference': references,
+        'Category': rng.choice(category_names, size=rows, p=weights),
+        'Account': rng.choice(account_names, size=rows),
+    })
+
+    category_config = {
+        name: {
+            'display_name': name,
+            'color': f'#{rng.integers(0, 0xFFFFFF):06X}',
+            'description': '',
+            'icon': 'cat_unclassified',
+            'excluded': False,
+        } for name in category_names
+    }
+
+    return Ledger(df=df, categories=category_config, start=start.strftime('%Y-%m'), months=months)
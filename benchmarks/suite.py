@@ -0,0 +1,359 @@
+"""Benchmark cases, result files and baseline comparison.
+
+Each case times one stage of the pipeline against a generated ledger:
+
+- ``cache_data``: :meth:`DatabaseAPI.cache_data`
+- ``database_data``: :meth:`DatabaseAPI.data`
+- ``get_data``: :func:`ExpenseTracker.data.data.get_data`
+- ``get_trends``: :func:`ExpenseTracker.data.data.get_trends`
+- ``fetch_data``: :func:`ExpenseTracker.core.service._fetch_data` against a local spreadsheet
+- ``fetch_data_single``: the same with all ranges in a single request, without concurrency
+- ``sync_match``: normalizing, hashing and joining remote keys with queued edits, as
+  :meth:`SyncAPI.commit_queue` does without a usable row index
+- ``commit_queue``: :meth:`SyncAPI.commit_queue` against a local spreadsheet
+- ``expense_model``: populating :class:`ExpenseTracker.data.model.expense.ExpenseModel`
+- ``transactions_model``: populating :class:`ExpenseTracker.data.model.transaction.TransactionsModel`
+
+The remote spreadsheet is served by :class:`ExpenseTracker.core.localsheets.LocalSheetsService`
+from an SQLite file written next to the isolated config. Set a per-request latency to compare
+the concurrent and single-request fetches under realistic round-trip times.
+
+Results are written as JSON and compared against a stored baseline. A case regresses when its
+best time exceeds the baseline by more than the threshold.
+"""
+import datetime
+import json
+import logging
+import pathlib
+import platform
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .ledger import Ledger, generate_ledger
+
+BASELINE_PATH = pathlib.Path(__file__).parent / 'baseline.json'
+DEFAULT_THRESHOLD = 0.25
+# Absolute slowdown in seconds below which a case never counts as a regression
+NOISE_FLOOR = 0.005
+SYNC_QUEUE_SIZE = 100
+
+
+@dataclass
+class Result:
+    """Timing of a benchmark case.
+
+    Attributes:
+        case: Name of the case.
+        rows: Number of ledger rows.
+        best: Fastest run in seconds.
+        median: Median run in seconds.
+        repeat: Number of runs.
+    """
+    case: str
+    rows: int
+    best: float
+    median: float
+    repeat: int
+
+    @property
+    def key(self) -> str:
+        return f'{self.case}[{self.rows}]'
+
+
+@dataclass
+class Regression:
+    """A case slower than its baseline by more than the threshold."""
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float('inf')
+
+
+def prepare_environment() -> None:
+    """Isolate the benchmark from the user's configuration and cache.
+
+    Redirects the Qt standard paths to their test locations, clears them, and reinitializes the
+    settings, database and sync singletons against the clean directory.
+    """
+    import os
+    import shutil
+    from PySide6 import QtCore, QtWidgets
+
+    # The models need an application instance, the offscreen platform keeps it headless
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    QtCore.QStandardPaths.setTestModeEnabled(True)
+    if not QtWidgets.QApplication.instance():
+        QtWidgets.QApplication([])
+
+    from ExpenseTracker.core import database
+    from ExpenseTracker.core import sync
+    from ExpenseTracker.settings import lib
+
+    config_dir = lib.ConfigPaths().config_dir
+    if config_dir.exists():
+        shutil.rmtree(config_dir)
+
+    lib.settings = lib.SettingsAPI()
+    database.database = database.DatabaseAPI()
+    sync.sync = sync.SyncAPI()
+
+
+def write_local_sheet(ledger: Ledger, path: pathlib.Path) -> None:
+    """Write the ledger's sheet values to an SQLite file served as a local spreadsheet."""
+    columns = list(ledger.df.columns)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(f'CREATE TABLE Sheet1 ({", ".join(json.dumps(c) for c in columns)})')
+        conn.executemany(f'INSERT INTO Sheet1 VALUES ({", ".join("?" * len(columns))})', ledger.sheet_values())
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def configure(ledger: Ledger, latency: float = 0.0) -> None:
+    """Write the config sections describing the ledger and point the spreadsheet at a local copy.
+
+    Args:
+        ledger: The ledger to configure.
+        latency: Simulated round-trip time of each spreadsheet request in seconds.
+    """
+    from ExpenseTracker.core import service
+    from ExpenseTracker.settings import lib
+
+    path = lib.ConfigPaths().config_dir / 'benchmark_ledger.db'
+    write_local_sheet(ledger, path)
+    service.clear_service()
+
+    lib.settings.set_section('header', ledger.header)
+    lib.settings.set_section('mapping', ledger.mapping)
+    lib.settings.set_section('categories', ledger.categories)
+
+    metadata = lib.settings.get_section('metadata')
+    metadata.update({
+        'yearmonth': ledger.start,
+        'span': ledger.months,
+        'negative_span': ledger.months,
+        'hide_empty_categories': True,
+    })
+    lib.settings.set_section('metadata', metadata)
+    sid = f'local:{path}?latency={latency}' if latency else f'local:{path}'
+    lib.settings.set_section('spreadsheet', {'id': sid, 'worksheet': 'Sheet1'})
+
+
+def _time(func: Callable[[], Any], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _queue_edits() -> None:
+    """Queue category edits for a fixed sample of cached rows."""
+    from ExpenseTracker.core import database
+    from ExpenseTracker.core import sync as sync_module
+    from ExpenseTracker.core.sync import EditOperation
+
+    api = sync_module.sync
+    api._parsed_mapping.clear()
+
+    df = database.database.data()
+    sample = df.sample(min(SYNC_QUEUE_SIZE, len(df)), random_state=0).to_dict(orient='records')
+    api._queue = [
+        EditOperation(row['local_id'], 'category', row['Category'], 'Edited', api._get_local_stable_keys(row))
+        for row in sample
+    ]
+
+
+def _sync_match(ledger: Ledger) -> Callable[[], Any]:
+    """Return a callable matching a queue of edits against the ledger's remote rows."""
+    from ExpenseTracker.core import rowindex
+    from ExpenseTracker.core import service as service_module
+    from ExpenseTracker.core import sync as sync_module
+
+    api = sync_module.sync
+    _queue_edits()
+
+    service = service_module.get_service()
+    headers = list(ledger.df.columns)
+    header_to_idx = {h: i for i, h in enumerate(headers)}
+    stable_fields = ['date', 'amount', 'description']
+    stable_map = api._build_stable_headers_map(headers, stable_fields)
+    data_rows = len(ledger.df)
+
+    def run() -> Any:
+        column_values = api._fetch_stable_data(service, stable_map, header_to_idx, data_rows + 1, data_rows)
+        key_cols = rowindex.key_columns(column_values, stable_fields)
+        hashes = rowindex.hash_keys(key_cols, data_rows)
+        empty = rowindex.empty_keys(key_cols, data_rows)
+        index_map = api._join_remote_keys(column_values, stable_fields, hashes, empty)
+        return api._match_operations(index_map, stable_fields, {})
+
+    return run
+
+
+def run_case(name: str, ledger: Ledger, repeat: int) -> List[float]:
+    """Time one benchmark case.
+
+    The database is expected to hold the ledger for every case but ``cache_data``.
+
+    Args:
+        name: Name of the case, one of :data:`CASES`.
+        ledger: The ledger to run against.
+        repeat: Number of runs.
+
+    Returns:
+        List[float]: Run times in seconds.
+    """
+    from ExpenseTracker.core import database
+    from ExpenseTracker.core import service
+    from ExpenseTracker.core import sync
+    from ExpenseTracker.data import data
+    from ExpenseTracker.data.model.expense import ExpenseModel
+    from ExpenseTracker.data.model.transaction import TransactionsModel
+    from ExpenseTracker.ui.actions import signals
+    from PySide6 import QtCore
+
+    if name == 'cache_data':
+        def run():
+            with QtCore.QSignalBlocker(signals):
+                database.database.cache_data(ledger.df)
+        return _time(run, repeat)
+    if name == 'database_data':
+        return _time(database.database.data, repeat)
+    if name == 'get_data':
+        return _time(data.get_data, repeat)
+    if name == 'get_trends':
+        return _time(data.get_trends, repeat)
+    if name == 'fetch_data':
+        return _time(service._fetch_data, repeat)
+    if name == 'fetch_data_single':
+        return _time(lambda: service._fetch_data(concurrency=1), repeat)
+    if name == 'sync_match':
+        return _time(_sync_match(ledger), repeat)
+    if name == 'commit_queue':
+        def run():
+            _queue_edits()
+            with QtCore.QSignalBlocker(signals):
+                sync.sync.commit_queue()
+        return _time(run, repeat)
+    if name == 'expense_model':
+        model = ExpenseModel()
+        return _time(model.init_data, repeat)
+    if name == 'transactions_model':
+        records = [r for transactions in data.get_data(add_total_row=False)['transactions'] for r in transactions]
+        model = TransactionsModel()
+        return _time(lambda: model.init_data(records), repeat)
+    raise ValueError(f'Unknown benchmark case "{name}".')
+
+
+CASES: List[str] = [
+    'cache_data',
+    'database_data',
+    'get_data',
+    'get_trends',
+    'fetch_data',
+    'fetch_data_single',
+    'sync_match',
+    'commit_queue',
+    'expense_model',
+    'transactions_model',
+]
+
+
+def run_suite(
+        rows: List[int],
+        cases: Optional[List[str]] = None,
+        repeat: int = 3,
+        categories: int = 12,
+        accounts: int = 4,
+        seed: int = 0,
+        latency: float = 0.0,
+) -> List[Result]:
+    """Run the benchmark cases against generated ledgers of each size.
+
+    Args:
+        rows: Ledger sizes to run.
+        cases: Cases to run. Defaults to all :data:`CASES`.
+        repeat: Number of runs per case.
+        categories: Number of distinct categories in the generated ledgers.
+        accounts: Number of distinct accounts in the generated ledgers.
+        seed: Random seed of the generated ledgers.
+        latency: Simulated round-trip time of each spreadsheet request in seconds.
+
+    Returns:
+        List[Result]: One result per case and ledger size.
+    """
+    cases = cases or CASES
+    results: List[Result] = []
+    for n in rows:
+        ledger = generate_ledger(n, categories=categories, accounts=accounts, seed=seed)
+        configure(ledger, latency=latency)
+        # Every case but cache_data reads the cache, so always populate it first
+        run_case('cache_data', ledger, 1)
+
+        for name in cases:
+            timings = run_case(name, ledger, repeat)
+            result = Result(name, n, min(timings), statistics.median(timings), repeat)
+            logging.info(f'{result.key}: best {result.best:.4f}s, median {result.median:.4f}s')
+            results.append(result)
+    return results
+
+
+def write_results(results: List[Result], path: pathlib.Path) -> None:
+    """Write results to a JSON file."""
+    payload = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+        },
+        'results': [asdict(r) for r in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+
+
+def load_results(path: pathlib.Path) -> Dict[str, Result]:
+    """Load results from a JSON file, keyed by ``case[rows]``."""
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text())
+    results = [Result(**r) for r in payload.get('results', [])]
+    return {r.key: r for r in results}
+
+
+def compare(results: List[Result], baseline: Dict[str, Result],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """Compare results against a baseline.
+
+    Args:
+        results: Current results.
+        baseline: Baseline results keyed by ``case[rows]``.
+        threshold: Allowed slowdown as a fraction of the baseline time.
+
+    Returns:
+        List[Regression]: Cases whose best time exceeds the baseline by more than the threshold
+            and by more than :data:`NOISE_FLOOR`. Cases missing from the baseline are ignored.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        if result.best > max(base.best * (1.0 + threshold), base.best + NOISE_FLOOR):
+            regressions.append(Regression(result.key, base.best, result.best))
+    return regressions
@@ -0,0 +1,187 @@
+"""Tests for :mod:`ExpenseTracker.core.asyncsheets` against a local HTTP server."""
+import asyncio
+import concurrent.futures
+import csv
+import pathlib
+import tempfile
+import time
+from unittest import mock
+
+from PySide6 import QtCore
+from googleapiclient.errors import HttpError
+
+from ExpenseTracker.core import fetcher, localsheets
+from ExpenseTracker.core.asyncsheets import AsyncSheetsClient, ConnectionPool
+from ExpenseTracker.core.scheduler import scheduler
+from ExpenseTracker.core.tasks import TaskExecutor, executor
+from ExpenseTracker.status import status
+from tests.base import BaseTestCase
+
+HEADER = ['Date', 'Amount', 'Description', 'Category', 'Account']
+
+
+class AsyncSheetsClientTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp.name) / 'ledger.csv'
+        self.rows = [[f'2025-01-{1 + i % 28:02d}', str(-i), f'Item {i}', 'Food', 'Visa'] for i in range(60)]
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + self.rows)
+        self.servers = []
+
+    def tearDown(self) -> None:
+        for server in self.servers:
+            server.close()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def _serve(self, options: str = '') -> localsheets.LocalSheetsServer:
+        server = localsheets.LocalSheetsServer(f'local:{self.csv_path}{options}')
+        self.servers.append(server)
+        return server
+
+    def _run(self, server, func, max_connections: int = 4, **kwargs):
+        async def main():
+            client = AsyncSheetsClient(
+                base_url=server.url, pool=ConnectionPool(max_connections=max_connections), backoff=0.0, **kwargs
+            )
+            try:
+                return await func(client, server.service.spreadsheet_id)
+            finally:
+                await client.close()
+
+        return asyncio.run(main())
+
+    def test_metadata_values_and_update(self):
+        server = self._serve()
+
+        async def main(client, sid):
+            meta = await client.get_metadata(sid, fields='sheets.properties')
+            await client.batch_update(sid, [{'range': 'Sheet1!C2', 'values': [['Edited']]}])
+            values = await client.batch_get(sid, ['Sheet1!A1:E2'], value_render_option='FORMATTED_VALUE')
+            return meta, values
+
+        meta, values = self._run(server, main)
+        props = meta['sheets'][0]['properties']
+        self.assertEqual((props['title'], props['gridProperties']['rowCount']), ('Sheet1', len(self.rows) + 1))
+        self.assertEqual(values['valueRanges'][0]['values'], [HEADER, ['2025-01-01', '0', 'Edited', 'Food', 'Visa']])
+
+        with self.csv_path.open(newline='') as f:
+            self.assertEqual(list(csv.reader(f))[1][2], 'Edited')
+
+    def test_fetch_ranges_reuses_connections(self):
+        server = self._serve()
+        ranges = fetcher.split_ranges('Sheet1', len(self.rows) + 1, 'E', 5)
+
+        async def main(client, sid):
+            return await client.fetch_ranges(sid, ranges, concurrency=8)
+
+        rows = self._run(server, main, max_connections=3)
+        expected = fetcher.fetch_ranges(server.service, server.service.spreadsheet_id, ranges, concurrency=1)
+        self.assertEqual(rows, expected)
+        self.assertEqual(len(rows), len(self.rows) + 1)
+        self.assertLessEqual(server.connection_count, 3)
+
+    def test_errors_are_retried_and_recorded(self):
+        server = self._serve('?error_rate=1&error_status=503')
+        scheduler.clear()
+
+        async def main(client, sid):
+            return await client.batch_get(sid, ['Sheet1!A1:E2'])
+
+        with self.assertRaises(HttpError) as ctx:
+            self._run(server, main, attempts=2)
+        self.assertEqual(ctx.exception.resp.status, 503)
+        self.assertEqual(server.service.request_count, 2)
+
+        record = scheduler.records()[-1]
+        self.assertEqual((record.name, record.attempts, record.status), ('values.batchGet', 2, 503))
+
+        missing = self._serve()
+
+        async def not_found(client, _sid):
+            return await client.get_metadata('local:/does/not/exist.csv')
+
+        with self.assertRaises(HttpError) as ctx:
+            self._run(missing, not_found)
+        self.assertEqual(ctx.exception.resp.status, 404)
+
+    def test_runs_on_the_executor_loop(self):
+        server = self._serve()
+        slow = self._serve('?latency=2')
+        executor = TaskExecutor(max_workers=1)
+        client = AsyncSheetsClient(base_url=server.url, backoff=0.0)
+        slow_client = AsyncSheetsClient(base_url=slow.url, backoff=0.0)
+        try:
+            handle = executor.submit_async(client.batch_get, server.service.spreadsheet_id, ['Sheet1!A1:E1'])
+            results = []
+            handle.finished.connect(results.append)
+
+            slow_handle = executor.submit_async(slow_client.batch_get, slow.service.spreadsheet_id, ['Sheet1!A1'])
+            reasons = []
+            slow_handle.cancelled.connect(reasons.append)
+            slow_handle.cancel('Stop.')
+
+            deadline = time.monotonic() + 5
+            while not (handle.settled and slow_handle.settled) and time.monotonic() < deadline:
+                QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+
+            self.assertEqual(results[0]['valueRanges'][0]['values'], [HEADER])
+            self.assertEqual(reasons, ['Stop.'])
+        finally:
+            executor.submit_async(client.close).result(timeout=5)
+            executor.shutdown()
+
+
+class FetcherClientTests(AsyncSheetsClientTests):
+    def _client(self, server, max_connections: int = 3) -> AsyncSheetsClient:
+        return AsyncSheetsClient(base_url=server.url, pool=ConnectionPool(max_connections=max_connections), backoff=0.0)
+
+    def test_only_services_with_credentials_get_a_client(self):
+        server = self._serve()
+        self.assertIsNone(fetcher.async_client(server.service))
+
+        service = mock.Mock()
+        client = fetcher.async_client(service, concurrency=2, attempts=3)
+        self.assertIs(client.credentials, service._http.credentials)
+        self.assertEqual((client.pool.max_connections, client.attempts), (2, 3))
+
+    def test_fetch_value_ranges_uses_the_client(self):
+        server = self._serve()
+        sid = server.service.spreadsheet_id
+        ranges = fetcher.split_ranges('Sheet1', len(self.rows) + 1, 'E', 5)
+        expected = fetcher.fetch_value_ranges(server.service, sid, ranges, concurrency=1)
+        requests = server.service.request_count
+
+        progress = []
+        with mock.patch.object(fetcher, 'async_client', return_value=self._client(server)):
+            values = fetcher.fetch_value_ranges(
+                server.service, sid, ranges, concurrency=4, progress=lambda *args: progress.append(args)
+            )
+        self.assertEqual(values, expected)
+        self.assertEqual(server.service.request_count - requests, len(ranges))
+        self.assertLessEqual(server.connection_count, 3)
+        self.assertEqual(progress[-1], (len(ranges), len(ranges), len(self.rows) + 1))
+
+        requests = server.service.request_count
+        with mock.patch.object(fetcher, 'async_client', return_value=self._client(server)):
+            grouped = fetcher.fetch_value_ranges(server.service, sid, ranges, concurrency=4, group=5)
+        self.assertEqual(grouped, expected)
+        self.assertEqual(server.service.request_count - requests, -(-len(ranges) // 5))
+
+    def test_cancelling_the_task_cancels_the_requests(self):
+        server = self._serve('?latency=2')
+        sid = server.service.spreadsheet_id
+        ranges = ['Sheet1!A1:E5', 'Sheet1!A6:E10']
+        with mock.patch.object(fetcher, 'async_client', return_value=self._client(server)):
+            handle = executor.submit(fetcher.fetch_value_ranges, server.service, sid, ranges, concurrency=2)
+            time.sleep(0.1)
+            start = time.monotonic()
+            handle.cancel()
+            with self.assertRaises(status.OperationCancelledException):
+                handle.result(timeout=5)
+            # The worker returns without waiting for the responses
+            done, _ = concurrent.futures.wait([handle.future], timeout=5)
+        self.assertTrue(done)
+        self.assertLess(time.monotonic() - start, 1.0)
@@ -0,0 +1,211 @@
+"""Tests for :mod:`ExpenseTracker.core.autorefresh`."""
+import csv
+import pathlib
+import tempfile
+import time
+
+from PySide6 import QtCore
+
+from ExpenseTracker.core import service
+from ExpenseTracker.core.autorefresh import FULL_REFRESH_MINUTES, BackgroundRefresher, RefreshOutcome, check_for_changes
+from ExpenseTracker.core.database import FINGERPRINT_ROWS, DatabaseAPI
+from ExpenseTracker.core import sync
+from ExpenseTracker.core.sync import SyncAPI
+from ExpenseTracker.settings import lib
+from ExpenseTracker.ui.actions import signals
+from tests.base import BaseTestCase, mute_ui_signals
+
+HEADER = ['Date', 'Amount', 'Description', 'Category', 'Account']
+ROWS = [
+    ['2025-01-01', '-10.5', 'Coffee', 'Food', 'Visa'],
+    ['2025-01-02', '-900', 'Rent', 'Housing', 'Debit'],
+    ['2025-01-03', '-4.25', 'Bus', 'Travel', 'Visa'],
+]
+
+
+class BackgroundRefreshTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp.name) / 'ledger.csv'
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + ROWS)
+
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category',
+            'account': 'Account',
+        })
+        service.clear_service()
+        lib.settings.set_section('spreadsheet', {'id': f'local:{self.csv_path}', 'worksheet': 'Sheet1'})
+
+        self.refresher = BackgroundRefresher()
+        self.outcomes = []
+        signals.backgroundRefreshFinished.connect(self.outcomes.append)
+
+    def tearDown(self) -> None:
+        sync.sync.clear_queue()
+        signals.backgroundRefreshFinished.disconnect(self.outcomes.append)
+        self.refresher.stop()
+        self.refresher.deleteLater()
+        service.clear_service()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def _cache(self) -> None:
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+
+    def _append_csv_rows(self, rows) -> None:
+        with self.csv_path.open('a', newline='') as f:
+            csv.writer(f).writerows(rows)
+        service.clear_service()
+
+    def _wait(self) -> None:
+        handle = self.refresher._handle
+        handle.future.result()
+        while not handle.settled:
+            QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+
+    def _refresh(self) -> None:
+        self.refresher.refresh()
+        self.assertTrue(self.refresher.is_running())
+        self._wait()
+
+    def test_check_for_changes(self):
+        self.assertEqual(check_for_changes(), (RefreshOutcome.Skipped, None))
+
+        self._cache()
+        outcome, _ = check_for_changes()
+        self.assertEqual(outcome, RefreshOutcome.Unchanged)
+
+        self._append_csv_rows([['2025-01-04', '-7', 'Lunch', 'Food', 'Visa']])
+        outcome, new_rows = check_for_changes()
+        self.assertEqual(outcome, RefreshOutcome.Appended)
+        self.assertEqual(list(new_rows.df['Description']), ['Lunch'])
+
+        rows = [HEADER] + ROWS[:2] + [['2025-01-03', '-4.25', 'Train', 'Travel', 'Visa']]
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows(rows)
+        service.clear_service()
+        outcome, df = check_for_changes()
+        self.assertEqual(outcome, RefreshOutcome.Changed)
+        self.assertEqual(list(df['Description']), ['Coffee', 'Rent', 'Train'])
+
+    def _write_csv(self, rows) -> None:
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + rows)
+        service.clear_service()
+
+    def test_full_refresh_catches_edits_above_the_tail(self):
+        rows = [[f'2025-01-{i % 28 + 1:02d}', f'-{i}', f'Item {i}', 'Food', 'Visa'] for i in range(FINGERPRINT_ROWS + 5)]
+        self._write_csv(rows)
+        self._cache()
+
+        rows[0][2] = 'Edited'
+        self._write_csv(rows)
+        self.assertEqual(check_for_changes()[0], RefreshOutcome.Unchanged)
+        outcome, df = check_for_changes(full=True)
+        self.assertEqual(outcome, RefreshOutcome.Changed)
+        self.assertEqual(df['Description'].iloc[0], 'Edited')
+
+        self._refresh()
+        self.assertEqual(self.outcomes[-1], RefreshOutcome.Unchanged.value)
+
+        self.refresher._last_full_fetch -= FULL_REFRESH_MINUTES * 60
+        self._refresh()
+        self.assertEqual(self.outcomes[-1], RefreshOutcome.Changed.value)
+        self.assertEqual(DatabaseAPI.data()['Description'].iloc[0], 'Edited')
+
+        # The background fetch restarts the period
+        self._refresh()
+        self.assertEqual(self.outcomes[-1], RefreshOutcome.Unchanged.value)
+
+    def test_unchanged_full_refresh_emits_nothing(self):
+        self._cache()
+        fetched = []
+        signals.dataAboutToBeFetched.connect(fetched.append)
+        try:
+            self.refresher._last_full_fetch -= FULL_REFRESH_MINUTES * 60
+            self._refresh()
+        finally:
+            signals.dataAboutToBeFetched.disconnect(fetched.append)
+
+        self.assertEqual(self.outcomes, [RefreshOutcome.Unchanged.value])
+        self.assertEqual(fetched, [])
+        # The comparison restarts the period
+        self.assertLess(time.monotonic() - self.refresher._last_full_fetch, 60)
+
+    def test_queued_edits_survive_a_background_refresh(self):
+        rows = [list(r) for r in ROWS]
+        self._cache()
+        rows[0][2] = 'Edited'
+        self._write_csv(rows)
+        self.refresher._last_full_fetch -= FULL_REFRESH_MINUTES * 60
+
+        sync.sync.queue_edit(2, 'description', 'Queued')
+        self.refresher.refresh()
+        self.assertFalse(self.refresher.is_running())
+        self.assertEqual(len(sync.sync.get_queued_ops()), 1)
+
+        # Edits queued while the sheet downloads discard the download
+        sync.sync.clear_queue()
+        self.refresher.refresh()
+        sync.sync.queue_edit(2, 'description', 'Queued')
+        self._wait()
+        self.assertEqual(self.outcomes, [RefreshOutcome.Skipped.value])
+        self.assertEqual(len(sync.sync.get_queued_ops()), 1)
+        self.assertEqual(DatabaseAPI.data()['Description'].iloc[0], 'Coffee')
+
+    def test_commit_updates_the_fingerprint(self):
+        self._cache()
+        row_count, fingerprint = DatabaseAPI.get_fetch_state()
+
+        api = SyncAPI()
+        api.queue_edit(3, 'description', 'Train')
+        with mute_ui_signals():
+            results = api.commit_queue()
+        self.assertEqual(results, {(3, 'description'): (True, 'Committed successfully')})
+
+        self.assertEqual(DatabaseAPI.get_fetch_state()[0], row_count)
+        self.assertNotEqual(DatabaseAPI.get_fetch_state()[1], fingerprint)
+        service.clear_service()
+        self.assertEqual(check_for_changes()[0], RefreshOutcome.Unchanged)
+
+    def test_refresh_appends_in_background(self):
+        self._cache()
+        appended = []
+        signals.dataAppended.connect(appended.append)
+        try:
+            self._append_csv_rows([['2025-01-04', '-7', 'Lunch', 'Food', 'Visa']])
+            self._refresh()
+        finally:
+            signals.dataAppended.disconnect(appended.append)
+
+        self.assertEqual(self.outcomes, [RefreshOutcome.Appended.value])
+        self.assertEqual(len(appended), 1)
+        self.assertEqual(list(DatabaseAPI.data()['Description']), ['Coffee', 'Rent', 'Bus', 'Lunch'])
+
+        self._refresh()
+        self.assertEqual(self.outcomes[-1], RefreshOutcome.Unchanged.value)
+
+    def test_result_is_discarded_after_manual_fetch(self):
+        self._cache()
+        self._append_csv_rows([['2025-01-04', '-7', 'Lunch', 'Food', 'Visa']])
+        self.refresher.refresh()
+        signals.dataAboutToBeFetched.emit()
+        self._wait()
+
+        self.assertEqual(self.outcomes, [])
+        self.assertEqual(len(DatabaseAPI.data()), len(ROWS))
+
+    def test_set_interval(self):
+        self.refresher.set_interval(5, save=False)
+        self.assertEqual(self.refresher.interval(), 5)
+        self.assertTrue(self.refresher._timer.isActive())
+        self.assertEqual(self.refresher._timer.interval(), 5 * 60 * 1000)
+
+        self.refresher.set_interval(0, save=False)
+        self.assertFalse(self.refresher._timer.isActive())
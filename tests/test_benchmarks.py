@@ -0,0 +1,40 @@
+"""Smoke tests for the benchmark suite in :mod:`benchmarks`."""
+import pathlib
+import tempfile
+
+from benchmarks import suite
+from benchmarks.ledger import generate_ledger
+from tests.base import BaseTestCase
+
+
+class BenchmarkSuiteTests(BaseTestCase):
+    def test_generate_ledger_shape(self):
+        ledger = generate_ledger(500, categories=5, accounts=3, seed=1)
+        self.assertEqual(len(ledger.df), 500)
+        self.assertEqual(list(ledger.df.columns), list(ledger.header))
+        self.assertLessEqual(ledger.df['Category'].nunique(), 5)
+        self.assertLessEqual(ledger.df['Account'].nunique(), 3)
+        self.assertEqual(len(ledger.categories), 5)
+
+        # Mixed date formats
+        kinds = {type(v).__name__ for v in ledger.df['Date']}
+        self.assertIn('float', kinds)
+        self.assertIn('str', kinds)
+
+    def test_run_suite_all_cases(self):
+        results = suite.run_suite([300], repeat=1)
+        self.assertEqual([r.case for r in results], suite.CASES)
+        self.assertTrue(all(r.best >= 0 for r in results))
+
+    def test_results_roundtrip_and_compare(self):
+        results = [suite.Result('get_data', 100, 1.0, 1.0, 1), suite.Result('get_trends', 100, 0.5, 0.5, 1)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'results.json'
+            suite.write_results(results, path)
+            baseline = suite.load_results(path)
+        self.assertEqual(set(baseline), {'get_data[100]', 'get_trends[100]'})
+
+        current = [suite.Result('get_data', 100, 1.5, 1.5, 1), suite.Result('get_trends', 100, 0.55, 0.55, 1)]
+        regressions = suite.compare(current, baseline, threshold=0.25)
+        self.assertEqual([r.key for r in regressions], ['get_data[100]'])
+        self.assertAlmostEqual(regressions[0].ratio, 1.5)
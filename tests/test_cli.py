@@ -0,0 +1,130 @@
+"""Tests for the headless command-line entry point :mod:`ExpenseTracker.cli`."""
+import csv
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+from ExpenseTracker import cli
+from ExpenseTracker.core import service
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase, mute_ui_signals
+
+HEADER = ['Date', 'Amount', 'Description', 'Category', 'Account']
+ROWS = [
+    ['2025-01-03', '-10.5', 'Coffee', 'Food', 'Visa'],
+    ['2025-01-09', '-900', 'Rent', 'Housing', 'Debit'],
+    ['2025-01-20', '-4.5', 'Lunch', 'Food', 'Visa'],
+    ['2025-02-02', '-30', 'Dinner', 'Food', 'Visa'],
+]
+
+
+def category(name: str) -> dict:
+    return {'display_name': name, 'color': '#FF0000', 'description': '', 'icon': 'cat_unclassified',
+            'excluded': False}
+
+
+class CommandLineTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self.tmp.name)
+        ledger = self.root / 'ledger.csv'
+        with ledger.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + ROWS)
+
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category',
+            'account': 'Account',
+        })
+        lib.settings.set_section('categories', {'Food': category('Food'), 'Housing': category('Housing')})
+        service.clear_service()
+        lib.settings.set_section('spreadsheet', {'id': f'local:{ledger}', 'worksheet': 'Sheet1'})
+
+        metadata = lib.settings.get_section('metadata')
+        metadata.update({'yearmonth': '2024-06', 'span': 1})
+        lib.settings.set_section('metadata', metadata)
+
+    def tearDown(self) -> None:
+        service.clear_service()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def run_cli(self, *argv: str) -> int:
+        with mute_ui_signals():
+            return cli.main(list(argv))
+
+    def test_refresh_and_export_summary_csv(self):
+        path = self.root / 'summary.csv'
+        code = self.run_cli('--refresh', 'summary', '--yearmonth', '2025-01', '--output', str(path))
+        self.assertEqual(code, 0)
+
+        with path.open(newline='') as f:
+            rows = {r['category']: r for r in csv.DictReader(f)}
+        self.assertNotIn('transactions', next(iter(rows.values())))
+        self.assertAlmostEqual(float(rows['Food']['total']), -15.0)
+        self.assertAlmostEqual(float(rows['Housing']['total']), -900.0)
+        self.assertAlmostEqual(float(rows['Total']['total']), -915.0)
+
+        # The stored metadata is not modified by command-line overrides
+        self.assertEqual(lib.settings.get_section('metadata')['yearmonth'], '2024-06')
+
+    def test_summary_json_with_filter_and_transactions(self):
+        self.run_cli('--refresh', 'summary', '--yearmonth', '2025-01', '--span', '2', '--format', 'json')
+        path = self.root / 'summary.json'
+        code = self.run_cli('summary', '--yearmonth', '2025-01', '--span', '2', '--filter', 'category = "Food"',
+                            '--transactions', '--output', str(path))
+        self.assertEqual(code, 0)
+
+        records = json.loads(path.read_text())
+        food = next(r for r in records if r['category'] == 'Food')
+        self.assertAlmostEqual(food['total'], -45.0)
+        self.assertEqual(len(food['transactions']), 3)
+        self.assertNotIn('Housing', [r['category'] for r in records])
+
+    def test_trends_json(self):
+        path = self.root / 'trends.json'
+        code = self.run_cli('--refresh', 'trends', '--category', 'Food', '--yearmonth', '2025-02',
+                            '--negative-span', '2', '--output', str(path))
+        self.assertEqual(code, 0)
+
+        records = json.loads(path.read_text())
+        self.assertEqual({r['category'] for r in records}, {'Food'})
+        self.assertEqual([r['monthly_total'] for r in records], [-15.0, -30.0])
+
+    def test_requests_after_refresh(self):
+        from ExpenseTracker.core.profiler import profiler
+        from ExpenseTracker.core.scheduler import scheduler
+
+        scheduler.clear()
+        profiler.clear()
+        path = self.root / 'requests.json'
+        code = self.run_cli('--refresh', 'requests', '--output', str(path))
+        self.assertEqual(code, 0)
+
+        records = {r['request']: r for r in json.loads(path.read_text())}
+        self.assertEqual(records['values:batchGet']['errors'], 0)
+        self.assertGreater(records['values:batchGet']['bytes'], 0)
+        self.assertIn('p95_ms', records['spreadsheets.get'])
+
+        path = self.root / 'refreshes.csv'
+        self.assertEqual(self.run_cli('requests', '--refreshes', '--output', str(path)), 0)
+        with path.open(newline='') as f:
+            refreshes = list(csv.DictReader(f))
+        self.assertEqual([r['stage'] for r in refreshes], ['service.fetch_data'])
+        self.assertEqual(int(refreshes[0]['requests']), sum(r['calls'] for r in records.values()))
+        scheduler.clear()
+        profiler.clear()
+
+    def test_invalid_cache_exits_with_error(self):
+        self.assertEqual(self.run_cli('summary'), 1)
+
+    def test_import_is_free_of_qt(self):
+        code = 'import sys, ExpenseTracker.cli; print(sorted(m for m in sys.modules if m.startswith("PySide6")))'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=pathlib.Path(__file__).parent.parent)
+        self.assertEqual(result.stdout.strip(), '[]')
@@ -0,0 +1,115 @@
+"""Tests for :mod:`ExpenseTracker.data.data` and the roles of the expense model."""
+import math
+from unittest import mock
+
+import pandas as pd
+
+from ExpenseTracker.core.database import DatabaseAPI
+from ExpenseTracker.data.data import get_rolling_stats
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase, mute_ui_signals
+
+HEADER = {'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'}
+ROWS = [
+    ['2025-01-05', -10.0, 'Lunch', 'Food', 'Visa'],
+    ['2025-01-01', -100.0, 'Rent', 'Rent', 'Debit'],
+    ['2025-02-03', -20.0, 'Lunch', 'Food', 'Visa'],
+    ['2025-03-02', -60.0, 'Dinner', 'Food', 'Visa'],
+    ['2025-03-01', -100.0, 'Rent', 'Rent', 'Debit'],
+    ['2025-03-15', 500.0, 'Salary', 'Income', 'Debit'],
+]
+
+
+def category(name: str) -> dict:
+    return {'display_name': name, 'color': '#00FF00', 'description': '', 'icon': 'cat', 'excluded': False}
+
+
+class DataTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        lib.settings.set_section('header', HEADER)
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category',
+            'account': 'Account',
+        })
+        lib.settings.set_section('categories', {c: category(c) for c in ('Food', 'Rent', 'Income')})
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(pd.DataFrame(ROWS, columns=list(HEADER)))
+            lib.settings['yearmonth'] = '2025-03'
+            lib.settings['span'] = 1
+
+
+class RollingStatsTests(DataTestCase):
+    def _stats(self, **kwargs) -> pd.DataFrame:
+        stats = get_rolling_stats(**kwargs)
+        return stats.set_index(['category', stats['month'].dt.strftime('%Y-%m')])
+
+    def test_window_math(self):
+        stats = self._stats(window=3)
+        self.assertEqual(list(stats.columns), ['month', 'mean', 'median', 'std', 'p90'])
+        self.assertEqual(sorted(stats.index.get_level_values(0).unique()), ['Food', 'Rent'])
+
+        food = stats.loc[('Food', '2025-03')]
+        self.assertAlmostEqual(food['mean'], -30.0)
+        self.assertAlmostEqual(food['median'], -20.0)
+        self.assertAlmostEqual(food['std'], math.sqrt(1400 / 3))  # population standard deviation
+        self.assertAlmostEqual(food['p90'], -12.0)
+
+        # Months without transactions count as zero
+        rent = stats.loc[('Rent', '2025-03')]
+        self.assertAlmostEqual(rent['mean'], -200 / 3)
+        self.assertAlmostEqual(rent['median'], -100.0)
+
+        # The first windows are partial
+        first = stats.loc[('Food', '2025-01')]
+        self.assertEqual((first['mean'], first['std']), (-10.0, 0.0))
+        self.assertAlmostEqual(stats.loc[('Food', '2025-02'), 'mean'], -15.0)
+
+        # A window of one month is the month's total
+        self.assertAlmostEqual(self._stats(window=1).loc[('Food', '2025-03'), 'mean'], -60.0)
+
+    def test_period_end_follows_span(self):
+        stats = self._stats(window=3, yearmonth='2025-03', span=3)
+        self.assertEqual(sorted(stats.loc['Food'].index), ['2025-01', '2025-02', '2025-03', '2025-04', '2025-05'])
+        self.assertAlmostEqual(stats.loc[('Food', '2025-05'), 'mean'], -20.0)
+
+    def test_filtered_and_empty(self):
+        stats = self._stats(window=3, filter_expression='category = "Food"')
+        self.assertEqual(list(stats.index.get_level_values(0).unique()), ['Food'])
+        self.assertAlmostEqual(stats.loc[('Food', '2025-03'), 'mean'], -30.0)
+
+        stats = self._stats(window=3, exclude_positive=False, exclude_negative=True)
+        self.assertEqual(list(stats.index.get_level_values(0).unique()), ['Income'])
+
+        empty = get_rolling_stats(filter_expression='category = "Nothing"')
+        self.assertTrue(empty.empty)
+        self.assertEqual(list(empty.columns), lib.ROLLING_STATS_COLUMNS)
+
+
+class ExpenseModelRollingRolesTests(DataTestCase):
+    def test_rolling_roles(self):
+        from ExpenseTracker.data.model.expense import (
+            CategoryRole, Columns, ExpenseModel, RollingMeanRole, RollingMedianRole, RollingP90Role, RollingStdRole
+        )
+
+        model = ExpenseModel()
+        with mock.patch.object(DatabaseAPI, 'data', wraps=DatabaseAPI.data) as read:
+            model.init_data()
+        self.assertEqual(read.call_count, 1)  # the rolling statistics reuse the loaded rows
+        rows = {model.data(model.index(r, 0), CategoryRole): r for r in range(model.rowCount())}
+        food = model.index(rows['Food'], Columns.Amount)
+        self.assertAlmostEqual(model.data(food, RollingMeanRole), -30.0)
+        self.assertAlmostEqual(model.data(food, RollingMedianRole), -20.0)
+        self.assertAlmostEqual(model.data(food, RollingStdRole), math.sqrt(1400 / 3))
+        self.assertAlmostEqual(model.data(food, RollingP90Role), -12.0)
+
+        rent = model.index(rows['Rent'], Columns.Amount)
+        self.assertAlmostEqual(model.data(rent, RollingMeanRole), -200 / 3)
+
+        # Categories without statistics in the period, e.g. the total row, have none
+        for label, row in rows.items():
+            if label not in ('Food', 'Rent'):
+                self.assertIsNone(model.data(model.index(row, Columns.Amount), RollingMeanRole))
+
+        model.clear_data()
+        self.assertEqual(model.rowCount(), 0)
@@ -24,6 +24,7 @@ from ExpenseTracker.core.database import (
     cast_type,
     get_sql_type,
     google_serial_date_to_iso,
+    serial_dates_to_iso,
 )
 from ExpenseTracker.settings import lib
 from ExpenseTracker.status import status
@@ -43,6 +44,10 @@ ROWS: List[List[Any]] = [
 ]
 
 
+def category(name: str) -> dict:
+    return {'display_name': name, 'color': '#00FF00', 'description': '', 'icon': 'cat', 'excluded': False}
+
+
 def df(rows: List[List[Any]] | None = None) -> pd.DataFrame:
     return pd.DataFrame(rows or ROWS, columns=list(HDR_TYPES_BASE))
 
@@ -86,6 +91,24 @@ class DatabaseAPITests(BaseTestCase):
         with self.assertRaises(status.HeadersInvalidException):
             cast_type('NoSuchHeader', 1)
 
+    def test_serial_dates_to_iso(self):
+        values = [45002, 45002.75, -20000, 2958466, '2025-01-02', None, float('nan'), True]
+        expected = [google_serial_date_to_iso(45002)] * 2 + ['1845-03-28', None, None, None, None, None]
+        self.assertEqual(serial_dates_to_iso(values).tolist(), expected)
+        self.assertEqual(serial_dates_to_iso(pd.Series([1, 60]).to_numpy()).tolist(), ['1899-12-31', '1900-02-28'])
+        self.assertEqual(serial_dates_to_iso([]).tolist(), [])
+
+    def test_cache_data_converts_serial_dates_without_parsing(self):
+        self._apply_header_cfg()
+        rows = [[45658, 1.0, 'A', 'Food', 1], ['02.01.2025', 2.0, 'B', 'Food', 2]]
+
+        with patch('ExpenseTracker.core.database.locale.parse_date',
+                   return_value=datetime.datetime(2025, 1, 2)) as parse_date:
+            self._cache_df(df(rows))
+        parse_date.assert_called_once()
+
+        self.assertEqual(DatabaseAPI.data()['Date'].tolist(), ['2025-01-01', '2025-01-02'])
+
     def test_cache_empty_state_empty(self):
         self._apply_header_cfg()
         self._cache_df(pd.DataFrame(columns=list(HDR_TYPES_BASE)))
@@ -134,6 +157,21 @@ class DatabaseAPITests(BaseTestCase):
             DatabaseAPI.verify()
         self.assertEqual(DatabaseAPI.get_state(), CacheState.Stale)
 
+    def test_quality_model_reloads_once_per_cache(self):
+        from ExpenseTracker.data.model.quality import QualityModel
+        from ExpenseTracker.ui.actions import signals
+
+        self._apply_header_cfg()
+        model = QualityModel()
+        resets = []
+        model.modelReset.connect(lambda: resets.append(1))
+
+        DatabaseAPI.cache_data(df())
+        self.assertEqual(len(resets), 1)
+        # Appending emits dataQualityChanged itself, the append signal doesn't reload again
+        signals.dataAppended.emit(df())
+        self.assertEqual(len(resets), 1)
+
     def test_get_row_and_update_cell(self):
         self._apply_header_cfg()
         self._cache_df(df())
@@ -147,6 +185,63 @@ class DatabaseAPITests(BaseTestCase):
         with self.assertRaises(sqlite3.OperationalError):
             DatabaseAPI.update_cell(1, 'Bogus', 'x')
 
+    def test_cache_data_records_quality_issues(self):
+        from ExpenseTracker.core.quality import Issue
+        self._apply_header_cfg()
+        lib.settings.set_section('categories', {'Food': category('Food'), 'Rent': category('Rent')})
+        rows = ROWS + [
+            ['2025-01-01', 10.5, 'Coffee', 'Food', 1],  # duplicate of row 1
+            ['2025-01-03', 5, 'Snack', 'Unknown', 1],
+            [None, 5, 'No date', 'Food', 1],
+        ]
+        self._cache_df(df(rows))
+
+        report = DatabaseAPI.quality_report()
+        self.assertEqual(report.total_rows, 5)
+        self.assertEqual(report.ids(Issue.Duplicate), [3])
+        self.assertEqual(report.ids(Issue.UnmappedCategory), [4])
+        self.assertEqual(report.ids(Issue.InvalidDate), [5])
+        self.assertEqual(report.ids(Issue.InvalidAmount), [])
+
+        # Editing the category updates the stored flag without a full rescan
+        with mute_ui_signals():
+            DatabaseAPI.update_cell(4, 'Category', 'Food')
+        self.assertEqual(DatabaseAPI.quality_report().ids(Issue.UnmappedCategory), [])
+
+        # A config change triggers a rescan
+        lib.settings.set_section('categories', {'Rent': category('Rent')})
+        with mute_ui_signals():
+            report = DatabaseAPI.scan_quality()
+        self.assertEqual(report.ids(Issue.UnmappedCategory), [1, 3, 4, 5])
+
+    def test_quality_changed_is_emitted_after_commit(self):
+        from ExpenseTracker.core.quality import Issue
+        from ExpenseTracker.ui.actions import signals
+
+        self._apply_header_cfg()
+        lib.settings.set_section('categories', {'Food': category('Food'), 'Rent': category('Rent')})
+        self._cache_df(df())
+
+        seen = []
+
+        def on_quality_changed():
+            seen.append(DatabaseAPI.quality_report().ids(Issue.UnmappedCategory))
+
+        signals.dataQualityChanged.connect(on_quality_changed)
+        try:
+            DatabaseAPI.update_cell(1, 'Category', 'Unknown')
+            DatabaseAPI.update_cell(1, 'Amount', 1.0)
+        finally:
+            signals.dataQualityChanged.disconnect(on_quality_changed)
+        # The slot reads the committed flag, and edits of other columns don't emit
+        self.assertEqual(seen, [[1]])
+
+    def test_quality_report_empty_without_cache(self):
+        self.assertTrue(DatabaseAPI.quality_report().is_clean())
+        self._apply_header_cfg()
+        self._cache_df(pd.DataFrame(columns=list(HDR_TYPES_BASE)))
+        self.assertTrue(DatabaseAPI.quality_report().is_clean())
+
     def test_delete_retries(self):
         self._apply_header_cfg()
         self._cache_df(df())
@@ -0,0 +1,64 @@
+"""Tests for :mod:`ExpenseTracker.core.discovery`."""
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import httplib2
+from google.oauth2.credentials import Credentials
+from googleapiclient import discovery_cache
+
+from ExpenseTracker.core import discovery
+from ExpenseTracker.core.profiler import profiler
+
+
+class DiscoveryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        discovery.clear()
+        profiler.clear()
+
+    def tearDown(self) -> None:
+        discovery.clear()
+        profiler.clear()
+
+    def _stages(self, name):
+        return [r for r in profiler.records() if r.stage == name]
+
+    def test_document_is_parsed_once(self):
+        document = discovery.get_document()
+        self.assertEqual((document['name'], document['version']), ('sheets', 'v4'))
+        self.assertIs(discovery.get_document(), document)
+        self.assertEqual(len(self._stages('service.discovery')), 1)
+
+    def test_build_service(self):
+        service = discovery.build_service(Credentials(token='token'))
+        request = service.spreadsheets().values().batchGet(spreadsheetId='abc', ranges=['Sheet1!A1'])
+        self.assertIn('/v4/spreadsheets/abc/values:batchGet', request.uri)
+        self.assertEqual(service._http.credentials.token, 'token')
+        self.assertEqual(len(self._stages('service.build')), 1)
+
+    def test_first_request_is_timed(self):
+        http = mock.Mock()
+        http.request.return_value = (httplib2.Response({'status': 200}), b'{}')
+        authorized = discovery._FirstRequestHttp(Credentials(token='token'), http=http)
+        authorized.request('https://example.com')
+        authorized.request('https://example.com')
+
+        self.assertEqual(http.request.call_count, 2)
+        self.assertEqual(http.request.call_args.kwargs['headers']['authorization'], 'Bearer token')
+        self.assertEqual(len(self._stages('service.first_request')), 1)
+
+    def test_disk_cache_when_not_bundled(self):
+        content = json.dumps({'name': 'sheets', 'version': 'v4', 'revision': '1', 'resources': {}})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'discovery' / 'sheets.v4.test.json'
+            with mock.patch.object(discovery_cache, 'get_static_doc', return_value=None), \
+                    mock.patch.object(discovery, 'cache_path', return_value=path), \
+                    mock.patch.object(discovery, '_download', return_value=content) as download:
+                self.assertEqual(discovery.get_document()['revision'], '1')
+                self.assertEqual(path.read_text(encoding='utf-8'), content)
+
+                discovery.clear()
+                self.assertEqual(discovery.get_document()['revision'], '1')
+                download.assert_called_once()
@@ -0,0 +1,180 @@
+"""Tests for :mod:`ExpenseTracker.core.fetcher`."""
+import csv
+import pathlib
+import tempfile
+import unittest
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from ExpenseTracker.core import fetcher
+from ExpenseTracker.core import localsheets
+from ExpenseTracker.core import service
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase
+
+HEADER = ['Date', 'Amount', 'Description', 'Category', 'Account']
+
+
+def _http_error(status_code: int) -> HttpError:
+    return HttpError(httplib2.Response({'status': status_code}), b'{}', uri='test')
+
+
+class _FlakyRequest:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def execute(self, http=None, num_retries=0):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'ok': True}
+
+
+class RetryTests(unittest.TestCase):
+    def test_split_ranges(self):
+        self.assertEqual(
+            fetcher.split_ranges('Sheet1', 7, 'E', 3),
+            ['Sheet1!A1:E3', 'Sheet1!A4:E6', 'Sheet1!A7:E7']
+        )
+        self.assertEqual(fetcher.split_ranges('Sheet1', 0, 'E', 3), [])
+
+    def test_retries_transient_errors(self):
+        request = _FlakyRequest([_http_error(503), _http_error(429)])
+        self.assertEqual(fetcher.execute_with_retry(request, backoff=0.0), {'ok': True})
+        self.assertEqual(request.calls, 3)
+
+    def test_does_not_retry_client_errors(self):
+        request = _FlakyRequest([_http_error(403)])
+        with self.assertRaises(HttpError):
+            fetcher.execute_with_retry(request, backoff=0.0)
+        self.assertEqual(request.calls, 1)
+
+    def test_gives_up_after_attempts(self):
+        request = _FlakyRequest([_http_error(500)] * 5)
+        with self.assertRaises(HttpError):
+            fetcher.execute_with_retry(request, attempts=3, backoff=0.0)
+        self.assertEqual(request.calls, 3)
+
+
+class FetchRangesTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp.name) / 'ledger.csv'
+        self.rows = [[f'2025-01-{1 + i % 28:02d}', str(-i), f'Item {i}', 'Food', 'Visa'] for i in range(50)]
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + self.rows)
+
+        self.sid = f'local:{self.csv_path}'
+        self.service = localsheets.LocalSheetsService(self.sid)
+        self.ranges = fetcher.split_ranges('Sheet1', len(self.rows) + 1, 'E', 7)
+
+    def tearDown(self) -> None:
+        service.clear_service()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_concurrent_matches_single_request(self):
+        single = fetcher.fetch_ranges(self.service, self.sid, self.ranges, concurrency=1)
+        concurrent = fetcher.fetch_ranges(self.service, self.sid, self.ranges, concurrency=4)
+        self.assertEqual(concurrent, single)
+        self.assertEqual(len(concurrent), len(self.rows) + 1)
+        self.assertEqual(concurrent[0], HEADER)
+        self.assertEqual(concurrent[-1][2], 'Item 49')
+
+    def test_progress_is_reported_per_range(self):
+        calls = []
+        fetcher.fetch_ranges(self.service, self.sid, self.ranges, concurrency=3,
+                             progress=lambda *args: calls.append(args))
+        self.assertEqual(len(calls), len(self.ranges))
+        self.assertEqual(sorted(c[0] for c in calls), list(range(1, len(self.ranges) + 1)))
+        self.assertEqual(max(calls)[1:], (len(self.ranges), len(self.rows) + 1))
+
+    def test_failed_range_raises(self):
+        svc = localsheets.LocalSheetsService(f'{self.sid}?error_rate=1&error_status=500')
+        with self.assertRaises(HttpError):
+            fetcher.fetch_ranges(svc, svc.spreadsheet_id, self.ranges, concurrency=2, attempts=2, backoff=0.0)
+
+    def test_fetch_data_chunking_is_transparent(self):
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category',
+            'account': 'Account',
+        })
+        service.clear_service()
+        lib.settings.set_section('spreadsheet', {'id': self.sid, 'worksheet': 'Sheet1'})
+
+        single = service._fetch_data(concurrency=1)
+        chunked = service._fetch_data(chunk_size=5, concurrency=4)
+        self.assertTrue(chunked.equals(single))
+        self.assertEqual(len(chunked), len(self.rows))
+
+
+def _blank_to_none(df):
+    df = df.astype(object)
+    return df.where(df.notna() & (df != ''), None)
+
+
+class FetchColumnsTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp.name) / 'ledger.csv'
+        self.header = ['Date', 'Notes', 'Amount', 'Description', 'Category', 'Account']
+        self.rows = [
+            [f'2025-01-{1 + i % 28:02d}', 'n' if i % 3 else '', str(-i - 0.5 * (i % 2)), f'Item {i}',
+             'Food' if i % 4 else '', 'Visa']
+            for i in range(23)
+        ]
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([self.header] + self.rows + [[], []])
+
+        self.sid = f'local:{self.csv_path}'
+        self.service = localsheets.LocalSheetsService(self.sid)
+
+    def tearDown(self) -> None:
+        service.clear_service()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_column_spans(self):
+        self.assertEqual(fetcher.column_spans([7, 0, 2, 1, 5, 8]), [(0, 2), (5, 5), (7, 8)])
+        self.assertEqual(fetcher.column_spans([]), [])
+
+    def test_fetch_columns_matches_rows(self):
+        rows = fetcher.fetch_ranges(self.service, self.sid, [f'Sheet1!A2:F{len(self.rows) + 3}'], concurrency=1)
+        rows = [r + [None] * (6 - len(r)) for r in rows] + [[None] * 6] * (len(self.rows) + 2 - len(rows))
+        for concurrency in (1, 3):
+            requests = self.service.request_count
+            columns = fetcher.fetch_columns(
+                self.service, self.sid, 'Sheet1', [5, 0, 2, 4], 2, len(self.rows) + 3, chunk_size=7,
+                concurrency=concurrency,
+            )
+            # One request per block of rows, holding the ranges of the three column spans
+            self.assertEqual(self.service.request_count - requests, 1 if concurrency == 1 else 4)
+            # Empty cells at the end of a range are missing from the response, like at the end of a row
+            expected = [[row[i] if row[i] != '' else None for row in rows] for i in (5, 0, 2, 4)]
+            self.assertEqual([[v if v != '' else None for v in c] for c in columns], expected)
+
+    def test_fetch_data_column_major_skips_unused_columns(self):
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category',
+            'account': 'Account',
+        })
+        service.clear_service()
+        lib.settings.set_section('spreadsheet', {'id': self.sid, 'worksheet': 'Sheet1'})
+
+        by_row = service._fetch_data(column_major=False)
+        by_column = service._fetch_data(chunk_size=5, column_major=True)
+
+        self.assertEqual(by_column.columns.tolist(), ['Date', 'Amount', 'Description', 'Category', 'Account'])
+        self.assertEqual(len(by_column), len(self.rows))
+        self.assertTrue(_blank_to_none(by_column).equals(_blank_to_none(by_row.drop(columns=['Notes']))))
+        self.assertEqual(by_column['Amount'].dtype, 'float64')
@@ -0,0 +1,129 @@
+"""Tests for :mod:`ExpenseTracker.core.filters`."""
+import sqlite3
+
+import pandas as pd
+
+from ExpenseTracker.core import filters
+from ExpenseTracker.core.database import DatabaseAPI
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase, mute_ui_signals
+
+ROWS = [
+    ['2025-01-01', -120.0, 'Uber ride', 'Travel', 'Visa'],
+    ['2025-01-05', -20.0, 'Coffee', 'Food', 'Amex'],
+    ['2025-02-01', -75.5, 'UBER EATS', 'Food', 'Debit'],
+    ['2025-02-10', 1500.0, 'Salary', 'Income', 'Visa'],
+]
+
+EXPRESSIONS = {
+    'amount < -50 and account in ("Visa", "Amex") and description ~ "uber"': [0],
+    'description ~ "uber"': [0, 2],
+    'not description ~ "uber"': [1, 3],
+    'category = "Food" or amount > 0': [1, 2, 3],
+    'account not in ("Visa")': [1, 2],
+    "date >= '2025-02-01'": [2, 3],
+    '(amount < 0 and category != "Food") or description !~ "e"': [0, 3],
+}
+
+
+def logical_frame() -> pd.DataFrame:
+    df = pd.DataFrame(ROWS, columns=['date', 'amount', 'description', 'category', 'account'])
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+class FilterExpressionTests(BaseTestCase):
+    def test_mask_matches_expected_rows(self):
+        df = logical_frame()
+        for expression, expected in EXPRESSIONS.items():
+            with self.subTest(expression=expression):
+                mask = filters.compile_filter(expression).mask(df)
+                self.assertEqual(mask[mask].index.tolist(), expected)
+
+    def test_sql_matches_mask(self):
+        self._assert_sql_matches(ROWS, EXPRESSIONS)
+
+    def _assert_sql_matches(self, rows, expressions):
+        conn = sqlite3.connect(':memory:')
+        filters.register_sql_functions(conn)
+        conn.execute('CREATE TABLE t (local_id INTEGER, D TEXT, A REAL, N TEXT, C TEXT, Acc TEXT)')
+        conn.executemany('INSERT INTO t VALUES (?, ?, ?, ?, ?, ?)', [[i] + r for i, r in enumerate(rows)])
+        columns = {'date': ['D'], 'amount': ['A'], 'description': ['N'], 'category': ['C'], 'account': ['Acc']}
+
+        df = pd.DataFrame(rows, columns=['date', 'amount', 'description', 'category', 'account'])
+        df['date'] = pd.to_datetime(df['date'])
+        for expression, expected in expressions.items():
+            with self.subTest(expression=expression):
+                f = filters.compile_filter(expression)
+                where, params = f.to_sql(columns)
+                ids = [r[0] for r in conn.execute(f'SELECT local_id FROM t WHERE {where} ORDER BY local_id', params)]
+                self.assertEqual(ids, expected)
+                mask = f.mask(df)
+                self.assertEqual(mask[mask].index.tolist(), expected)
+        conn.close()
+
+    def test_empty_cells_match_alike(self):
+        rows = [
+            ['2025-01-01', None, None, None, None],
+            ['2025-01-02', -5.0, 'Été café', 'Food', 'Amex'],
+            ['2025-01-03', 0.0, '', '', ''],
+        ]
+        self._assert_sql_matches(rows, {
+            'account != "Amex"': [0, 2],
+            'account not in ("Amex", "Visa")': [0, 2],
+            'account = ""': [0, 2],
+            'description !~ "café"': [0, 2],
+            'amount = 0': [0, 2],
+            'amount < 0 or category = "Food"': [1],
+            'description ~ "ÉTÉ"': [1],
+            'description ~ "CAFÉ" and account ~ "amex"': [1],
+            'description ~ "%"': [],
+            'date <= "2025-01-02"': [0, 1],
+        })
+
+    def test_literals_are_typed(self):
+        self.assertEqual(filters.compile_filter('amount < "-5"').root.value, -5.0)
+        self.assertEqual(filters.compile_filter('date >= "2025-2-1"').root.value, '2025-02-01')
+        self.assertEqual(filters.compile_filter('account = 1234').root.value, '1234')
+        self.assertEqual(filters.compile_filter('description ~ 10').root.pattern, '10')
+
+        for expression in ('amount < "x"', 'amount in (1, "x")', 'date = 2025', 'date > "soon"'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(filters.FilterSyntaxError):
+                    filters.compile_filter(expression)
+
+    def test_compiled_filters_are_cached(self):
+        a = filters.compile_filter('amount > 1')
+        b = filters.compile_filter('amount > 1')
+        self.assertIs(a, b)
+
+    def test_syntax_errors(self):
+        for expression in ('', 'uber', 'amount <', 'bogus = 1', 'amount in (1', 'amount > 1 and', '"x" = 1'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(filters.FilterSyntaxError):
+                    filters.compile_filter(expression)
+
+    def test_apply_filter_empty_expression_is_noop(self):
+        df = logical_frame()
+        self.assertIs(filters.apply_filter(df, '  '), df)
+
+    def test_database_data_filter_expression(self):
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(pd.DataFrame(ROWS, columns=['Date', 'Amount', 'Description', 'Category', 'Account']))
+
+        df = DatabaseAPI.data(filter_expression='description ~ "uber" and amount < -100')
+        self.assertEqual(df['Description'].tolist(), ['Uber ride'])
+
+    def test_get_data_rejects_mistyped_literal(self):
+        from ExpenseTracker.data.data import get_data
+
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(pd.DataFrame(ROWS, columns=['Date', 'Amount', 'Description', 'Category', 'Account']))
+        with self.assertRaises(filters.FilterSyntaxError):
+            get_data(filter_expression='amount < "x"')
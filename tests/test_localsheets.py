@@ -0,0 +1,323 @@
+"""Tests for :mod:`ExpenseTracker.core.localsheets`.
+
+Exercises the service and sync code paths end-to-end against the file-backed stand-in.
+"""
+import csv
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from googleapiclient.errors import HttpError
+from PySide6 import QtCore
+
+from ExpenseTracker.core import localsheets
+from ExpenseTracker.core import rowindex
+from ExpenseTracker.core import service
+from ExpenseTracker.core.database import DatabaseAPI, ledger_fingerprint
+from ExpenseTracker.core.scheduler import request_name, scheduler
+from ExpenseTracker.core.sync import SyncAPI
+from ExpenseTracker.settings import lib
+from ExpenseTracker.status import status
+from tests.base import BaseTestCase, mute_ui_signals
+
+HEADER = ['Date', 'Amount', 'Description', 'Category', 'Account']
+ROWS = [
+    ['2025-01-01', '-10.5', 'Coffee', 'Food', 'Visa'],
+    ['2025-01-02', '-900', 'Rent', 'Housing', 'Debit'],
+    ['2025-01-03', '-4.25', 'Bus', 'Travel', 'Visa'],
+]
+
+
+class LocalSheetsTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp.name) / 'ledger.csv'
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + ROWS)
+
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category',
+            'account': 'Account',
+        })
+        self._use(f'local:{self.csv_path}')
+
+    def tearDown(self) -> None:
+        service.clear_service()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def _use(self, spreadsheet_id: str) -> None:
+        service.clear_service()
+        lib.settings.set_section('spreadsheet', {'id': spreadsheet_id, 'worksheet': 'Sheet1'})
+
+    def test_get_service_returns_local_service(self):
+        svc = service.get_service()
+        self.assertIsInstance(svc, localsheets.LocalSheetsService)
+        self.assertIs(service.get_service(), svc)
+
+    def test_missing_file_is_service_unavailable(self):
+        self._use('local:/no/such/ledger.csv')
+        with self.assertRaises(status.ServiceUnavailableException):
+            service.get_service()
+
+    def test_fetch_headers_data_and_categories(self):
+        self.assertEqual(service._fetch_headers(), HEADER)
+        self.assertEqual(service._fetch_categories(), ['Food', 'Housing', 'Travel'])
+
+        df = service._fetch_data()
+        self.assertEqual(list(df.columns), HEADER)
+        self.assertEqual(len(df), 3)
+        # Dates are served as serial numbers, amounts as numbers
+        self.assertEqual(df['Date'].iloc[0], 45658)
+        self.assertEqual(df['Amount'].iloc[1], -900)
+
+    def _settle(self, handle) -> list:
+        outcome = []
+        handle.finished.connect(lambda result: outcome.append(('finished', result)))
+        handle.failed.connect(lambda ex: outcome.append(('failed', ex)))
+        deadline = time.monotonic() + 5
+        while not handle.settled and time.monotonic() < deadline:
+            QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+        return outcome
+
+    def test_operations_return_task_handles(self):
+        # The caller isn't blocked, the result arrives through the handle's signals
+        self.assertEqual(self._settle(service.fetch_headers()), [('finished', HEADER)])
+        self.assertEqual(self._settle(service.verify_mapping()), [('finished', None)])
+
+        errors = []
+        from ExpenseTracker.ui.actions import signals
+        signals.error.connect(errors.append)
+        try:
+            self._use('local:/no/such/ledger.csv')
+            outcome = self._settle(service.verify_sheet_access())
+        finally:
+            signals.error.disconnect(errors.append)
+        self.assertEqual(outcome[0][0], 'failed')
+        self.assertTrue(errors)
+
+    def test_range_parsing_and_rendering(self):
+        svc = service.get_service()
+        sid = lib.settings.get_section('spreadsheet')['id']
+
+        result = svc.spreadsheets().values().batchGet(
+            spreadsheetId=sid, ranges=['Sheet1!B2:C', "'Sheet1'!A4"],
+            valueRenderOption='FORMATTED_VALUE',
+        ).execute()
+        self.assertEqual(result['valueRanges'][0]['values'],
+                         [['-10.5', 'Coffee'], ['-900', 'Rent'], ['-4.25', 'Bus']])
+        self.assertEqual(result['valueRanges'][1]['values'], [['2025-01-03']])
+
+        with self.assertRaises(HttpError) as ctx:
+            svc.spreadsheets().values().batchGet(spreadsheetId='other', ranges=['Sheet1!A1']).execute()
+        self.assertEqual(ctx.exception.resp.status, 404)
+
+    def test_grid_data_header_types(self):
+        svc = service.get_service()
+        sid = lib.settings.get_section('spreadsheet')['id']
+        result = svc.spreadsheets().get(spreadsheetId=sid, ranges=['Sheet1!A2:E2'], includeGridData=True).execute()
+        cells = result['sheets'][0]['data'][0]['rowData'][0]['values']
+        self.assertEqual(
+            [service._convert_types(c) for c in cells],
+            ['date', 'float', 'string', 'string', 'string']
+        )
+
+    def test_injected_errors_and_latency(self):
+        self._use(f'local:{self.csv_path}?error_rate=1&error_status=503')
+        with self.assertRaises(status.ServiceUnavailableException):
+            service._verify_sheet_access()
+
+        self._use(f'local:{self.csv_path}?latency=0.01')
+        svc = service.get_service()
+        self.assertEqual(svc.latency, 0.01)
+        service._fetch_headers()
+        self.assertGreater(svc.request_count, 0)
+
+    def test_commit_queue_updates_csv(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+
+        api = SyncAPI()
+        api.queue_edit(2, 'category', 'Home')
+        with mute_ui_signals():
+            results = api.commit_queue()
+        self.assertEqual(results, {(2, 'category'): (True, 'Committed successfully')})
+
+        with self.csv_path.open(newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[2][3], 'Home')
+        self.assertEqual(DatabaseAPI.get_row(2)['Category'], 'Home')
+
+    def _commit_and_cancel(self, api: SyncAPI, cancel) -> dict:
+        """Commit the queued edits in the background, calling ``cancel(handle)`` on batchUpdate."""
+        handles, results = [], []
+        started = threading.Event()
+        execute = scheduler.execute
+
+        def execute_and_cancel(request, **kwargs):
+            if request_name(request).endswith('batchUpdate'):
+                started.wait(5)
+                cancel(handles[0])
+            return execute(request, **kwargs)
+
+        api.commitFinished.connect(results.append)
+        with mute_ui_signals(), mock.patch.object(scheduler, 'execute', execute_and_cancel):
+            handles.append(api.commit_queue_async())
+            started.set()
+            deadline = time.monotonic() + 30
+            while not results and time.monotonic() < deadline:
+                QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+        self.assertTrue(handles[0].settled)
+        self.assertEqual(len(results), 1)
+        return results[0]
+
+    def test_cancelling_during_batch_update_reports_the_commit(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+        self._use(f'local:{self.csv_path}?latency=0.4')
+
+        api = SyncAPI()
+        api.queue_edit(2, 'category', 'Home')
+        results = self._commit_and_cancel(
+            api, lambda handle: threading.Timer(0.1, handle.cancel, args=('Stop.',)).start()
+        )
+
+        # The request was already sent, so the commit completed and says so
+        self.assertEqual(results, {(2, 'category'): (True, 'Committed successfully')})
+        self.assertEqual(api.get_queued_ops(), [])
+        with self.csv_path.open(newline='') as f:
+            self.assertEqual(list(csv.reader(f))[2][3], 'Home')
+        self.assertEqual(DatabaseAPI.get_row(2)['Category'], 'Home')
+
+    def test_cancelling_before_batch_update_keeps_edits_queued(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+
+        api = SyncAPI()
+        api.queue_edit(2, 'category', 'Home')
+        results = self._commit_and_cancel(api, lambda handle: handle.cancel('Stop.'))
+
+        self.assertEqual(results, {(2, 'category'): (False, 'Stop.')})
+        self.assertEqual(len(api.get_queued_ops()), 1)
+        with self.csv_path.open(newline='') as f:
+            self.assertEqual(list(csv.reader(f))[2][3], 'Housing')
+        self.assertEqual(DatabaseAPI.get_row(2)['Category'], 'Housing')
+
+    def _batch_get_ranges(self):
+        return [r.ranges for r in scheduler.records() if r.name.endswith('batchGet')]
+
+    def test_commit_verifies_only_indexed_rows(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+        key = (('2025-01-02',), (-900.0,), ('Rent',))
+        self.assertEqual(DatabaseAPI.lookup_row_index([rowindex.fingerprint(key)]), {rowindex.fingerprint(key): [3]})
+
+        scheduler.clear()
+        api = SyncAPI()
+        api.queue_edit(2, 'category', 'Home')
+        with mute_ui_signals():
+            results = api.commit_queue()
+        self.assertEqual(results, {(2, 'category'): (True, 'Committed successfully')})
+        self.assertIn(('Sheet1!A3:C3',), self._batch_get_ranges())
+        self.assertNotIn('Sheet1!A2:A4', [r for ranges in self._batch_get_ranges() for r in ranges])
+
+        with self.csv_path.open(newline='') as f:
+            self.assertEqual(list(csv.reader(f))[2][3], 'Home')
+
+    def test_commit_rebuilds_index_when_rows_moved(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER, ['2024-12-31', '-1', 'Gum', 'Food', 'Visa']] + ROWS)
+        service.clear_service()
+
+        scheduler.clear()
+        api = SyncAPI()
+        api.queue_edit(2, 'description', 'Rent Jan')
+        with mute_ui_signals():
+            results = api.commit_queue()
+        self.assertEqual(results, {(2, 'description'): (True, 'Committed successfully')})
+        self.assertIn('Sheet1!A2:A5', [r for ranges in self._batch_get_ranges() for r in ranges])
+
+        with self.csv_path.open(newline='') as f:
+            self.assertEqual(list(csv.reader(f))[3][2], 'Rent Jan')
+        # The rebuilt index follows the moved rows, the edited key is dropped
+        coffee = rowindex.fingerprint((('2025-01-01',), (-10.5,), ('Coffee',)))
+        rent = rowindex.fingerprint((('2025-01-02',), (-900.0,), ('Rent',)))
+        self.assertEqual(DatabaseAPI.lookup_row_index([coffee, rent]), {coffee: [3]})
+
+    def test_sqlite_backend(self):
+        db_path = pathlib.Path(self.tmp.name) / 'ledger.db'
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE Sheet1 ("Date", "Amount", "Description", "Category", "Account")')
+        conn.executemany('INSERT INTO Sheet1 VALUES (?, ?, ?, ?, ?)', ROWS)
+        conn.commit()
+        conn.close()
+
+        self._use(f'local:{db_path}')
+        self.assertEqual(len(service._fetch_data()), 3)
+
+        svc = service.get_service()
+        sid = lib.settings.get_section('spreadsheet')['id']
+        svc.spreadsheets().values().batchUpdate(spreadsheetId=sid, body={
+            'valueInputOption': 'USER_ENTERED', 'data': [{'range': 'Sheet1!D3', 'values': [['Home']]}]
+        }).execute()
+
+        conn = sqlite3.connect(db_path)
+        self.assertEqual(conn.execute('SELECT Category FROM Sheet1 WHERE rowid = 2').fetchone()[0], 'Home')
+        conn.close()
+
+    def _append_csv_rows(self, rows) -> None:
+        with self.csv_path.open('a', newline='') as f:
+            csv.writer(f).writerows(rows)
+        service.clear_service()
+
+    def test_fetch_new_rows_appends_to_cache(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+        self.assertEqual(DatabaseAPI.get_fetch_state()[0], 3)
+
+        self._append_csv_rows([['2025-01-04', '-7', 'Lunch', 'Food', 'Visa'],
+                               ['2025-01-05', '-3', 'Tea', 'Food', 'Debit']])
+        new_rows = service._fetch_new_rows()
+        self.assertIsNotNone(new_rows)
+        self.assertEqual(list(new_rows.df['Description']), ['Lunch', 'Tea'])
+        self.assertEqual(new_rows.row_count, 5)
+
+        with mute_ui_signals():
+            DatabaseAPI.append_data(new_rows.df)
+            DatabaseAPI.set_fetch_state(new_rows.row_count, new_rows.fingerprint)
+        df = DatabaseAPI.data()
+        self.assertEqual(list(df['Description']), ['Coffee', 'Rent', 'Bus', 'Lunch', 'Tea'])
+        self.assertEqual(list(df['local_id']), [1, 2, 3, 4, 5])
+
+        # The stored fingerprint matches a full fetch of the extended sheet
+        full = service._fetch_data()
+        self.assertEqual(
+            new_rows.fingerprint, ledger_fingerprint(list(full.columns), full.itertuples(index=False, name=None))
+        )
+        self.assertTrue(service._fetch_new_rows().df.empty)
+
+    def test_fetch_new_rows_falls_back_when_tail_changes(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+
+        svc = service.get_service()
+        sid = lib.settings.get_section('spreadsheet')['id']
+        svc.spreadsheets().values().batchUpdate(spreadsheetId=sid, body={
+            'valueInputOption': 'USER_ENTERED', 'data': [{'range': 'Sheet1!C3', 'values': [['Mortgage']]}]
+        }).execute()
+        self.assertIsNone(service._fetch_new_rows())
+
+    def test_fetch_new_rows_needs_fetch_state(self):
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(service._fetch_data())
+        DatabaseAPI.set_fetch_state(0, '')
+        self.assertIsNone(service._fetch_new_rows())
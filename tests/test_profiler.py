@@ -0,0 +1,103 @@
+"""Tests for :mod:`ExpenseTracker.core.profiler`."""
+import tracemalloc
+
+import pandas as pd
+
+from ExpenseTracker.core import profiler
+from ExpenseTracker.core.database import DatabaseAPI
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase, mute_ui_signals
+
+
+class ProfilerTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        profiler.profiler.clear()
+
+    def tearDown(self) -> None:
+        profiler.Profiler.set_track_allocations(False)
+        super().tearDown()
+
+    def test_stage_records_time_and_rows(self):
+        p = profiler.Profiler()
+        with p.stage('outer', rows=10):
+            with p.stage('inner') as s:
+                s.rows = 3
+
+        records = p.records()
+        self.assertEqual([r.stage for r in records], ['inner', 'outer'])
+        self.assertEqual([r.rows for r in records], [3, 10])
+        self.assertTrue(all(r.seconds >= 0 for r in records))
+        self.assertTrue(all(r.peak_bytes is None for r in records))
+        self.assertGreaterEqual(records[1].seconds, records[0].seconds)
+
+    def test_ring_buffer_capacity(self):
+        p = profiler.Profiler(capacity=5)
+        for i in range(8):
+            with p.stage(f's{i}'):
+                pass
+        self.assertEqual([r.stage for r in p.records()], ['s3', 's4', 's5', 's6', 's7'])
+
+        generation = p.generation
+        p.clear()
+        self.assertEqual(p.records(), [])
+        self.assertGreater(p.generation, generation)
+
+    def test_stage_recorded_on_exception(self):
+        p = profiler.Profiler()
+        with self.assertRaises(RuntimeError):
+            with p.stage('failing'):
+                raise RuntimeError('boom')
+        self.assertEqual([r.stage for r in p.records()], ['failing'])
+
+    def test_profiled_decorator_counts_rows(self):
+        @profiler.profiled('test.decorated')
+        def build():
+            return pd.DataFrame({'a': range(7)})
+
+        self.assertEqual(len(build()), 7)
+        record = profiler.profiler.records()[-1]
+        self.assertEqual((record.stage, record.rows), ('test.decorated', 7))
+
+    def test_peak_allocations(self):
+        profiler.Profiler.set_track_allocations(True)
+        self.assertTrue(tracemalloc.is_tracing())
+
+        p = profiler.Profiler()
+        with p.stage('outer'):
+            with p.stage('inner'):
+                data = [object() for _ in range(20000)]
+            del data
+
+        inner, outer = p.records()
+        self.assertGreater(inner.peak_bytes, 0)
+        self.assertGreaterEqual(outer.peak_bytes, inner.peak_bytes)
+
+    def test_summary_and_histogram(self):
+        p = profiler.Profiler()
+        for seconds in (0.1, 0.2, 0.3, 1.0):
+            p.add(profiler.StageRecord('fetch', seconds, rows=5))
+        p.add(profiler.StageRecord('cast', 0.5))
+
+        summary = p.summary()
+        self.assertEqual(list(summary), ['fetch', 'cast'])
+        fetch = summary['fetch']
+        self.assertEqual(fetch.calls, 4)
+        self.assertEqual(fetch.last, 1.0)
+        self.assertAlmostEqual(fetch.median, 0.25)
+        self.assertEqual(fetch.max, 1.0)
+        self.assertEqual(fetch.last_rows, 5)
+        self.assertEqual(fetch.histogram(3), [3, 0, 1])
+        self.assertEqual(summary['cast'].histogram(4), [1, 0, 0, 0])
+
+    def test_cache_data_records_stages(self):
+        lib.settings.set_section('header', {'Date': 'date', 'Amount': 'float'})
+        df = pd.DataFrame([['2025-01-01', 1.0], ['2025-01-02', 2.0]], columns=['Date', 'Amount'])
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(df)
+        DatabaseAPI.data()
+
+        stages = {r.stage: r.rows for r in profiler.profiler.records()}
+        self.assertEqual(stages['database.cast'], 2)
+        self.assertEqual(stages['database.insert'], 2)
+        self.assertEqual(stages['database.read_sql'], 2)
@@ -0,0 +1,93 @@
+"""Tests for :mod:`ExpenseTracker.core.rowindex`."""
+import math
+
+import numpy as np
+import pandas as pd
+
+from ExpenseTracker.core import rowindex
+from ExpenseTracker.core.database import DatabaseAPI
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase, mute_ui_signals
+
+
+class RowIndexTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Notes': 'string', 'Category': 'string',
+        })
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description|Notes', 'category': 'Category',
+            'account': 'Category',
+        })
+
+    def _frame(self, rows):
+        return pd.DataFrame(rows, columns=['Date', 'Amount', 'Description', 'Notes', 'Category'])
+
+    def test_normalize_value(self):
+        self.assertEqual(rowindex.normalize_value('date', 45658), '2025-01-01')
+        self.assertEqual(rowindex.normalize_value('date', '2025-01-01'), '2025-01-01')
+        self.assertEqual(rowindex.normalize_value('amount', '-10.499'), -10.5)
+        self.assertEqual(rowindex.normalize_value('id', 7.0), 7)
+        self.assertEqual(rowindex.normalize_value('description', '  Coffee '), 'Coffee')
+        self.assertIsNone(rowindex.normalize_value('amount', None))
+        self.assertEqual(rowindex.normalize_value('description', None), '')
+
+    def test_normalize_values_matches_per_cell(self):
+        values = [None, 45227, 45227.7, -30000, 2.675, 0.285, -0.001, 1e15, 10, True, float('nan'),
+                  ' 10.5 ', 'abc', '', '2025-01-01', 7.0, -4.25]
+        for field in ('date', 'amount', 'id', 'description'):
+            expected = [str(v) if isinstance(v, float) and math.isnan(v) else v
+                        for v in (rowindex.normalize_value(field, v) for v in values)]
+            actual = [str(v) if isinstance(v, float) and math.isnan(v) else v
+                      for v in rowindex.normalize_values(field, values)]
+            self.assertEqual(actual, expected, field)
+            self.assertEqual([type(v) for v in actual], [type(v) for v in expected], field)
+
+        # NaN of a numeric column is an empty cell
+        self.assertEqual(rowindex.normalize_values('amount', np.array([1.005, np.nan])), [1.0, None])
+        self.assertEqual(rowindex.normalize_values('description', np.array([1.5, np.nan])), ['1.5', ''])
+
+    def test_hash_keys(self):
+        columns = [['2025-01-01', '2025-01-01', None], [10, 10.0, -0.0], ['a', 'a', '']]
+        hashes = rowindex.hash_keys(columns, 3)
+        self.assertEqual(hashes.dtype, np.int64)
+        self.assertEqual(hashes[0], hashes[1])
+        self.assertEqual(hashes[0], rowindex.fingerprint((('2025-01-01',), (10.0,), ('a',))))
+        self.assertEqual(rowindex.fingerprint(((None,), (0.0,), ('',))), hashes[2])
+        self.assertNotEqual(rowindex.fingerprint((('a', 'b'),)), rowindex.fingerprint((('b', 'a'),)))
+        self.assertEqual(rowindex.empty_keys(columns, 3).tolist(), [False, False, False])
+        self.assertEqual(rowindex.empty_keys([[None, 'x'], ['', '']], 2).tolist(), [True, False])
+
+    def test_stable_layout(self):
+        self.assertEqual(rowindex.stable_layout(['#', 'Date']), (['id'], {'id': ['#']}))
+        fields, stable_map = rowindex.stable_layout(['Date', 'Amount', 'Notes', 'Description'])
+        self.assertEqual(fields, ['date', 'amount', 'description'])
+        self.assertEqual(stable_map['description'], ['Description', 'Notes'])
+        with self.assertRaises(ValueError):
+            rowindex.stable_layout(['Date', 'Description'])
+
+    def test_frame_entries(self):
+        df = self._frame([
+            [45658, -10.5, 'Coffee', 'Cup', 'Food'],
+            [math.nan, math.nan, None, None, 'Food'],  # Empty key, not indexed
+            [45659, -900, 'Rent', None, 'Housing'],
+        ])
+        entries = rowindex.frame_entries(df, first_row=10)
+        self.assertEqual([row for row, _ in entries], [10, 12])
+        self.assertEqual(entries[1][1], rowindex.fingerprint((('2025-01-02',), (-900.0,), ('Rent', ''))))
+
+        self.assertEqual(rowindex.frame_entries(df[['Date', 'Category']]), [])
+
+    def test_cache_and_append_record_index(self):
+        rows = [[45658, -10.5, 'Coffee', '', 'Food'], [45659, -900, 'Rent', '', 'Housing']]
+        with mute_ui_signals():
+            DatabaseAPI.cache_data(self._frame(rows))
+            DatabaseAPI.append_data(self._frame([[45660, -3, 'Tea', '', 'Food']]))
+
+        tea = rowindex.fingerprint((('2025-01-03',), (-3.0,), ('Tea', '')))
+        rent = rowindex.fingerprint((('2025-01-02',), (-900.0,), ('Rent', '')))
+        self.assertEqual(DatabaseAPI.lookup_row_index([tea, rent, 'missing']), {rent: [3], tea: [4]})
+
+        DatabaseAPI.remove_row_index([3])
+        self.assertEqual(DatabaseAPI.lookup_row_index([rent]), {})
@@ -0,0 +1,202 @@
+"""Tests for :mod:`ExpenseTracker.core.scheduler`."""
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from ExpenseTracker.core import scheduler
+from ExpenseTracker.core.tasks import CancellationToken, TaskExecutor, current_token
+from ExpenseTracker.status import status
+
+
+def _http_error(status_code: int, retry_after: str = None) -> HttpError:
+    headers = {'status': status_code}
+    if retry_after is not None:
+        headers['retry-after'] = retry_after
+    return HttpError(httplib2.Response(headers), b'{}', uri='test')
+
+
+class _Request:
+    def __init__(self, errors, method='GET', rate_limited=True):
+        self.errors = list(errors)
+        self.method = method
+        self.rate_limited = rate_limited
+        self.methodId = 'sheets.spreadsheets.values.batchGet'
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'ok': True}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_waits_for_tokens_at_the_quota_rate(self):
+        clock = _Clock()
+        bucket = scheduler.TokenBucket(60, capacity=2, clock=clock, sleep=clock.sleep)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_pause_blocks_then_allows_one_request(self):
+        clock = _Clock()
+        bucket = scheduler.TokenBucket(60, clock=clock, sleep=clock.sleep)
+        bucket.pause(5.0)
+        self.assertAlmostEqual(bucket.acquire(), 5.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+
+    def test_cancelling_the_token_ends_the_wait(self):
+        bucket = scheduler.TokenBucket(1, capacity=1)
+        bucket.acquire()
+
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        start = time.monotonic()
+        with self.assertRaises(status.OperationCancelledException):
+            bucket.acquire(token)
+        self.assertLess(time.monotonic() - start, 5.0)
+
+
+    def test_cancelling_the_coroutine_ends_the_wait(self):
+        bucket = scheduler.TokenBucket(1, capacity=1)
+        self.assertEqual(asyncio.run(bucket.acquire_async()), 0.0)
+        self.assertGreater(bucket.try_acquire(), 0.0)
+
+        start = time.monotonic()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(bucket.acquire_async(), 0.05))
+        self.assertLess(time.monotonic() - start, 5.0)
+
+class RequestSchedulerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = scheduler.RequestScheduler(read_quota=6000, write_quota=6000, backoff=0.0)
+
+    def test_retry_after_header(self):
+        self.assertEqual(scheduler.retry_after(_http_error(429, '7')), 7.0)
+        self.assertIsNone(scheduler.retry_after(_http_error(429)))
+        self.assertEqual(scheduler.retry_after(_http_error(429, 'Wed, 21 Oct 2015 07:28:00 GMT')), 0.0)
+
+    def test_honours_retry_after(self):
+        request = _Request([_http_error(429, '3')])
+        with mock.patch.object(scheduler.time, 'sleep') as sleep, \
+                mock.patch.object(self.scheduler.read_bucket, 'pause') as pause:
+            self.assertEqual(self.scheduler.execute(request), {'ok': True})
+        sleep.assert_called_once_with(3.0)
+        pause.assert_called_once_with(3.0)
+
+    def test_does_not_retry_client_errors(self):
+        for code in (403, 404):
+            request = _Request([_http_error(code)])
+            with self.assertRaises(HttpError):
+                self.scheduler.execute(request)
+            self.assertEqual(request.calls, 1)
+
+    def test_records_attempts_and_latency(self):
+        self.scheduler.execute(_Request([_http_error(503), _http_error(500)]))
+        with self.assertRaises(HttpError):
+            self.scheduler.execute(_Request([_http_error(503)] * 2), attempts=2)
+
+        ok, failed = self.scheduler.records()
+        self.assertEqual((ok.name, ok.attempts, ok.ok), ('spreadsheets.values.batchGet', 3, True))
+        self.assertGreaterEqual(ok.seconds, 0.0)
+        self.assertEqual((failed.attempts, failed.ok, failed.status), (2, False, 503))
+
+    def test_reads_and_writes_use_separate_buckets(self):
+        self.scheduler.execute(_Request([], method='POST'))
+        self.scheduler.execute(_Request([], rate_limited=False))
+        self.assertEqual(self.scheduler.write_bucket._tokens, 5999)
+        self.assertEqual(self.scheduler.read_bucket._tokens, 6000)
+
+    def test_backoff_is_bounded(self):
+        for attempt in range(1, 12):
+            delay = scheduler.backoff_delay(attempt, 0.5, maximum=4.0)
+            self.assertTrue(0.0 <= delay <= min(4.0, 0.5 * 2 ** (attempt - 1)))
+
+
+    def test_threads_get_their_own_transport(self):
+        from google.oauth2.credentials import Credentials
+        from ExpenseTracker.core import discovery
+
+        service = discovery.build_service(Credentials(token='token'))
+
+        def request():
+            return service.spreadsheets().values().batchGet(spreadsheetId='abc', ranges=['Sheet1!A1'])
+
+        # The first thread uses the service's transport, other threads one of their own
+        self.assertIs(scheduler.thread_http(request()), service._http)
+        others = []
+        thread = threading.Thread(target=lambda: others.extend(scheduler.thread_http(request()) for _ in range(2)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(others[0], service._http)
+        self.assertIs(others[0], others[1])
+        self.assertIs(others[0].credentials, service._http.credentials)
+        self.assertIs(scheduler.thread_http(request()), service._http)
+
+        self.assertIsNone(scheduler.thread_http(_Request([])))
+
+
+class _CancellingRequest(_Request):
+    """Cancels the running task while it is being sent."""
+
+    token = None
+
+    def execute(self):
+        self.token.cancel('Stop.')
+        return super().execute()
+
+
+class CancellationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = scheduler.RequestScheduler(read_quota=6000, write_quota=6000, backoff=0.0)
+        self.executor = TaskExecutor(max_workers=1)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    def _run(self, func):
+        return self.executor.submit(func, settle_on_return=True).future.result(timeout=5)
+
+    def test_cancelled_requests_are_not_sent(self):
+        request = _Request([])
+
+        def work():
+            current_token().cancel('Stop.')
+            return self.scheduler.execute(request)
+
+        with self.assertRaises(status.OperationCancelledException):
+            self._run(work)
+        self.assertEqual(request.calls, 0)
+
+    def _execute(self, request):
+        def work():
+            request.token = current_token()
+            return self.scheduler.execute(request)
+        return self._run(work)
+
+    def test_sent_writes_are_retried_to_the_end(self):
+        write = _CancellingRequest([_http_error(503)], method='POST')
+        self.assertEqual(self._execute(write), {'ok': True})
+        self.assertEqual(write.calls, 2)
+
+        read = _CancellingRequest([_http_error(503)])
+        with self.assertRaises(status.OperationCancelledException):
+            self._execute(read)
+        self.assertEqual(read.calls, 1)
@@ -15,9 +15,11 @@ from pathlib import Path
 from typing import Any, Dict
 
 from ExpenseTracker.settings import lib
+from ExpenseTracker.settings import locale
 from ExpenseTracker.settings.lib import (
     HEADER_TYPES,
     LEDGER_SCHEMA,
+    MappingPlan,
     SettingsAPI,
     _validate_categories,
     _validate_header,
@@ -101,6 +103,49 @@ class HelperFunctionTests(unittest.TestCase):
         self.assertEqual(parse_merge_mapping("   "), [])
 
 
+class MappingPlanTests(unittest.TestCase):
+    def test_plan_columns_and_lookups(self):
+        plan = MappingPlan({"date": "Date", "description": "Description|Notes + Memo", "amount": "Amount"})
+        self.assertEqual(plan.sources("description"), ("Description", "Notes", "Memo"))
+        self.assertEqual(plan.sources("category"), ())
+        self.assertEqual(list(plan.columns)[:len(lib.DATA_MAPPING_KEYS)], lib.DATA_MAPPING_KEYS)
+        self.assertEqual(plan.merged_keys, frozenset({"description"}))
+        self.assertEqual(plan.keys_of("Notes"), ("description",))
+        self.assertEqual(plan.keys_of("Other"), ())
+        self.assertTrue(plan.is_merged_column("Memo"))
+        self.assertFalse(plan.is_merged_column("Date"))
+
+
+class LocaleFormattingTests(unittest.TestCase):
+    def test_format_currency_value_matches_babel(self):
+        from babel import Locale, numbers
+
+        for loc in ("en_US", "de_DE", "hu_HU", "ja_JP"):
+            currency = locale.get_currency_from_locale(loc)
+            for value in (0, -0.0, 1234.5, -99.999):
+                expected = numbers.format_currency(value, currency=currency, locale=Locale.parse(loc))
+                self.assertEqual(locale.format_currency_value(value, loc), expected)
+
+    def test_formatter_is_memoized(self):
+        self.assertIs(locale.get_currency_formatter("fr_FR"), locale.get_currency_formatter("fr_FR"))
+        self.assertIs(locale.get_locale("fr_FR"), locale.get_currency_formatter("fr_FR").locale)
+
+    def test_format_currency_many(self):
+        values = [1.5, -2.0, 1.5, 0.0]
+        self.assertEqual(
+            locale.format_currency_many(values, "en_US"),
+            [locale.format_currency_value(v, "en_US") for v in values],
+        )
+        self.assertEqual(locale.format_currency_many([], "en_US"), [])
+        # Negative zero is formatted like zero, whichever comes first
+        self.assertEqual(locale.format_currency_many([-0.0, 0.0], "en_US"), ["$0.00", "$0.00"])
+        self.assertEqual(locale.format_currency_value(0.0, "en_US"), "$0.00")
+
+    def test_invalid_locale_falls_back_to_str(self):
+        self.assertEqual(locale.format_currency_value(1.5, "not a locale"), "1.5")
+        self.assertEqual(locale.format_currency_many([1.5], "not a locale"), ["1.5"])
+
+
 class ValidatorTests(unittest.TestCase):
     def test_validate_header_good(self):
         _validate_header({"A": "string", "B": "float"}, HEADER_TYPES)  # no raise
@@ -295,6 +340,48 @@ class SettingsAPIBehaviour(BaseTestCase):
         self.api.revert_client_secret_to_template()
         self.assertTrue(self.api.client_secret_path.exists())
 
+    def test_snapshot_cached_until_change(self):
+        snap = self.api.snapshot
+        self.assertIs(self.api.snapshot, snap)
+
+        self.api["span"] = 3
+        new = self.api.snapshot
+        self.assertIsNot(new, snap)
+        self.assertGreater(new.version, snap.version)
+        self.assertEqual(new.span, 3)
+        self.assertEqual(snap.span, 0)
+
+        cats = self.api.get_section("categories")
+        cats["rent"] = {**cats["cash"], "display_name": "Rent", "excluded": True}
+        self.api.set_section("categories", cats)
+        self.assertGreater(self.api.snapshot.version, new.version)
+
+    def test_snapshot_values(self):
+        snap = self.api.snapshot
+        self.assertEqual(snap.locale, "en_US")
+        self.assertEqual(snap.loess_fraction, 0.25)
+        self.assertEqual(snap.mapped_column("amount"), "Amount")
+        self.assertEqual(snap.mapped_columns["description"], ("Description",))
+        self.assertEqual(dict(snap.category_order), {"cash": 0})
+        self.assertEqual(snap.excluded_categories, frozenset())
+        self.assertEqual(snap.header["Date"], "date")
+
+    def test_snapshot_mapping_plan_follows_mapping(self):
+        self.assertEqual(self.api.snapshot.mapping_plan.sources("description"), ("Description",))
+        mapping = self.api.get_section("mapping")
+        mapping["description"] = "Description|Account"
+        self.api.set_section("mapping", mapping)
+        self.assertEqual(self.api.snapshot.mapping_plan.sources("description"), ("Description", "Account"))
+
+    def test_snapshot_is_read_only(self):
+        snap = self.api.snapshot
+        with self.assertRaises(AttributeError):
+            snap.locale = "de_DE"
+        with self.assertRaises(TypeError):
+            snap.categories["cash"]["color"] = "#000000"
+        with self.assertRaises(TypeError):
+            snap.metadata["span"] = 1
+
 
 class CategoryManagerTests(BaseTestCase):
     """Tests for the CategoryManager unified API."""
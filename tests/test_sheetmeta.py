@@ -0,0 +1,166 @@
+"""Tests for :mod:`ExpenseTracker.core.sheetmeta`."""
+import csv
+import pathlib
+import tempfile
+import time
+from unittest import mock
+
+from ExpenseTracker.core import localsheets
+from ExpenseTracker.core import service
+from ExpenseTracker.core.profiler import profiler
+from ExpenseTracker.core.scheduler import scheduler
+from ExpenseTracker.core.sheetmeta import SheetMetadataCache, SheetProperties, UsedRange, metadata_cache
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase
+
+HEADER = ['Date', 'Amount', 'Description', 'Category', 'Account']
+ROWS = [
+    ['2025-01-01', '-10.5', 'Coffee', 'Food', 'Visa'],
+    ['2025-01-02', '-900', 'Rent', 'Housing', 'Debit'],
+]
+
+
+class SheetMetadataCacheTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp.name) / 'ledger.csv'
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + ROWS)
+        self.sid = f'local:{self.csv_path}'
+        self.service = localsheets.LocalSheetsService(self.sid)
+        self.cache = SheetMetadataCache(ttl=60.0)
+
+    def tearDown(self) -> None:
+        service.clear_service()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_sheets_and_header_are_cached(self):
+        sheets = self.cache.sheets(self.service, self.sid)
+        self.assertEqual(sheets, {'Sheet1': SheetProperties('Sheet1', len(ROWS) + 1, len(HEADER))})
+        self.assertEqual(self.cache.header(self.service, self.sid, 'Sheet1', len(HEADER)), HEADER)
+        requests = self.service.request_count
+
+        self.cache.sheets(self.service, self.sid)
+        header = self.cache.header(self.service, self.sid, 'Sheet1', len(HEADER))
+        header.append('mutated')
+        self.assertEqual(self.cache.header(self.service, self.sid, 'Sheet1', len(HEADER)), HEADER)
+        self.assertEqual(self.service.request_count, requests)
+        self.assertEqual(self.cache.hits, 3)
+
+    def test_entries_expire(self):
+        self.cache.sheets(self.service, self.sid)
+        requests = self.service.request_count
+        with mock.patch('ExpenseTracker.core.sheetmeta.time.monotonic', return_value=time.monotonic() + 61):
+            self.cache.sheets(self.service, self.sid)
+        self.assertEqual(self.service.request_count, requests + 1)
+
+    def test_entries_are_tied_to_the_service(self):
+        self.cache.sheets(self.service, self.sid)
+        other = localsheets.LocalSheetsService(self.sid)
+        self.cache.sheets(other, self.sid)
+        self.assertEqual(other.request_count, 1)
+
+    def test_invalidate(self):
+        self.cache.sheets(self.service, self.sid)
+        self.cache.invalidate('local:other.csv')
+        self.cache.sheets(self.service, self.sid)
+        self.assertEqual(self.cache.misses, 1)
+
+        self.cache.invalidate(self.sid)
+        self.cache.sheets(self.service, self.sid)
+        self.assertEqual(self.cache.misses, 2)
+
+    def _configure(self):
+        lib.settings.set_section('header', {
+            'Date': 'date', 'Amount': 'float', 'Description': 'string', 'Category': 'string', 'Account': 'string'
+        })
+        lib.settings.set_section('mapping', {
+            'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category',
+            'account': 'Account',
+        })
+        service.clear_service()
+        lib.settings.set_section('spreadsheet', {'id': self.sid, 'worksheet': 'Sheet1'})
+        return service.get_service()
+
+    def _append_blank_rows(self, count: int) -> None:
+        with self.csv_path.open('a', newline='') as f:
+            csv.writer(f).writerows([[]] * count)
+        self.service = localsheets.LocalSheetsService(self.sid)
+
+    def test_fetch_data_shares_metadata_requests(self):
+        svc = self._configure()
+        df = service._fetch_data(concurrency=1, column_major=False)
+        self.assertEqual(len(df), len(ROWS))
+        # One spreadsheets().get, then values().batchGet for the header, the used range and the rows
+        self.assertEqual(svc.request_count, 4)
+
+        service._fetch_headers()
+        self.assertEqual(svc.request_count, 4)
+
+        metadata_cache.invalidate()
+        service._verify_sheet_access()
+        self.assertEqual(svc.request_count, 5)
+
+    def test_used_range(self):
+        self._append_blank_rows(500)
+        grid_rows = len(ROWS) + 501
+        self.assertEqual(self.cache.sheets(self.service, self.sid)['Sheet1'].row_count, grid_rows)
+
+        used = self.cache.used_range(self.service, self.sid, 'Sheet1', grid_rows, [0, 1])
+        self.assertEqual(used, UsedRange(len(ROWS) + 1, grid_rows))
+        self.assertEqual(used.skipped, 500)
+
+        # A hint at or above the last row needs a single request
+        for hint, requests in ((len(ROWS) + 1, 1), (2, 1), (len(ROWS) + 10, 2)):
+            self.cache.invalidate()
+            count = self.service.request_count
+            used = self.cache.used_range(self.service, self.sid, 'Sheet1', grid_rows, [0], hint=hint)
+            self.assertEqual(used.last_row, len(ROWS) + 1)
+            self.assertEqual(self.service.request_count - count, requests)
+
+        self.assertEqual(self.cache.used_range(self.service, self.sid, 'Sheet1', 10, []), UsedRange(10, 10))
+
+    def test_used_range_probe_is_bounded(self):
+        with self.csv_path.open('a', newline='') as f:
+            csv.writer(f).writerows(ROWS * 15)
+        self._append_blank_rows(5)
+        grid_rows = len(ROWS) * 16 + 6
+
+        # Without a hint only the bottom windows are read, not the columns in full
+        with mock.patch('ExpenseTracker.core.sheetmeta.PROBE_ROWS', 4):
+            scheduler.clear()
+            used = self.cache.used_range(self.service, self.sid, 'Sheet1', grid_rows, [0])
+            self.assertEqual(used, UsedRange(grid_rows - 5, grid_rows))
+            self.assertEqual(
+                [r.ranges for r in scheduler.records()],
+                [(f'Sheet1!A{grid_rows - 3}:A{grid_rows}',), (f'Sheet1!A{grid_rows - 11}:A{grid_rows - 4}',)]
+            )
+
+            # A hint below the last row, after rows were deleted, searches upwards from the hint
+            self.cache.invalidate()
+            scheduler.clear()
+            used = self.cache.used_range(self.service, self.sid, 'Sheet1', grid_rows, [0], hint=grid_rows - 2)
+            self.assertEqual(used.last_row, grid_rows - 5)
+            self.assertEqual(
+                [r.ranges for r in scheduler.records()],
+                [(f'Sheet1!A{grid_rows - 2}:A{grid_rows}',), (f'Sheet1!A{grid_rows - 6}:A{grid_rows - 3}',)]
+            )
+
+    def test_fetch_skips_blank_rows(self):
+        self._append_blank_rows(5_000)
+        svc = self._configure()
+        profiler.clear()
+
+        for column_major in (False, True):
+            metadata_cache.invalidate()
+            count = svc.request_count
+            df = service._fetch_data(chunk_size=100, concurrency=1, column_major=column_major)
+            self.assertEqual(len(df), len(ROWS))
+            # Metadata, header, three probe windows up from the bottom and a single chunk of rows
+            self.assertEqual(svc.request_count - count, 6)
+
+        stages = [r for r in profiler.records() if r.stage == 'service.used_range']
+        self.assertEqual([r.rows for r in stages], [5_000, 5_000])
+        profiler.clear()
@@ -38,6 +38,33 @@ def gen_rows(n: int, *, with_id: bool = True, dup: bool = False) -> List[List[An
     return rows
 
 
+def assemble_remote_rows(column_values_map: Dict[Tuple[str, str], List[Any]],
+                         data_row_count: int) -> List[Dict[str, Tuple[Any, ...]]]:
+    """Reference: build each remote row as {logical field: tuple of its values by sorted header}."""
+    headers: Dict[str, List[str]] = {}
+    for logical_field, actual_header in column_values_map:
+        headers.setdefault(logical_field, []).append(actual_header)
+    for actual_headers in headers.values():
+        actual_headers.sort()
+    return [
+        {field: tuple(column_values_map[(field, h)][i] for h in hs) for field, hs in headers.items()}
+        for i in range(data_row_count)
+    ]
+
+
+def build_remote_index_map(remote_rows: List[Dict[str, Tuple[Any, ...]]],
+                           logical_stable_fields: List[str]) -> Dict[Tuple[Any, ...], List[int]]:
+    """Reference: map every non-empty stable key to its 0-based data row indices."""
+    index_map: Dict[Tuple[Any, ...], List[int]] = {}
+    for idx, row in enumerate(remote_rows):
+        key = tuple(row.get(field) for field in logical_stable_fields)
+        # Rows whose key values are all blank never match
+        if all(v is None or all(e is None or e == '' for e in v) for v in key):
+            continue
+        index_map.setdefault(key, []).append(idx)
+    return index_map
+
+
 class SyncIntegrationTest(BaseServiceTestCase):
     """Live‑sheet integration tests covering optimistic‑lock behaviour."""
 
@@ -306,7 +333,7 @@ class SyncInternalHelperTest(BaseTestCase):
         with self.assertRaises(ValueError):
             self.sync._build_stable_headers_map(['Date'], ['description'])
 
-    # _fetch_stable_data, _assemble_remote_rows, _build_remote_index_map -----
+    # _fetch_stable_data ------------------------------------------------------
     def test_data_roundtrip_helpers(self):
         headers = ['ID', 'Date', 'Amount']
         col_vals = {
@@ -320,10 +347,7 @@ class SyncInternalHelperTest(BaseTestCase):
         fetched = self.sync._fetch_stable_data(svc, stable_map, idx, 2, 1)
         self.assertEqual(fetched[('amount', 'Amount')][0], 10.23)
 
-        # assemble_remote_rows now takes only (column_values_map, data_row_count)
-        rows = self.sync._assemble_remote_rows(fetched, 1)
-        # build index map with logical stable fields
-        m = self.sync._build_remote_index_map(rows, ['id', 'date', 'amount'])
+        m = build_remote_index_map(assemble_remote_rows(fetched, 1), ['id', 'date', 'amount'])
         self.assertIn(((1,), ('2023-10-28',), (10.23,)), m)
 
     # _match_operations, _build_update_payload, _apply_local_updates ---------
@@ -338,3 +362,31 @@ class SyncInternalHelperTest(BaseTestCase):
         self.assertEqual(payload['data'][0]['values'][0][0], 2)
         self.sync._apply_local_updates(to_upd, {'Amount': 1})
         mock_update.assert_called_once_with(1, 'Amount', 2)
+
+    # _join_remote_keys ------------------------------------------------------
+    def test_join_remote_keys_matches_index_map(self):
+        rng = random.Random(7)
+        n = 500
+        col_vals = {
+            ('date', 'Date'): [rng.choice(['2025-01-01', '2025-01-02', None]) for _ in range(n)],
+            ('amount', 'Amount'): [rng.choice([1.5, 2.0, 2, None]) for _ in range(n)],
+            ('description', 'Notes'): [rng.choice(['', 'n']) for _ in range(n)],
+            ('description', 'Description'): [rng.choice(['a', 'b', '']) for _ in range(n)],
+        }
+        fields = ['date', 'amount', 'description']
+        self.sync._queue = [
+            EditOperation(i + 1, 'category', None, 'X', {'date': (d,), 'amount': (a,), 'description': (s, t)})
+            for i, (d, a, s, t) in enumerate(itertools.product(
+                ['2025-01-01', None], [2.0, 2, None], ['a', ''], ['n', '', 'missing']
+            ))
+        ]
+        expected = build_remote_index_map(assemble_remote_rows(col_vals, n), fields)
+
+        from ExpenseTracker.core import rowindex
+        key_cols = rowindex.key_columns(col_vals, fields)
+        joined = self.sync._join_remote_keys(
+            col_vals, fields, rowindex.hash_keys(key_cols, n), rowindex.empty_keys(key_cols, n)
+        )
+        op_keys = {tuple(op.stable_keys[f] for f in fields) for op in self.sync._queue}
+        self.assertEqual(joined, {k: v for k, v in expected.items() if k in op_keys})
+        self.assertTrue(joined)
@@ -0,0 +1,191 @@
+"""Tests for :mod:`ExpenseTracker.core.tasks`."""
+import csv
+import logging
+import pathlib
+import tempfile
+import threading
+import time
+
+from PySide6 import QtCore
+
+from ExpenseTracker.core import fetcher
+from ExpenseTracker.core import localsheets
+from ExpenseTracker.core.tasks import TaskCancelled, TaskExecutor, check_cancelled, current_token, uncancellable
+from ExpenseTracker.status import status
+from tests.base import BaseTestCase
+
+
+class TaskExecutorTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.executor = TaskExecutor(max_workers=2)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown(wait=True)
+        super().tearDown()
+
+    def _wait(self, handle, seconds: float = 5.0) -> None:
+        """Process events until the handle has emitted its signal."""
+        deadline = time.monotonic() + seconds
+        while not handle.settled and time.monotonic() < deadline:
+            QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+        self.assertTrue(handle.settled)
+
+    def _connect(self, handle):
+        emitted = []
+        handle.finished.connect(lambda v: emitted.append(('finished', v)))
+        handle.failed.connect(lambda v: emitted.append(('failed', v)))
+        handle.cancelled.connect(lambda v: emitted.append(('cancelled', v)))
+        return emitted
+
+    def test_finished(self):
+        handle = self.executor.submit(lambda a, b=0: a + b, 1, b=2)
+        emitted = self._connect(handle)
+        self._wait(handle)
+        self.assertEqual(emitted, [('finished', 3)])
+        self.assertEqual(handle.result(), 3)
+        self.assertEqual(self.executor.active(), 0)
+
+    def test_failed(self):
+        def fail():
+            raise ValueError('boom')
+
+        handle = self.executor.submit(fail)
+        emitted = self._connect(handle)
+        self._wait(handle)
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0][0], 'failed')
+        self.assertIsInstance(emitted[0][1], ValueError)
+        with self.assertRaises(ValueError):
+            handle.result()
+
+    def test_cancel_stops_the_task(self):
+        started, stopped = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            try:
+                while True:
+                    check_cancelled()
+                    time.sleep(0.01)
+            finally:
+                stopped.set()
+
+        handle = self.executor.submit(work)
+        emitted = self._connect(handle)
+        self.assertTrue(started.wait(5))
+        handle.cancel('Stop.')
+        self._wait(handle)
+
+        self.assertEqual(emitted, [('cancelled', 'Stop.')])
+        self.assertTrue(stopped.wait(5))
+        with self.assertRaises(status.OperationCancelledException):
+            handle.result()
+
+    def test_cancelling_is_not_reported_as_an_error(self):
+        started = threading.Event()
+
+        def work():
+            started.set()
+            while True:
+                check_cancelled()
+                time.sleep(0.01)
+
+        logging.disable(logging.NOTSET)
+        try:
+            with self.assertNoLogs(level='ERROR'):
+                handle = self.executor.submit(work)
+                self.assertTrue(started.wait(5))
+                handle.cancel('Stop.')
+                self._wait(handle)
+                self.assertIsInstance(handle.future.exception(timeout=5), TaskCancelled)
+        finally:
+            logging.disable(logging.CRITICAL)
+
+    def test_timeout_cancels_without_terminating(self):
+        def work():
+            token = current_token()
+            while not token.wait(0.01):
+                pass
+            return 'ignored'
+
+        handle = self.executor.submit(work, timeout=0.1)
+        emitted = self._connect(handle)
+        self._wait(handle)
+        self.assertEqual(emitted, [('cancelled', 'Operation timed out after 0.1s.')])
+        # The task saw the cancellation and returned on its own
+        self.assertEqual(handle.future.result(timeout=5), 'ignored')
+
+    def test_settle_on_return_reports_what_the_task_did(self):
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            with uncancellable():
+                self.assertIsNone(current_token())
+                release.wait(5)
+                check_cancelled()
+            self.assertIsNotNone(current_token())
+            return 'done'
+
+        handle = self.executor.submit(work, settle_on_return=True)
+        emitted = self._connect(handle)
+        self.assertTrue(started.wait(5))
+        handle.cancel('Stop.')
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+        # Not settled while the task runs
+        self.assertFalse(handle.settled)
+        self.assertFalse(handle.done())
+
+        release.set()
+        self._wait(handle)
+        self.assertEqual(emitted, [('finished', 'done')])
+        self.assertEqual(handle.result(), 'done')
+
+    def test_settle_on_return_cancelled_when_the_task_stops(self):
+        started = threading.Event()
+
+        def work():
+            started.set()
+            while True:
+                check_cancelled()
+                time.sleep(0.01)
+
+        handle = self.executor.submit(work, settle_on_return=True)
+        emitted = self._connect(handle)
+        self.assertTrue(started.wait(5))
+        handle.cancel('Stop.')
+        self._wait(handle)
+        self.assertEqual(emitted, [('cancelled', 'Stop.')])
+
+    def test_tasks_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        handles = [self.executor.submit(barrier.wait) for _ in range(2)]
+        for handle in handles:
+            self._wait(handle)
+        self.assertEqual(sorted(h.result() for h in handles), [0, 1])
+
+    def test_check_cancelled_outside_of_a_task(self):
+        self.assertIsNone(current_token())
+        check_cancelled()
+
+    def test_fetch_ranges_stops_when_cancelled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = pathlib.Path(tmp) / 'ledger.csv'
+            with csv_path.open('w', newline='') as f:
+                csv.writer(f).writerows([['Date', 'Amount']] + [['2025-01-01', str(i)] for i in range(40)])
+            svc = localsheets.LocalSheetsService(f'local:{csv_path}')
+            ranges = fetcher.split_ranges('Sheet1', 41, 'B', 5)
+            calls = []
+
+            def progress(*args):
+                calls.append(args)
+                handle.cancel()
+
+            handle = self.executor.submit(
+                fetcher.fetch_ranges, svc, svc.spreadsheet_id, ranges, concurrency=2, progress=progress
+            )
+            self._wait(handle)
+            with self.assertRaises(status.OperationCancelledException):
+                handle.future.result(timeout=5)
+            self.assertLess(len(calls), len(ranges))
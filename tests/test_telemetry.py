@@ -0,0 +1,121 @@
+"""Tests for :mod:`ExpenseTracker.core.telemetry`."""
+import csv
+import json
+import pathlib
+import tempfile
+from unittest import mock
+
+import httplib2
+from google.oauth2.credentials import Credentials
+
+from ExpenseTracker.core import localsheets, telemetry
+from ExpenseTracker.core.profiler import StageRecord, profiler
+from ExpenseTracker.core.scheduler import RequestRecord, RequestScheduler, request_ranges, scheduler
+from tests.base import BaseTestCase
+
+
+class TelemetryTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        scheduler.clear()
+        profiler.clear()
+
+    def tearDown(self) -> None:
+        scheduler.clear()
+        profiler.clear()
+        super().tearDown()
+
+    def test_summary(self):
+        records = [
+            RequestRecord('values.batchGet', 1, 0.1 * i, finished=float(i), ranges=('A1:B2', 'C1:C2'), bytes=100)
+            for i in range(1, 21)
+        ]
+        records.append(RequestRecord('spreadsheets.get', 3, 2.0, error='HttpError', status=503, bytes=50))
+
+        stats = telemetry.summary(records)
+        self.assertEqual(list(stats), ['values.batchGet', 'spreadsheets.get'])
+        batch_get = stats['values.batchGet']
+        self.assertEqual((batch_get.calls, batch_get.ranges, batch_get.bytes), (20, 40, 2000))
+        self.assertAlmostEqual(batch_get.p50, 1.1)
+        self.assertAlmostEqual(batch_get.p95, 1.9)
+        get = stats['spreadsheets.get']
+        self.assertEqual((get.retries, get.errors), (2, 1))
+
+        frame = telemetry.summary_frame(records)
+        self.assertEqual(frame.loc[0, 'p95_ms'], 1900.0)
+
+    def test_refreshes(self):
+        records = [RequestRecord('values.batchGet', 1 + i % 2, 0.1, finished=float(i), bytes=10) for i in range(10)]
+        stages = [
+            StageRecord('service.fetch_data', 3.0, finished=4.0),
+            StageRecord('database.cast', 5.0, finished=9.0),
+            StageRecord('service.fetch_new_rows', 1.5, finished=9.0),
+        ]
+        refreshes = telemetry.refreshes(records, stages)
+        self.assertEqual([(r.stage, r.requests, r.retries, r.bytes) for r in refreshes], [
+            ('service.fetch_data', 4, 2, 40),
+            ('service.fetch_new_rows', 2, 1, 20),
+        ])
+        self.assertEqual(telemetry.bytes_per_refresh(refreshes), 30.0)
+        self.assertEqual(telemetry.bytes_per_refresh([]), 0.0)
+
+    def test_local_requests_record_ranges_and_bytes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'ledger.csv'
+            with path.open('w', newline='') as f:
+                csv.writer(f).writerows([['Date', 'Amount']] + [['2025-01-01', str(i)] for i in range(10)])
+            svc = localsheets.LocalSheetsService(f'local:{path}')
+
+            ranges = ['Sheet1!A1:B5', 'Sheet1!A6:B11']
+            result = scheduler.execute(svc.spreadsheets().values().batchGet(spreadsheetId=svc.spreadsheet_id,
+                                                                            ranges=ranges))
+            record = scheduler.records()[-1]
+            self.assertEqual(record.ranges, tuple(ranges))
+            self.assertEqual(record.bytes, len(json.dumps(result)))
+
+    def test_request_ranges_of_api_requests(self):
+        from ExpenseTracker.core import discovery
+
+        service = discovery.build_service(Credentials(token='token'))
+        request = service.spreadsheets().values().batchGet(spreadsheetId='abc', ranges=['Sheet1!A1:B2', 'Sheet1!C:C'])
+        self.assertEqual(request_ranges(request), ('Sheet1!A1:B2', 'Sheet1!C:C'))
+
+        request = service.spreadsheets().values().batchUpdate(spreadsheetId='abc', body={
+            'valueInputOption': 'RAW', 'data': [{'range': 'Sheet1!B2', 'values': [[1]]}]
+        })
+        self.assertEqual(request_ranges(request), ('Sheet1!B2',))
+
+    def test_transport_counts_response_bytes(self):
+        content = b'{"valueRanges": []}'
+        http = mock.Mock()
+        http.request.return_value = (httplib2.Response({'status': 200}), content)
+        transport = telemetry.InstrumentedHttp(Credentials(token='token'), http=http)
+
+        class Request:
+            methodId = 'sheets.spreadsheets.values.batchGet'
+            rate_limited = False
+
+            def execute(self):
+                transport.request('https://example.com')
+                return {}
+
+        local = RequestScheduler()
+        local.execute(Request())
+        self.assertEqual(local.records()[-1].bytes, len(content))
+
+        # Outside of a scheduled request nothing is recorded
+        transport.request('https://example.com')
+        self.assertEqual(len(local.records()), 1)
+
+    def test_request_model(self):
+        from ExpenseTracker.log.model import RequestColumns, RequestModel
+
+        scheduler.add_record(RequestRecord('values.batchGet', 2, 0.25, finished=1.0, bytes=2048))
+        model = RequestModel()
+        model.refresh()
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.data(model.index(0, RequestColumns.Retries)), '1')
+        self.assertEqual(model.data(model.index(0, RequestColumns.Bytes)), '2.0 KiB')
+
+        model.clear()
+        self.assertEqual(model.rowCount(), 0)
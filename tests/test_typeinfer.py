@@ -0,0 +1,73 @@
+"""Tests for :mod:`ExpenseTracker.core.typeinfer`."""
+import csv
+import pathlib
+import tempfile
+
+from ExpenseTracker.core import localsheets, service, typeinfer
+from ExpenseTracker.core.typeinfer import TypeGuess, infer_column, sample_blocks
+from ExpenseTracker.settings import lib
+from tests.base import BaseTestCase
+
+HEADER = ['Date', 'Amount', 'Count', 'Description', 'Mixed']
+
+
+class TypeInferenceTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        typeinfer.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = pathlib.Path(self.tmp.name) / 'ledger.csv'
+        self.rows = [
+            [f'2025-01-{1 + i % 28:02d}', f'-{i}.5', str(i), f'Item {i}', str(i) if i % 4 else f'Note {i}']
+            for i in range(5000)
+        ]
+        with self.csv_path.open('w', newline='') as f:
+            csv.writer(f).writerows([HEADER] + self.rows + [[]] * 1000)
+        self.sid = f'local:{self.csv_path}'
+
+    def tearDown(self) -> None:
+        typeinfer.clear()
+        service.clear_service()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_sample_blocks(self):
+        self.assertEqual(sample_blocks(2, 1001, 40, blocks=4), [(2, 11), (332, 341), (662, 671), (992, 1001)])
+        self.assertEqual(sample_blocks(2, 50, 200), [(2, 50)])
+        self.assertEqual(sample_blocks(2, 1, 200), [])
+        spans = sample_blocks(2, 100_001, 200)
+        self.assertEqual(sum(r1 - r0 + 1 for r0, r1 in spans), 200)
+        self.assertEqual((spans[0][0], spans[-1][1]), (2, 100_001))
+
+    def test_infer_column(self):
+        self.assertEqual(infer_column([1, 2, '', None, 3.0]), TypeGuess('int', 1.0, 3))
+        self.assertEqual(infer_column([1, 2.5, '3']), TypeGuess('float', 1.0, 3))
+        self.assertEqual(infer_column(['2025-01-02', '2025-1-3', 'n/a', '']).type, 'date')
+        self.assertEqual(infer_column(['1/2/2025'], locale='en_US').type, 'date')
+        self.assertEqual(infer_column(['Coffee', True, 1]), TypeGuess('string', 2 / 3, 3))
+        self.assertEqual(infer_column([]), TypeGuess('string', 0.0, 0))
+
+    def test_infer_types_samples_and_caches(self):
+        svc = localsheets.LocalSheetsService(self.sid)
+        guesses = typeinfer.infer_types(svc, self.sid, 'Sheet1', HEADER, len(self.rows) + 1, sample_size=80)
+        self.assertEqual({k: v.type for k, v in guesses.items()}, {
+            'Date': 'date', 'Amount': 'float', 'Count': 'int', 'Description': 'string', 'Mixed': 'int'
+        })
+        self.assertAlmostEqual(guesses['Mixed'].confidence, 0.75, delta=0.05)
+        self.assertEqual(guesses['Date'].samples, 80)
+        self.assertEqual(svc.request_count, 1)
+
+        typeinfer.infer_types(svc, self.sid, 'Sheet1', HEADER, len(self.rows) + 1, sample_size=80)
+        self.assertEqual(svc.request_count, 1)
+        typeinfer.infer_types(svc, self.sid, 'Sheet1', HEADER[:-1], len(self.rows) + 1, sample_size=80)
+        self.assertEqual(svc.request_count, 2)
+
+    def test_service_infers_header_types(self):
+        service.clear_service()
+        lib.settings.set_section('spreadsheet', {'id': self.sid, 'worksheet': 'Sheet1'})
+        guesses = service._infer_header_types(sample_size=80)
+        self.assertEqual([(k, v.type) for k, v in guesses.items()], [
+            ('Date', 'date'), ('Amount', 'float'), ('Count', 'int'), ('Description', 'string'), ('Mixed', 'int')
+        ])
+        # The blank rows below the data are not sampled
+        self.assertEqual(guesses['Description'].samples, 80)
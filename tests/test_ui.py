@@ -122,6 +122,10 @@ class TestLogView(UIBaseTestCase):
         from ExpenseTracker.log.view import LogDockWidget
         self.assertIsNotNone(LogDockWidget(None))
 
+    def test_PerformanceDockWidget_init(self):
+        from ExpenseTracker.log.view import PerformanceDockWidget
+        self.assertIsNotNone(PerformanceDockWidget(None))
+
 
 @unittest.skip("Skipping UI tests")
 class TestDataView(UIBaseTestCase):